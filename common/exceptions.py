@@ -2,6 +2,7 @@
 """
 结构计算程序通用异常类
 """
+from enum import IntEnum
 
 
 class CalculationError(Exception):
@@ -49,4 +50,71 @@ class ParameterError(CalculationError):
     """
     参数错误异常类
     """
-    pass
\ No newline at end of file
+    pass
+
+class ErrorCode(IntEnum):
+    """
+    批量计算错误码（逐行错误码数组，仅对出错行生成错误信息）
+    """
+    OK = 0
+    DIMENSION = 1  # 截面尺寸
+    FLANGE_HEIGHT = 2  # 翼缘高度不小于梁高
+    FLANGE_SUM = 3  # 上下翼缘高度之和不小于梁高
+    FLANGE_SIZE = 4  # 翼缘尺寸（配筋设计）
+    STEEL_AREA = 5  # 钢筋面积为负
+    COVER = 6  # 钢筋合力点至边缘距离
+    GAMMA0 = 7  # 结构重要性系数
+    MOMENT = 8  # 弯矩设计值为负
+    MATERIAL = 9  # 材料等级无效
+    EFFECTIVE_DEPTH = 10  # 有效高度
+    CALCULATION = 11  # 计算过程错误（超筋截面无解等）
+    INPUT = 12  # 读取阶段的输入错误（如钢筋标注无法解析）
+    SECTION_TYPE = 13  # 截面类型不支持
+
+
+# 错误码对应的异常类及错误信息（与逐截面计算函数抛出的异常一致）
+ERROR_TYPES = {
+    ErrorCode.DIMENSION: (ParameterError, "截面尺寸必须大于0"),
+    ErrorCode.FLANGE_HEIGHT: (ParameterError, "翼缘高度必须小于梁总高度"),
+    ErrorCode.FLANGE_SUM: (ParameterError, "上下翼缘高度之和必须小于梁总高度"),
+    ErrorCode.FLANGE_SIZE: (ParameterError, "翼缘尺寸无效"),
+    ErrorCode.STEEL_AREA: (ParameterError, "钢筋面积不能为负"),
+    ErrorCode.COVER: (ParameterError, "钢筋合力点至边缘距离必须大于0"),
+    ErrorCode.GAMMA0: (ParameterError, "结构重要性系数必须大于0"),
+    ErrorCode.MOMENT: (ParameterError, "弯矩设计值不能为负"),
+    ErrorCode.MATERIAL: (MaterialError, "获取材料参数失败"),
+    ErrorCode.EFFECTIVE_DEPTH: (GeometryError, "有效高度必须大于0"),
+    ErrorCode.CALCULATION: (CalculationError, "抗弯承载力计算失败"),
+    ErrorCode.INPUT: (ParameterError, "输入数据错误"),
+    ErrorCode.SECTION_TYPE: (ParameterError, "截面类型不支持"),
+}
+
+
+def make_error(code, message=None, section=None, parameter=None):
+    """
+    由错误码生成异常对象
+    :param code: 错误码（ErrorCode或整数）
+    :param message: 错误信息，None时取错误码的默认信息
+    :param section: 错误发生的截面编号
+    :param parameter: 相关参数
+    :return: CalculationError - 对应类型的异常对象（不抛出）
+    """
+    cls, default = ERROR_TYPES[ErrorCode(code)]
+    return cls(message or default, section=section, parameter=parameter)
+
+
+def error_code(error):
+    """
+    由异常对象或错误信息取错误码（按ERROR_TYPES的错误信息匹配）
+    :param error: 异常对象、错误信息文字或None
+    :return: ErrorCode - 无错误为OK；未匹配时材料异常为MATERIAL，其余异常为CALCULATION，错误信息文字为INPUT
+    """
+    if error is None or error == "":
+        return ErrorCode.OK
+    text = error.message if isinstance(error, CalculationError) else str(error)
+    for code, (_, message) in ERROR_TYPES.items():
+        if message in text:
+            return code
+    if isinstance(error, MaterialError):
+        return ErrorCode.MATERIAL
+    return ErrorCode.CALCULATION if isinstance(error, Exception) else ErrorCode.INPUT
@@ -79,6 +79,20 @@ def solve_quadratic_equation(a: float, b: float, c: float) -> float:
         # 判别式为负，返回0
         return 0
 
+# ========== 缺失值判断函数 ============
+def is_missing(value: Any) -> bool:
+    """
+    判断单元格值是否缺失（None或nan），替代pandas.isna以免单截面计算导入pandas
+    :param value: 待判断的值
+    :return: bool - 是否缺失
+    """
+    if value is None:
+        return True
+    try:
+        return math.isnan(value)
+    except TypeError:
+        return False
+
 # ========== 格式化计算结果函数 ============
 def format_calculation_result(result: Tuple[Any, ...], decimal_places: int = 1) -> Tuple[Any, ...]:
     """
@@ -15,9 +15,49 @@ OUTPUT_DIR = os.path.join(PROJECT_ROOT, 'output')
 EXCEL_OUTPUT_NAME = "梁抗弯承载力计算结果.xlsx"
 EXCEL_OUTPUT_PATH = os.path.join(OUTPUT_DIR, EXCEL_OUTPUT_NAME)
 
+# 计算书文件（.out）是否gzip压缩（压缩时文件名为.out.gz；计算书索引文件为文件名.idx）
+REPORT_GZIP = False
+REPORT_OUTPUT_NAME = "梁抗弯承载力计算结果.out" + (".gz" if REPORT_GZIP else "")
+REPORT_OUTPUT_PATH = os.path.join(OUTPUT_DIR, REPORT_OUTPUT_NAME)
+
+# 生成计算书的进程数（0为在当前进程逐个生成，命令行--workers可覆盖）
+REPORT_WORKERS = 0
+
+# 命令行计算前是否自动修正计算数据（T形截面bf或hf为0时按矩形截面计算，命令行--fix/--no-fix可覆盖）
+INPUT_AUTO_FIX = False
+
+# 列式结果目录（全部输入参数及全精度计算结果，每列一个.npy文件，供分析程序按内存映射快速载入）
+RESULT_EXPORT_NAME = "梁抗弯承载力计算结果.cols"
+RESULT_EXPORT_PATH = os.path.join(OUTPUT_DIR, RESULT_EXPORT_NAME)
+
 # 抗震承载力调整系数
 GAMMA_RE = 0.75
 
+# Excel输入列定义（A-P列）
+INPUT_COLS = ["截面编号", "截面类型", "b", "h", "bf", "hf",
+              "混凝土强度等级C", "受拉钢筋强度等级", "受压钢筋强度等级",
+              "受拉钢筋面积As", "受拉钢筋as", "受压钢筋面积As", "受压钢筋as",
+              "弯矩设计值M", "是否地震作用组合", "结构重要性系数γ0"]
+
+# 可选平法标注列（放在T列之后，填写标注后自动计算As及as，替代手填数值）
+REBAR_NOTATION_COLS = {
+    "bottom": "梁底钢筋",  # 如4d20/4d25
+    "top": "梁顶钢筋",  # 如2d25+2d22/4d25
+    "tension_side": "受拉侧",  # 梁底/梁顶，默认梁底受拉
+    "c": "保护层厚度c",
+    "dv": "箍筋直径dv",
+    "sn": "排间净距sn"
+}
+
+# 可选受拉翼缘列（工字形、箱形截面，未填写时按无受拉翼缘计算）
+TENSION_FLANGE_COLS = {
+    "bft": "受拉翼缘宽度bft",
+    "hft": "受拉翼缘高度hft"
+}
+
+# 平法标注列未填写保护层厚度、箍筋直径、排间净距时的默认值(mm)
+REBAR_DEFAULTS = {"c": 20, "dv": 10, "sn": 25}
+
 # Excel列定义
 OUTPUT_COLS = {
     "x_col": "受压区高度x",  # Q列
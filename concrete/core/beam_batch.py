@@ -0,0 +1,675 @@
+"""梁抗弯承载力批量（向量化）计算模块
+依据：GB 50010-2010
+与beam_rect_fc/beam_t_fc逐截面计算采用相同公式与分支，输入为等长数组（或可广播的标量）
+"""
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from common.exceptions import CalculationError, ErrorCode, make_error
+from . import concrete, rebar
+from .beam_rect_fc import get_material_params
+from ..config import GAMMA_RE
+
+# 混凝土极限压应变（规范定值）
+εcu: float = 0.0033
+
+
+# ====================== 1. 材料参数缓存 ======================
+@lru_cache(maxsize=None)
+def concrete_row(fcuk: float) -> Optional[Tuple[float, float, float, float]]:
+    """
+    获取混凝土参数（带缓存）
+    :param fcuk: 混凝土立方体抗压强度等级值
+    :return: (fc, α1, β1, ft)，等级无效时返回None
+    """
+    try:
+        conc = concrete.get_params(fcuk)
+    except (TypeError, ValueError):
+        return None
+    return conc["fc"], conc["α1"], conc["β1"], conc["ft"]
+
+
+@lru_cache(maxsize=None)
+def rebar_row(grade: str) -> Optional[Tuple[float, float]]:
+    """
+    获取钢筋参数（带缓存，ξb与混凝土等级相关，另行计算）
+    :param grade: 钢筋牌号（如"HRB400"）
+    :return: (fy, Es)，牌号无效时返回None
+    """
+    try:
+        rb = rebar.get_params(grade, β1=0.8)
+    except (AttributeError, ValueError):
+        return None
+    return float(rb["fy"]), float(rb["Es"])
+
+
+def _lookup(values: np.ndarray, func, width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    按唯一值查询材料参数，再按原顺序展开
+    :param values: 一维输入数组
+    :param func: 单值查询函数（返回tuple或None）
+    :param width: 查询结果元素个数
+    :return: (参数数组(N, width), 有效掩码(N,))
+    """
+    if values.dtype.kind in "fiu":
+        uniq, inverse = np.unique(values, return_inverse=True)
+        keys = [float(v) for v in uniq]
+    else:
+        uniq, inverse = np.unique(values.astype(str), return_inverse=True)
+        keys = [str(v) for v in uniq]
+    table = np.full((len(keys), width), np.nan)
+    found = np.zeros(len(keys), dtype=bool)
+    for i, key in enumerate(keys):
+        row = func(key)
+        if row is not None:
+            table[i] = row
+            found[i] = True
+    return table[inverse], found[inverse]
+
+
+def material_arrays(fcuk, fy_grade, fyc_grade) -> Dict[str, np.ndarray]:
+    """
+    批量获取材料参数（与beam_rect_fc.get_material_params取值一致）
+    :param fcuk: 混凝土强度等级数组
+    :param fy_grade: 受拉钢筋牌号数组
+    :param fyc_grade: 受压钢筋牌号数组
+    :return: dict - fc/α1/β1/ft/fy/Es/ξb/fyc数组，有效掩码valid及各材料的有效掩码ok_c/ok_t/ok_s
+    """
+    fcuk, fy_grade, fyc_grade = (np.asarray(v).ravel() for v in np.broadcast_arrays(fcuk, fy_grade, fyc_grade))
+    conc, ok_c = _lookup(fcuk, concrete_row, 4)
+    rt, ok_t = _lookup(fy_grade, rebar_row, 2)
+    rc, ok_s = _lookup(fyc_grade, rebar_row, 2)
+    fc, α1, β1 = conc[:, 0], conc[:, 1], conc[:, 2]
+    fy, Es = rt[:, 0], rt[:, 1]
+    # ξb依赖混凝土β1，与rebar._calc_xi_b公式一致
+    ξb = β1 / (1 + fy / (Es * εcu))
+    return {"fc": fc, "α1": α1, "β1": β1, "ft": conc[:, 3], "fy": fy, "Es": Es, "ξb": ξb, "fyc": rc[:, 0],
+            "valid": ok_c & ok_t & ok_s, "ok_c": ok_c, "ok_t": ok_t, "ok_s": ok_s}
+
+
+# ====================== 2. 数值核心（纯数组运算） ======================
+def _solve_quadratic(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """向量化求ax²+bx+c=0的正实根（a>0），无正实根时返回0，与solve_quadratic_equation一致"""
+    discriminant = b * b - 4 * a * c
+    root = (-b + np.sqrt(np.where(discriminant >= 0, discriminant, 0))) / (2 * a)
+    return np.where((discriminant >= 0) & (root > 0), root, 0.0)
+
+
+def rect_core(b, h0, fc, α1, β1, fy, Es, ξb, fyc, Ast, Asc, asc) -> Dict[str, np.ndarray]:
+    """
+    矩形截面数值核心（未除γ0、未取整）
+    :return: dict - x/xb/σs/σsc/Mu(kN·m)/ok(受压区高度有效)/balanced(轴力平衡)
+    """
+    denominator = α1 * fc * b
+    x = (fy * Ast - fy * Asc) / denominator
+    xb = ξb * h0
+    σs = np.array(fy, dtype=float, copy=True)
+    σsc = np.array(fyc, dtype=float, copy=True)
+
+    low = x < 2 * asc
+    Ast1 = α1 * fc * b * 2 * asc / fy
+    br_a = low & (Ast <= Ast1)
+    br_b = low & ~br_a
+    br_c = ~low & (x > xb)
+
+    # 分支A：x<2as'且受压钢筋不屈服，忽略受压钢筋
+    x_a = fy * Ast / denominator
+    # 分支B：取x=2as'，受压钢筋应力由平衡反算
+    σsc_b = np.where(Asc > 0, (fy * Ast - α1 * fc * b * (2 * asc)) / np.where(Asc > 0, Asc, 1), 0.0)
+    # 分支C：超筋截面，解二次方程
+    a1 = α1 * fc * b
+    b1 = fyc * Asc + Es * εcu * Ast
+    c1 = -Es * εcu * β1 * h0 * Ast
+    x_c = _solve_quadratic(a1, b1, c1)
+
+    x = np.where(br_a, x_a, np.where(br_b, 2 * asc, np.where(br_c, x_c, x)))
+    σsc = np.where(br_a, 0.0, np.where(br_b, σsc_b, σsc))
+    x_safe = np.where(x > 0, x, 1.0)
+    σs = np.where(br_c, Es * εcu * (β1 * h0 / x_safe - 1), σs)
+
+    Mu = np.where(
+        br_a, α1 * fc * b * x * (h0 - x / 2) / 1e6,
+        np.where(
+            br_b, α1 * fc * b * 2 * asc * (h0 - asc) / 1e6 + σsc * Asc * (h0 - asc) / 1e6,
+            np.where(
+                br_c, α1 * fc * b * x * (h0 - x / 2) / 1e6 + fyc * Asc * (h0 - asc) / 1e6,
+                α1 * fc * b * x * (h0 - x / 2) / 1e6 + fy * Asc * (h0 - asc) / 1e6)))
+
+    balance = σs * Ast - α1 * fc * b * x - σsc * Asc
+    return {"x": x, "xb": xb, "σs": σs, "σsc": σsc, "Mu": Mu,
+            "ok": ~(br_c & (x_c <= 0)), "balanced": np.abs(balance) < 0.001}
+
+
+def t_core(b, h0, bf, hf, fc, α1, β1, fy, Es, ξb, fyc, Ast, Asc, asc) -> Dict[str, np.ndarray]:
+    """
+    第二类T形截面数值核心（未除γ0、未取整；第一类按宽度bf的矩形截面调用rect_core）
+    :return: dict - x/xb/σs/σsc/Mu(kN·m)/ok/balanced
+    """
+    xb = ξb * h0
+    b_safe = np.where(b != 0, b, 1.0)
+    x = ((fy * Ast - fyc * Asc) / (α1 * fc) - (bf - b) * hf) / b_safe
+
+    over = ~(x <= xb)
+    a1 = α1 * fc * b
+    b1 = α1 * fc * (bf - b) * hf + fyc * Asc + Es * εcu * Ast
+    c1 = -Es * εcu * β1 * h0 * Ast
+    x_c = _solve_quadratic(np.where(a1 != 0, a1, 1.0), b1, c1)
+    x = np.where(over, x_c, x)
+    x_safe = np.where(x > 0, x, 1.0)
+    σs = np.where(over, Es * εcu * (β1 * h0 / x_safe - 1), fy)
+    σsc = np.array(fyc, dtype=float, copy=True)
+    Mu = α1 * fc * (b * x * (h0 - 0.5 * x) + (bf - b) * hf * (h0 - 0.5 * hf)) / 1e6 + fyc * Asc * (h0 - asc) / 1e6
+
+    balance = σs * Ast - α1 * fc * b * x - σsc * Asc - α1 * fc * (bf - b) * hf
+    return {"x": x, "xb": xb, "σs": σs, "σsc": σsc, "Mu": Mu,
+            "ok": (b != 0) & ~(over & (x_c <= 0)), "balanced": np.abs(balance) < 0.001}
+
+
+def i_core(b, h0, bf, hf, bft, yt, fc, α1, β1, fy, Es, ξb, fyc, Ast, Asc, asc) -> Dict[str, np.ndarray]:
+    """
+    工字形截面受压区进入腹板或受拉翼缘时的数值核心（未除γ0、未取整；受压区位于受压翼缘时调用rect_core）
+    :param yt: 受拉翼缘顶面至受压边缘距离(h - hft)
+    :return: dict - x/xb/σs/σsc/Mu(kN·m)/xt(受拉翼缘挑出部分受压高度)/ok/balanced
+    """
+    xb = ξb * h0
+    has_t = bft > 0
+    b_safe = np.where(b != 0, b, 1.0)
+    bft_safe = np.where(has_t, bft, 1.0)
+    Nc = (fy * Ast - fyc * Asc) / (α1 * fc) - (bf - b) * hf
+    x2 = Nc / b_safe
+    x = np.where(has_t & (x2 > yt), (Nc + (bft - b) * yt) / bft_safe, x2)
+
+    over = ~(x <= xb)
+    a1 = α1 * fc * b
+    b1 = α1 * fc * (bf - b) * hf + fyc * Asc + Es * εcu * Ast
+    c1 = -Es * εcu * β1 * h0 * Ast
+    x_c = _solve_quadratic(np.where(a1 != 0, a1, 1.0), b1, c1)
+    x_c3 = _solve_quadratic(α1 * fc * bft_safe, b1 - α1 * fc * (bft - b) * yt, c1)
+    x_c = np.where(has_t & (x_c > yt), x_c3, x_c)
+    x = np.where(over, x_c, x)
+    x_safe = np.where(x > 0, x, 1.0)
+    σs = np.where(over, Es * εcu * (β1 * h0 / x_safe - 1), fy)
+    σsc = np.array(fyc, dtype=float, copy=True)
+    xt = np.where(has_t, np.maximum(x - yt, 0), 0.0)
+    Mu = (α1 * fc * (b * x * (h0 - 0.5 * x) + (bf - b) * hf * (h0 - 0.5 * hf) + (bft - b) * xt * (h0 - yt - 0.5 * xt))
+          / 1e6 + fyc * Asc * (h0 - asc) / 1e6)
+
+    balance = σs * Ast - α1 * fc * b * x - σsc * Asc - (α1 * fc * (bf - b) * hf + α1 * fc * (bft - b) * xt)
+    return {"x": x, "xb": xb, "σs": σs, "σsc": σsc, "Mu": Mu, "xt": xt,
+            "ok": (b != 0) & ~(over & (x_c <= 0)), "balanced": np.abs(balance) < 0.001}
+
+
+# ====================== 3. 批量计算入口 ======================
+# 各计算函数的参数名（错误码结果param为出错参数在其中的序号）
+RECT_PARAMS = ("b", "h", "fcuk", "fy_grade", "fyc_grade", "Ast", "ast", "Asc", "asc", "γ0")
+T_PARAMS = ("b", "h", "bf", "hf", "fcuk", "fy_grade", "fyc_grade", "Ast", "ast", "Asc", "asc", "γ0")
+I_PARAMS = ("b", "h", "bf", "hf", "bft", "hft", "fcuk", "fy_grade", "fyc_grade", "Ast", "ast", "Asc", "asc", "γ0")
+RECT_DESIGN_PARAMS = ("b", "h", "fcuk", "fy_grade", "fyc_grade", "M", "ast", "Asc", "asc", "γ0")
+T_DESIGN_PARAMS = ("b", "h", "bf", "hf", "fcuk", "fy_grade", "fyc_grade", "M", "ast", "Asc", "asc", "γ0")
+
+# 各错误码在错误信息中列出的参数（与逐截面计算函数的参数提示一致，h0 = h - ast）
+ERROR_PARAMS = {
+    ErrorCode.DIMENSION: ("b", "h", "bf", "hf", "bft", "hft"),
+    ErrorCode.FLANGE_HEIGHT: ("hf", "h"),
+    ErrorCode.FLANGE_SUM: ("hf", "hft", "h"),
+    ErrorCode.FLANGE_SIZE: ("b", "bf", "hf", "h"),
+    ErrorCode.STEEL_AREA: ("Ast", "Asc"),
+    ErrorCode.COVER: ("ast", "asc"),
+    ErrorCode.GAMMA0: ("γ0",),
+    ErrorCode.MOMENT: ("M",),
+    ErrorCode.MATERIAL: ("fcuk", "fy_grade", "fyc_grade"),
+    ErrorCode.EFFECTIVE_DEPTH: ("h", "ast", "h0"),
+}
+
+# 配筋设计的截面尺寸校验只列出b、h（同beam_design._check_params）
+DESIGN_ERROR_PARAMS = {**ERROR_PARAMS, ErrorCode.DIMENSION: ("b", "h")}
+
+
+def _error_codes(checks, keys: Tuple[str, ...], n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    向量化参数校验：每行取第一个不满足的校验项
+    :param checks: [(错误码, [(参数名, 出错掩码), ...]), ...]，顺序同逐截面计算函数的校验顺序，
+                   参数名为None表示与具体参数无关
+    :param keys: 计算函数参数名
+    :param n: 行数
+    :return: (错误码数组int8（0为有效）, 出错参数序号数组int8（无则为-1）)
+    """
+    code = np.zeros(n, dtype=np.int8)
+    param = np.full(n, -1, dtype=np.int8)
+    for err, items in reversed(checks):
+        for name, bad in reversed(items):
+            bad = np.broadcast_to(bad, (n,))
+            code = np.where(bad, np.int8(err), code)
+            param = np.where(bad, np.int8(keys.index(name) if name else -1), param)
+    return code, param
+
+
+def _material_checks(mat: Dict[str, np.ndarray]):
+    """材料等级校验项"""
+    return (ErrorCode.MATERIAL, [("fcuk", ~mat["ok_c"]), ("fy_grade", ~mat["ok_t"]), ("fyc_grade", ~mat["ok_s"])])
+
+
+@lru_cache(maxsize=256)
+def _material_message(fcuk, fy_grade, fyc_grade) -> str:
+    """材料参数错误信息（与逐截面计算一致，按材料组合缓存）"""
+    try:
+        get_material_params(fcuk, fy_grade, fyc_grade)
+    except Exception as e:
+        return f"获取材料参数失败: {str(e)}"
+    return "获取材料参数失败"
+
+
+def batch_error(code, keys: Tuple[str, ...], args,
+                error_params: Dict[ErrorCode, Tuple[str, ...]] = ERROR_PARAMS) -> Optional[CalculationError]:
+    """
+    由批量计算的错误码生成异常对象（只对出错行调用）
+    :param code: 错误码
+    :param keys: 计算函数参数名（如RECT_PARAMS）
+    :param args: 该行的原始参数值（与keys对应）
+    :param error_params: 各错误码列出的参数（配筋设计传DESIGN_ERROR_PARAMS）
+    :return: 与逐截面计算函数抛出的异常类型、信息一致的异常对象；
+             无错误或计算过程错误（信息依赖中间结果）时返回None，需调用逐截面计算函数获取
+    """
+    code = ErrorCode(int(code))
+    if code in (ErrorCode.OK, ErrorCode.CALCULATION):
+        return None
+    values = dict(zip(keys, args))
+    try:
+        values["h0"] = values["h"] - values["ast"]
+    except (KeyError, TypeError):
+        pass
+    message = None
+    if code == ErrorCode.MATERIAL:
+        try:
+            message = _material_message(values["fcuk"], values["fy_grade"], values["fyc_grade"])
+        except TypeError:
+            message = None
+    parameter = ", ".join(f"{k}={values[k]}" for k in error_params[code] if k in values)
+    return make_error(code, message, parameter=parameter)
+
+
+def _prepare(*arrays) -> Tuple[Tuple[np.ndarray, ...], Tuple[int, ...]]:
+    """广播输入数组并展平，返回(展平数组, 原形状)"""
+    shape = np.broadcast_shapes(*(np.shape(a) for a in arrays))
+    flat = tuple(np.broadcast_to(np.asarray(a), shape).ravel() for a in arrays)
+    return flat, shape
+
+
+def _round(a: np.ndarray, n: int) -> np.ndarray:
+    """
+    按Python内置round的结果取整：整体用np.round计算，
+    仅对x.x5边界附近的值（np.round先放大再取整，结果可能与round不同）逐个按round修正
+    """
+    a = np.asarray(a, dtype=float)
+    r = np.round(a, n)
+    with np.errstate(invalid="ignore"):
+        scaled = a * 10.0 ** n
+        near_half = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+    if near_half.any():
+        idx = np.flatnonzero(near_half)
+        r.reshape(-1)[idx] = [round(v, n) for v in a.reshape(-1)[idx].tolist()]
+    return r
+
+
+def _round_rect(res: Dict[str, np.ndarray], h0: np.ndarray) -> None:
+    """按beam_rect_fc的取整规则原位取整"""
+    res["x"] = _round(res["x"], 1)
+    res["xb"] = _round(res["xb"], 1)
+    res["ξ"] = _round(res["x"] / h0, 4)
+    res["ξb"] = _round(res["ξb"], 4)
+    res["Mu"] = _round(res["Mu"], 1)
+    res["σs"] = _round(res["σs"], 1)
+    res["σsc"] = _round(res["σsc"], 1)
+
+
+def _round_t(res: Dict[str, np.ndarray], h0: np.ndarray) -> None:
+    """按beam_t_fc的取整规则原位取整"""
+    res["x"] = _round(res["x"], 2)
+    res["xb"] = _round(res["xb"], 2)
+    res["ξ"] = _round(res["x"] / h0, 3)
+    res["ξb"] = _round(res["ξb"], 3)
+    res["Mu"] = _round(res["Mu"], 2)
+    res["σs"] = _round(res["σs"], 2)
+    res["σsc"] = _round(res["σsc"], 2)
+
+
+def _reshape(res: Dict[str, np.ndarray], shape: Tuple[int, ...]) -> Dict[str, np.ndarray]:
+    """将结果数组恢复为输入广播后的形状"""
+    return {k: v.reshape(shape) for k, v in res.items()}
+
+
+def rect_eval(b, h, mat: Dict[str, np.ndarray], Ast, ast, Asc, asc, γ0,
+              rounded: bool = False) -> Dict[str, np.ndarray]:
+    """
+    矩形截面批量计算（一维浮点数组，材料参数已查询）
+    :param mat: material_arrays格式的材料参数（可由调用方按索引预先展开）
+    :return: dict - x/xb/ξ/ξb/Mu/σs/σsc/balanced/valid/code/param数组
+    """
+    h0 = h - ast
+    with np.errstate(divide="ignore", invalid="ignore"):
+        res = rect_core(b, h0, mat["fc"], mat["α1"], mat["β1"], mat["fy"], mat["Es"], mat["ξb"],
+                        mat["fyc"], Ast, Asc, asc)
+        res["Mu"] = res["Mu"] / γ0
+        res["ξ"] = res["x"] / h0
+        res["ξb"] = mat["ξb"]
+
+        code, param = _error_codes([
+            (ErrorCode.DIMENSION, [("b", ~(b > 0)), ("h", ~(h > 0))]),
+            (ErrorCode.STEEL_AREA, [("Ast", ~(Ast >= 0)), ("Asc", ~(Asc >= 0))]),
+            (ErrorCode.COVER, [("ast", ~(ast > 0)), ("asc", ~(asc > 0))]),
+            (ErrorCode.GAMMA0, [("γ0", ~(γ0 > 0))]),
+            _material_checks(mat),
+            (ErrorCode.EFFECTIVE_DEPTH, [("ast", ~(h0 > 0))]),
+            (ErrorCode.CALCULATION, [(None, ~res.pop("ok"))]),
+        ], RECT_PARAMS, len(h0))
+        valid = code == 0
+        if rounded:
+            _round_rect(res, h0)
+
+    for key in ("x", "xb", "ξ", "ξb", "Mu", "σs", "σsc"):
+        res[key] = np.where(valid, res[key], np.nan)
+    res["balanced"] = res["balanced"] & valid
+    res["valid"] = valid
+    res["code"], res["param"] = code, param
+    return res
+
+
+def beam_rect_fc_batch(b, h, fcuk, fy_grade, fyc_grade, Ast, ast, Asc, asc, γ0,
+                       rounded: bool = False) -> Dict[str, np.ndarray]:
+    """
+    矩形截面梁抗弯承载力批量计算（参数含义同beam_rect_fc，均可为数组）
+    :param rounded: 是否按beam_rect_fc的规则取整（默认返回全精度结果）
+    :return: dict - x/xb/ξ/ξb/Mu/σs/σsc/balanced/valid/code/param数组
+             valid为False的行（参数、材料或计算无效）其余结果为nan，code为错误码（ErrorCode），
+             param为出错参数在RECT_PARAMS中的序号，可由batch_error生成与beam_rect_fc一致的异常
+    """
+    (b, h, fcuk, fy_grade, fyc_grade, Ast, ast, Asc, asc, γ0), shape = _prepare(
+        b, h, fcuk, fy_grade, fyc_grade, Ast, ast, Asc, asc, γ0)
+    b, h, Ast, ast, Asc, asc, γ0 = (v.astype(float) for v in (b, h, Ast, ast, Asc, asc, γ0))
+    mat = material_arrays(fcuk, fy_grade, fyc_grade)
+    return _reshape(rect_eval(b, h, mat, Ast, ast, Asc, asc, γ0, rounded), shape)
+
+
+def t_eval(b, h, bf, hf, mat: Dict[str, np.ndarray], Ast, ast, Asc, asc, γ0,
+           rounded: bool = False) -> Dict[str, np.ndarray]:
+    """
+    T形截面批量计算（一维浮点数组，材料参数已查询）
+    :param mat: material_arrays格式的材料参数（可由调用方按索引预先展开）
+    :return: dict - flag/x/xb/ξ/ξb/Mu/σs/σsc/balanced/valid/code/param数组
+    """
+    fc, α1, β1, fy, Es, ξb, fyc = (mat[k] for k in ("fc", "α1", "β1", "fy", "Es", "ξb", "fyc"))
+    h0 = h - ast
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        type1 = fy * Ast <= α1 * fc * bf * hf
+        # 第一类：按宽度bf的矩形截面计算（含矩形截面的参数校验与γ0修正）
+        r1 = rect_core(bf, h0, fc, α1, β1, fy, Es, ξb, fyc, Ast, Asc, asc)
+        r1["Mu"] = r1["Mu"] / γ0
+        r1["ξb"] = ξb
+        ok1 = r1.pop("ok") & (bf > 0)
+        # 第二类
+        r2 = t_core(b, h0, bf, hf, fc, α1, β1, fy, Es, ξb, fyc, Ast, Asc, asc)
+        r2["Mu"] = r2["Mu"] / γ0
+        r2["ξb"] = ξb
+        ok2 = r2.pop("ok")
+
+        if rounded:
+            _round_rect(r1, h0)
+        res = {k: np.where(type1, r1[k], r2[k]) for k in ("x", "xb", "ξb", "Mu", "σs", "σsc", "balanced")}
+        res["ξ"] = res["x"] / h0
+        if rounded:
+            _round_t(res, h0)
+
+        code, param = _error_codes([
+            (ErrorCode.DIMENSION, [("b", ~(b >= 0)), ("h", ~(h >= 0)), ("bf", ~(bf >= 0)), ("hf", ~(hf >= 0))]),
+            (ErrorCode.FLANGE_HEIGHT, [("hf", ~(hf < h))]),
+            (ErrorCode.STEEL_AREA, [("Ast", ~(Ast >= 0)), ("Asc", ~(Asc >= 0))]),
+            (ErrorCode.COVER, [("ast", ~(ast > 0)), ("asc", ~(asc > 0))]),
+            (ErrorCode.GAMMA0, [("γ0", ~(γ0 > 0))]),
+            _material_checks(mat),
+            (ErrorCode.EFFECTIVE_DEPTH, [("ast", ~(h0 > 0))]),
+            (ErrorCode.CALCULATION, [(None, ~np.where(type1, ok1, ok2))]),
+        ], T_PARAMS, len(h0))
+        valid = code == 0
+
+    for key in ("x", "xb", "ξ", "ξb", "Mu", "σs", "σsc"):
+        res[key] = np.where(valid, res[key], np.nan)
+    res["balanced"] = res["balanced"] & valid
+    res["flag"] = np.where(valid, np.where(type1, 1, 2), 0)
+    res["valid"] = valid
+    res["code"], res["param"] = code, param
+    return res
+
+
+def beam_t_fc_batch(b, h, bf, hf, fcuk, fy_grade, fyc_grade, Ast, ast, Asc, asc, γ0,
+                    rounded: bool = False) -> Dict[str, np.ndarray]:
+    """
+    T形截面梁抗弯承载力批量计算（参数含义同beam_t_fc，均可为数组）
+    :param rounded: 是否按beam_t_fc的规则取整（默认返回全精度结果）
+    :return: dict - flag(1=第一类、2=第二类、0=无效)/x/xb/ξ/ξb/Mu/σs/σsc/balanced/valid数组，
+             code/param为错误码及出错参数在T_PARAMS中的序号
+    """
+    (b, h, bf, hf, fcuk, fy_grade, fyc_grade, Ast, ast, Asc, asc, γ0), shape = _prepare(
+        b, h, bf, hf, fcuk, fy_grade, fyc_grade, Ast, ast, Asc, asc, γ0)
+    b, h, bf, hf, Ast, ast, Asc, asc, γ0 = (v.astype(float) for v in (b, h, bf, hf, Ast, ast, Asc, asc, γ0))
+    mat = material_arrays(fcuk, fy_grade, fyc_grade)
+    return _reshape(t_eval(b, h, bf, hf, mat, Ast, ast, Asc, asc, γ0, rounded), shape)
+
+
+def i_eval(b, h, bf, hf, bft, hft, mat: Dict[str, np.ndarray], Ast, ast, Asc, asc, γ0,
+           rounded: bool = False) -> Dict[str, np.ndarray]:
+    """
+    工字形（箱形）截面批量计算（一维浮点数组，材料参数已查询）
+    :param mat: material_arrays格式的材料参数（可由调用方按索引预先展开）
+    :return: dict - flag/x/xb/ξ/ξb/Mu/σs/σsc/balanced/valid/code/param数组
+    """
+    fc, α1, β1, fy, Es, ξb, fyc = (mat[k] for k in ("fc", "α1", "β1", "fy", "Es", "ξb", "fyc"))
+    h0 = h - ast
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        type1 = fy * Ast <= α1 * fc * bf * hf + fyc * Asc
+        # 受压区位于受压翼缘：按宽度bf的矩形截面计算
+        r1 = rect_core(bf, h0, fc, α1, β1, fy, Es, ξb, fyc, Ast, Asc, asc)
+        r1["Mu"] = r1["Mu"] / γ0
+        r1["ξb"] = ξb
+        ok1 = r1.pop("ok") & (bf > 0)
+        # 受压区进入腹板或受拉翼缘
+        r2 = i_core(b, h0, bf, hf, bft, h - hft, fc, α1, β1, fy, Es, ξb, fyc, Ast, Asc, asc)
+        r2["Mu"] = r2["Mu"] / γ0
+        r2["ξb"] = ξb
+        ok2 = r2.pop("ok")
+
+        if rounded:
+            _round_rect(r1, h0)
+        res = {k: np.where(type1, r1[k], r2[k]) for k in ("x", "xb", "ξb", "Mu", "σs", "σsc", "balanced")}
+        res["ξ"] = res["x"] / h0
+        if rounded:
+            _round_t(res, h0)
+
+        code, param = _error_codes([
+            (ErrorCode.DIMENSION, [("b", ~(b >= 0)), ("h", ~(h >= 0)), ("bf", ~(bf >= 0)), ("hf", ~(hf >= 0)),
+                                   ("bft", ~(bft >= 0)), ("hft", ~(hft >= 0))]),
+            (ErrorCode.FLANGE_SUM, [("hf", ~(hf + hft < h))]),
+            (ErrorCode.STEEL_AREA, [("Ast", ~(Ast >= 0)), ("Asc", ~(Asc >= 0))]),
+            (ErrorCode.COVER, [("ast", ~(ast > 0)), ("asc", ~(asc > 0))]),
+            (ErrorCode.GAMMA0, [("γ0", ~(γ0 > 0))]),
+            _material_checks(mat),
+            (ErrorCode.EFFECTIVE_DEPTH, [("ast", ~(h0 > 0))]),
+            (ErrorCode.CALCULATION, [(None, ~np.where(type1, ok1, ok2))]),
+        ], I_PARAMS, len(h0))
+        valid = code == 0
+
+    for key in ("x", "xb", "ξ", "ξb", "Mu", "σs", "σsc"):
+        res[key] = np.where(valid, res[key], np.nan)
+    res["balanced"] = res["balanced"] & valid
+    res["flag"] = np.where(valid, np.where(type1, 1, np.where(r2["xt"] > 0, 3, 2)), 0)
+    res["valid"] = valid
+    res["code"], res["param"] = code, param
+    return res
+
+
+def beam_i_fc_batch(b, h, bf, hf, bft, hft, fcuk, fy_grade, fyc_grade, Ast, ast, Asc, asc, γ0,
+                    rounded: bool = False) -> Dict[str, np.ndarray]:
+    """
+    工字形（箱形）截面梁抗弯承载力批量计算（参数含义同beam_i_fc，均可为数组）
+    :param rounded: 是否按beam_i_fc的规则取整（默认返回全精度结果）
+    :return: dict - flag(1=受压翼缘、2=腹板、3=受拉翼缘、0=无效)/x/xb/ξ/ξb/Mu/σs/σsc/balanced/valid数组，
+             code/param为错误码及出错参数在I_PARAMS中的序号
+    """
+    (b, h, bf, hf, bft, hft, fcuk, fy_grade, fyc_grade, Ast, ast, Asc, asc, γ0), shape = _prepare(
+        b, h, bf, hf, bft, hft, fcuk, fy_grade, fyc_grade, Ast, ast, Asc, asc, γ0)
+    b, h, bf, hf, bft, hft, Ast, ast, Asc, asc, γ0 = (
+        v.astype(float) for v in (b, h, bf, hf, bft, hft, Ast, ast, Asc, asc, γ0))
+    mat = material_arrays(fcuk, fy_grade, fyc_grade)
+    return _reshape(i_eval(b, h, bf, hf, bft, hft, mat, Ast, ast, Asc, asc, γ0, rounded), shape)
+
+
+# ====================== 4. 配筋设计（反算，与beam_design逐截面计算一致） ======================
+def _solve_x(Md, α1fcb, h0) -> Tuple[np.ndarray, np.ndarray]:
+    """向量化由α1·fc·b·x·(h0 - x/2) = Md求x，返回(x, 有解掩码)"""
+    αs = Md / (α1fcb * h0 * h0)
+    ok = 2 * αs <= 1
+    return h0 * (1 - np.sqrt(np.where(ok, 1 - 2 * αs, 0.0))), ok
+
+
+def rect_design_core(b, h0, α1, fc, fy, ξb, fyc, Md, Asc, asc) -> Dict[str, np.ndarray]:
+    """
+    矩形截面配筋数值核心（Md单位N·mm，分支同beam_design._rect_design）
+    :return: dict - x/Ast/Asc/ok
+    """
+    denominator = α1 * fc * b
+    xb = ξb * h0
+    x0, ok0 = _solve_x(Md, denominator, h0)
+    x1, ok1 = _solve_x(Md - fy * Asc * (h0 - asc), denominator, h0)
+
+    # 分支A：不计受压钢筋x≤2as'；分支B：取x=2as'；分支C：需增配受压钢筋；其余为适筋
+    br_a = ok0 & (x0 <= 2 * asc)
+    normal = ~br_a & ok1 & (x1 <= xb)
+    br_b = normal & (x1 < 2 * asc)
+    br_c = ~br_a & ~normal
+
+    Asc_c = (Md - denominator * xb * (h0 - xb / 2)) / (fyc * (h0 - asc))
+    x = np.where(br_a, x0, np.where(br_b, 2 * asc, np.where(br_c, xb, x1)))
+    Ast = np.where(br_a, denominator * x0 / fy,
+                   np.where(br_b, Md / (fy * (h0 - asc)),
+                            np.where(br_c, (denominator * xb + fyc * Asc_c) / fy, denominator * x1 / fy + Asc)))
+    Asc = np.where(br_c, Asc_c, Asc)
+    return {"x": x, "Ast": Ast, "Asc": Asc, "ok": ~(br_c & (xb < 2 * asc))}
+
+
+def t_design_core(b, h0, bf, hf, α1, fc, fy, ξb, fyc, Md, Asc, asc) -> Dict[str, np.ndarray]:
+    """
+    第二类T形截面配筋数值核心（Md单位N·mm，第一类按宽度bf调用rect_design_core）
+    :return: dict - x/Ast/Asc
+    """
+    xb = ξb * h0
+    Cf = α1 * fc * (bf - b) * hf
+    Mf = Cf * (h0 - 0.5 * hf)
+    x, ok = _solve_x(Md - Mf - fyc * Asc * (h0 - asc), α1 * fc * b, h0)
+    over = ~ok | (x > xb)
+    x = np.where(over, xb, x)
+    Asc = np.where(over, (Md - Mf - α1 * fc * b * xb * (h0 - 0.5 * xb)) / (fyc * (h0 - asc)), Asc)
+    return {"x": x, "Ast": (α1 * fc * b * x + Cf + fyc * Asc) / fy, "Asc": Asc}
+
+
+def _design_moment(M, γ0, is_seismic) -> np.ndarray:
+    """配筋设计弯矩(N·mm)，同beam_design.design_moment"""
+    return γ0 * M * np.where(is_seismic == 1, GAMMA_RE, 1.0) * 1e6
+
+
+def _design_checks(b, h, M, ast, Asc, asc, γ0) -> list:
+    """配筋设计参数校验项，同beam_design._check_params"""
+    return [
+        (ErrorCode.DIMENSION, [("b", ~(b > 0)), ("h", ~(h > 0))]),
+        (ErrorCode.MOMENT, [("M", ~(M >= 0))]),
+        (ErrorCode.STEEL_AREA, [("Asc", ~(Asc >= 0))]),
+        (ErrorCode.COVER, [("ast", ~(ast > 0)), ("asc", ~(asc > 0))]),
+        (ErrorCode.GAMMA0, [("γ0", ~(γ0 > 0))]),
+        (ErrorCode.EFFECTIVE_DEPTH, [("ast", ~(h - ast > 0))]),
+    ]
+
+
+def _finish_design(res, code, param, h0, shape, prec) -> Dict[str, np.ndarray]:
+    """配筋设计结果取整（prec为None时不取整）并标记无效行"""
+    valid = code == 0
+    if prec is not None:
+        res["x"] = _round(res["x"], prec[0])
+        res["xb"] = _round(res["xb"], prec[0])
+        res["ξ"] = _round(res["x"] / h0, prec[1])
+        res["ξb"] = _round(res["ξb"], prec[1])
+        for key in ("Ast", "Asc", "Ast_min"):
+            res[key] = _round(res[key], 1)
+    for key in ("x", "xb", "ξ", "ξb", "Ast", "Asc", "Ast_min"):
+        res[key] = np.where(valid, res[key], np.nan)
+    if "flag" in res:
+        res["flag"] = np.where(valid, res["flag"], 0)
+    res["valid"] = valid
+    res["code"], res["param"] = code, param
+    return _reshape(res, shape)
+
+
+def beam_rect_design_batch(b, h, fcuk, fy_grade, fyc_grade, M, ast, Asc, asc, γ0, is_seismic=0,
+                           rounded: bool = False) -> Dict[str, np.ndarray]:
+    """
+    矩形截面梁配筋设计批量计算（参数含义同beam_design.beam_rect_design，均可为数组）
+    :param rounded: 是否按beam_rect_design的规则取整（默认返回全精度结果）
+    :return: dict - x/xb/ξ/ξb/Ast/Asc/Ast_min/valid数组，无效行为nan；
+             code/param为错误码及出错参数在RECT_DESIGN_PARAMS中的序号
+    """
+    (b, h, fcuk, fy_grade, fyc_grade, M, ast, Asc, asc, γ0, is_seismic), shape = _prepare(
+        b, h, fcuk, fy_grade, fyc_grade, M, ast, Asc, asc, γ0, is_seismic)
+    b, h, M, ast, Asc, asc, γ0 = (v.astype(float) for v in (b, h, M, ast, Asc, asc, γ0))
+    mat = material_arrays(fcuk, fy_grade, fyc_grade)
+    h0 = h - ast
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        res = rect_design_core(b, h0, mat["α1"], mat["fc"], mat["fy"], mat["ξb"], mat["fyc"],
+                               _design_moment(M, γ0, is_seismic), Asc, asc)
+        code, param = _error_codes(_design_checks(b, h, M, ast, Asc, asc, γ0) + [
+            _material_checks(mat),
+            (ErrorCode.CALCULATION, [(None, ~res.pop("ok"))]),
+        ], RECT_DESIGN_PARAMS, len(h0))
+        res["xb"] = mat["ξb"] * h0
+        res["ξ"] = res["x"] / h0
+        res["ξb"] = mat["ξb"]
+        res["Ast_min"] = np.maximum(0.002, 0.45 * mat["ft"] / mat["fy"]) * b * h
+        return _finish_design(res, code, param, h0, shape, (1, 4) if rounded else None)
+
+
+def beam_t_design_batch(b, h, bf, hf, fcuk, fy_grade, fyc_grade, M, ast, Asc, asc, γ0, is_seismic=0,
+                        rounded: bool = False) -> Dict[str, np.ndarray]:
+    """
+    T形截面梁配筋设计批量计算（参数含义同beam_design.beam_t_design，均可为数组）
+    :param rounded: 是否按beam_t_design的规则取整（默认返回全精度结果）
+    :return: dict - flag(1=第一类、2=第二类、0=无效)/x/xb/ξ/ξb/Ast/Asc/Ast_min/valid数组，
+             code/param为错误码及出错参数在T_DESIGN_PARAMS中的序号
+    """
+    (b, h, bf, hf, fcuk, fy_grade, fyc_grade, M, ast, Asc, asc, γ0, is_seismic), shape = _prepare(
+        b, h, bf, hf, fcuk, fy_grade, fyc_grade, M, ast, Asc, asc, γ0, is_seismic)
+    b, h, bf, hf, M, ast, Asc, asc, γ0 = (v.astype(float) for v in (b, h, bf, hf, M, ast, Asc, asc, γ0))
+    mat = material_arrays(fcuk, fy_grade, fyc_grade)
+    fc, α1, fy, ξb, fyc = (mat[k] for k in ("fc", "α1", "fy", "ξb", "fyc"))
+    h0 = h - ast
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        Md = _design_moment(M, γ0, is_seismic)
+        r1 = rect_design_core(bf, h0, α1, fc, fy, ξb, fyc, Md, Asc, asc)
+        type1 = r1["ok"] & (fy * r1["Ast"] <= α1 * fc * bf * hf)
+        r2 = t_design_core(b, h0, bf, hf, α1, fc, fy, ξb, fyc, Md, Asc, asc)
+        # 已配受压钢筋使第二类所需Ast落入第一类判别范围时取第一类结果（同beam_design.beam_t_design）
+        use1 = ~type1 & r1["ok"] & (fy * r2["Ast"] <= α1 * fc * bf * hf)
+        r2["Ast"] = np.where(use1, r1["Ast"], r2["Ast"])
+        r2["x"] = np.where(use1, ((fy * r1["Ast"] - fyc * Asc) / (α1 * fc) - (bf - b) * hf) / b, r2["x"])
+        res = {k: np.where(type1, r1[k], r2[k]) for k in ("x", "Ast", "Asc")}
+        code, param = _error_codes(_design_checks(b, h, M, ast, Asc, asc, γ0) + [
+            (ErrorCode.FLANGE_SIZE, [("bf", ~(bf >= b)), ("hf", ~((hf > 0) & (hf < h)))]),
+            _material_checks(mat),
+        ], T_DESIGN_PARAMS, len(h0))
+        res["xb"] = ξb * h0
+        res["ξ"] = res["x"] / h0
+        res["ξb"] = ξb
+        res["Ast_min"] = np.maximum(0.002, 0.45 * mat["ft"] / fy) * b * h
+        res["flag"] = np.where(type1, 1, 2)
+        return _finish_design(res, code, param, h0, shape, (2, 3) if rounded else None)
@@ -0,0 +1,207 @@
+"""梁正截面受弯配筋设计模块（由弯矩设计值反算所需钢筋面积）
+依据：GB 50010-2010
+各分支公式与beam_rect_fc/beam_t_fc承载力验算一致，按设计结果配筋验算时Mu与设计弯矩相等
+"""
+import math
+from typing import Optional, Tuple
+from common.exceptions import CalculationError, ParameterError, MaterialError, GeometryError
+from .beam_rect_fc import get_material_params
+from ..config import GAMMA_RE
+
+
+def design_moment(M: float, γ0: float, is_seismic=0) -> float:
+    """
+    配筋设计采用的弯矩(kN·m)，与承载力验算的抗力效应比R/S对应
+    非地震组合：Mu/γ0 ≥ M → 需Mu ≥ γ0·M；地震组合：Mu/γ0/γRE ≥ M → 需Mu ≥ γRE·γ0·M
+    :param M: 弯矩设计值(kN·m)
+    :param γ0: 结构重要性系数
+    :param is_seismic: 是否地震作用组合（1=是）
+    :return: float - 截面所需抗弯承载力(kN·m)
+    """
+    return γ0 * M * (GAMMA_RE if is_seismic == 1 else 1)
+
+
+def solve_x(Md: float, α1fcb: float, h0: float) -> Optional[float]:
+    """
+    由α1·fc·b·x·(h0 - x/2) = Md求受压区高度
+    :param Md: 混凝土受压区承担的弯矩(N·mm)
+    :param α1fcb: α1·fc·b(N/mm)
+    :param h0: 截面有效高度(mm)
+    :return: 受压区高度x(mm)，超过截面最大抵抗矩（αs > 0.5）时返回None
+    """
+    αs = Md / (α1fcb * h0 * h0)
+    if 2 * αs > 1:
+        return None
+    return h0 * (1 - math.sqrt(1 - 2 * αs))
+
+
+def min_steel_area(b: float, h: float, ft: float, fy: float) -> float:
+    """
+    受拉钢筋最小配筋面积（GB 50010-2010 第8.5.1条：ρmin = max(0.20%, 45ft/fy%)，按b·h计算）
+    :param b: 腹板宽度(mm)
+    :param h: 梁总高度(mm)
+    :param ft: 混凝土轴心抗拉强度设计值(N/mm²)
+    :param fy: 受拉钢筋抗拉强度设计值(N/mm²)
+    :return: float - 最小配筋面积(mm²)
+    """
+    return max(0.002, 0.45 * ft / fy) * b * h
+
+
+def _rect_design(b, h0, α1, fc, fy, ξb, fyc, Md, Asc, asc) -> Tuple[float, float, float]:
+    """
+    矩形截面配筋计算核心（Md单位N·mm）
+    需增配受压钢筋时取x=xb，受压钢筋按fy'计算（此时受拉钢筋恰好屈服，与超筋分支在界限处连续）
+    :return: tuple - (x, Ast, Asc)
+    """
+    denominator = α1 * fc * b
+    xb = ξb * h0
+
+    # 不计受压钢筋时x ≤ 2as'：对应验算分支x<2as'且Ast≤Ast1
+    x0 = solve_x(Md, denominator, h0)
+    if x0 is not None and x0 <= 2 * asc:
+        return x0, denominator * x0 / fy, Asc
+
+    # 计入已有受压钢筋
+    x1 = solve_x(Md - fy * Asc * (h0 - asc), denominator, h0)
+    if x1 is not None and x1 <= xb:
+        if x1 >= 2 * asc:
+            return x1, denominator * x1 / fy + Asc, Asc
+        # 取x=2as'，对受压钢筋合力点取矩
+        return 2 * asc, Md / (fy * (h0 - asc)), Asc
+
+    # 已有受压钢筋不足，取x=xb计算所需受压钢筋
+    if xb < 2 * asc:
+        raise CalculationError("界限受压区高度小于2as'，无法按双筋截面设计", parameter=f"xb={xb}, asc={asc}")
+    Asc = (Md - denominator * xb * (h0 - xb / 2)) / (fyc * (h0 - asc))
+    return xb, (denominator * xb + fyc * Asc) / fy, Asc
+
+
+def _check_params(b, h, M, ast, Asc, asc, γ0) -> None:
+    """配筋设计参数校验"""
+    if b <= 0 or h <= 0:
+        raise ParameterError("截面尺寸必须大于0", parameter=f"b={b}, h={h}")
+    if M < 0:
+        raise ParameterError("弯矩设计值不能为负", parameter=f"M={M}")
+    if Asc < 0:
+        raise ParameterError("钢筋面积不能为负", parameter=f"Asc={Asc}")
+    if ast <= 0 or asc <= 0:
+        raise ParameterError("钢筋合力点至边缘距离必须大于0", parameter=f"ast={ast}, asc={asc}")
+    if γ0 <= 0:
+        raise ParameterError("结构重要性系数必须大于0", parameter=f"γ0={γ0}")
+    if h - ast <= 0:
+        raise GeometryError("有效高度必须大于0", parameter=f"h={h}, ast={ast}, h0={h - ast}")
+
+
+def _materials(fcuk, fy_grade, fyc_grade):
+    """获取材料参数，失败时统一抛出MaterialError"""
+    try:
+        return get_material_params(fcuk, fy_grade, fyc_grade)
+    except Exception as e:
+        raise MaterialError(f"获取材料参数失败: {str(e)}", parameter=f"fcuk={fcuk}, fy_grade={fy_grade}, fyc_grade={fyc_grade}")
+
+
+def beam_rect_design(b: float, h: float, fcuk: float, fy_grade: str, fyc_grade: str, M: float,
+                     ast: float, Asc: float, asc: float, γ0: float,
+                     is_seismic=0) -> Tuple[float, float, float, float, float, float, float]:
+    """
+    矩形截面梁配筋设计
+    :param b: 截面宽度(mm)
+    :param h: 梁总高度(mm)
+    :param fcuk: 混凝土立方体抗压强度等级值（如C30传30，C40传40）
+    :param fy_grade: 受拉钢筋强度等级（如"HRB400"）
+    :param fyc_grade: 受压钢筋强度等级（如"HRB400"）
+    :param M: 弯矩设计值(kN·m)
+    :param ast: 受拉钢筋合力点至受拉边缘距离(mm)
+    :param Asc: 已配受压钢筋面积(mm²)，无则传0
+    :param asc: 受压钢筋合力点至受压边缘距离(mm)
+    :param γ0: 结构重要性系数
+    :param is_seismic: 是否地震作用组合（1=是，设计弯矩乘γRE）
+    :return: tuple - (x, xb, ξ, ξb, Ast, Asc, Ast_min)
+             x: 混凝土受压区高度(mm)
+             xb: 界限受压区高度(mm)
+             ξ: 相对受压区高度
+             ξb: 界限相对受压区高度
+             Ast: 承载力所需受拉钢筋面积(mm²)
+             Asc: 受压钢筋面积(mm²)（ξ > ξb时为所需面积，否则为已配面积）
+             Ast_min: 最小配筋面积(mm²)，实配受拉钢筋取max(Ast, Ast_min)
+    :raises ParameterError: 参数错误时抛出异常
+    :raises MaterialError: 材料参数错误时抛出异常
+    :raises GeometryError: 几何参数错误时抛出异常
+    :raises CalculationError: 无法配筋时抛出异常
+    """
+    # ========== 1. 参数校验 ==========
+    _check_params(b, h, M, ast, Asc, asc, γ0)
+
+    # ========== 2. 获取材料参数 ==========
+    (fc, ft, Ec, α1, β1), (fy, Es, ξb), fyc = _materials(fcuk, fy_grade, fyc_grade)
+    h0 = h - ast
+
+    # ========== 3. 配筋计算 ==========
+    Md = design_moment(M, γ0, is_seismic) * 1e6
+    x, Ast, Asc = _rect_design(b, h0, α1, fc, fy, ξb, fyc, Md, Asc, asc)
+    Ast_min = min_steel_area(b, h, ft, fy)
+
+    # ========== 4. 整理计算结果 ==========
+    x = round(float(x), 1)
+    return (x, round(float(ξb * h0), 1), round(x / h0, 4), round(float(ξb), 4),
+            round(float(Ast), 1), round(float(Asc), 1), round(float(Ast_min), 1))
+
+
+def beam_t_design(b: float, h: float, bf: float, hf: float, fcuk: float, fy_grade: str, fyc_grade: str,
+                  M: float, ast: float, Asc: float, asc: float, γ0: float,
+                  is_seismic=0) -> Tuple[str, float, float, float, float, float, float, float]:
+    """
+    T形截面梁配筋设计
+    参数同beam_rect_design，另加：
+    :param bf: 翼缘宽度(mm)
+    :param hf: 翼缘高度(mm)
+    :return: tuple - (flag, x, xb, ξ, ξb, Ast, Asc, Ast_min)
+             flag: 截面类型（"第一类T型截面"或"第二类T型截面"），判别方法同beam_t_fc
+    :raises ParameterError: 参数错误时抛出异常
+    :raises MaterialError: 材料参数错误时抛出异常
+    :raises GeometryError: 几何参数错误时抛出异常
+    :raises CalculationError: 无法配筋时抛出异常
+    """
+    # ========== 1. 参数校验 ==========
+    _check_params(b, h, M, ast, Asc, asc, γ0)
+    if bf < b or hf <= 0 or hf >= h:
+        raise ParameterError("翼缘尺寸无效", parameter=f"b={b}, bf={bf}, hf={hf}, h={h}")
+
+    # ========== 2. 获取材料参数 ==========
+    (fc, ft, Ec, α1, β1), (fy, Es, ξb), fyc = _materials(fcuk, fy_grade, fyc_grade)
+    h0 = h - ast
+    xb = ξb * h0
+
+    # ========== 3. 配筋计算 ==========
+    Md = design_moment(M, γ0, is_seismic) * 1e6
+    Ast1 = None
+    try:
+        x, Ast1, Asc_req = _rect_design(bf, h0, α1, fc, fy, ξb, fyc, Md, Asc, asc)
+        type1 = fy * Ast1 <= α1 * fc * bf * hf
+    except CalculationError:
+        type1 = False
+    if type1:
+        Ast = Ast1
+        # 第一类T型截面，按宽度为bf的矩形截面计算
+        flag = "第一类T型截面"
+    else:
+        # 第二类T型截面：扣除翼缘挑出部分及已有受压钢筋承担的弯矩
+        flag = "第二类T型截面"
+        Cf = α1 * fc * (bf - b) * hf
+        Mf = Cf * (h0 - 0.5 * hf)
+        x = solve_x(Md - Mf - fyc * Asc * (h0 - asc), α1 * fc * b, h0)
+        Asc_req = Asc
+        if x is None or x > xb:
+            x = xb
+            Asc_req = (Md - Mf - α1 * fc * b * xb * (h0 - 0.5 * xb)) / (fyc * (h0 - asc))
+        Ast = (α1 * fc * b * x + Cf + fyc * Asc_req) / fy
+        if Ast1 is not None and fy * Ast <= α1 * fc * bf * hf:
+            # 已配受压钢筋使第二类所需Ast落入第一类判别范围，取第一类结果（验算为第二类，承载力偏安全）
+            Ast = Ast1
+            x = ((fy * Ast - fyc * Asc) / (α1 * fc) - (bf - b) * hf) / b
+    Ast_min = min_steel_area(b, h, ft, fy)
+
+    # ========== 4. 整理计算结果 ==========
+    x = round(float(x), 2)
+    return (flag, x, round(float(xb), 2), round(x / h0, 3), round(float(ξb), 3),
+            round(float(Ast), 1), round(float(Asc_req), 1), round(float(Ast_min), 1))
@@ -0,0 +1,312 @@
+"""梁正截面纤维模型计算模块（应变协调，弯矩-曲率分析）
+依据：GB 50010-2010 第6.2.1条（平截面假定、混凝土抛物线-矩形应力应变关系、不计混凝土抗拉、
+钢筋理想弹塑性、极限拉应变0.01）
+混凝土沿截面高度离散为纤维层，钢筋按排分层（可直接采用calc_core_batch的各排高度），
+多个截面（及多个曲率点）按数组一次求解中和轴高度，不逐纤维循环；
+钢筋所占混凝土面积不扣除
+"""
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .beam_batch import concrete_row
+from .rebar import REBAR_PARAMS
+
+# 默认混凝土纤维层数
+DEFAULT_FIBERS = 100
+
+# 钢筋极限拉应变
+εsu: float = 0.01
+
+# 中和轴迭代次数上限及收敛容差（相对截面高度）
+MAX_ITER = 60
+TOL = 1e-10
+
+# 极限状态控制类型
+CONCRETE_CRUSHING = 0  # 受压边缘混凝土达到εcu
+STEEL_RUPTURE = 1  # 最外排受拉钢筋达到εsu
+
+
+# ====================== 1. 材料 ======================
+@lru_cache(maxsize=None)
+def steel_row(grade: str) -> Optional[Tuple[float, float, float]]:
+    """
+    获取钢筋参数（带缓存）
+    :param grade: 钢筋牌号（如"HRB400"）
+    :return: (fy, fyc, Es)，牌号无效时返回None
+    """
+    params = REBAR_PARAMS.get(str(grade).strip().upper())
+    if params is None:
+        return None
+    return float(params["fy"]), float(params["fyc"]), float(params["Es"])
+
+
+def concrete_curve(fcuk) -> Dict[str, np.ndarray]:
+    """
+    混凝土受压应力应变曲线参数（GB 50010-2010 式6.2.1-3~6.2.1-5）
+    :param fcuk: 混凝土立方体抗压强度等级值（标量或数组）
+    :return: dict - n/ε0/εcu数组
+    """
+    fcuk = np.asarray(fcuk, dtype=float)
+    return {"n": np.minimum(2 - (fcuk - 50) / 60, 2.0),
+            "ε0": np.maximum(0.002 + 0.5 * (fcuk - 50) * 1e-5, 0.002),
+            "εcu": np.minimum(0.0033 - (fcuk - 50) * 1e-5, 0.0033)}
+
+
+def concrete_stress(ε, fc, ε0, n) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    混凝土应力及切线模量（压为正，不计抗拉）
+    :return: (σc, Et)
+    """
+    r = np.clip(ε / ε0, 0.0, 1.0)
+    rest = (1 - r) ** (n - 1)
+    σ = np.where(ε > 0, fc * (1 - rest * (1 - r)), 0.0)
+    Et = np.where((ε > 0) & (ε < ε0), fc * n / ε0 * rest, 0.0)
+    return σ, Et
+
+
+def steel_stress(ε, fy, fyc, Es) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    钢筋应力及切线模量（理想弹塑性，压为正）
+    :return: (σs, Et)
+    """
+    σ = Es * ε
+    elastic = (σ < fyc) & (σ > -fy)
+    return np.clip(σ, -fy, fyc), np.where(elastic, Es, 0.0)
+
+
+# ====================== 2. 截面 ======================
+class FiberSection:
+    """
+    纤维截面（N个截面，坐标y自受压边缘向下）
+    混凝土纤维及钢筋层的数组形状分别为(N, F)、(N, L)，不存在的层面积取0
+    """
+
+    def __init__(self, h, fiber_y, fiber_area, bar_y, bar_area, fy, fyc, Es, fc, fcuk):
+        """
+        :param h: 截面高度(N,)
+        :param fiber_y: 混凝土纤维中心坐标(N, F)
+        :param fiber_area: 混凝土纤维面积(N, F)，可表达任意沿高度变宽的截面
+        :param bar_y: 钢筋层中心坐标(N, L)
+        :param bar_area: 钢筋层面积(N, L)
+        :param fy: 钢筋层抗拉强度设计值(N, L)
+        :param fyc: 钢筋层抗压强度设计值(N, L)
+        :param Es: 钢筋层弹性模量(N, L)
+        :param fc: 混凝土轴心抗压强度设计值(N,)
+        :param fcuk: 混凝土立方体抗压强度等级值(N,)
+        """
+        self.h = np.asarray(h, dtype=float)
+        n = self.h.shape[0]
+        self.fiber_y, self.fiber_area = (np.broadcast_to(np.asarray(v, dtype=float), (n, np.shape(v)[-1]))
+                                         for v in (fiber_y, fiber_area))
+        layers = np.shape(bar_area)[-1]
+        self.bar_y, self.bar_area, self.fy, self.fyc, self.Es = (
+            np.broadcast_to(np.asarray(v, dtype=float), (n, layers)) for v in (bar_y, bar_area, fy, fyc, Es))
+        self.fc = np.broadcast_to(np.asarray(fc, dtype=float), (n,))
+        curve = concrete_curve(np.broadcast_to(fcuk, (n,)))
+        self.n, self.ε0, self.εcu = curve["n"], curve["ε0"], curve["εcu"]
+        # 最外排受拉钢筋坐标（极限拉应变及屈服判别的参考点）
+        self.d = np.where(self.bar_area > 0, self.bar_y, -np.inf).max(axis=1)
+
+    def __len__(self) -> int:
+        return self.h.shape[0]
+
+    def gather(self, idx) -> Dict[str, np.ndarray]:
+        """按计算点展开截面数组（迭代前展开一次）"""
+        return {"y": self.fiber_y[idx], "A": self.fiber_area[idx], "fc": self.fc[idx, None],
+                "ε0": self.ε0[idx, None], "n": self.n[idx, None], "bar_y": self.bar_y[idx],
+                "bar_area": self.bar_area[idx], "fy": self.fy[idx], "fyc": self.fyc[idx], "Es": self.Es[idx]}
+
+
+def _axial(g: Dict[str, np.ndarray], c, curv, dcurv):
+    """
+    轴力、轴力对中和轴高度的导数及弯矩（压为正）
+    :param g: FiberSection.gather展开的截面数组
+    :param c: 中和轴高度(M,)
+    :param curv: 曲率(M,)
+    :param dcurv: 曲率对c的导数(M,)
+    :return: (N, dN/dc, M) - 弯矩对受压边缘取矩(N·mm)
+    """
+    c, curv, dcurv = c[:, None], curv[:, None], dcurv[:, None]
+    lever = c - g["y"]
+    σ, Et = concrete_stress(curv * lever, g["fc"], g["ε0"], g["n"])
+    F = σ * g["A"]
+    total, moment = F.sum(axis=1), -(F * g["y"]).sum(axis=1)
+    slope = (Et * g["A"] * (curv + dcurv * lever)).sum(axis=1)
+
+    lever = c - g["bar_y"]
+    σ, Et = steel_stress(curv * lever, g["fy"], g["fyc"], g["Es"])
+    F = σ * g["bar_area"]
+    total += F.sum(axis=1)
+    moment -= (F * g["bar_y"]).sum(axis=1)
+    slope += (Et * g["bar_area"] * (curv + dcurv * lever)).sum(axis=1)
+    return total, slope, moment
+
+
+def _fiber_grid(h, n_fibers: int) -> Tuple[np.ndarray, np.ndarray]:
+    """等厚纤维层中心坐标(N, F)及层厚(N, 1)"""
+    t = (h / n_fibers)[:, None]
+    return (np.arange(n_fibers) + 0.5) * t, t
+
+
+def build_section(b, h, fcuk, fy_grade, fyc_grade, Ast, ast, Asc, asc, bf=None, hf=None,
+                  rows: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+                  n_fibers: int = DEFAULT_FIBERS) -> FiberSection:
+    """
+    由beam_rect_fc/beam_t_fc的输入参数生成纤维截面（参数为标量或等长数组）
+    :param bf: 翼缘宽度，None为矩形截面（翼缘位于受压边缘）
+    :param hf: 翼缘高度
+    :param rows: 可选受拉钢筋分排数据(A, rc)，各为(N, 4)，rc为各排中心至受拉边缘距离
+                 （calc_core_batch的rc，无钢筋的排为nan），给出时代替Ast/ast集中为一层
+    :param n_fibers: 混凝土纤维层数
+    :return: FiberSection
+    :raises ValueError: 材料等级无效时抛出异常
+    """
+    b, h, Ast, ast, Asc, asc = (np.atleast_1d(np.asarray(v, dtype=float)) for v in
+                                np.broadcast_arrays(b, h, Ast, ast, Asc, asc))
+    n = b.shape[0]
+    fcuk, fy_grade, fyc_grade = (np.broadcast_to(np.asarray(v), (n,)) for v in (fcuk, fy_grade, fyc_grade))
+
+    # ========== 1. 材料参数 ==========
+    conc = [concrete_row(float(v)) for v in fcuk]
+    tension = [steel_row(v) for v in fy_grade]
+    compression = [steel_row(v) for v in fyc_grade]
+    bad = [i for i in range(n) if conc[i] is None or tension[i] is None or compression[i] is None]
+    if bad:
+        i = bad[0]
+        raise ValueError(f"材料等级无效：fcuk={fcuk[i]}, fy_grade={fy_grade[i]}, fyc_grade={fyc_grade[i]}")
+    fc = np.array([row[0] for row in conc])
+    st, sc = np.array(tension), np.array(compression)
+
+    # ========== 2. 混凝土纤维 ==========
+    y, t = _fiber_grid(h, n_fibers)
+    width = np.broadcast_to(b[:, None], y.shape)
+    if bf is not None:
+        bf, hf = (np.broadcast_to(np.asarray(v, dtype=float), (n,)) for v in (bf, hf))
+        # 跨越翼缘底面的纤维层按各自高度范围内的宽度加权
+        in_flange = np.clip(hf[:, None] - (y - t / 2), 0, t) / t
+        width = width + (bf - b)[:, None] * in_flange
+    area = width * t
+
+    # ========== 3. 钢筋层（受压钢筋一层+受拉钢筋一层或分排） ==========
+    if rows is None:
+        bar_y = np.column_stack([asc, h - ast])
+        bar_area = np.column_stack([Asc, Ast])
+        layers = 1
+    else:
+        A_rows, rc = (np.asarray(v, dtype=float).reshape(n, -1) for v in rows)
+        exists = A_rows > 0
+        bar_y = np.column_stack([asc, np.where(exists, h[:, None] - np.nan_to_num(rc), 0.0)])
+        bar_area = np.column_stack([Asc, np.where(exists, A_rows, 0.0)])
+        layers = A_rows.shape[1]
+    grade = np.concatenate([sc[:, None, :], np.repeat(st[:, None, :], layers, axis=1)], axis=1)
+    return FiberSection(h, y, area, bar_y, bar_area, grade[..., 0], grade[..., 1], grade[..., 2], fc, fcuk)
+
+
+# ====================== 3. 中和轴求解 ======================
+def _solve(sec: FiberSection, idx, hi, curv_fn):
+    """
+    安全牛顿法求轴力为0的中和轴高度（N(c)单调递增，区间[0, hi]内牛顿步越界时二分）
+    :param idx: 各计算点对应的截面序号(M,)
+    :param hi: 中和轴高度上限(M,)
+    :param curv_fn: c -> (曲率, 曲率对c的导数)
+    :return: (c, 曲率, 弯矩N·mm)
+    """
+    g = sec.gather(idx)
+    lo = np.zeros(idx.shape)
+    hi = np.array(hi, dtype=float)
+    c = 0.5 * hi
+    tol = TOL * sec.h[idx]
+    for _ in range(MAX_ITER):
+        curv, dcurv = curv_fn(c)
+        N, dN, M = _axial(g, c, curv, dcurv)
+        lo = np.where(N < 0, c, lo)
+        hi = np.where(N >= 0, c, hi)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = c - N / dN
+        c_new = np.where((dN > 0) & (step >= lo) & (step <= hi), step, 0.5 * (lo + hi))
+        done = np.abs(c_new - c) <= tol
+        c = c_new
+        if done.all():
+            break
+    curv, dcurv = curv_fn(c)
+    return c, curv, _axial(g, c, curv, dcurv)[2]
+
+
+def _fixed_strain(ε_ref, y_ref):
+    """参考点应变固定时的曲率函数：φ = ε_ref / (c - y_ref)"""
+    def curv_fn(c):
+        den = c - y_ref
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return ε_ref / den, -ε_ref / (den * den)
+    return curv_fn
+
+
+def solve_curvature(sec: FiberSection, φ) -> Dict[str, np.ndarray]:
+    """
+    给定曲率求中和轴高度及弯矩（多截面×多曲率一次求解）
+    :param φ: 曲率(1/mm)，形状(N, K)，或各截面共用的(K,)
+    :return: dict - c(mm)/M(kN·m)，形状(N, K)
+    """
+    φ = np.atleast_2d(np.asarray(φ, dtype=float))
+    φ = np.broadcast_to(φ, (len(sec), φ.shape[1]))
+    flat = φ.ravel()
+    c = np.full(flat.shape, np.nan)
+    M = np.zeros(flat.shape)
+    # 曲率为0时截面无应力，不参与求解
+    pts = np.flatnonzero(flat > 0)
+    idx = pts // φ.shape[1]
+    c[pts], _, M[pts] = _solve(sec, idx, sec.h[idx], lambda c: (flat[pts], np.zeros(len(pts))))
+    return {"c": c.reshape(φ.shape), "M": (M / 1e6).reshape(φ.shape)}
+
+
+def _yield_point(sec: FiberSection):
+    """
+    最外排受拉钢筋屈服时的中和轴高度、曲率及弯矩
+    受压边缘混凝土应变此时已超过εcu的截面（超筋，混凝土先压碎、钢筋未屈服）无屈服点，结果为nan
+    :return: (c, 曲率, 弯矩N·mm, 是否屈服)
+    """
+    idx = np.arange(len(sec))
+    last = np.argmax(np.where(sec.bar_area > 0, sec.bar_y, -np.inf), axis=1)
+    εy = -sec.fy[idx, last] / sec.Es[idx, last]
+    c, φ, M = _solve(sec, idx, sec.d, _fixed_strain(εy, sec.d))
+    yielded = φ * c <= sec.εcu
+    nan = np.where(yielded, 1.0, np.nan)
+    return c * nan, φ * nan, M * nan, yielded
+
+
+def ultimate(sec: FiberSection) -> Dict[str, np.ndarray]:
+    """
+    极限状态：受压边缘混凝土达到εcu，或最外排受拉钢筋先达到εsu
+    :return: dict - c(mm)/φu(1/mm)/Mu(kN·m，未除γ0)/εs(最外排受拉钢筋应变，拉为负)/mode(控制类型)
+    """
+    idx = np.arange(len(sec))
+    c, φ, M = _solve(sec, idx, sec.h, _fixed_strain(sec.εcu, 0.0))
+    εs = φ * (c - sec.d)
+    rupture = εs < -εsu
+    if rupture.any():
+        sub = np.flatnonzero(rupture)
+        c2, φ2, M2 = _solve(sec, sub, sec.d[sub], _fixed_strain(np.full(len(sub), -εsu), sec.d[sub]))
+        c[sub], φ[sub], M[sub] = c2, φ2, M2
+        εs[sub] = -εsu
+    return {"c": c, "φu": φ, "Mu": M / 1e6, "εs": εs,
+            "mode": np.where(rupture, STEEL_RUPTURE, CONCRETE_CRUSHING).astype(np.int8)}
+
+
+def moment_curvature(sec: FiberSection, n_points: int = 40) -> Dict[str, np.ndarray]:
+    """
+    弯矩-曲率曲线及延性指标
+    :param n_points: 每个截面的曲率点数（0至φu均分）
+    :return: dict - φ/M/c曲线(N, n_points)，φy/My屈服点，φu/Mu极限点，μφ曲率延性系数φu/φy，mode，
+             yielded（受拉钢筋是否先于混凝土压碎屈服；为False的超筋截面φy/My/μφ为nan）
+    """
+    ult = ultimate(sec)
+    _, φy, My, yielded = _yield_point(sec)
+    φ = ult["φu"][:, None] * np.linspace(0, 1, n_points)[None, :]
+    curve = solve_curvature(sec, φ)
+    # 末点即极限状态
+    curve["M"][:, -1] = ult["Mu"]
+    curve["c"][:, -1] = ult["c"]
+    return {"φ": φ, "M": curve["M"], "c": curve["c"], "φy": φy, "My": My / 1e6,
+            "φu": ult["φu"], "Mu": ult["Mu"], "μφ": ult["φu"] / φy, "mode": ult["mode"], "yielded": yielded}
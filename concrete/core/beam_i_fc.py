@@ -0,0 +1,131 @@
+"""工字形（I形）及箱形截面梁抗弯承载力计算模块
+依据：GB 50010-2010
+箱形截面按两侧腹板厚度之和作为腹板宽度b，等效为工字形截面计算
+"""
+from typing import Tuple
+from common.utils import solve_quadratic_equation
+from common.exceptions import CalculationError, ParameterError, MaterialError, GeometryError
+from .beam_rect_fc import (
+    beam_rect_fc,
+    get_material_params,
+    calculate_axial_balance_check
+)
+
+# 混凝土极限压应变（规范定值）
+εcu: float = 0.0033
+
+# 受压区位置类型
+I_FLAGS = {1: "受压区位于受压翼缘", 2: "受压区进入腹板", 3: "受压区进入受拉翼缘"}
+
+
+def beam_i_fc(b: float, h: float, bf: float, hf: float, bft: float, hft: float, fcuk: float, fy_grade: str,
+              fyc_grade: str, Ast: float, ast: float, Asc: float, asc: float,
+              γ0: float) -> Tuple[str, float, float, float, float, float, float, float, str]:
+    """
+    工字形截面梁抗弯承载力计算（受拉翼缘混凝土仅在受压区进入受拉翼缘时参与受压）
+    :param b: 腹板宽度(mm)，箱形截面为两侧腹板厚度之和
+    :param h: 梁总高度(mm)
+    :param bf: 受压翼缘宽度(mm)
+    :param hf: 受压翼缘高度(mm)
+    :param bft: 受拉翼缘宽度(mm)，无受拉翼缘时传0
+    :param hft: 受拉翼缘高度(mm)，无受拉翼缘时传0
+    :param fcuk: 混凝土立方体抗压强度等级值（如C30传30，C40传40）
+    :param fy_grade: 受拉钢筋强度等级（如"HRB400"）
+    :param fyc_grade: 受压钢筋强度等级（如"HRB400"）
+    :param Ast: 受拉钢筋面积(mm²)
+    :param ast: 受拉钢筋合力点至受拉边缘距离(mm)
+    :param Asc: 受压钢筋面积(mm²)
+    :param asc: 受压钢筋合力点至受压边缘距离(mm)
+    :param γ0: 结构重要性系数
+    :return: tuple - (flag, x, xb, ξ, ξb, Mu, σs, σsc, check)，含义及取整同beam_t_fc
+             flag: 受压区位置（I_FLAGS）
+    :raises CalculationError: 计算错误时抛出异常
+    :raises ParameterError: 参数错误时抛出异常
+    :raises MaterialError: 材料参数错误时抛出异常
+    :raises GeometryError: 几何参数错误时抛出异常
+    """
+    # ========== 1. 参数校验 ==========
+    if b < 0 or h < 0 or bf < 0 or hf < 0 or bft < 0 or hft < 0:
+        raise ParameterError("截面尺寸必须大于0", parameter=f"b={b}, h={h}, bf={bf}, hf={hf}, bft={bft}, hft={hft}")
+    if hf + hft >= h:
+        raise ParameterError("上下翼缘高度之和必须小于梁总高度", parameter=f"hf={hf}, hft={hft}, h={h}")
+    if Ast < 0 or Asc < 0:
+        raise ParameterError("钢筋面积不能为负", parameter=f"Ast={Ast}, Asc={Asc}")
+    if ast <= 0 or asc <= 0:
+        raise ParameterError("钢筋合力点至边缘距离必须大于0", parameter=f"ast={ast}, asc={asc}")
+    if γ0 <= 0:
+        raise ParameterError("结构重要性系数必须大于0", parameter=f"γ0={γ0}")
+
+    # ========== 2. 获取材料参数 ==========
+    try:
+        (fc, ft, Ec, α1, β1), (fy, Es, ξb), fyc = get_material_params(fcuk, fy_grade, fyc_grade)
+    except Exception as e:
+        raise MaterialError(f"获取材料参数失败: {str(e)}", parameter=f"fcuk={fcuk}, fy_grade={fy_grade}, fyc_grade={fyc_grade}")
+
+    h0 = h - ast
+    if h0 <= 0:
+        raise GeometryError("有效高度必须大于0", parameter=f"h={h}, ast={ast}, h0={h0}")
+
+    xb = ξb * h0
+    # 受拉翼缘顶面至受压边缘距离
+    yt = h - hft
+
+    # ========== 3. 抗弯承载力计算==========
+    try:
+        # 受压翼缘混凝土与受压钢筋的合力不小于受拉钢筋合力时受压区位于受压翼缘（GB 50010 6.2.11）
+        if fy * Ast <= α1 * fc * bf * hf + fyc * Asc:
+            # 受压区位于受压翼缘，按宽度为bf的矩形截面计算
+            x, xb, ξ, ξb, Mu, σs, σsc, check = beam_rect_fc(bf, h, fcuk, fy_grade, fyc_grade, Ast, ast, Asc, asc, γ0)
+            flag = I_FLAGS[1]
+        else:
+            if b <= 0 or α1 * fc <= 0:
+                raise CalculationError("计算分母为0，无法计算受压区高度", parameter=f"b={b}, α1={α1}, fc={fc}")
+            Cf = α1 * fc * (bf - b) * hf
+
+            # 适筋截面：先按受压区进入腹板计算，超过受拉翼缘顶面时计入受拉翼缘挑出部分
+            x = ((fy * Ast - fyc * Asc) / (α1 * fc) - (bf - b) * hf) / b
+            if x > yt and bft > 0:
+                x = ((fy * Ast - fyc * Asc) / (α1 * fc) - (bf - b) * hf + (bft - b) * yt) / bft
+            if x <= xb:
+                σs = fy
+            else:
+                # 超筋截面，解二次方程
+                a1 = α1 * fc * b
+                b1 = Cf + fyc * Asc + Es * εcu * Ast
+                c1 = -Es * εcu * β1 * h0 * Ast
+                x = solve_quadratic_equation(a1, b1, c1)
+                if x > yt and bft > 0:
+                    x = solve_quadratic_equation(α1 * fc * bft, b1 - α1 * fc * (bft - b) * yt, c1)
+                if x <= 0:
+                    raise CalculationError("超筋截面计算失败，受压区高度无效", parameter=f"x={x}")
+                σs = Es * εcu * (β1 * h0 / x - 1)
+            σsc = fyc
+
+            # 受拉翼缘挑出部分的受压高度
+            xt = max(x - yt, 0) if bft > 0 else 0
+            flag = I_FLAGS[3] if xt > 0 else I_FLAGS[2]
+            Mu = α1 * fc * (b * x * (h0 - 0.5 * x) + (bf - b) * hf * (h0 - 0.5 * hf)
+                            + (bft - b) * xt * (h0 - yt - 0.5 * xt)) / 1e6 + fyc * Asc * (h0 - asc) / 1e6
+
+            # 轴力平衡校验，考虑上下翼缘挑出部分的附加力
+            additional_force = Cf + α1 * fc * (bft - b) * xt
+            check = calculate_axial_balance_check(σs, Ast, α1, fc, b, x, σsc, Asc, additional_force)
+
+            # 结构重要性系数修正（受压区位于受压翼缘时已在beam_rect_fc中修正）
+            Mu = Mu / γ0
+    except ZeroDivisionError as e:
+        raise CalculationError(f"计算过程中出现除零错误: {str(e)}")
+    except Exception as e:
+        raise CalculationError(f"抗弯承载力计算失败: {str(e)}")
+
+    # ========== 4. 整理计算结果 ==========
+    x = round(float(x), 2)
+    xb = round(float(xb), 2)
+    ξ = round(float(x / h0), 3)
+    ξb = round(float(ξb), 3)
+    Mu = round(float(Mu), 2)
+    σs = round(float(σs), 2)
+    σsc = round(float(σsc), 2)
+
+    # ========== 5. 返回结果 ==========
+    return (flag, x, xb, ξ, ξb, Mu, σs, σsc, check)
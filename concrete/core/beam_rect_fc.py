@@ -1,6 +1,7 @@
 """矩形截面梁抗弯承载力计算模块
 依据：GB 50010-2010
 """
+from functools import lru_cache
 from typing import Tuple, Dict
 from common.utils import solve_quadratic_equation
 from common.exceptions import CalculationError, ParameterError, MaterialError, GeometryError
@@ -10,9 +11,10 @@ from . import concrete, rebar
 εcu: float = 0.0033
 
 
+@lru_cache(maxsize=256)
 def get_material_params(fcuk: float, fy_grade: str, fyc_grade: str) -> Tuple[Tuple[float, float, float, float, float], Tuple[float, float, float], float]:
     """
-    获取混凝土和钢筋的材料参数
+    获取混凝土和钢筋的材料参数（按材料组合缓存，逐截面计算函数不再每次查表）
     :param fcuk: 混凝土立方体抗压强度等级值（如30,40）
     :param fy_grade: 受拉钢筋强度等级（如"HRB400"）
     :param fyc_grade: 受压钢筋强度等级（如"HRB400"）
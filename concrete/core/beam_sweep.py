@@ -0,0 +1,223 @@
+"""梁抗弯承载力参数扫描模块（设计图表用）
+任意输入参数可取列表/范围，按笛卡尔积分块调用批量计算核心，不逐点调用beam_rect_fc/beam_t_fc；
+结果超立方体可保存为.npz文件，或分块写入按参数轴组织的内存映射.npy目录
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from common.exceptions import ParameterError
+from .beam_batch import material_arrays, rect_eval, t_eval
+
+# 各截面类型的输入参数（含义同beam_rect_fc/beam_t_fc）
+RECT_KEYS = ("b", "h", "fcuk", "fy_grade", "fyc_grade", "Ast", "ast", "Asc", "asc", "γ0")
+T_KEYS = ("b", "h", "bf", "hf", "fcuk", "fy_grade", "fyc_grade", "Ast", "ast", "Asc", "asc", "γ0")
+MATERIAL_KEYS = ("fcuk", "fy_grade", "fyc_grade")
+
+# 各截面类型可输出的结果键（rect_eval/t_eval的结果键）
+RECT_OUTPUTS = ("x", "xb", "ξ", "ξb", "Mu", "σs", "σsc", "balanced", "valid", "code", "param")
+T_OUTPUTS = ("flag",) + RECT_OUTPUTS
+INT_OUTPUTS = ("flag", "code", "param")
+
+# 每块计算点数（约1e6点，单块内存占用约数十MB）
+DEFAULT_CHUNK = 1 << 20
+
+# 保存文件中的参数轴前缀及元数据名
+AXIS_PREFIX = "axis_"
+META_NAME = "meta"
+
+
+class SweepGrid:
+    """
+    惰性笛卡尔积网格：只保存各参数轴，按线性序号区间展开计算点
+    受拉钢筋可用配筋率"ρ"代替"Ast"输入（Ast = ρ·b·h0）
+    """
+
+    def __init__(self, params: Dict[str, object], section: str = "矩形"):
+        """
+        :param params: 参数字典，值为标量（固定值）或列表/数组/range（参数轴），轴顺序即超立方体维度顺序
+        :param section: 截面类型（"矩形"或"T形"）
+        :raises ValueError: 截面类型无效或缺少参数时抛出异常
+        """
+        if section not in ("矩形", "T形"):
+            raise ValueError(f"截面类型'{section}'不支持")
+        keys = RECT_KEYS if section == "矩形" else T_KEYS
+        params = dict(params)
+        self.use_ρ = "Ast" not in params and "ρ" in params
+        required = [("ρ" if k == "Ast" and self.use_ρ else k) for k in keys]
+        missing = [k for k in required if k not in params]
+        if missing:
+            raise ValueError(f"缺少参数：{', '.join(missing)}")
+
+        self.section = section
+        self.keys = keys
+        self.axes = {k: np.asarray(list(v) if isinstance(v, range) else v) for k, v in params.items()
+                     if k in required and np.ndim(v) > 0}
+        self.fixed = {k: v for k, v in params.items() if k in required and np.ndim(v) == 0}
+        self.shape = tuple(len(a) for a in self.axes.values())
+        self.size = int(np.prod(self.shape, dtype=np.int64))
+
+        # 材料参数只按材料轴组合查询一次，计算时按序号展开
+        values = [self.axes[k] if k in self.axes else np.asarray([self.fixed[k]]) for k in MATERIAL_KEYS]
+        self._mat_shape = tuple(len(v) for v in values)
+        mesh = np.meshgrid(*values, indexing="ij")
+        self._mat = material_arrays(*(m.ravel() for m in mesh))
+
+    def take(self, start: int, stop: int) -> Dict[str, np.ndarray]:
+        """
+        展开线性序号区间[start, stop)内的计算点
+        :return: dict - 各输入参数的一维数组（固定参数为标量），材料参数键"mat"
+        """
+        names = list(self.axes)
+        index = np.unravel_index(np.arange(start, stop, dtype=np.int64), self.shape) if names else ()
+        index = dict(zip(names, index))
+        point = {k: (self.axes[k][index[k]] if k in index else self.fixed[k]) for k in self.axes.keys() | self.fixed.keys()}
+        mat_index = np.ravel_multi_index([index.get(k, 0) for k in MATERIAL_KEYS], self._mat_shape)
+        mat_index = np.broadcast_to(mat_index, (stop - start,))
+        point["mat"] = {k: v[mat_index] for k, v in self._mat.items()}
+        return point
+
+    def evaluate(self, start: int, stop: int, outputs: Iterable[str]) -> Dict[str, np.ndarray]:
+        """
+        计算线性序号区间[start, stop)内的计算点
+        :param outputs: 输出结果键（如("Mu", "ξ")）
+        :return: dict - 各输出结果的一维数组
+        """
+        p = self.take(start, stop)
+        n = stop - start
+        f = {k: np.broadcast_to(np.asarray(p[k], dtype=float), (n,))
+             for k in self.keys if k not in MATERIAL_KEYS and not (k == "Ast" and self.use_ρ)}
+        if self.use_ρ:
+            f["Ast"] = np.asarray(p["ρ"], dtype=float) * f["b"] * (f["h"] - f["ast"])
+        if self.section == "矩形":
+            res = rect_eval(f["b"], f["h"], p["mat"], f["Ast"], f["ast"], f["Asc"], f["asc"], f["γ0"])
+        else:
+            res = t_eval(f["b"], f["h"], f["bf"], f["hf"], p["mat"], f["Ast"], f["ast"], f["Asc"], f["asc"], f["γ0"])
+        return {k: np.broadcast_to(res[k], (n,)) for k in outputs}
+
+
+class SweepResult:
+    """参数扫描结果：参数轴+结果超立方体（内存数组或内存映射）"""
+
+    def __init__(self, axes: Dict[str, np.ndarray], data: Dict[str, np.ndarray],
+                 fixed: Optional[Dict[str, object]] = None, section: str = "矩形"):
+        self.axes = axes
+        self.data = data
+        self.fixed = fixed or {}
+        self.section = section
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self.data[key]
+
+    def index(self, name: str, value) -> int:
+        """
+        查询参数值在参数轴上的序号
+        :raises KeyError: 参数轴或参数值不存在时抛出异常
+        """
+        hits = np.flatnonzero(self.axes[name] == value)
+        if not len(hits):
+            raise KeyError(f"参数轴{name}中无取值{value}")
+        return int(hits[0])
+
+    def sel(self, key: str, **values) -> np.ndarray:
+        """
+        按参数值选取子数组，如sel("Mu", b=250, fy_grade="HRB400")
+        :param key: 输出结果键
+        :param values: 参数轴名=参数值，未指定的轴保留
+        """
+        slices = tuple(self.index(name, values[name]) if name in values else slice(None) for name in self.axes)
+        return self.data[key][slices]
+
+    def _meta(self) -> str:
+        """参数轴顺序、固定参数及截面类型（JSON）"""
+        fixed = {k: (v.item() if isinstance(v, np.generic) else v) for k, v in self.fixed.items()}
+        return json.dumps({"axes": list(self.axes), "fixed": fixed, "section": self.section,
+                           "outputs": list(self.data)}, ensure_ascii=False)
+
+    def save(self, path: str, compressed: bool = False) -> None:
+        """
+        保存为单个.npz文件（结果数组+参数轴+元数据）
+        :param compressed: 是否压缩
+        """
+        arrays = dict(self.data)
+        arrays.update({AXIS_PREFIX + k: v for k, v in self.axes.items()})
+        arrays[META_NAME] = np.asarray(self._meta())
+        (np.savez_compressed if compressed else np.savez)(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "SweepResult":
+        """
+        读取.npz文件或内存映射目录（目录中的结果数组以只读内存映射方式打开）
+        """
+        if os.path.isdir(path):
+            with np.load(os.path.join(path, "axes.npz")) as f:
+                meta = json.loads(str(f[META_NAME]))
+                axes = {k: f[AXIS_PREFIX + k] for k in meta["axes"]}
+            data = {k: np.load(os.path.join(path, f"{k}.npy"), mmap_mode="r") for k in meta["outputs"]}
+        else:
+            with np.load(path) as f:
+                meta = json.loads(str(f[META_NAME]))
+                axes = {k: f[AXIS_PREFIX + k] for k in meta["axes"]}
+                data = {k: f[k] for k in meta["outputs"]}
+        return cls(axes, data, meta["fixed"], meta["section"])
+
+
+def _evaluate_chunk(grid: SweepGrid, start: int, stop: int, dtypes: Dict[str, object]) -> Dict[str, np.ndarray]:
+    """进程池任务：计算一块并转换为存储类型（减少进程间传输量）"""
+    return {k: v.astype(dtypes[k]) for k, v in grid.evaluate(start, stop, dtypes).items()}
+
+
+def sweep(params: Dict[str, object], section: str = "矩形", outputs: Iterable[str] = ("Mu",),
+          chunk_size: int = DEFAULT_CHUNK, workers: int = 0, out_dir: Optional[str] = None,
+          dtype=np.float32) -> SweepResult:
+    """
+    参数扫描：对参数笛卡尔积逐块批量计算
+    :param params: 参数字典，见SweepGrid
+    :param section: 截面类型（"矩形"或"T形"）
+    :param outputs: 输出结果键（矩形截面见RECT_OUTPUTS，T形截面见T_OUTPUTS，如"Mu"、"ξ"、"valid"）
+    :param chunk_size: 每块计算点数
+    :param workers: 进程数，0为在当前进程计算
+    :param out_dir: 内存映射输出目录（每个结果一个.npy文件及axes.npz），None时结果保存在内存
+    :param dtype: 浮点结果的存储类型（默认float32）
+    :return: SweepResult - 结果形状为各参数轴长度
+    :raises ParameterError: 输出结果键对该截面类型无效时抛出异常
+    """
+    grid = SweepGrid(params, section)
+    outputs = tuple(outputs)
+    valid_outputs = RECT_OUTPUTS if section == "矩形" else T_OUTPUTS
+    unknown = [k for k in outputs if k not in valid_outputs]
+    if unknown:
+        raise ParameterError(f"{section}截面无输出结果：{', '.join(unknown)}",
+                             parameter=f"可用结果键：{', '.join(valid_outputs)}")
+    dtypes = {k: (bool if k in ("valid", "balanced") else np.int8 if k in INT_OUTPUTS else dtype) for k in outputs}
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+        data = {k: np.lib.format.open_memmap(os.path.join(out_dir, f"{k}.npy"), mode="w+",
+                                             dtype=dtypes[k], shape=grid.shape) for k in outputs}
+    else:
+        data = {k: np.empty(grid.shape, dtype=dtypes[k]) for k in outputs}
+    flat = {k: v.reshape(-1) for k, v in data.items()}
+
+    bounds = [(i, min(i + chunk_size, grid.size)) for i in range(0, grid.size, chunk_size)]
+    if workers and len(bounds) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [(start, stop, pool.submit(_evaluate_chunk, grid, start, stop, dtypes))
+                       for start, stop in bounds]
+            for start, stop, future in futures:
+                for k, v in future.result().items():
+                    flat[k][start:stop] = v
+    else:
+        for start, stop in bounds:
+            for k, v in grid.evaluate(start, stop, outputs).items():
+                flat[k][start:stop] = v
+
+    result = SweepResult(grid.axes, data, grid.fixed, section)
+    if out_dir:
+        for v in data.values():
+            v.flush()
+        np.savez(os.path.join(out_dir, "axes.npz"), **{AXIS_PREFIX + k: v for k, v in grid.axes.items()},
+                 **{META_NAME: np.asarray(result._meta())})
+    return result
@@ -108,14 +108,14 @@ def beam_t_fc(b: float, h: float, bf: float, hf: float, fcuk: float, fy_grade: s
             # 轴力平衡校验，考虑翼缘部分的附加力
             additional_force = α1 * fc * (bf - b) * hf
             check = calculate_axial_balance_check(σs, Ast, α1, fc, b, x, σsc, Asc, additional_force)
+
+            # 结构重要性系数修正（第一类T型截面已在beam_rect_fc中修正）
+            Mu = Mu / γ0
     except ZeroDivisionError as e:
         raise CalculationError(f"计算过程中出现除零错误: {str(e)}")
     except Exception as e:
         raise CalculationError(f"抗弯承载力计算失败: {str(e)}")
 
-    # 结构重要性系数修正
-    Mu = Mu / γ0
-
     # ========== 4. 整理计算结果 ==========
     # 确保所有值都是 Python 原生浮点数
     x = round(float(x), 2)
@@ -1,13 +1,15 @@
 # -*- coding: utf-8 -*-
 """
 混凝土梁抗弯承载力计算工具函数模块
+pandas/openpyxl仅在实际读写Excel时导入，单截面计算无需承担其导入开销
 """
 import sys
 import os
-import pandas as pd
-from openpyxl import load_workbook
-from openpyxl.styles import Alignment
-from ..config import OUTPUT_COLS, COL_MAPPING
+from common.utils import is_missing
+from .rebar_thickness import rebar_centroid
+from .records import SectionInput
+from ..config import (INPUT_COLS, REBAR_NOTATION_COLS, REBAR_DEFAULTS, TENSION_FLANGE_COLS, OUTPUT_COLS,
+                      COL_MAPPING)
 
 
 def validate_file_exists(file_path):
@@ -23,33 +25,82 @@ def validate_file_exists(file_path):
 
 def read_excel_data(file_path):
     """
-    读取Excel A-P列数据
+    读取Excel A-P列数据及可选的平法标注列、受拉翼缘列
     :param file_path: Excel文件路径
     :return: pandas.DataFrame - 读取的数据
     :raises Exception: 当读取文件失败时抛出异常
     """
+    import pandas as pd
+
     try:
         df_input = pd.read_excel(
             file_path,
             sheet_name="Sheet1",
-            usecols=["截面编号", "截面类型", "b", "h", "bf", "hf",
-                     "混凝土强度等级C", "受拉钢筋强度等级", "受压钢筋强度等级",
-                     "受拉钢筋面积As", "受拉钢筋as", "受压钢筋面积As", "受压钢筋as",
-                     "弯矩设计值M", "是否地震作用组合", "结构重要性系数γ0"],
+            usecols=lambda col: (col in INPUT_COLS or col in REBAR_NOTATION_COLS.values()
+                                 or col in TENSION_FLANGE_COLS.values()),
             engine="openpyxl",
             dtype={"截面编号": str}
         )
+        missing = [col for col in INPUT_COLS if col not in df_input.columns]
+        if missing:
+            raise ValueError(f"缺少数据列：{'、'.join(missing)}")
         return df_input
     except Exception as e:
         print(f"❌ 读取Excel文件时出错: {e}")
         sys.exit()
 
 
+def _notation_param(row, key):
+    """读取保护层厚度等标注参数，未填写时取默认值"""
+    value = row.get(REBAR_NOTATION_COLS[key])
+    if is_missing(value) or value == "":
+        return REBAR_DEFAULTS[key]
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def tension_flange(row):
+    """
+    读取受拉翼缘尺寸（工字形、箱形截面），未填写时为0
+    :param row: 输入数据行（dict或pandas.Series）
+    :return: tuple - (bft, hft)
+    """
+    values = []
+    for key in ("bft", "hft"):
+        value = row.get(TENSION_FLANGE_COLS[key])
+        values.append(0 if is_missing(value) or value == "" else value)
+    return tuple(values)
+
+
+def resolve_rebar_notation(row):
+    """
+    由平法标注列计算受拉/受压钢筋面积及合力点，未填写标注的一侧沿用手填数值
+    :param row: 输入数据行（dict或pandas.Series）
+    :return: tuple - (受拉As, 受拉as, 受压As, 受压as)
+    :raises ValueError: 标注无法解析或受拉侧填写错误
+    """
+    values = [row["受拉钢筋面积As"], row["受拉钢筋as"], row["受压钢筋面积As"], row["受压钢筋as"]]
+    side = row.get(REBAR_NOTATION_COLS["tension_side"])
+    side = "梁底" if is_missing(side) or str(side).strip() == "" else str(side).strip()
+    if side not in ("梁底", "梁顶"):
+        raise ValueError(f"受拉侧'{side}'无效，应为梁底或梁顶")
+    params = tuple(_notation_param(row, key) for key in ("c", "dv", "sn"))
+
+    # 梁底受拉时梁顶为受压钢筋，反之亦然
+    tension_pos = "bottom" if side == "梁底" else "top"
+    for pos, slot in ((tension_pos, 0), ("top" if tension_pos == "bottom" else "bottom", 2)):
+        notation = row.get(REBAR_NOTATION_COLS[pos])
+        if is_missing(notation) or str(notation).strip() == "":
+            continue
+        values[slot:slot + 2] = rebar_centroid(str(notation).strip(), pos, *params)
+    return tuple(values)
+
+
 def prepare_calculation_data(df_input):
     """
     准备计算数据
     :param df_input: 输入数据DataFrame
-    :return: tuple - (计算参数列表, 结果数据列表)
+    :return: tuple - (计算参数列表（SectionInput，可按字典方式读取）, 结果数据列表)
     """
     param = []
     result_data = []
@@ -61,21 +112,21 @@ def prepare_calculation_data(df_input):
             result_item[col] = None
         result_data.append(result_item)
 
+        # 平法标注列计算钢筋面积及合力点
+        error = None
+        try:
+            Ast, ast, Asc, asc = resolve_rebar_notation(row)
+        except ValueError as e:
+            error = f"钢筋标注错误：{e}"
+            Ast, ast, Asc, asc = row["受拉钢筋面积As"], row["受拉钢筋as"], row["受压钢筋面积As"], row["受压钢筋as"]
+
         # 构造计算参数
-        param_item = {
-            "sec_num": row["截面编号"],
-            "sec_type": row["截面类型"],
-            "M": row["弯矩设计值M"],
-            "is_seismic": row["是否地震作用组合"],
-            "γ0": row["结构重要性系数γ0"],
-            "calc_params": [
-                row["b"], row["h"], row["bf"], row["hf"],
-                row["混凝土强度等级C"], row["受拉钢筋强度等级"], row["受压钢筋强度等级"],
-                row["受拉钢筋面积As"], row["受拉钢筋as"],
-                row["受压钢筋面积As"], row["受压钢筋as"], row["结构重要性系数γ0"]
-            ]
-        }
-        param.append(param_item)
+        param.append(SectionInput(
+            row["截面编号"], row["截面类型"], row["b"], row["h"], row["bf"], row["hf"],
+            row["混凝土强度等级C"], row["受拉钢筋强度等级"], row["受压钢筋强度等级"],
+            Ast, ast, Asc, asc, row["结构重要性系数γ0"], *tension_flange(row),
+            M=row["弯矩设计值M"], is_seismic=row["是否地震作用组合"], error=error
+        ))
 
     return param, result_data
 
@@ -87,6 +138,9 @@ def save_excel_result_with_style(result_list, save_path, source_path):
     :param save_path: 保存路径
     :param source_path: 源文件路径
     """
+    from openpyxl import load_workbook
+    from openpyxl.styles import Alignment
+
     # 1. 加载原始Excel文件，保留所有样式
     wb = load_workbook(source_path)
     ws = wb.active
@@ -104,7 +158,7 @@ def save_excel_result_with_style(result_list, save_path, source_path):
             value = result_item.get(OUTPUT_COLS[col_key])
 
             # 写入值：简化处理，直接赋值
-            if pd.isna(value):
+            if is_missing(value):
                 cell.value = ""
             else:
                 cell.value = value
@@ -0,0 +1,229 @@
+"""梁抗弯承载力曲线模块（固定截面与材料，Mu随受拉钢筋面积Ast分段解析变化）
+依据：GB 50010-2010
+分段与beam_rect_fc/beam_t_fc的计算分支一一对应，分段点只在建立曲线时计算一次，
+之后Mu(Ast)及Ast(Mu)查询均为二分定位分段+解析公式，支持数组输入
+"""
+from typing import Optional
+
+import numpy as np
+
+from common.exceptions import ParameterError, MaterialError, GeometryError
+from .beam_rect_fc import get_material_params
+
+# 混凝土极限压应变（规范定值）
+εcu: float = 0.0033
+
+# 分段类型（对应beam_rect_fc/beam_t_fc的计算分支）
+RECT_A = 0  # x<2as'且Ast≤Ast1，忽略受压钢筋
+RECT_B = 1  # x<2as'且Ast>Ast1，取x=2as'
+RECT_D = 2  # 适筋
+RECT_C = 3  # 超筋
+T_D = 4  # 第二类T形截面适筋
+T_C = 5  # 第二类T形截面超筋
+
+BRANCH_NAMES = {
+    RECT_A: "x<2as'（忽略受压钢筋）",
+    RECT_B: "x=2as'",
+    RECT_D: "适筋",
+    RECT_C: "超筋",
+    T_D: "第二类T形截面适筋",
+    T_C: "第二类T形截面超筋",
+}
+
+
+def _solve_x(M, α1fcb, h0):
+    """由α1·fc·b·x·(h0 - x/2) = M求x（M单位N·mm），超过最大抵抗矩时返回nan"""
+    αs = M / (α1fcb * h0 * h0)
+    with np.errstate(invalid="ignore"):
+        return h0 * (1 - np.sqrt(1 - 2 * αs))
+
+
+def _quadratic_x(a, b, c):
+    """超筋分支受压区高度（ax²+bx+c=0的正根）"""
+    return (-b + np.sqrt(b * b - 4 * a * c)) / (2 * a)
+
+
+class CapacityCurve:
+    """
+    抗弯承载力曲线：固定截面尺寸、材料及受压钢筋，Mu为Ast的分段解析函数
+    矩形截面分段点：Ast1 = α1·fc·b·2as'/fy，Ast_a = As' + α1·fc·b·2as'/fy，Ast_b = As' + α1·fc·b·xb/fy
+    T形截面另有翼缘判别点Ast_f = α1·fc·bf·hf/fy（此前按宽度bf的矩形截面分段）及第二类界限点Ast_t
+    """
+
+    def __init__(self, b: float, h: float, fcuk: float, fy_grade: str, fyc_grade: str,
+                 ast: float, Asc: float, asc: float, γ0: float,
+                 bf: Optional[float] = None, hf: Optional[float] = None):
+        """
+        :param b: 腹板宽度(mm)
+        :param h: 梁总高度(mm)
+        :param fcuk: 混凝土立方体抗压强度等级值
+        :param fy_grade: 受拉钢筋强度等级
+        :param fyc_grade: 受压钢筋强度等级
+        :param ast: 受拉钢筋合力点至受拉边缘距离(mm)
+        :param Asc: 受压钢筋面积(mm²)
+        :param asc: 受压钢筋合力点至受压边缘距离(mm)
+        :param γ0: 结构重要性系数
+        :param bf: 翼缘宽度(mm)，None为矩形截面
+        :param hf: 翼缘高度(mm)
+        :raises ParameterError: 参数错误时抛出异常
+        :raises MaterialError: 材料参数错误时抛出异常
+        :raises GeometryError: 几何参数错误时抛出异常
+        """
+        # ========== 1. 参数校验 ==========
+        if b <= 0 or h <= 0:
+            raise ParameterError("截面尺寸必须大于0", parameter=f"b={b}, h={h}")
+        if Asc < 0:
+            raise ParameterError("钢筋面积不能为负", parameter=f"Asc={Asc}")
+        if ast <= 0 or asc <= 0:
+            raise ParameterError("钢筋合力点至边缘距离必须大于0", parameter=f"ast={ast}, asc={asc}")
+        if γ0 <= 0:
+            raise ParameterError("结构重要性系数必须大于0", parameter=f"γ0={γ0}")
+        is_t = bf is not None
+        if is_t and (bf <= 0 or hf < 0 or hf >= h):
+            raise ParameterError("翼缘尺寸无效", parameter=f"bf={bf}, hf={hf}, h={h}")
+
+        # ========== 2. 获取材料参数 ==========
+        try:
+            (fc, ft, Ec, α1, β1), (fy, Es, ξb), fyc = get_material_params(fcuk, fy_grade, fyc_grade)
+        except Exception as e:
+            raise MaterialError(f"获取材料参数失败: {str(e)}", parameter=f"fcuk={fcuk}, fy_grade={fy_grade}, fyc_grade={fyc_grade}")
+        h0 = h - ast
+        if h0 <= 0:
+            raise GeometryError("有效高度必须大于0", parameter=f"h={h}, ast={ast}, h0={h0}")
+
+        self.b, self.h0, self.Asc, self.asc, self.γ0 = b, h0, Asc, asc, γ0
+        self.bf, self.hf = (bf, hf) if is_t else (b, 0)
+        self.α1, self.fc, self.β1, self.fy, self.Es, self.fyc = α1, fc, β1, fy, Es, fyc
+        self.xb = ξb * h0
+
+        # ========== 3. 分段点（只计算一次） ==========
+        # 矩形截面（第一类T形截面按宽度bf）
+        den = α1 * fc * self.bf
+        Ast1 = den * 2 * asc / fy
+        Ast_a = Asc + Ast1
+        Ast_b = max(Ast_a, Asc + den * self.xb / fy)
+        edges = [0.0, Ast1, Ast_a, Ast_b]
+        kinds = [RECT_A, RECT_B, RECT_D, RECT_C]
+        if is_t:
+            # 第二类T形截面：翼缘判别点之后x≤xb为适筋，其后超筋
+            Ast_f = α1 * fc * bf * hf / fy
+            Ast_t = max(Ast_f, (α1 * fc * (b * self.xb + (bf - b) * hf) + fyc * Asc) / fy)
+            edges = [min(e, Ast_f) for e in edges] + [Ast_f, Ast_t]
+            kinds = kinds + [T_D, T_C]
+        self.edges = np.array(edges + [np.inf])
+        self.kinds = np.array(kinds)
+
+        # 各分段两端的承载力（用于反算时二分定位），末段取Ast→∞时的极限值，长度为0的分段不参与定位
+        lo = self._mu_raw(self.edges[:-1], self.kinds)
+        hi = np.append(self._mu_raw(self.edges[1:-1], self.kinds[:-1]), self._mu_limit())
+        empty = self.edges[1:] <= self.edges[:-1]
+        self.mu_lo = np.where(empty, -np.inf, lo / γ0)
+        self.mu_hi = np.maximum.accumulate(np.where(empty, -np.inf, hi / γ0))
+
+    # ====================== 承载力计算 ======================
+    def _mu_raw(self, Ast: np.ndarray, kinds: np.ndarray) -> np.ndarray:
+        """按指定分段公式计算Mu(N·mm，未除γ0)"""
+        Ast = np.asarray(Ast, dtype=float)
+        α1fc, fy, fyc, h0, asc, Asc = self.α1 * self.fc, self.fy, self.fyc, self.h0, self.asc, self.Asc
+        den = α1fc * self.bf
+        Mf = α1fc * (self.bf - self.b) * self.hf * (self.h0 - 0.5 * self.hf)
+        Mu = np.full(Ast.shape, np.nan)
+        for kind in np.unique(kinds):
+            m = kinds == kind
+            A = Ast[m]
+            if kind == RECT_A:
+                x = fy * A / den
+                Mu[m] = den * x * (h0 - x / 2)
+            elif kind == RECT_B:
+                Mu[m] = fy * A * (h0 - asc)
+            elif kind == RECT_D:
+                x = fy * (A - Asc) / den
+                Mu[m] = den * x * (h0 - x / 2) + fy * Asc * (h0 - asc)
+            elif kind == RECT_C:
+                x = _quadratic_x(den, fyc * Asc + self.Es * εcu * A, -self.Es * εcu * self.β1 * h0 * A)
+                Mu[m] = den * x * (h0 - x / 2) + fyc * Asc * (h0 - asc)
+            else:
+                Cf = α1fc * (self.bf - self.b) * self.hf
+                if kind == T_D:
+                    x = ((fy * A - fyc * Asc) - Cf) / (α1fc * self.b)
+                else:
+                    a1 = α1fc * self.b
+                    x = _quadratic_x(a1, Cf + fyc * Asc + self.Es * εcu * A, -self.Es * εcu * self.β1 * h0 * A)
+                Mu[m] = α1fc * self.b * x * (h0 - 0.5 * x) + Mf + fyc * Asc * (h0 - asc)
+        return Mu
+
+    def _mu_limit(self) -> float:
+        """Ast→∞时的承载力极限（超筋分支x→β1·h0）"""
+        x = self.β1 * self.h0
+        Mc = self.fyc * self.Asc * (self.h0 - self.asc)
+        if self.kinds[-1] == RECT_C:
+            return self.α1 * self.fc * self.bf * x * (self.h0 - x / 2) + Mc
+        Mf = self.α1 * self.fc * (self.bf - self.b) * self.hf * (self.h0 - 0.5 * self.hf)
+        return self.α1 * self.fc * self.b * x * (self.h0 - 0.5 * x) + Mf + Mc
+
+    def branch(self, Ast) -> np.ndarray:
+        """
+        查询受拉钢筋面积所在分段
+        :param Ast: 受拉钢筋面积(mm²)，标量或数组
+        :return: 分段类型数组（RECT_A/RECT_B/RECT_D/RECT_C/T_D/T_C）
+        """
+        Ast = np.asarray(Ast, dtype=float)
+        idx = np.clip(np.searchsorted(self.edges, Ast, side="right") - 1, 0, len(self.kinds) - 1)
+        if len(self.kinds) > 4:
+            # 翼缘判别点fy·Ast = α1·fc·bf·hf属于第一类T形截面
+            idx = np.where(Ast == self.edges[4], np.maximum(np.searchsorted(self.edges, Ast, side="left") - 1, 0), idx)
+        return self.kinds[idx]
+
+    def mu(self, Ast) -> np.ndarray:
+        """
+        抗弯承载力Mu(Ast)，与beam_rect_fc/beam_t_fc结果一致（未取整）
+        :param Ast: 受拉钢筋面积(mm²)，标量或数组
+        :return: 抗弯承载力(kN·m)数组，已除γ0
+        """
+        Ast = np.asarray(Ast, dtype=float)
+        return self._mu_raw(Ast, self.branch(Ast)) / self.γ0 / 1e6
+
+    @property
+    def ast_max(self) -> float:
+        """不超筋的最大受拉钢筋面积(mm²)（矩形截面Ast_b，T形截面Ast_t）"""
+        return float(self.edges[-2])
+
+    # ====================== 反算 ======================
+    def ast(self, Mu) -> np.ndarray:
+        """
+        达到指定抗弯承载力所需的最小受拉钢筋面积Ast(Mu)
+        :param Mu: 抗弯承载力(kN·m，已除γ0)，标量或数组
+        :return: 受拉钢筋面积(mm²)数组，超过Ast→∞时的承载力极限时为nan
+        """
+        target = np.asarray(Mu, dtype=float) * 1e6
+        k = np.searchsorted(self.mu_hi, target, side="left")
+        reach = k < len(self.kinds)
+        k = np.minimum(k, len(self.kinds) - 1)
+        M = target * self.γ0
+        α1fc, fy, fyc, h0, asc, Asc = self.α1 * self.fc, self.fy, self.fyc, self.h0, self.asc, self.Asc
+        den = α1fc * self.bf
+        Cf = α1fc * (self.bf - self.b) * self.hf
+        Mf = Cf * (h0 - 0.5 * self.hf)
+        Mc = fyc * Asc * (h0 - asc)
+        kinds = self.kinds[k]
+        out = np.full(target.shape, np.nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for kind in np.unique(kinds):
+                m = kinds == kind
+                Mk = M[m]
+                if kind == RECT_A:
+                    out[m] = den * _solve_x(Mk, den, h0) / fy
+                elif kind == RECT_B:
+                    out[m] = Mk / (fy * (h0 - asc))
+                elif kind == RECT_D:
+                    out[m] = den * _solve_x(Mk - fy * Asc * (h0 - asc), den, h0) / fy + Asc
+                elif kind == RECT_C:
+                    x = _solve_x(Mk - Mc, den, h0)
+                    out[m] = (den * x + fyc * Asc) / (self.Es * εcu * (self.β1 * h0 / x - 1))
+                else:
+                    x = _solve_x(Mk - Mf - Mc, α1fc * self.b, h0)
+                    σs = fy if kind == T_D else self.Es * εcu * (self.β1 * h0 / x - 1)
+                    out[m] = (α1fc * self.b * x + Cf + fyc * Asc) / σs
+            # 目标值落在分段间的跳跃处时取分段起点（起点本身属于前一分段，取其后相邻浮点数）
+            out = np.where((target <= self.mu_lo[k]) & (k > 0), np.nextafter(self.edges[k], np.inf), out)
+        return np.where(reach, out, np.nan)
@@ -0,0 +1,223 @@
+"""计算数据校验模块
+计算前按列向量化校验全部输入行，规则同beam_rect_fc / beam_t_fc / beam_i_fc的参数校验
+及concrete.get_params / rebar.get_params的材料校验，给出逐行问题表及各问题行数汇总；
+可选按GUI的规则自动修正（T形截面bf或hf为0时按矩形截面计算）
+"""
+import numbers
+from typing import Any, Dict, List, NamedTuple, Sequence
+
+import numpy as np
+
+from common.exceptions import ERROR_TYPES, ErrorCode
+from .beam_batch import rebar_row
+from .records import SectionInput
+from .section_types import PARAM_KEYS, SECTION_TYPES
+
+# 问题级别
+ERROR = "错误"  # 计算必然失败，计算前剔除
+WARNING = "警告"  # 可以计算，但数据可疑
+FIXED = "修正"  # 已自动修正
+
+# 截面尺寸参数
+DIMENSION_KEYS = ("b", "h", "bf", "hf", "bft", "hft")
+
+# 数值参数（calc_params中除钢筋等级外的参数及弯矩设计值M）
+NUMERIC_KEYS = tuple(k for k in PARAM_KEYS if k not in ("fy_grade", "fyc_grade")) + ("M",)
+
+
+class Issue(NamedTuple):
+    """数据问题"""
+    row: int  # 行序号（从0开始，与输入顺序一致）
+    sec_num: Any  # 截面编号
+    level: str  # 问题级别（ERROR/WARNING/FIXED）
+    message: str  # 问题描述
+    parameter: str  # 相关参数取值，如"h=40, ast=45"
+
+    def text(self) -> str:
+        """问题文字（格式同common.exceptions中异常的文字）"""
+        return f"{self.message} | 参数：{self.parameter}" if self.parameter else self.message
+
+
+class QualityReport(NamedTuple):
+    """数据质量报告"""
+    issues: List[Issue]  # 逐行问题表（按行序号排序）
+    counts: Dict[str, int]  # 各问题（级别: 描述）的行数
+    bad: np.ndarray  # 有错误的行掩码
+    fixed: np.ndarray  # 已自动修正的行掩码
+
+    def row_errors(self) -> Dict[int, str]:
+        """各错误行的首个错误文字"""
+        errors: Dict[int, str] = {}
+        for issue in self.issues:
+            if issue.level == ERROR:
+                errors.setdefault(issue.row, issue.text())
+        return errors
+
+    def mark_errors(self, items: Sequence[dict]) -> int:
+        """
+        将错误写入计算参数项的error（solve_items及calculate_single_item跳过并报告该行）
+        :param items: 计算参数列表（即校验的items，SectionInput项替换为新记录）
+        :return: int - 新标记的错误行数
+        """
+        count = 0
+        for row, text in self.row_errors().items():
+            item = items[row]
+            if item.get("error"):
+                continue
+            if isinstance(item, SectionInput):
+                items[row] = item.replace(error=text)
+            else:
+                item["error"] = text
+            count += 1
+        return count
+
+    def summary(self) -> str:
+        """汇总文字"""
+        lines = [f"共{len(self.bad)}行，错误{int(self.bad.sum())}行，自动修正{int(self.fixed.sum())}行"]
+        lines += [f"  {key}：{count}行" for key, count in self.counts.items()]
+        return "\n".join(lines)
+
+
+def _numeric(values: list) -> tuple:
+    """
+    数值列转为float数组
+    :return: (数组（非数值为nan）, 非数值掩码)
+    """
+    arr = np.asarray(values)
+    if arr.dtype.kind in "fiub":
+        return arr.astype(float), np.zeros(len(values), dtype=bool)
+    bad = np.array([not isinstance(v, numbers.Real) for v in values], dtype=bool)
+    return np.array([np.nan if x else float(v) for v, x in zip(values, bad)]), bad
+
+
+def _valid_grades(values: list) -> np.ndarray:
+    """钢筋牌号有效掩码（按唯一值查询）"""
+    valid = {}
+    for v in set(values):
+        try:
+            valid[v] = isinstance(v, str) and rebar_row(v) is not None
+        except TypeError:
+            valid[v] = False
+    return np.array([valid[v] for v in values], dtype=bool)
+
+
+def _columns(items: Sequence[dict]) -> Dict[str, list]:
+    """按参数名整理各列原始值（calc_params省略的受拉翼缘参数取0）"""
+    n = len(PARAM_KEYS)
+    rows = [list(item["calc_params"]) + [0] * (n - len(item["calc_params"])) for item in items]
+    columns = {k: list(col) for k, col in zip(PARAM_KEYS, zip(*rows))} if rows else {k: [] for k in PARAM_KEYS}
+    columns["M"] = [item["M"] for item in items]
+    return columns
+
+
+def _auto_fix(items: Sequence[dict], names: np.ndarray, bf: np.ndarray, hf: np.ndarray) -> np.ndarray:
+    """T形截面bf或hf不大于0时改为矩形截面（同GUI单截面计算），返回修正行掩码"""
+    fixed = (names == "T形") & ((bf <= 0) | (hf <= 0))
+    for i in np.flatnonzero(fixed):
+        item = items[i]
+        if isinstance(item, SectionInput):
+            items[i] = item.replace(sec_type="矩形", bf=0, hf=0)
+            continue
+        item["sec_type"] = "矩形"
+        item["calc_params"] = list(item["calc_params"])
+        item["calc_params"][2:4] = [0, 0]
+    bf[fixed] = 0
+    hf[fixed] = 0
+    names[fixed] = "矩形"
+    return fixed
+
+
+def check_items(items: Sequence[dict], fix: bool = False) -> QualityReport:
+    """
+    计算参数整列校验
+    :param items: 计算参数列表（prepare_calculation_data输出的SectionInput，或含sec_num/sec_type/M/calc_params的字典）
+    :param fix: 是否自动修正（T形截面bf或hf不大于0时改为矩形截面，直接修改items中的项）
+    :return: QualityReport - 数据质量报告
+    """
+    n = len(items)
+    raw = _columns(items)
+    col: Dict[str, np.ndarray] = {}
+    non_numeric = {}
+    for key in NUMERIC_KEYS:
+        col[key], non_numeric[key] = _numeric(raw[key])
+    names = np.array([str(item["sec_type"]) for item in items], dtype=object)
+
+    # ========== 1. 自动修正 ==========
+    fixed = _auto_fix(items, names, col["bf"], col["hf"]) if fix else np.zeros(n, dtype=bool)
+
+    # 各行截面类型用到的参数
+    uses = {k: np.zeros(n, dtype=bool) for k in PARAM_KEYS}
+    strict = np.zeros(n, dtype=bool)
+    flange_sum = np.zeros(n, dtype=bool)
+    known = np.zeros(n, dtype=bool)
+    for name, section in SECTION_TYPES.items():
+        rows = names == name
+        known |= rows
+        for k in section.keys:
+            uses[k] |= rows
+        if "bf" not in section.keys:
+            strict |= rows  # 矩形截面尺寸须大于0，带翼缘截面须不小于0
+        if "bft" in section.keys:
+            flange_sum |= rows
+    flange = uses["hf"] & ~flange_sum
+
+    # ========== 2. 校验规则（顺序同逐截面计算函数） ==========
+    def used(key):
+        return uses[key] if key in uses else known
+
+    message = {code: msg for code, (_, msg) in ERROR_TYPES.items()}
+    c, b, h, bf, hf, hft = (col[k] for k in ("fcuk", "b", "h", "bf", "hf", "hft"))
+    with np.errstate(invalid="ignore"):
+        grades = {k: _valid_grades(raw[k]) for k in ("fy_grade", "fyc_grade")}
+        rules = [
+            (ERROR, "截面类型不支持", ("sec_type",), ~known),
+            (ERROR, "参数须为数值", None, {k: non_numeric[k] & used(k) for k in NUMERIC_KEYS}),
+            (ERROR, "参数缺失", None, {k: np.isnan(col[k]) & ~non_numeric[k] & used(k) for k in NUMERIC_KEYS}),
+            (ERROR, message[ErrorCode.DIMENSION], None,
+             {k: used(k) & np.where(strict, col[k] <= 0, col[k] < 0) for k in DIMENSION_KEYS}),
+            (ERROR, message[ErrorCode.FLANGE_HEIGHT], ("hf", "h"), flange & (hf >= h)),
+            (ERROR, message[ErrorCode.FLANGE_SUM], ("hf", "hft", "h"), flange_sum & (hf + hft >= h)),
+            (ERROR, message[ErrorCode.STEEL_AREA], ("Ast", "Asc"), known & ((col["Ast"] < 0) | (col["Asc"] < 0))),
+            (ERROR, message[ErrorCode.COVER], ("ast", "asc"), known & ((col["ast"] <= 0) | (col["asc"] <= 0))),
+            (ERROR, message[ErrorCode.GAMMA0], ("γ0",), known & (col["γ0"] <= 0)),
+            (ERROR, "混凝土强度等级需为15~80", ("fcuk",), known & ~non_numeric["fcuk"] & ((c < 15) | (c > 80))),
+            (ERROR, "受拉钢筋牌号无效", ("fy_grade",), known & ~grades["fy_grade"]),
+            (ERROR, "受压钢筋牌号无效", ("fyc_grade",), known & ~grades["fyc_grade"]),
+            (ERROR, message[ErrorCode.EFFECTIVE_DEPTH], ("h", "ast"), known & (h - col["ast"] <= 0)),
+            (WARNING, "翼缘宽度小于腹板宽度", ("b", "bf"), uses["bf"] & (bf < b)),
+            (WARNING, "T形截面翼缘尺寸为0", ("bf", "hf"), (names == "T形") & ((bf <= 0) | (hf <= 0))),
+            (WARNING, message[ErrorCode.MOMENT], ("M",), col["M"] < 0),
+        ]
+
+    # ========== 3. 整理问题表 ==========
+    issues: List[Issue] = []
+    counts: Dict[str, int] = {}
+    bad = np.zeros(n, dtype=bool)
+    if fixed.any():
+        counts[f"{FIXED}: T形截面翼缘尺寸为0，按矩形截面计算"] = int(fixed.sum())
+        issues += [Issue(int(i), items[i]["sec_num"], FIXED, "T形截面翼缘尺寸为0，按矩形截面计算", "bf=0, hf=0")
+                   for i in np.flatnonzero(fixed)]
+    for level, text, keys, mask in rules:
+        # 按参数的规则（dict）逐参数列出出错参数，其余规则列出全部相关参数
+        if isinstance(mask, dict):
+            mask = {k: m for k, m in mask.items() if m.any()}
+            rows = np.flatnonzero(np.logical_or.reduce(list(mask.values()))) if mask else np.array([], dtype=int)
+            params = [", ".join(f"{k}={raw[k][i]}" for k, m in mask.items() if m[i]) for i in rows]
+        else:
+            rows = np.flatnonzero(mask)
+            params = [", ".join(f"{k}={items[i][k] if k == 'sec_type' else raw[k][i]}" for k in keys) for i in rows]
+        if not len(rows):
+            continue
+        counts[f"{level}: {text}"] = len(rows)
+        if level == ERROR:
+            bad[rows] = True
+        issues += [Issue(int(i), items[i]["sec_num"], level, text, p) for i, p in zip(rows, params)]
+
+    # 读取阶段已有的错误（如钢筋标注错误）
+    prior = np.array([bool(item.get("error")) for item in items], dtype=bool)
+    if prior.any():
+        counts[f"{ERROR}: 输入数据错误"] = int(prior.sum())
+        issues += [Issue(int(i), items[i]["sec_num"], ERROR, items[i]["error"], "") for i in np.flatnonzero(prior)]
+        bad |= prior
+    issues.sort(key=lambda issue: issue.row)
+    return QualityReport(issues, counts, bad, fixed)
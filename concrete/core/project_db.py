@@ -0,0 +1,320 @@
+"""项目数据库
+以SQLite文件（.db）代替数据文件.xlsx作为工作存储：截面数据按行存放在sections表（列名同数据文件表头，
+pos按行顺序递增且留有间隔，插入、删除行不移动其余行），计算结果、使用的材料参数及每次批量计算的信息分别存放在results、materials、runs表；
+截面编号、截面类型、行顺序（pos）及R/S建有索引。打开项目只执行一次按列读取，保存只更新改动的行，
+Excel数据文件仅用于导入导出（export_workbook输出与数据文件相同的表头，可选附加Q-T结果列）。
+仅依赖标准库sqlite3；读取为DataFrame及导入导出Excel时才导入pandas/openpyxl
+"""
+import math
+import os
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from concrete.config import INPUT_COLS, OUTPUT_COLS
+
+# 项目数据库文件后缀
+PROJECT_SUFFIX = ".db"
+
+# 数据库结构版本（meta表schema_version）
+SCHEMA_VERSION = 1
+
+# 相邻行pos的间隔（插入行取前后两行pos的中值，间隔用尽时重新编排）
+POS_GAP = 1 << 20
+
+# 结果表的结果列（R/S、ξ/ξb、Mu、判别同GUI结果列，x、MuE同结果文件Q、S列）
+RESULT_FIELDS = ("x", "Mu", "MuE", "R/S", "ξ/ξb", "判别", "error")
+
+# 材料表的材料参数列（同records.MaterialSet）
+MATERIAL_FIELDS = ("fc", "ft", "Ec", "α1", "β1", "fy", "Es", "ξb", "fyc")
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS sections (id INTEGER PRIMARY KEY, pos INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS sections_pos ON sections(pos);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY, started TEXT, finished TEXT, source TEXT, sections INTEGER, errors INTEGER);
+CREATE TABLE IF NOT EXISTS results (
+    section_id INTEGER PRIMARY KEY REFERENCES sections(id) ON DELETE CASCADE, run_id INTEGER REFERENCES runs(id),
+    {", ".join(f'"{f}"' for f in RESULT_FIELDS)});
+CREATE INDEX IF NOT EXISTS results_rs ON results("R/S");
+CREATE TABLE IF NOT EXISTS materials (
+    fcuk REAL, fy_grade TEXT, fyc_grade TEXT, {", ".join(f'"{f}" REAL' for f in MATERIAL_FIELDS)},
+    PRIMARY KEY (fcuk, fy_grade, fyc_grade));
+"""
+
+# 建索引的数据列
+_INDEXED_COLS = ("截面编号", "截面类型")
+
+
+def is_project(file_path: str) -> bool:
+    """是否为项目数据库文件（按后缀判断）"""
+    return str(file_path).lower().endswith(PROJECT_SUFFIX)
+
+
+def _quote(name: str) -> str:
+    """SQL标识符（列名含中文及/等字符）"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _cell(value: Any) -> Any:
+    """单元格值转为SQLite取值（nan为NULL，numpy标量转为Python数值）"""
+    if value is None:
+        return None
+    if hasattr(value, "item") and not isinstance(value, (str, bytes)):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+class ProjectDB:
+    """项目数据库（同一连接只在创建它的线程中使用）"""
+
+    def __init__(self, path: str):
+        """
+        打开项目数据库（不存在时新建）
+        :param path: 数据库文件路径
+        """
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(_SCHEMA)
+        if self.meta("schema_version") is None:
+            self.set_meta(schema_version=SCHEMA_VERSION, created=datetime.now().isoformat(timespec="seconds"))
+            self.conn.commit()
+        self._columns: Optional[List[str]] = None
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "ProjectDB":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ====================== 1. 项目信息 ======================
+    def meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def set_meta(self, **values) -> None:
+        self.conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                              [(k, str(v)) for k, v in values.items()])
+
+    @property
+    def columns(self) -> List[str]:
+        """数据列名（按数据文件表头顺序）"""
+        if self._columns is None:
+            self._columns = [row[1] for row in self.conn.execute("PRAGMA table_info(sections)")][2:]
+        return self._columns
+
+    def count(self) -> int:
+        """截面数"""
+        return self.conn.execute("SELECT COUNT(*) FROM sections").fetchone()[0]
+
+    def _add_columns(self, names: Iterable[str]) -> None:
+        """增加数据列（已有的列忽略）"""
+        for name in names:
+            if name not in self.columns:
+                self.conn.execute(f"ALTER TABLE sections ADD COLUMN {_quote(name)}")
+                self._columns.append(name)
+                if name in _INDEXED_COLS:
+                    self.conn.execute(f"CREATE INDEX IF NOT EXISTS {_quote('sections_' + name)} "
+                                      f"ON sections({_quote(name)})")
+
+    def _ids(self) -> List[int]:
+        """按行顺序排列的截面id"""
+        return [row for row, in self.conn.execute("SELECT id FROM sections ORDER BY pos")]
+
+    def _insert_row(self, ids: List[int], pos: List[int], row: int) -> None:
+        """在行号row处插入空行（pos取前后两行的中值，ids、pos同步插入）"""
+        lo = pos[row - 1] if row > 0 else (pos[0] if pos else 0) - 2 * POS_GAP
+        hi = pos[row] if row < len(pos) else (pos[-1] if pos else 0) + 2 * POS_GAP
+        if hi - lo < 2:
+            # 间隔用尽，全部行重新按POS_GAP编排
+            pos[:] = [i * POS_GAP for i in range(len(ids))]
+            self.conn.executemany("UPDATE sections SET pos = ? WHERE id = ?", zip(pos, ids))
+            self._insert_row(ids, pos, row)
+            return
+        new = (lo + hi) // 2
+        ids.insert(row, self.conn.execute("INSERT INTO sections (pos) VALUES (?)", (new,)).lastrowid)
+        pos.insert(row, new)
+
+    # ====================== 2. 截面数据 ======================
+    def replace_sections(self, columns: Dict[str, Sequence]) -> int:
+        """
+        整体替换截面数据（删除原有截面及结果）
+        :param columns: 按列存储的数据 {数据列名: 各行取值}，列顺序即表头顺序
+        :return: int - 截面数
+        """
+        names = list(columns)
+        n = len(next(iter(columns.values()))) if columns else 0
+        with self.conn:
+            self.conn.execute("DELETE FROM results")
+            self.conn.execute("DELETE FROM sections")
+            self._add_columns(names)
+            sql = (f"INSERT INTO sections (pos, {', '.join(_quote(c) for c in names)}) "
+                   f"VALUES (?{', ?' * len(names)})")
+            self.conn.executemany(sql, ((i * POS_GAP, *(_cell(v) for v in row))
+                                        for i, row in enumerate(zip(*(columns[c] for c in names)))))
+        return n
+
+    def read_columns(self, fill=None) -> Dict[str, list]:
+        """
+        按行顺序读取全部截面数据
+        :param fill: 空值（NULL）替换值
+        :return: dict - {数据列名: 各行取值}
+        """
+        names = self.columns
+        rows = self.conn.execute(f"SELECT {', '.join(_quote(c) for c in names)} FROM sections ORDER BY pos").fetchall()
+        if not rows:
+            return {c: [] for c in names}
+        columns = {c: list(values) for c, values in zip(names, zip(*rows))}
+        if fill is not None:
+            for values in columns.values():
+                if None in values:
+                    values[:] = [fill if v is None else v for v in values]
+        return columns
+
+    def read_frame(self):
+        """读取为DataFrame（空值为nan，供prepare_calculation_data）"""
+        import pandas as pd
+
+        columns = self.read_columns()
+        missing = [col for col in INPUT_COLS if col not in columns]
+        if missing:
+            raise ValueError(f"缺少数据列：{'、'.join(missing)}")
+        df = pd.DataFrame(columns)
+        df["截面编号"] = [None if v is None else str(v) for v in columns["截面编号"]]
+        return df
+
+    def apply_changes(self, ops: Sequence[Tuple[str, int]], cells: Sequence[Tuple[int, Dict[str, Any]]]) -> int:
+        """
+        按顺序重放增删行并回写修改的单元格（一个事务），修改过的截面删除计算结果
+        :param ops: 增删行操作 [("insert"/"delete", 行号)]
+        :param cells: 修改的单元格 [(行号, {数据列名: 值})]，行号为全部增删行之后的行号
+        :return: int - 写入的单元格数
+        """
+        count = 0
+        with self.conn:
+            # 行号按内存中的(id, pos)列表定位，增删行只改动该行
+            rows = self.conn.execute("SELECT id, pos FROM sections ORDER BY pos").fetchall()
+            ids, pos = [list(col) for col in zip(*rows)] if rows else ([], [])
+            for op, row in ops:
+                if op == "insert":
+                    self._insert_row(ids, pos, row)
+                else:
+                    self.conn.execute("DELETE FROM sections WHERE id = ?", (ids.pop(row),))
+                    del pos[row]
+            self._add_columns({col for _, values in cells for col in values})
+            for row, values in cells:
+                names = list(values)
+                self.conn.execute(f"UPDATE sections SET {', '.join(_quote(c) + ' = ?' for c in names)} WHERE id = ?",
+                                  [_cell(values[c]) for c in names] + [ids[row]])
+                self.conn.execute("DELETE FROM results WHERE section_id = ?", (ids[row],))
+                count += len(names)
+        return count
+
+    # ====================== 3. 计算结果 ======================
+    def save_results(self, results: Dict[str, Sequence], rows: Optional[Sequence[int]] = None,
+                     source: str = "", started: Optional[datetime] = None, materials: Iterable = ()) -> int:
+        """
+        保存一次计算的结果并记录计算信息
+        :param results: {结果列名: 各行结果}（RESULT_FIELDS中的列，nan为NULL）
+        :param rows: 结果对应的行号（按行顺序从0起），None时为全部行
+        :param source: 计算来源（如"批量计算"）
+        :param started: 计算开始时间
+        :param materials: 使用的材料参数（records.MaterialSet）
+        :return: int - 计算记录id
+        """
+        ids = self._ids()
+        rows = range(len(ids)) if rows is None else rows
+        names = [f for f in RESULT_FIELDS if f in results]
+        errors = sum(1 for flag in results.get("判别", ()) if flag == "错误")
+        now = datetime.now().isoformat(timespec="seconds")
+        with self.conn:
+            run_id = self.conn.execute(
+                "INSERT INTO runs (started, finished, source, sections, errors) VALUES (?, ?, ?, ?, ?)",
+                ((started.isoformat(timespec="seconds") if started else now), now, source, len(rows), errors)
+            ).lastrowid
+            sql = (f"INSERT OR REPLACE INTO results (section_id, run_id, {', '.join(_quote(f) for f in names)}) "
+                   f"VALUES (?, ?{', ?' * len(names)})")
+            self.conn.executemany(sql, ((ids[row], run_id, *(_cell(v) for v in values))
+                                        for row, *values in zip(rows, *(results[f] for f in names))))
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO materials VALUES (?, ?, ?{', ?' * len(MATERIAL_FIELDS)})",
+                [(m.fcuk, m.fy_grade, m.fyc_grade, *(getattr(m, f) for f in MATERIAL_FIELDS)) for m in materials])
+        return run_id
+
+    def read_results(self, fields: Sequence[str] = RESULT_FIELDS) -> Dict[str, list]:
+        """
+        按行顺序读取计算结果
+        :param fields: 结果列名
+        :return: dict - {结果列名: 各行结果}，无结果的行为None，结果为NULL（计算出错）时为nan
+        """
+        n = self.count()
+        columns = {f: [None] * n for f in fields}
+        row = {section_id: i for i, section_id in enumerate(self._ids())}
+        sql = f"SELECT section_id, {', '.join(_quote(f) for f in fields)} FROM results"
+        for section_id, *values in self.conn.execute(sql):
+            i = row[section_id]
+            for f, v in zip(fields, values):
+                columns[f][i] = math.nan if v is None and f not in ("判别", "error") else v
+        return columns
+
+    def runs(self) -> List[tuple]:
+        """计算记录 [(id, 开始时间, 结束时间, 来源, 截面数, 出错数)]，按时间先后"""
+        return self.conn.execute("SELECT id, started, finished, source, sections, errors FROM runs ORDER BY id").fetchall()
+
+    # ====================== 4. Excel导入导出 ======================
+    def export_workbook(self, file_path: str, results: bool = False) -> int:
+        """
+        导出为数据文件格式的Excel（Sheet1，表头同导入的数据文件）
+        :param file_path: Excel文件路径
+        :param results: 是否附加Q-T结果列（受压区高度x、抗弯承载力Mu、抗震承载力MuE、抗力效应比R/S），
+                        截面数据中已有的同名结果列由当前计算结果替换
+        :return: int - 导出的截面数
+        """
+        from openpyxl import Workbook
+
+        columns = self.read_columns()
+        header = list(columns)
+        if results:
+            header = [col for col in header if col not in OUTPUT_COLS.values()]
+            res = self.read_results(("x", "Mu", "MuE", "R/S"))
+            for key, field, digits in (("x_col", "x", 3), ("mu_col", "Mu", 2), ("mue_col", "MuE", 2), ("rs_col", "R/S", 2)):
+                header.append(OUTPUT_COLS[key])
+                columns[OUTPUT_COLS[key]] = [None if v is None or math.isnan(v) else round(v, digits) for v in res[field]]
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Sheet1")
+        ws.append(header)
+        for row in zip(*(columns[c] for c in header)):
+            ws.append(row)
+        wb.save(file_path)
+        return self.count()
+
+
+def import_workbook(xlsx_path: str, db_path: Optional[str] = None) -> str:
+    """
+    由Excel数据文件新建项目数据库（已存在时替换其中的截面数据）
+    :param xlsx_path: 数据文件路径（读取第一个工作表的全部列，Q-T结果列除外）
+    :param db_path: 数据库路径，None时为数据文件同名.db
+    :return: str - 数据库路径
+    :raises ValueError: 缺少A-P数据列时抛出异常
+    """
+    import pandas as pd
+
+    df = pd.read_excel(xlsx_path, dtype={"截面编号": str})
+    missing = [col for col in INPUT_COLS if col not in df.columns]
+    if missing:
+        raise ValueError(f"缺少数据列：{'、'.join(missing)}")
+    # 结果列（如导出的数据文件中的Q-T列）不作为截面数据，计算结果另存于results表
+    df = df.drop(columns=[col for col in OUTPUT_COLS.values() if col in df.columns])
+    db_path = db_path or os.path.splitext(xlsx_path)[0] + PROJECT_SUFFIX
+    with ProjectDB(db_path) as db:
+        db.replace_sections({str(col): df[col].tolist() for col in df.columns})
+        with db.conn:
+            db.set_meta(source=os.path.abspath(xlsx_path), imported=datetime.now().isoformat(timespec="seconds"))
+    return db_path
@@ -0,0 +1,182 @@
+"""梁受拉钢筋排布优选模块
+依据：GB 50010-2010
+按钢筋直径表枚举每排根数×直径（最多四排），合力点as采用rebar_thickness的排高度模型；
+先用承载力曲线给出的Ast上下限剪枝，再对剩余方案批量计算承载力，按钢筋面积或造价返回前k个平法标注
+"""
+import math
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from common.exceptions import ParameterError
+from .beam_batch import material_arrays, rect_eval, t_eval
+from .beam_design import min_steel_area
+from .capacity_curve import CapacityCurve
+from .rebar_thickness import MAX_ROWS, calc_core_batch
+from ..config import GAMMA_RE
+
+# 常用纵筋直径(mm)
+BAR_DIAMETERS = (12, 14, 16, 18, 20, 22, 25, 28, 32)
+
+# 每排最少根数（两侧角筋）
+MIN_BARS_PER_ROW = 2
+
+
+class LayoutCandidate(NamedTuple):
+    """排布方案"""
+    notation: str  # 平法标注（梁底左远右近，梁顶左近右远）
+    Ast: float  # 受拉钢筋面积(mm²)
+    ast: float  # 受拉钢筋合力点至受拉边缘距离(mm)
+    Mu: float  # 抗弯承载力(kN·m)
+    ξ: float  # 相对受压区高度
+    score: float  # 评分（钢筋面积或造价，越小越优）
+
+
+def clear_spacing(d: float, position: str = "bottom") -> float:
+    """
+    同排钢筋最小净距（GB 50010-2010 第9.2.1条：梁下部≥25mm且≥d，梁上部≥30mm且≥1.5d）
+    :param d: 钢筋直径(mm)
+    :param position: 钢筋位置（top=梁顶，bottom=梁底）
+    :return: float - 最小净距(mm)
+    """
+    return max(25, d) if position == "bottom" else max(30, 1.5 * d)
+
+
+def max_bars_per_row(b: float, d: float, c=20, dv=10, position: str = "bottom") -> int:
+    """
+    一排可布置的最多根数
+    :param b: 梁宽(mm)
+    :param d: 钢筋直径(mm)
+    :param c: 保护层厚度
+    :param dv: 箍筋直径
+    :param position: 钢筋位置（top=梁顶，bottom=梁底）
+    :return: int - 最多根数
+    """
+    s = clear_spacing(d, position)
+    return max(0, int(math.floor((b - 2 * (c + dv) + s) / (d + s))))
+
+
+@lru_cache(maxsize=64)
+def layout_table(b: float, c=20, dv=10, sn=25, position: str = "bottom",
+                 diameters: Sequence[int] = BAR_DIAMETERS, max_rows: int = MAX_ROWS) -> Dict[str, np.ndarray]:
+    """
+    枚举可行排布及其几何量（按参数缓存，同宽度的梁共用）
+    每排同一直径，自靠近梁边的排向内根数不增、直径不增
+    :param b: 梁宽(mm)
+    :param c: 保护层厚度
+    :param dv: 箍筋直径
+    :param sn: 排间净距
+    :param position: 钢筋位置（top=梁顶，bottom=梁底）
+    :param diameters: 可选直径（tuple）
+    :param max_rows: 最多排数
+    :return: dict - n/d各排根数及直径(N, 4)（靠近梁边的排在前，无钢筋的排为0）、
+             Ast/ast/rows/bars数组（只读）
+    """
+    opts = [(n, d) for d in diameters for n in range(MIN_BARS_PER_ROW, max_bars_per_row(b, d, c, dv, position) + 1)]
+    if not opts:
+        raise ParameterError("梁宽不足以布置钢筋", parameter=f"b={b}")
+    opt_n, opt_d = (np.array(v, dtype=float) for v in zip(*opts))
+
+    # 逐排扩展：新排根数、直径均不大于前一排
+    levels = [(opt_n[:, None], opt_d[:, None])]
+    for _ in range(1, max_rows):
+        prev_n, prev_d = levels[-1]
+        pi, oi = np.nonzero((opt_n[None, :] <= prev_n[:, -1:]) & (opt_d[None, :] <= prev_d[:, -1:]))
+        levels.append((np.column_stack([prev_n[pi], opt_n[oi]]), np.column_stack([prev_d[pi], opt_d[oi]])))
+    n = np.vstack([np.pad(v, ((0, 0), (0, MAX_ROWS - v.shape[1]))) for v, _ in levels])
+    d = np.vstack([np.pad(v, ((0, 0), (0, MAX_ROWS - v.shape[1]))) for _, v in levels])
+    rows = (n > 0).sum(axis=1)
+
+    # 转为左远右近顺序后按排高度模型计算合力点
+    cols = np.arange(MAX_ROWS)
+    idx = np.clip(rows[:, None] - 1 - cols, 0, None)
+    A = n * math.pi * d ** 2 / 4
+    A_far = np.where(cols < rows[:, None], np.take_along_axis(A, idx, axis=1), 0.0)
+    d_far = np.where(cols < rows[:, None], np.take_along_axis(d, idx, axis=1), 0.0)
+    geo = calc_core_batch(A_far, d_far, c, dv, sn)
+
+    table = {"n": n, "d": d, "Ast": geo["At"], "ast": geo["xc"], "rows": rows, "bars": n.sum(axis=1)}
+    for v in table.values():
+        v.flags.writeable = False
+    return table
+
+
+def layout_notation(n_row: Sequence[float], d_row: Sequence[float], position: str = "bottom") -> str:
+    """
+    排布方案的平法标注（可由parse_rows解析）
+    :param n_row: 各排根数（靠近梁边的排在前，0为无钢筋）
+    :param d_row: 各排直径
+    :param position: 钢筋位置（梁底标注左远右近，梁顶标注左近右远）
+    :return: str - 如"2d20/4d25"
+    """
+    rows = [f"{int(n)}d{int(d)}" for n, d in zip(n_row, d_row) if n > 0]
+    return "/".join(rows[::-1] if position == "bottom" else rows)
+
+
+def optimize_layout(b: float, h: float, fcuk: float, fy_grade: str, fyc_grade: str, M: float,
+                    Asc: float, asc: float, γ0: float, is_seismic=0,
+                    bf: Optional[float] = None, hf: Optional[float] = None,
+                    c=20, dv=10, sn=25, position: str = "bottom",
+                    diameters: Sequence[int] = BAR_DIAMETERS, max_rows: int = MAX_ROWS,
+                    cost: Optional[Dict[int, float]] = None, top_k: int = 5) -> List[LayoutCandidate]:
+    """
+    受拉钢筋排布优选
+    :param b: 腹板宽度(mm)
+    :param h: 梁总高度(mm)
+    :param fcuk: 混凝土立方体抗压强度等级值
+    :param fy_grade: 受拉钢筋强度等级
+    :param fyc_grade: 受压钢筋强度等级
+    :param M: 弯矩设计值(kN·m)
+    :param Asc: 受压钢筋面积(mm²)
+    :param asc: 受压钢筋合力点至受压边缘距离(mm)
+    :param γ0: 结构重要性系数
+    :param is_seismic: 是否地震作用组合（1=是，要求Mu/γRE ≥ M）
+    :param bf: 翼缘宽度(mm)，None为矩形截面
+    :param hf: 翼缘高度(mm)
+    :param c: 保护层厚度
+    :param dv: 箍筋直径
+    :param sn: 排间净距
+    :param position: 受拉钢筋位置（top=梁顶，bottom=梁底）
+    :param diameters: 可选直径
+    :param max_rows: 最多排数
+    :param cost: 各直径单根钢筋造价（同一长度，相对值即可），None时按钢筋面积评分
+    :param top_k: 返回方案数
+    :return: list - 满足承载力、不超筋且不小于最小配筋面积的方案，按评分、排数、根数升序
+    """
+    table = layout_table(b, c, dv, sn, position, tuple(diameters), max_rows)
+    target = M * (GAMMA_RE if is_seismic == 1 else 1)
+
+    # ========== 1. 按承载力曲线剪枝 ==========
+    # as最小时（一排最细钢筋）h0最大：所需Ast的下限及不超筋的Ast上限
+    ast_lo = float(table["ast"].min())
+    curve = CapacityCurve(b, h, fcuk, fy_grade, fyc_grade, ast_lo, Asc, asc, γ0, bf=bf, hf=hf)
+    mat = material_arrays(fcuk, fy_grade, fyc_grade)
+    Ast_lo = max(float(curve.ast(target)), min_steel_area(b, h, mat["ft"][0], mat["fy"][0]))
+    keep = np.flatnonzero((table["Ast"] >= Ast_lo) & (table["Ast"] <= curve.ast_max))
+    if not len(keep):
+        return []
+
+    # ========== 2. 剩余方案批量计算承载力 ==========
+    Ast, ast = table["Ast"][keep], table["ast"][keep]
+    mat = {k: np.broadcast_to(v, Ast.shape) for k, v in mat.items()}
+    b_, h_, Asc_, asc_, γ0_ = (np.full(Ast.shape, float(v)) for v in (b, h, Asc, asc, γ0))
+    if bf is None:
+        res = rect_eval(b_, h_, mat, Ast, ast, Asc_, asc_, γ0_)
+    else:
+        res = t_eval(b_, h_, np.full(Ast.shape, float(bf)), np.full(Ast.shape, float(hf)), mat, Ast, ast,
+                     Asc_, asc_, γ0_)
+    ok = res["valid"] & (res["Mu"] >= target) & (res["x"] <= res["xb"])
+    keep, res = keep[ok], {k: v[ok] for k, v in res.items()}
+
+    # ========== 3. 评分排序 ==========
+    if cost is None:
+        score = table["Ast"][keep]
+    else:
+        price = np.vectorize(lambda d: cost.get(int(d), np.inf) if d > 0 else 0.0, otypes=[float])
+        score = (table["n"][keep] * price(table["d"][keep])).sum(axis=1)
+    order = np.lexsort((table["bars"][keep], table["rows"][keep], score))[:top_k]
+    return [LayoutCandidate(layout_notation(table["n"][keep[i]], table["d"][keep[i]], position),
+                            round(float(table["Ast"][keep[i]]), 1), round(float(table["ast"][keep[i]]), 2),
+                            round(float(res["Mu"][i]), 1), round(float(res["ξ"][i]), 4), round(float(score[i]), 1))
+            for i in order]
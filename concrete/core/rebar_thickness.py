@@ -1,108 +1,287 @@
 import re
 import math
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional, Tuple
 
 # 极简变量名：n(根数), d(直径), c(保护层), dv(箍筋直径), sn(排间净距)
 # At(总面积), xc(合力中心), rc(各排中心高度), π(圆周率)
 π = math.pi
 
+# 每侧最多排数（calc_core最多支持四排）
+MAX_ROWS = 4
+
+
+# ---------------------- 平法标注记录 ----------------------
+class RebarGroup(NamedTuple):
+    """同一排中同直径的一组钢筋"""
+    n: int                   # 根数
+    d: int                   # 直径(mm)
+    cut: int = 0             # 不伸入支座的根数，如2d25(-2)
+    erection: bool = False   # 是否为架立筋，如(2d12)，不计入受力钢筋
+
+    @property
+    def area(self) -> float:
+        """受力钢筋面积(mm²)，架立筋为0"""
+        return 0.0 if self.erection else self.n * π * (self.d / 2) ** 2
+
+    @property
+    def text(self) -> str:
+        """还原为平法标注文本"""
+        s = f"{self.n}d{self.d}" + (f"(-{self.cut})" if self.cut else "")
+        return f"({s})" if self.erection else s
+
+
+class RebarRow(NamedTuple):
+    """一排钢筋（可含多种直径）"""
+    groups: Tuple[RebarGroup, ...]
+
+    @property
+    def n(self) -> int:
+        """受力钢筋根数"""
+        return sum(g.n for g in self.groups if not g.erection)
+
+    @property
+    def d(self) -> int:
+        """本排受力钢筋最大直径(mm)，用于确定排中心高度"""
+        return max(g.d for g in self.groups if not g.erection)
+
+    @property
+    def cut(self) -> int:
+        """不伸入支座的根数"""
+        return sum(g.cut for g in self.groups if not g.erection)
+
+    @property
+    def area(self) -> float:
+        """受力钢筋面积(mm²)"""
+        return sum(g.area for g in self.groups)
+
+    @property
+    def text(self) -> str:
+        """还原为平法标注文本"""
+        return "+".join(g.text for g in self.groups)
+
 
 # ---------------------- 梁顶钢筋顺序反转模块 ----------------------
 def reverse_top_rebar(r):
     """
     梁顶钢筋顺序反转函数（梁顶标注左近右远→反转为左远右近，匹配梁底计算逻辑）
-    :param r: 原平法标注排配置列表（parse_flat输出）
+    :param r: 原平法标注排配置列表（parse_flat/parse_rows输出）
     :return: 反转后的排配置列表
     """
     return r[::-1]
 
 
 # ---------------------- 平法标注解析模块 ----------------------
-def parse_flat(r_str):
-    """解析平法标注，返回排配置列表（平法原始顺序，最多四排）"""
-    r = []
-    if "/" in r_str and " " not in r_str:
-        for s in r_str.split("/")[:4]:
-            g = re.findall(r"(\d+)d(\d+)", s)
-            if g:
-                n, d = int(g[0][0]), int(g[0][1])
-                r.append((n, d))
-    elif " " in r_str:
-        s1, s2 = r_str.strip().split(maxsplit=1)
-        g = re.findall(r"(\d+)d(\d+)", s1)
-        if g:
-            tn, d = int(g[0][0]), int(g[0][1])
-            for n in list(map(int, s2.split("/")))[:4]:
-                r.append((n, d))
+# 钢筋直径符号：d（程序约定），兼容C、Φ输入
+_GROUP_RE = re.compile(r"(\d+)[dDCcΦφ](\d+)(?:\(-(\d+)\))?")
+_ERECTION_RE = re.compile(r"\((\d+)[dDCcΦφ](\d+)\)")
+_COUNT_RE = re.compile(r"(\d+)(?:\(-(\d+)\))?")
+_SPACE_RE = re.compile(r"\s+")
+# 全角符号转半角
+_FULL_WIDTH = str.maketrans({"＋": "+", "／": "/", "（": "(", "）": ")", "－": "-", "　": " "})
+
+
+def _parse_group(s: str, r_str: str) -> RebarGroup:
+    """解析单组钢筋，如2d25、2d25(-2)、(2d12)"""
+    m = _ERECTION_RE.fullmatch(s)
+    if m:
+        return RebarGroup(int(m.group(1)), int(m.group(2)), 0, True)
+    m = _GROUP_RE.fullmatch(s)
+    if not m:
+        raise ValueError(f"无法解析平法标注：{r_str}（无法识别“{s}”）")
+    n, d, cut = int(m.group(1)), int(m.group(2)), int(m.group(3) or 0)
+    if n <= 0 or d <= 0 or cut > n:
+        raise ValueError(f"平法标注数值无效：{r_str}（“{s}”）")
+    return RebarGroup(n, d, cut)
+
+
+@lru_cache(maxsize=8192)
+def parse_rows(r_str: str) -> Tuple[RebarRow, ...]:
+    """
+    解析平法标注（按原始标注字符串缓存），返回排记录（平法原始顺序，最多四排）
+    支持格式：
+      1. 斜杠分隔多排，排内加号连接不同直径：4d20/4d25、2d25+2d22/4d25、2d25+3d22(-3)/5d25
+      2. 总根数+各排根数：9d25 3/3/3、6d25 2(-2)/4（括号内为不伸入支座根数）
+      3. 单排：6d22、4d20+2d18、2d25+(2d12)（括号内为架立筋）
+    :param r_str: 平法标注
+    :return: tuple - 排记录RebarRow
+    :raises ValueError: 标注无法完整解析、各排根数之和与总根数不符或超过四排时抛出异常
+    """
+    s = _SPACE_RE.sub(" ", r_str.translate(_FULL_WIDTH)).strip()
+    s = s.replace(" /", "/").replace("/ ", "/").replace(" +", "+").replace("+ ", "+")
+    if not s:
+        raise ValueError("平法标注为空")
+
+    if " " in s:
+        # 总根数+各排根数
+        head, tail = s.split(" ", 1)
+        total = _parse_group(head, r_str)
+        if total.cut or total.erection:
+            raise ValueError(f"无法解析平法标注：{r_str}")
+        rows = []
+        for part in tail.split("/"):
+            m = _COUNT_RE.fullmatch(part)
+            if not m:
+                raise ValueError(f"无法解析平法标注：{r_str}（无法识别“{part}”）")
+            n, cut = int(m.group(1)), int(m.group(2) or 0)
+            if n <= 0 or cut > n:
+                raise ValueError(f"平法标注数值无效：{r_str}（“{part}”）")
+            rows.append(RebarRow((RebarGroup(n, total.d, cut),)))
+        if sum(row.n for row in rows) != total.n:
+            raise ValueError(f"各排根数之和与总根数不符：{r_str}")
     else:
-        g = re.findall(r"(\d+)d(\d+)", r_str)
-        if g:
-            tn = sum(int(n) for n, d in g)
-            md = max(int(d) for n, d in g)
-            r.append((tn, md))
-    return r[:4]
+        rows = [RebarRow(tuple(_parse_group(g, r_str) for g in part.split("+"))) for part in s.split("/")]
+
+    if len(rows) > MAX_ROWS:
+        raise ValueError(f"平法标注超过{MAX_ROWS}排：{r_str}")
+    if any(row.n == 0 for row in rows):
+        raise ValueError(f"平法标注存在无受力钢筋的排：{r_str}")
+    return tuple(rows)
+
+
+def parse_many(r_strs: Iterable[str], strict: bool = True) -> List[Optional[Tuple[RebarRow, ...]]]:
+    """
+    批量解析一列平法标注（重复标注只解析一次）
+    :param r_strs: 平法标注序列
+    :param strict: True时遇到无法解析的标注抛出异常，False时该项返回None（空值也返回None）
+    :return: list - 与输入等长的排记录列表
+    """
+    parsed = {}
+    result = []
+    for r_str in r_strs:
+        if r_str not in parsed:
+            try:
+                parsed[r_str] = parse_rows(r_str)
+            except (ValueError, TypeError, AttributeError):
+                if strict:
+                    raise
+                parsed[r_str] = None
+        result.append(parsed[r_str])
+    return result
+
+
+def parse_flat(r_str):
+    """
+    解析平法标注，返回排配置列表（平法原始顺序，最多四排）
+    兼容旧接口：每排为(根数, 最大直径)，混合直径的精确面积请使用parse_rows
+    """
+    return [(row.n, row.d) for row in parse_rows(r_str)]
+
+
+def _row_nd_area(row):
+    """排配置统一为(根数, 最大直径, 面积)，兼容(n, d)元组与RebarRow记录"""
+    if isinstance(row, RebarRow):
+        return row.n, row.d, row.area
+    n, d = row
+    return n, d, n * π * (d / 2) ** 2
+
+
+def _row_text(row):
+    """排配置的平法文本"""
+    if isinstance(row, RebarRow):
+        return row.text
+    n, d = row
+    return f"{n}d{d}"
 
 
 # ---------------------- 核心计算模块（左远右近逻辑） ----------------------
+def calc_rows(r, c=20, dv=10, sn=25):
+    """
+    数值核心（不生成说明文字，不取整）：各排中心高度、面积及合力中心
+    高度从靠近梁边的排（标注最右）起算：rc = c + dv + d/2，其后每排累加 d前/2 + sn + d/2
+    :param r: 排配置列表（左远右近，parse_flat/parse_rows输出或reverse_top_rebar反转后）
+    :param c: 保护层厚度
+    :param dv: 箍筋直径
+    :param sn: 排间净距
+    :return: tuple - (At总面积, xc合力中心, 各排中心高度tuple, 各排面积tuple)，后两者按原始标注顺序
+    """
+    rows = [_row_nd_area(row) for row in r]
+    rc = []
+    prev_top = c + dv
+    for _, d, _ in reversed(rows):
+        rc.append(prev_top + d / 2)
+        prev_top += d + sn
+    rc.reverse()
+    areas = tuple(area for _, _, area in rows)
+    At = sum(areas)
+    xc = sum(a * h for a, h in zip(areas, rc)) / At
+    return At, xc, tuple(rc), areas
+
+
+def rows_to_arrays(layouts):
+    """
+    将多组排配置整理为补零的二维数组（最多四排，按原始标注顺序左对齐）
+    :param layouts: 排配置列表的序列（parse_many输出等）
+    :return: tuple - (面积数组(N, 4), 直径数组(N, 4))
+    """
+    import numpy as np
+
+    A = np.zeros((len(layouts), MAX_ROWS))
+    D = np.zeros((len(layouts), MAX_ROWS))
+    for i, r in enumerate(layouts):
+        for j, (_, d, area) in enumerate(_row_nd_area(row) for row in r):
+            A[i, j] = area
+            D[i, j] = d
+    return A, D
+
+
+def calc_core_batch(A, D, c=20, dv=10, sn=25):
+    """
+    向量化数值核心：多组排配置一次计算
+    :param A: 各排面积(N, 4)，按原始标注顺序（左远右近）左对齐，无钢筋的排为0
+    :param D: 各排（最大）直径(N, 4)，与A对应
+    :param c: 保护层厚度（标量或(N,)数组）
+    :param dv: 箍筋直径（标量或(N,)数组）
+    :param sn: 排间净距（标量或(N,)数组）
+    :return: dict - At(N,)/xc(N,)/rc(N, 4)各排中心高度（无钢筋的排为nan）/k(N,)排数
+    """
+    import numpy as np
+
+    A = np.asarray(A, dtype=float)
+    D = np.asarray(D, dtype=float)
+    k = (A > 0).sum(axis=1)
+    cols = np.arange(A.shape[1])
+    # 转为计算顺序（靠近梁边的排在前）：计算第j排对应原始标注第k-1-j排
+    idx = np.clip(k[:, None] - 1 - cols, 0, None)
+    exists = cols < k[:, None]
+    d_calc = np.where(exists, np.take_along_axis(D, idx, axis=1), 0.0)
+    # rc_j = c + dv + Σ(m<j)d_m + d_j/2 + j·sn
+    base = (np.asarray(c, dtype=float) + np.asarray(dv, dtype=float))[..., None]
+    rc_calc = base + np.cumsum(d_calc, axis=1) - d_calc / 2 + cols * np.asarray(sn, dtype=float)[..., None]
+    # 还原为原始标注顺序
+    rc = np.where(exists, np.take_along_axis(rc_calc, idx, axis=1), np.nan)
+    At = A.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        xc = np.where(exists, A * rc, 0.0).sum(axis=1) / At
+    return {"At": At, "xc": xc, "rc": rc, "k": k}
+
+
 def calc_core(r, c=20, dv=10, sn=25):
     """
     核心计算模块（梁底标注左远右近；梁顶反序后也为左远右近）
-    :param r: 排配置列表（parse_flat输出或reverse_top_rebar反转后）
+    计算书所需的高度计算过程文字由generate_calc_book按需生成；
+    仅需数值结果时请使用calc_rows/calc_core_batch
+    :param r: 排配置列表（parse_flat/parse_rows输出或reverse_top_rebar反转后）
     :param c: 保护层厚度
     :param dv: 箍筋直径
     :param sn: 排间净距
-    :return: 计算结果字典
+    :return: 计算结果字典（A_list为各排面积；A{i}_fmt键为兼容旧调用保留）
     """
     k = len(r)
-    # 反转排序列表：将左远右近转为计算用的左近右远（方便从靠近梁边开始计算高度）
-    r_calc = r[::-1]
-    n1, d1 = r_calc[0] if k >= 1 else (0, 0)
-    n2, d2 = r_calc[1] if k >= 2 else (0, 0)
-    n3, d3 = r_calc[2] if k >= 3 else (0, 0)
-    n4, d4 = r_calc[3] if k >= 4 else (0, 0)
+    At, _, rc_list, areas = calc_rows(r, c, dv, sn)
 
     # 精度控制：面积1位，距离2位
     prec_A = 1
     prec_x = 2
 
-    # 逐排计算中心高度：从靠近梁边（第1排）到最远（第k排）
-    rc_list = [0.0] * k
-    height_calc = []
-    if k >= 1:
-        rc_list[0] = c + dv + d1 / 2
-        height_calc.append(f"距离梁边第1排（靠近梁边）：c + dv + d/2 = {c} + {dv} + {d1}/2 = {rc_list[0]:.2f}mm")
-    if k >= 2:
-        rc_list[1] = rc_list[0] + d1 / 2 + sn + d2 / 2
-        height_calc.append(
-            f"距离梁边第2排：距离梁边第1排中心 + d1/2 + sn + d2/2 = {rc_list[0]:.2f} + {d1}/2 + {sn} + {d2}/2 = {rc_list[1]:.2f}mm")
-    if k >= 3:
-        rc_list[2] = rc_list[1] + d2 / 2 + sn + d3 / 2
-        height_calc.append(
-            f"距离梁边第3排：距离梁边第2排中心 + d2/2 + sn + d3/2 = {rc_list[1]:.2f} + {d2}/2 + {sn} + {d3}/2 = {rc_list[2]:.2f}mm")
-    if k >= 4:
-        rc_list[3] = rc_list[2] + d3 / 2 + sn + d4 / 2
-        height_calc.append(
-            f"距离梁边第4排（最远）：距离梁边第3排中心 + d3/2 + sn + d4/2 = {rc_list[2]:.2f} + {d3}/2 + {sn} + {d4}/2 = {rc_list[3]:.2f}mm")
-
-    # 反转高度列表：匹配原始标注的左远右近顺序（r[0]对应最远，高度最大）
-    rc_list_original = rc_list[::-1]
     # 计算面积：按原始标注顺序（左远右近）
-    area_list = []
-    for i in range(k):
-        n, d = r[i]
-        area = n * π * (d / 2) ** 2
-        area_list.append(round(area, prec_A))
-    At = sum([n * π * (d / 2) ** 2 for n, d in r])
+    area_list = [round(area, prec_A) for area in areas]
     At_fmt = round(At, prec_A)
 
     # 合力中心计算：按原始标注顺序的面积和对应高度加权平均
-    xc = sum(area_list[i] * rc_list_original[i] for i in range(k)) / At
+    xc = sum(area_list[i] * rc_list[i] for i in range(k)) / At
     xc_fmt = round(xc, prec_x)
 
-    # 整理输出用的面积格式（按原始标注顺序）
-    A_fmt = {}
-    for i in range(k):
-        A_fmt[f"A{i + 1}_fmt"] = area_list[i]
-
     # 返回结果：包含原始标注顺序的高度、面积
     return {
         "r": r,
@@ -110,14 +289,53 @@ def calc_core(r, c=20, dv=10, sn=25):
         "c": c,
         "dv": dv,
         "sn": sn,
-        "rc_list": rc_list_original,  # 原始标注顺序（左远右近）的高度列表
+        "rc_list": list(rc_list),  # 原始标注顺序（左远右近）的高度列表
         "At_fmt": At_fmt,
         "xc_fmt": xc_fmt,
-        "height_calc": height_calc,
-        **A_fmt
+        "A_list": area_list,
+        **{f"A{i + 1}_fmt": area_list[i] for i in range(k)}
     }
 
 
+@lru_cache(maxsize=8192)
+def rebar_centroid(r_str: str, pos: str = "bottom", c=20, dv=10, sn=25) -> Tuple[float, float]:
+    """
+    由平法标注计算钢筋总面积及合力点至梁边距离（按标注及参数缓存，批量计算时相同配筋只计算一次）
+    :param r_str: 平法标注字符串
+    :param pos: 钢筋位置（top=梁顶，bottom=梁底）
+    :param c: 保护层厚度
+    :param dv: 箍筋直径
+    :param sn: 排间净距
+    :return: tuple - (At总面积, xc合力中心)，精度同calc_core
+    :raises ValueError: 标注无法解析
+    """
+    r = parse_rows(r_str)
+    res = calc_core(reverse_top_rebar(r) if pos == "top" else r, c, dv, sn)
+    return res["At_fmt"], res["xc_fmt"]
+
+
+def explain_heights(res):
+    """
+    生成各排中心高度计算过程文字（仅在输出计算书时调用）
+    :param res: calc_core输出的计算结果字典
+    :return: list - 从靠近梁边到最远的计算过程
+    """
+    k, c, dv, sn = res["k"], res["c"], res["dv"], res["sn"]
+    # 计算顺序：靠近梁边的排在前
+    d_calc = [_row_nd_area(row)[1] for row in res["r"]][::-1]
+    rc_calc = res["rc_list"][::-1]
+    lines = []
+    for j in range(k):
+        if j == 0:
+            lines.append(f"距离梁边第1排（靠近梁边）：c + dv + d/2 = {c} + {dv} + {d_calc[0]}/2 = {rc_calc[0]:.2f}mm")
+            continue
+        note = "（最远）" if j == 3 else ""
+        lines.append(
+            f"距离梁边第{j + 1}排{note}：距离梁边第{j}排中心 + d{j}/2 + sn + d{j + 1}/2 = "
+            f"{rc_calc[j - 1]:.2f} + {d_calc[j - 1]}/2 + {sn} + {d_calc[j]}/2 = {rc_calc[j]:.2f}mm")
+    return lines
+
+
 # ---------------------- 计算书生成模块（统一无判断） ----------------------
 def generate_calc_book(res, r_str):
     """
@@ -126,7 +344,7 @@ def generate_calc_book(res, r_str):
     :param r_str: 原始平法标注
     :return: 无（直接打印计算书）
     """
-    calc_config = " / ".join([f"{n}d{d}" for n, d in res['r']])
+    calc_config = " / ".join([_row_text(row) for row in res['r']])
     print(f"=== 钢筋保护层与合力中心计算书 ===")
     print(f"原始标注：{r_str}")
     print(f"计算用配置：{calc_config}（左远右近）")
@@ -136,24 +354,21 @@ def generate_calc_book(res, r_str):
 
     print("\n【步骤1：各排中心高度计算】")
     print("高度计算过程（从靠近梁边到最远）：")
-    for line in res["height_calc"]:
+    for line in explain_heights(res):
         print(f"  {line}")
     print("各排中心高度结果（匹配标注左远右近，单位：mm）：")
     for i in range(res["k"]):
-        n, d = res['r'][i]
         pos_note = "（最远）" if i == 0 else "（靠近梁边）" if i == res['k'] - 1 else ""
-        print(f"  标注第{i + 1}排（{n}d{d}）{pos_note}：{res['rc_list'][i]:.2f}")
+        print(f"  标注第{i + 1}排（{_row_text(res['r'][i])}）{pos_note}：{res['rc_list'][i]:.2f}")
 
     print("\n【步骤2：各排钢筋面积计算（单位：mm²）】")
     for i in range(res["k"]):
-        n, d = res['r'][i]
-        area_key = f"A{i + 1}_fmt"
-        print(f"  标注第{i + 1}排（{n}d{d}）：{res[area_key]}")
+        print(f"  标注第{i + 1}排（{_row_text(res['r'][i])}）：{res['A_list'][i]}")
     print(f"总面积：{res['At_fmt']}")
 
     print("\n【步骤3：合力中心计算】")
     if res["k"] >= 2:
-        calc_detail = " + ".join([f"{res[f'A{i + 1}_fmt']}×{res['rc_list'][i]:.2f}" for i in range(res["k"])])
+        calc_detail = " + ".join([f"{res['A_list'][i]}×{res['rc_list'][i]:.2f}" for i in range(res["k"])])
         print(f"合力中心计算式：xc=({calc_detail})/{res['At_fmt']}")
     print(f"合力中心位置：距离梁边 {res['xc_fmt']:.2f}mm")
     print("=== 计算结束 ===\n")
@@ -164,9 +379,9 @@ def user_interact():
     """用户交互模块（主入口，仅用于判断是否反序）"""
     print("=== 钢筋保护层与合力中心计算程序 ===")
     print("支持平法标注格式：")
-    print("1. 斜杠分隔多排：如4d20/4d25、2d18/3d20/2d22/2d25")
-    print("2. 排数标注：如9d25 3/3/3、10d25 2/3/5")
-    print("3. 单排：如6d22、4d20+2d18")
+    print("1. 斜杠分隔多排：如4d20/4d25、2d18/3d20/2d22/2d25、2d25+2d22/4d25")
+    print("2. 排数标注：如9d25 3/3/3、10d25 2/3/5、6d25 2(-2)/4")
+    print("3. 单排：如6d22、4d20+2d18、2d25+(2d12)")
     print("================================\n")
     r_str = input("请输入平法标注：")
     rebar_pos = input("请输入钢筋位置（top=梁顶，bottom=梁底，默认bottom）：") or "bottom"
@@ -175,7 +390,7 @@ def user_interact():
     sn = int(input("请输入排间净距（默认25mm）：") or 25)
 
     # 解析标注并处理梁顶反序
-    r = parse_flat(r_str)
+    r = parse_rows(r_str)
     if rebar_pos == "top":
         r_calc = reverse_top_rebar(r)
     else:
@@ -0,0 +1,146 @@
+"""截面输入、材料参数及计算结果记录
+以__slots__冻结数据类代替calc_params列表、结果tuple及参数字典，每个截面只占一组定长槽位；
+SectionInput支持item["calc_params"]、item.get("error")等字典式读取，原有按字典/tuple处理的函数可直接使用
+"""
+import dataclasses
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Optional, Sequence, Tuple
+
+from common.exceptions import MaterialError
+from .beam_rect_fc import get_material_params
+
+# 计算参数列表calc_params的参数名（与prepare_calculation_data构造顺序一致，SectionInput字段按此顺序排列）
+PARAM_KEYS = ("b", "h", "bf", "hf", "fcuk", "fy_grade", "fyc_grade", "Ast", "ast", "Asc", "asc", "γ0", "bft", "hft")
+
+
+@dataclass(frozen=True, slots=True)
+class MaterialSet:
+    """材料参数（同一材料组合共用一个实例，由material_set获取）"""
+    fcuk: float  # 混凝土立方体抗压强度等级值
+    fy_grade: str  # 受拉钢筋强度等级
+    fyc_grade: str  # 受压钢筋强度等级
+    fc: float
+    ft: float
+    Ec: float
+    α1: float
+    β1: float
+    fy: float
+    Es: float
+    ξb: float
+    fyc: float
+
+    def as_tuple(self) -> Tuple[Tuple[float, float, float, float, float], Tuple[float, float, float], float]:
+        """转为get_material_params的返回格式"""
+        return (self.fc, self.ft, self.Ec, self.α1, self.β1), (self.fy, self.Es, self.ξb), self.fyc
+
+
+@lru_cache(maxsize=256)
+def material_set(fcuk: float, fy_grade: str, fyc_grade: str) -> MaterialSet:
+    """
+    获取材料参数（按材料组合缓存）
+    :raises MaterialError: 材料等级无效时抛出异常（信息同逐截面计算函数）
+    """
+    try:
+        (fc, ft, Ec, α1, β1), (fy, Es, ξb), fyc = get_material_params(fcuk, fy_grade, fyc_grade)
+    except Exception as e:
+        raise MaterialError(f"获取材料参数失败: {str(e)}", parameter=f"fcuk={fcuk}, fy_grade={fy_grade}, fyc_grade={fyc_grade}")
+    return MaterialSet(fcuk, fy_grade, fyc_grade, fc, ft, Ec, α1, β1, fy, Es, ξb, fyc)
+
+
+@dataclass(frozen=True, slots=True)
+class SectionInput:
+    """截面计算输入（prepare_calculation_data的输出项）"""
+    sec_num: Any  # 截面编号
+    sec_type: str  # 截面类型
+    b: float
+    h: float
+    bf: float
+    hf: float
+    fcuk: float
+    fy_grade: str
+    fyc_grade: str
+    Ast: float
+    ast: float
+    Asc: float
+    asc: float
+    γ0: float
+    bft: float = 0
+    hft: float = 0
+    M: float = 0  # 弯矩设计值(kN·m)
+    is_seismic: int = 0  # 是否地震作用组合
+    error: Optional[str] = None  # 读取阶段的错误（如钢筋标注错误），有错误时不计算
+
+    @classmethod
+    def from_item(cls, item: dict) -> "SectionInput":
+        """由计算参数字典（sec_num/sec_type/M/is_seismic/calc_params/error）生成"""
+        return cls(item["sec_num"], item["sec_type"], *item["calc_params"], **{
+            k: item[k] for k in ("M", "is_seismic", "error") if k in item})
+
+    def to_item(self) -> dict:
+        """转为计算参数字典"""
+        item = {"sec_num": self.sec_num, "sec_type": self.sec_type, "M": self.M, "is_seismic": self.is_seismic,
+                "γ0": self.γ0, "calc_params": self.calc_params}
+        if self.error:
+            item["error"] = self.error
+        return item
+
+    @property
+    def calc_params(self) -> list:
+        """计算参数列表（顺序同PARAM_KEYS）"""
+        return [getattr(self, k) for k in PARAM_KEYS]
+
+    @property
+    def materials(self) -> MaterialSet:
+        """材料参数（相同材料组合的截面共用）"""
+        return material_set(self.fcuk, self.fy_grade, self.fyc_grade)
+
+    def args(self, keys: Sequence[str]) -> list:
+        """按参数名取计算函数参数"""
+        return [getattr(self, k) for k in keys]
+
+    def replace(self, **changes) -> "SectionInput":
+        """返回修改部分字段后的新记录"""
+        return dataclasses.replace(self, **changes)
+
+    # 字典式读取，兼容按计算参数字典处理的函数
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    def __contains__(self, key: str) -> bool:
+        return hasattr(self, key)
+
+
+@dataclass(frozen=True, slots=True)
+class FlexureResult:
+    """抗弯承载力计算结果"""
+    x: float  # 受压区高度(mm)
+    xb: float  # 界限受压区高度(mm)
+    ξ: float
+    ξb: float
+    Mu: float  # 抗弯承载力(kN·m)
+    σs: float
+    σsc: float
+    check: str  # 轴力平衡校验文字
+    flag: Optional[str] = None  # 截面类型判别或受压区位置（矩形截面为None）
+
+    @classmethod
+    def from_tuple(cls, result: Sequence, result_keys: Sequence[str]) -> "FlexureResult":
+        """由计算函数返回的tuple生成（result_keys为各项结果名，如SectionType.result_keys）"""
+        return cls(**dict(zip(result_keys, result)))
+
+    def to_tuple(self, result_keys: Sequence[str]) -> tuple:
+        """转为计算函数返回的tuple格式"""
+        return tuple(getattr(self, k) for k in result_keys)
+
+
+def section_inputs(items: Sequence[dict]) -> list:
+    """计算参数字典列表转为SectionInput列表"""
+    return [SectionInput.from_item(item) for item in items]
+
@@ -1,34 +1,41 @@
 from . import rebar, concrete
+from .records import FlexureResult
 
 class BeamReportBase:
-    def __init__(self, num, param, result):
+    def __init__(self, num, param, result, materials=None):
         self.num = num
         self.param = param
         self.result = result
+        self.materials = materials
         self._parse_params()
         
     def _parse_params(self):
-        """解析公共参数"""
-        # 解析混凝土参数
+        """解析公共参数（有材料参数记录时直接取用，否则按强度等级查表）"""
         self.fcuk = self._get_param('fcuk')
-        conc = concrete.get_params(self.fcuk)
-        self.fc = conc["fc"]
-        self.ft = conc["ft"]
-        self.Ec = conc["Ec"]
-        self.α1 = conc["α1"]
-        self.β1 = conc["β1"]
-        self.εcu = 0.0033
-        
-        # 解析钢筋参数
         self.fy_grade = self._get_param('fy_grade')
-        rt = rebar.get_params(self.fy_grade)
-        self.fy = rt["fy"]
-        self.Es = rt["Es"]
-        self.ξb = rt["ξb"]
-        
         self.fyc_grade = self._get_param('fyc_grade')
-        rc = rebar.get_params(self.fyc_grade)
-        self.fyc = rc["fy"]
+        self.εcu = 0.0033
+        if self.materials is not None:
+            m = self.materials
+            self.fc, self.ft, self.Ec, self.α1, self.β1 = m.fc, m.ft, m.Ec, m.α1, m.β1
+            self.fy, self.Es, self.ξb, self.fyc = m.fy, m.Es, m.ξb, m.fyc
+        else:
+            # 解析混凝土参数
+            conc = concrete.get_params(self.fcuk)
+            self.fc = conc["fc"]
+            self.ft = conc["ft"]
+            self.Ec = conc["Ec"]
+            self.α1 = conc["α1"]
+            self.β1 = conc["β1"]
+
+            # 解析钢筋参数
+            rt = rebar.get_params(self.fy_grade)
+            self.fy = rt["fy"]
+            self.Es = rt["Es"]
+            self.ξb = rt["ξb"]
+
+            rc = rebar.get_params(self.fyc_grade)
+            self.fyc = rc["fy"]
         
         self.Ast = self._get_param('Ast')
         self.ast = self._get_param('ast')
@@ -45,13 +52,20 @@ class BeamReportBase:
         self.σsc = self._get_result('σsc')
         self.check = self._get_result('check')
     
+    def _set_record(self, result, M, rs_ratio):
+        """由计算结果记录（FlexureResult）取结果"""
+        self.flag = result.flag
+        self.x, self.xb, self.ξ, self.ξb_val = result.x, result.xb, result.ξ, result.ξb
+        self.Mu, self.σs, self.σsc, self.check = result.Mu, result.σs, result.σsc, result.check
+        self.M, self.rs_ratio = M, rs_ratio
+
     def _get_param(self, param_name):
-        """根据参数名获取参数值，子类需要实现"""
-        raise NotImplementedError("子类必须实现_get_param方法")
+        """根据参数名获取参数值（子类在__init__中将参数解包为同名属性）"""
+        return getattr(self, param_name)
     
     def _get_result(self, result_name):
-        """根据结果名获取结果值，子类需要实现"""
-        raise NotImplementedError("子类必须实现_get_result方法")
+        """根据结果名获取结果值（子类在__init__中将结果解包为同名属性）"""
+        return getattr(self, result_name)
     
     def _get_title(self):
         """获取报告标题，子类需要实现"""
@@ -77,12 +91,14 @@ class BeamReportBase:
 """
 
 class RectBeamReport(BeamReportBase):
-    def __init__(self, num, param, result, is_seismic=0):
+    def __init__(self, num, param, result, is_seismic=0, M=0, rs_ratio=0, materials=None):
         self.b, self.h, self.fcuk, self.fy_grade, self.fyc_grade, \
         self.Ast, self.ast, self.Asc, self.asc, self.γ0 = param
         
-        # 从扩展结果中获取M和rs_ratio
-        if len(result) > 8:
+        # 结果记录另传M和rs_ratio；结果tuple可在末尾扩展M和rs_ratio
+        if isinstance(result, FlexureResult):
+            self._set_record(result, M, rs_ratio)
+        elif len(result) > 8:
             self.x, self.xb, self.ξ, self.ξb_val, self.Mu, self.σs, self.σsc, self.check, \
             self.M, self.rs_ratio = result
         else:
@@ -93,34 +109,7 @@ class RectBeamReport(BeamReportBase):
         # 新增：是否地震作用组合
         self.is_seismic = is_seismic
         
-        super().__init__(num, param, result)
-    
-    def _get_param(self, param_name):
-        """根据参数名获取矩形截面参数"""
-        param_map = {
-            'fcuk': self.fcuk,
-            'fy_grade': self.fy_grade,
-            'fyc_grade': self.fyc_grade,
-            'Ast': self.Ast,
-            'ast': self.ast,
-            'Asc': self.Asc,
-            'asc': self.asc,
-            'γ0': self.γ0
-        }
-        return param_map[param_name]
-    
-    def _get_result(self, result_name):
-        """根据结果名获取矩形截面结果"""
-        result_map = {
-            'x': self.x,
-            'xb': self.xb,
-            'ξ': self.ξ,
-            'Mu': self.Mu,
-            'σs': self.σs,
-            'σsc': self.σsc,
-            'check': self.check
-        }
-        return result_map[result_name]
+        super().__init__(num, param, result, materials)
     
     def _get_title(self):
         return "=====矩形截面梁已知配筋计算抗弯承载力====="
@@ -153,12 +142,14 @@ class RectBeamReport(BeamReportBase):
 2.9 抗力效应比R/S={self.rs_ratio:.2f}"""
 
 class TBeamReport(BeamReportBase):
-    def __init__(self, num, param, result, is_seismic=0):
+    def __init__(self, num, param, result, is_seismic=0, M=0, rs_ratio=0, materials=None):
         self.b, self.h, self.bf, self.hf, self.fcuk, self.fy_grade, \
         self.fyc_grade, self.Ast, self.ast, self.Asc, self.asc, self.γ0 = param
         
-        # 从扩展结果中获取M和rs_ratio
-        if len(result) > 9:
+        # 结果记录另传M和rs_ratio；结果tuple可在末尾扩展M和rs_ratio
+        if isinstance(result, FlexureResult):
+            self._set_record(result, M, rs_ratio)
+        elif len(result) > 9:
             self.flag, self.x, self.xb, self.ξ, self.ξb_val, self.Mu, \
             self.σs, self.σsc, self.check, self.M, self.rs_ratio = result
         else:
@@ -170,34 +161,7 @@ class TBeamReport(BeamReportBase):
         # 新增：是否地震作用组合
         self.is_seismic = is_seismic
         
-        super().__init__(num, param, result)
-    
-    def _get_param(self, param_name):
-        """根据参数名获取T形截面参数"""
-        param_map = {
-            'fcuk': self.fcuk,
-            'fy_grade': self.fy_grade,
-            'fyc_grade': self.fyc_grade,
-            'Ast': self.Ast,
-            'ast': self.ast,
-            'Asc': self.Asc,
-            'asc': self.asc,
-            'γ0': self.γ0
-        }
-        return param_map[param_name]
-    
-    def _get_result(self, result_name):
-        """根据结果名获取T形截面结果"""
-        result_map = {
-            'x': self.x,
-            'xb': self.xb,
-            'ξ': self.ξ,
-            'Mu': self.Mu,
-            'σs': self.σs,
-            'σsc': self.σsc,
-            'check': self.check
-        }
-        return result_map[result_name]
+        super().__init__(num, param, result, materials)
     
     def _get_title(self):
         return "=====T形截面梁已知配筋计算抗弯承载力====="
@@ -232,11 +196,48 @@ class TBeamReport(BeamReportBase):
 2.9 受拉钢筋应力σs ={self.σs:.1f}N/mm²
 2.10 抗力效应比R/S={self.rs_ratio:.2f}"""
 
-# 保持原有函数接口兼容，同时支持is_seismic参数
-def report_beam_rect_fc(num, param, result, is_seismic=0):
-    report = RectBeamReport(num, param, result, is_seismic)
+class IBeamReport(TBeamReport):
+    """工字形（箱形）截面计算书，参数在T形截面基础上增加受拉翼缘bft、hft"""
+    title = "工字形"
+
+    def __init__(self, num, param, result, is_seismic=0, M=0, rs_ratio=0, materials=None):
+        b, h, bf, hf, self.bft, self.hft, *rest = param
+        super().__init__(num, [b, h, bf, hf] + rest, result, is_seismic, M, rs_ratio, materials)
+
+    def _get_title(self):
+        return f"====={self.title}截面梁已知配筋计算抗弯承载力====="
+
+    def _get_input_params_section(self):
+        items = [line.split(" ", 1)[1] for line in super()._get_input_params_section().split("\n")]
+        # 受拉翼缘插在受压翼缘之后，各项重新编号
+        items[4:4] = [f"受拉翼缘宽度bf：{self.bft}mm", f"受拉翼缘厚度hf：{self.hft}mm"]
+        return "\n".join(f"1.{i} {item}" for i, item in enumerate(items, 1))
+
+    def _get_calculation_results_section(self):
+        return super()._get_calculation_results_section().replace("T形截面类型判别", "受压区位置")
+
+
+class BoxBeamReport(IBeamReport):
+    """箱形截面计算书（b为两侧腹板厚度之和）"""
+    title = "箱形"
+
+    def _get_input_params_section(self):
+        return super()._get_input_params_section().replace("梁宽b：", "腹板厚度之和b：", 1)
+
+
+# 保持原有函数接口兼容，同时支持is_seismic参数；result为FlexureResult时M、rs_ratio另传，materials为材料参数记录（MaterialSet）
+def report_beam_rect_fc(num, param, result, is_seismic=0, M=0, rs_ratio=0, materials=None):
+    report = RectBeamReport(num, param, result, is_seismic, M, rs_ratio, materials)
+    return report.generate_report()
+
+def report_beam_t_fc(num, param, result, is_seismic=0, M=0, rs_ratio=0, materials=None):
+    report = TBeamReport(num, param, result, is_seismic, M, rs_ratio, materials)
+    return report.generate_report()
+
+def report_beam_i_fc(num, param, result, is_seismic=0, M=0, rs_ratio=0, materials=None):
+    report = IBeamReport(num, param, result, is_seismic, M, rs_ratio, materials)
     return report.generate_report()
 
-def report_beam_t_fc(num, param, result, is_seismic=0):
-    report = TBeamReport(num, param, result, is_seismic)
-    return report.generate_report()
\ No newline at end of file
+def report_beam_box_fc(num, param, result, is_seismic=0, M=0, rs_ratio=0, materials=None):
+    report = BoxBeamReport(num, param, result, is_seismic, M, rs_ratio, materials)
+    return report.generate_report()
@@ -0,0 +1,259 @@
+"""计算书文件写入及按截面读取
+ReportWriter以大缓冲区写入.out计算书（后缀.gz时gzip压缩），同时记录各截面计算书的位置，
+关闭时写出索引文件（计算书文件名.idx）；ReportIndex按索引直接定位读取某个截面的计算书，不再扫描整个文件。
+压缩时计算书按块（约256KB）分别压缩为独立的gzip成员，整个文件仍可由gzip直接解压，
+读取一个截面只需解压其所在的一块。
+ReportBundle每个截面单独一个计算书文件（送审用），写入目录或zip压缩包，文件按序号命名，
+zip内文件顺序及时间戳固定，相同计算结果生成的压缩包逐字节相同
+"""
+import gzip
+import json
+import os
+import re
+import zipfile
+import zlib
+from typing import Any, Dict, List, Optional
+
+# 写入缓冲区大小(字节)
+WRITE_BUFFER = 1 << 20
+
+# gzip压缩块大小（未压缩字节数，每块为一个gzip成员）
+GZIP_BLOCK = 1 << 18
+
+# 索引文件后缀及格式版本
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 1
+
+# 分册计算书zip内文件的固定时间戳（zip格式最早可表示的时间）
+BUNDLE_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# 截面编号中不能用于文件名的字符
+_UNSAFE_NAME = re.compile(r'[\\/:*?"<>|\s]+')
+
+
+def index_path(report_path: str) -> str:
+    """计算书文件的索引文件路径"""
+    return report_path + INDEX_SUFFIX
+
+
+def is_compressed(report_path: str) -> bool:
+    """计算书文件是否gzip压缩（按后缀判断）"""
+    return str(report_path).lower().endswith(".gz")
+
+
+class ReportWriter:
+    """计算书文件写入（with语句使用，退出时写出索引文件）"""
+
+    def __init__(self, path: str, compress: Optional[bool] = None, buffer_size: int = WRITE_BUFFER,
+                 block_size: int = GZIP_BLOCK):
+        """
+        :param path: 计算书文件路径
+        :param compress: 是否gzip压缩，None时按后缀（.gz）判断
+        :param buffer_size: 写入缓冲区大小(字节)
+        :param block_size: gzip压缩块大小（未压缩字节数）
+        """
+        self.path = path
+        self.compress = is_compressed(path) if compress is None else compress
+        self.block_size = block_size
+        self._file = open(path, "wb", buffering=buffer_size)
+        self._pos = 0  # 已写入文件的字节数
+        self._block = bytearray()  # 压缩时当前块的未压缩内容
+        self.blocks: List[int] = [0] if self.compress else []  # 各压缩块在文件中的起始位置
+        # 各计算书的截面编号、所在块号（仅压缩时）、块内偏移（未压缩时为文件偏移）及字节数，按写入顺序
+        self.sections: List[str] = []
+        self._block_of: List[int] = []
+        self._offsets: List[int] = []
+        self._lengths: List[int] = []
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        self.close()
+
+    def write(self, text: str) -> int:
+        """
+        写入文字（标题、汇总等，不记入索引）
+        :return: int - 写入内容在未压缩文件中的字节数
+        """
+        data = text.encode("utf-8")
+        if not self.compress:
+            self._file.write(data)
+            self._pos += len(data)
+            return len(data)
+        self._block += data
+        if len(self._block) >= self.block_size:
+            self._flush_block()
+        return len(data)
+
+    def add_report(self, sec_num: Any, report: str) -> int:
+        """
+        写入一个截面的计算书（末尾换行）并记入索引
+        :param sec_num: 截面编号
+        :param report: 计算书文字
+        :return: int - 计算书序号（从0起，按写入顺序）
+        """
+        if self.compress:
+            self._block_of.append(len(self.blocks) - 1)
+            self._offsets.append(len(self._block))
+        else:
+            self._offsets.append(self._pos)
+        self._lengths.append(self.write(report + "\n"))
+        self.sections.append("" if sec_num is None else str(sec_num))
+        return len(self.sections) - 1
+
+    def _flush_block(self) -> None:
+        """当前块压缩为一个gzip成员写入文件，开始新块"""
+        if not self._block:
+            return
+        data = gzip.compress(bytes(self._block), mtime=0)
+        self._file.write(data)
+        self._pos += len(data)
+        self._block.clear()
+        self.blocks.append(self._pos)
+
+    def close(self) -> None:
+        """写完剩余内容并写出索引文件"""
+        if self._file.closed:
+            return
+        if self.compress:
+            self._flush_block()
+            self.blocks.pop()  # 最后一个起始位置为文件末尾
+        self._file.close()
+        index = {"version": INDEX_VERSION, "compressed": self.compress, "size": self._pos, "blocks": self.blocks,
+                 "sections": self.sections, "block": self._block_of, "offset": self._offsets, "length": self._lengths}
+        # 整体序列化后一次写入（json.dump逐项写入较慢）
+        with open(index_path(self.path), "w", encoding="utf-8") as f:
+            f.write(json.dumps(index, ensure_ascii=False, separators=(",", ":")))
+
+
+class ReportIndex:
+    """计算书文件索引（按截面编号或序号读取单个计算书）"""
+
+    def __init__(self, path: str):
+        """
+        :param path: 计算书文件路径（索引文件为path + INDEX_SUFFIX）
+        :raises FileNotFoundError: 计算书文件或索引文件不存在时抛出异常
+        :raises ValueError: 索引与计算书文件不对应（文件大小不同）或版本不支持时抛出异常
+        """
+        self.path = path
+        with open(index_path(path), encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version", 0) > INDEX_VERSION:
+            raise ValueError(f"计算书索引版本不支持: {index.get('version')}")
+        if os.path.getsize(path) != index["size"]:
+            raise ValueError("计算书文件已改动，索引不再对应")
+        self.compressed: bool = index["compressed"]
+        self.blocks: List[int] = index["blocks"]
+        self.sections: List[str] = index["sections"]
+        self.block_of: List[int] = index["block"]
+        self.offsets: List[int] = index["offset"]
+        self.lengths: List[int] = index["length"]
+        self.size: int = index["size"]
+        self._rows: Optional[Dict[str, List[int]]] = None
+        self._cache: Optional[tuple] = None  # 上次解压的(块号, 内容)
+
+    def __len__(self) -> int:
+        return len(self.sections)
+
+    def find(self, sec_num: Any) -> List[int]:
+        """截面编号对应的计算书序号（编号重复时有多个）"""
+        if self._rows is None:
+            self._rows = {}
+            for i, name in enumerate(self.sections):
+                self._rows.setdefault(name, []).append(i)
+        return self._rows.get(str(sec_num), [])
+
+    def _read_block(self, block: int) -> bytes:
+        if self._cache is None or self._cache[0] != block:
+            start = self.blocks[block]
+            end = self.blocks[block + 1] if block + 1 < len(self.blocks) else self.size
+            with open(self.path, "rb") as f:
+                f.seek(start)
+                self._cache = (block, zlib.decompress(f.read(end - start), 31))
+        return self._cache[1]
+
+    def read(self, i: int) -> str:
+        """
+        读取第i个计算书（不含末尾换行）
+        :param i: 计算书序号（从0起）
+        """
+        offset, length = self.offsets[i], self.lengths[i]
+        if self.compressed:
+            data = self._read_block(self.block_of[i])[offset:offset + length]
+        else:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                data = f.read(length)
+        return data.decode("utf-8")[:-1]
+
+    def report(self, sec_num: Any) -> Optional[str]:
+        """截面编号对应的第一个计算书，无该截面时为None（单次查找不建立编号字典）"""
+        if self._rows is not None:
+            rows = self.find(sec_num)
+            return self.read(rows[0]) if rows else None
+        try:
+            return self.read(self.sections.index(str(sec_num)))
+        except ValueError:
+            return None
+
+
+def read_report(path: str, sec_num: Any) -> Optional[str]:
+    """按索引读取计算书文件中某个截面的计算书（无该截面时为None）"""
+    return ReportIndex(path).report(sec_num)
+
+
+def bundle_name(index: int, sec_num: Any) -> str:
+    """
+    分册计算书文件名：序号(从1起，6位) + 截面编号（不能用于文件名的字符替换为_）
+    :param index: 计算书序号（从0起）
+    :param sec_num: 截面编号
+    """
+    name = _UNSAFE_NAME.sub("_", "" if sec_num is None else str(sec_num)).strip("_.")
+    return f"{index + 1:06d}_{name}.txt" if name else f"{index + 1:06d}.txt"
+
+
+class ReportBundle:
+    """分册计算书：每个截面一个文件，路径后缀为.zip时写入zip压缩包，否则写入目录（with语句使用）"""
+
+    def __init__(self, path: str):
+        """
+        :param path: zip压缩包或目录路径（目录不存在时新建）
+        """
+        self.path = path
+        self.count = 0
+        self._zip: Optional[zipfile.ZipFile] = None
+        if str(path).lower().endswith(".zip"):
+            self._zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+        else:
+            os.makedirs(path, exist_ok=True)
+
+    def __enter__(self) -> "ReportBundle":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def add(self, index: int, sec_num: Any, report: str) -> str:
+        """
+        写入一个截面的计算书
+        :param index: 计算书序号（从0起，决定文件名及zip内顺序）
+        :param sec_num: 截面编号
+        :param report: 计算书文字
+        :return: str - 文件名
+        """
+        name = bundle_name(index, sec_num)
+        data = (report + "\n").encode("utf-8")
+        if self._zip is not None:
+            info = zipfile.ZipInfo(name, date_time=BUNDLE_DATE_TIME)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            self._zip.writestr(info, data)
+        else:
+            with open(os.path.join(self.path, name), "wb") as f:
+                f.write(data)
+        self.count += 1
+        return name
+
+    def close(self) -> None:
+        if self._zip is not None:
+            self._zip.close()
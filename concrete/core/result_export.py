@@ -0,0 +1,149 @@
+"""计算结果列式导出
+全部输入参数及全精度计算结果按列写入结果目录（.cols）：每列一个.npy文件，columns.json记录列名、文件及行数；
+读取时按内存映射打开（np.load mmap_mode="r"），不复制数据、不解析Excel，可反复快速载入；
+安装pyarrow时可另存为CSV/Parquet（CSV无pyarrow时由标准库csv写出）
+"""
+import csv
+import importlib.util
+import json
+import math
+import numbers
+import os
+import shutil
+from datetime import datetime
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from common.exceptions import ParameterError
+
+# 结果目录后缀
+EXPORT_SUFFIX = ".cols"
+
+# 结果目录中的列清单文件
+MANIFEST_NAME = "columns.json"
+
+# 列清单格式标识及版本
+EXPORT_FORMAT = "structure-calc-columns"
+EXPORT_VERSION = 1
+
+
+def column_array(values: Sequence) -> np.ndarray:
+    """
+    一列取值转为定长数组（可内存映射）
+    :param values: 各行取值
+    :return: np.ndarray - 数值列为int64/float64（None为nan），文字列为定长unicode（None为空字符串）
+    """
+    arr = np.asarray(values)
+    if arr.dtype.kind in "biufU":
+        return arr
+    if all(v is None or isinstance(v, numbers.Real) and not isinstance(v, bool) for v in values):
+        return np.array([np.nan if v is None else v for v in values], dtype=float)
+    return np.array(["" if v is None else str(v) for v in values], dtype=str)
+
+
+def is_export(path: str) -> bool:
+    """是否为结果目录（含列清单文件）"""
+    return os.path.isfile(os.path.join(path, MANIFEST_NAME))
+
+
+def write_columns(columns: Dict[str, Sequence], path: str, **meta) -> int:
+    """
+    按列写入结果目录（先写入临时目录再替换，原有结果目录整体更新）
+    :param columns: 按列存储的数据 {列名: 各行取值}，列顺序即清单顺序
+    :param path: 结果目录路径
+    :param meta: 附加信息（如source），写入列清单
+    :return: int - 行数
+    :raises ParameterError: 路径已存在且不是结果目录、或各列行数不一致时抛出异常
+    """
+    if os.path.exists(path) and not is_export(path):
+        raise ParameterError("输出路径已存在且不是结果目录", parameter=path)
+    arrays = {name: column_array(values) for name, values in columns.items()}
+    rows = {len(arr) for arr in arrays.values()}
+    if len(rows) > 1:
+        raise ParameterError("各列行数不一致", parameter=", ".join(f"{k}={len(v)}" for k, v in arrays.items()))
+    count = rows.pop() if rows else 0
+
+    tmp = path + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    manifest = {"format": EXPORT_FORMAT, "version": EXPORT_VERSION, "rows": count,
+                "created": datetime.now().isoformat(timespec="seconds"), **meta, "columns": []}
+    for i, (name, arr) in enumerate(arrays.items()):
+        file_name = f"c{i:02d}.npy"  # 列名含/、中文等字符，文件按序号命名
+        np.save(os.path.join(tmp, file_name), arr)
+        manifest["columns"].append({"name": name, "file": file_name, "dtype": arr.dtype.str})
+    with open(os.path.join(tmp, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    os.replace(tmp, path)
+    return count
+
+
+def read_manifest(path: str) -> dict:
+    """
+    读取结果目录的列清单
+    :raises ParameterError: 不是结果目录或格式版本不支持时抛出异常
+    """
+    if not is_export(path):
+        raise ParameterError("不是结果目录", parameter=path)
+    with open(os.path.join(path, MANIFEST_NAME), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != EXPORT_FORMAT or manifest.get("version", 0) > EXPORT_VERSION:
+        raise ParameterError("结果目录格式不支持", parameter=f"{manifest.get('format')} v{manifest.get('version')}")
+    return manifest
+
+
+def load_columns(path: str, names: Optional[Sequence[str]] = None, mmap: bool = True) -> Dict[str, np.ndarray]:
+    """
+    读取结果目录
+    :param path: 结果目录路径
+    :param names: 读取的列名，None时为全部列
+    :param mmap: 是否按内存映射只读打开（不复制数据，按需从文件读取）
+    :return: dict - {列名: 数组}（names为None时顺序同列清单，否则同names）
+    :raises ParameterError: 列名不存在时抛出异常
+    """
+    files = {col["name"]: col["file"] for col in read_manifest(path)["columns"]}
+    missing = [name for name in names or () if name not in files]
+    if missing:
+        raise ParameterError("结果目录中没有该列", parameter="、".join(missing))
+    mode = "r" if mmap else None
+    return {name: np.load(os.path.join(path, files[name]), mmap_mode=mode) for name in names or files}
+
+
+def write_table(columns: Dict[str, Sequence], file_path: str) -> int:
+    """
+    另存为CSV或Parquet（按后缀）：安装pyarrow时由pyarrow写出，CSV无pyarrow时由标准库csv写出
+    :param columns: 按列存储的数据（如load_columns的输出）
+    :param file_path: 输出文件路径（.csv或.parquet）
+    :return: int - 行数
+    :raises ParameterError: 后缀不支持、或Parquet未安装pyarrow时抛出异常
+    """
+    suffix = os.path.splitext(file_path)[1].lower()
+    if suffix not in (".csv", ".parquet"):
+        raise ParameterError("只支持导出为.csv或.parquet", parameter=file_path)
+    arrays = {name: column_array(values) for name, values in columns.items()}
+    count = len(next(iter(arrays.values()))) if arrays else 0
+    if importlib.util.find_spec("pyarrow") is not None:
+        import pyarrow as pa
+
+        table = pa.table({name: pa.array(arr, from_pandas=arr.dtype.kind == "f") for name, arr in arrays.items()})
+        if suffix == ".csv":
+            import pyarrow.csv as pa_csv
+            pa_csv.write_csv(table, file_path)
+        else:
+            import pyarrow.parquet as pq
+            pq.write_table(table, file_path)
+        return count
+    if suffix == ".parquet":
+        raise ParameterError("导出Parquet需要安装pyarrow", parameter="pip install pyarrow")
+
+    # 标准库csv：nan写为空单元格，浮点数保留全精度；utf-8-sig便于Excel直接打开中文表头
+    cols = [arr.tolist() for arr in arrays.values()]
+    with open(file_path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(arrays)
+        for row in zip(*cols):
+            writer.writerow(["" if isinstance(v, float) and math.isnan(v) else v for v in row])
+    return count
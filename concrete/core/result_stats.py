@@ -0,0 +1,166 @@
+"""计算结果分布统计
+由按列存储的计算结果（R/S、ξ/ξb、Mu）整列计算直方图分箱及散点图抽样，供GUI结果分布面板绘图；
+直方图两端分箱不设界（包含离群值），分箱边界取整，各分箱可转为截面索引查询表达式；
+散点按绘图网格抽样，每个网格单元每组只保留一个点，50万点抽样后每组不超过6000点
+"""
+import math
+import numbers
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 直方图分箱数（取整后不超过该值）
+HIST_BINS = 30
+
+# 直方图范围取值的百分位（范围外的值归入两端分箱）
+HIST_PERCENTILES = (0.5, 99.5)
+
+# 散点图抽样网格（横向×竖向单元数，单元约为一个散点标记大小；QtCharts散点绘制耗时随点数超线性增长）
+SCATTER_GRID = (100, 60)
+
+
+def numeric_array(values: Sequence) -> np.ndarray:
+    """列值转为float数组（非数值及None为nan）"""
+    arr = np.asarray(values)
+    if arr.dtype.kind in "fiu":
+        return arr.astype(float)
+    return np.array([v if isinstance(v, numbers.Real) and not isinstance(v, bool) else np.nan for v in values],
+                    dtype=float)
+
+
+def nice_edges(lo: float, hi: float, bins: int = HIST_BINS) -> np.ndarray:
+    """
+    取整的分箱边界（步长为1、2、2.5、5×10^n）
+    :param lo: 最小值
+    :param hi: 最大值
+    :param bins: 最大分箱数
+    :return: np.ndarray - 分箱边界（升序，边界值为十进制短数，与查询表达式中的数值一致）
+    """
+    span = hi - lo
+    if span <= 0:
+        span = abs(lo) * 0.1 or 1.0
+        lo, hi = lo - span / 2, hi + span / 2
+    raw = span / bins
+    power = 10 ** math.floor(math.log10(raw))
+    step = next(m * power for m in (1, 2, 2.5, 5, 10) if m * power >= raw)
+    start = math.floor(lo / step)
+    count = max(int(math.ceil(hi / step)) - start, 1)
+    return np.array([float(f"{(start + i) * step:.10g}") for i in range(count + 1)])
+
+
+def _format(value: float) -> str:
+    return f"{value:.10g}"
+
+
+class Histogram(NamedTuple):
+    """直方图（首末分箱不设界：首箱为小于edges[1]，末箱为不小于edges[-2]）"""
+    field: str  # 字段名（截面索引查询字段，如"R/S"）
+    edges: np.ndarray  # 分箱边界
+    counts: np.ndarray  # 各分箱截面数
+    total: int  # 有效值（非nan）个数
+
+    def label(self, i: int) -> str:
+        """分箱i的取值范围文字"""
+        lo, hi = _format(self.edges[i]), _format(self.edges[i + 1])
+        if len(self.counts) == 1:
+            return "全部"
+        if i == 0:
+            return f"<{hi}"
+        if i == len(self.counts) - 1:
+            return f"≥{lo}"
+        return f"{lo}~{hi}"
+
+    def query(self, i: int) -> str:
+        """分箱i对应的截面索引查询表达式"""
+        lo, hi = _format(self.edges[i]), _format(self.edges[i + 1])
+        terms = []
+        if i > 0:
+            terms.append(f"{self.field}>={lo}")
+        if i < len(self.counts) - 1:
+            terms.append(f"{self.field}<{hi}")
+        return " ".join(terms) or f"{self.field}>={_format(-math.inf)}"
+
+
+def histogram(values: Sequence, field: str, bins: int = HIST_BINS,
+              percentiles: Tuple[float, float] = HIST_PERCENTILES) -> Histogram:
+    """
+    整列直方图
+    :param values: 各截面取值（nan及非数值不计）
+    :param field: 字段名
+    :param bins: 最大分箱数
+    :param percentiles: 分箱范围的百分位（范围外的值归入首末分箱）
+    :return: Histogram - 直方图（无有效值时counts为空）
+    """
+    arr = numeric_array(values)
+    arr = arr[np.isfinite(arr)]
+    if not len(arr):
+        return Histogram(field, np.array([]), np.array([], dtype=int), 0)
+    lo, hi = np.percentile(arr, percentiles)
+    edges = nice_edges(float(lo), float(hi), bins)
+    # 分箱号为不大于取值的内部边界个数（与查询">=下界 <上界"一致）
+    index = np.searchsorted(edges[1:-1], arr, side="right")
+    counts = np.bincount(index, minlength=len(edges) - 1)
+    return Histogram(field, edges, counts, len(arr))
+
+
+class Scatter(NamedTuple):
+    """散点图抽样结果"""
+    points: Dict[str, Tuple[np.ndarray, np.ndarray]]  # 各组抽样后的(x, y)
+    counts: Dict[str, int]  # 各组有效点数（抽样前）
+    x_range: Tuple[float, float]
+    y_range: Tuple[float, float]
+
+
+def downsample_scatter(x: Sequence, y: Sequence, groups: Sequence,
+                       grid: Tuple[int, int] = SCATTER_GRID) -> Scatter:
+    """
+    散点图按网格抽样：每组在每个网格单元只保留一个点（离群点所在单元同样保留）
+    :param x: 横坐标（nan及非数值的点不绘制）
+    :param y: 纵坐标
+    :param groups: 各点分组（如截面类型）
+    :param grid: 网格(横向单元数, 竖向单元数)
+    :return: Scatter - 各组抽样点及坐标范围
+    """
+    xs, ys = numeric_array(x), numeric_array(y)
+    names = np.array([str(g) for g in groups], dtype=object)
+    valid = np.isfinite(xs) & np.isfinite(ys)
+    if not valid.any():
+        return Scatter({}, {}, (0.0, 1.0), (0.0, 1.0))
+    xs, ys, names = xs[valid], ys[valid], names[valid]
+    x_range = (float(xs.min()), float(xs.max()))
+    y_range = (float(ys.min()), float(ys.max()))
+    nx, ny = grid
+    cx = ((xs - x_range[0]) / ((x_range[1] - x_range[0]) or 1.0) * (nx - 1)).astype(np.int64)
+    cy = ((ys - y_range[0]) / ((y_range[1] - y_range[0]) or 1.0) * (ny - 1)).astype(np.int64)
+    cells = cx * ny + cy
+
+    points, counts = {}, {}
+    for name in sorted(set(names.tolist())):
+        rows = np.flatnonzero(names == name)
+        _, first = np.unique(cells[rows], return_index=True)
+        keep = rows[np.sort(first)]
+        points[name] = (xs[keep], ys[keep])
+        counts[name] = len(rows)
+    return Scatter(points, counts, x_range, y_range)
+
+
+def result_summary(columns: Dict[str, Sequence]) -> Dict[str, int]:
+    """
+    结果汇总：截面总数、计算出错数（R/S为nan）及R/S<1的截面数
+    :param columns: 按列存储的数据（含R/S列）
+    """
+    rs = numeric_array(columns.get("R/S", []))
+    return {"总数": len(rs), "出错": int(np.isnan(rs).sum()), "R/S<1": int((rs < 1).sum())}
+
+
+def result_distribution(columns: Dict[str, Sequence], fields: Sequence[str] = ("R/S", "ξ/ξb", "Mu"),
+                        bins: int = HIST_BINS, grid: Optional[Tuple[int, int]] = None) -> tuple:
+    """
+    结果分布：各结果列直方图及M-Mu散点（按截面类型分组）
+    :param columns: 按列存储的数据（含计算结果列及弯矩设计值M、截面类型列）
+    :return: tuple - ({字段: Histogram}, Scatter, 汇总)
+    """
+    hists = {field: histogram(columns.get(field, []), field, bins) for field in fields}
+    scatter = downsample_scatter(columns.get("弯矩设计值M", []), columns.get("Mu", []),
+                                 columns.get("截面类型", []), grid or SCATTER_GRID)
+    return hists, scatter, result_summary(columns)
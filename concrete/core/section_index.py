@@ -0,0 +1,216 @@
+"""截面索引
+按列建立截面编号（前缀、子串）、截面类型、钢筋牌号、数值参数及计算结果列（R/S、ξ/ξb、Mu、判别）的内存索引，
+查询表达式按索引定位行（前缀及数值范围为二分查找，类型/牌号为倒排表），不再逐行扫描；
+各字段的索引在首次查询该字段时才建立
+"""
+import numbers
+import re
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from common.exceptions import ParameterError
+
+# 截面编号列
+ID_COL = "截面编号"
+
+# 分类字段：查询字段名 -> 数据列名（多列时任一列匹配即可）
+CATEGORY_FIELDS = {
+    "类型": ("截面类型",),
+    "钢筋": ("受拉钢筋强度等级", "受压钢筋强度等级"),
+    "受拉钢筋": ("受拉钢筋强度等级",),
+    "受压钢筋": ("受压钢筋强度等级",),
+    "判别": ("判别",),
+}
+
+# 数值字段：查询字段名 -> 数据列名
+NUMERIC_FIELDS = {
+    "R/S": "R/S", "ξ/ξb": "ξ/ξb", "Mu": "Mu", "C": "混凝土强度等级C", "b": "b", "h": "h", "bf": "bf", "hf": "hf",
+    "M": "弯矩设计值M", "γ0": "结构重要性系数γ0", "As": "受拉钢筋面积As",
+}
+
+# 计算结果字段（查询前须先计算结果）
+RESULT_FIELDS = ("R/S", "ξ/ξb", "Mu", "判别")
+
+# 比较运算符（两字符的在前）
+_TERM = re.compile(r"^(.+?)(<=|>=|!=|=|<|>)(.+)$")
+
+
+class Term(NamedTuple):
+    """查询条件"""
+    field: str  # 字段名，截面编号条件为ID_COL
+    op: str  # 比较运算符；截面编号条件为"^"（前缀）或"~"（子串）
+    value: str  # 取值（截面编号条件为小写文字）
+
+
+def parse_query(text: str) -> List[Term]:
+    """
+    解析查询表达式：空格分隔的条件同时满足
+      L5 / ^5F      截面编号包含L5 / 以5F开头（不区分大小写）
+      类型=T形      分类字段（类型、钢筋、受拉钢筋、受压钢筋、判别）等于/不等于(!=)
+      R/S<1 C>=30  数值字段（R/S、ξ/ξb、Mu、C、b、h、bf、hf、M、γ0、As）比较
+    :param text: 查询表达式
+    :return: list - 查询条件
+    :raises ParameterError: 字段名、运算符或数值无效时抛出异常
+    """
+    terms = []
+    for token in text.split():
+        match = _TERM.match(token)
+        if match is None:
+            if token.startswith("^"):
+                terms.append(Term(ID_COL, "^", token[1:].lower()))
+            else:
+                terms.append(Term(ID_COL, "~", token.lower()))
+            continue
+        field, op, value = match.groups()
+        if field in CATEGORY_FIELDS:
+            if op not in ("=", "!="):
+                raise ParameterError("分类字段只能使用=或!=", parameter=token)
+        elif field in NUMERIC_FIELDS:
+            try:
+                float(value)
+            except ValueError:
+                raise ParameterError("查询数值无效", parameter=token) from None
+        else:
+            raise ParameterError(f"查询字段'{field}'不支持",
+                                 parameter=f"可选：{', '.join(list(CATEGORY_FIELDS) + list(NUMERIC_FIELDS))}")
+        terms.append(Term(field, op, value))
+    return terms
+
+
+def uses_results(terms: Sequence[Term]) -> bool:
+    """查询条件是否用到计算结果字段"""
+    return any(term.field in RESULT_FIELDS for term in terms)
+
+
+class SectionIndex:
+    """截面索引（建立后数据修改须重新建立）"""
+
+    def __init__(self, columns: Dict[str, Sequence]):
+        """
+        :param columns: 按列存储的截面数据 {数据列名: 各行取值}，可含计算结果列R/S、ξ/ξb、Mu、判别
+        """
+        self._columns = columns
+        self.n = len(columns[ID_COL]) if ID_COL in columns else 0
+        self._ids: Optional[np.ndarray] = None  # 小写截面编号
+        self._id_order: Optional[np.ndarray] = None
+        self._id_sorted: Optional[np.ndarray] = None
+        self._categories: Dict[str, Dict[str, np.ndarray]] = {}
+        self._numeric: Dict[str, tuple] = {}
+        self._last_substring: Optional[tuple] = None  # 上次子串查询(子串, 结果行)，输入增加字符时在其结果中查找
+
+    # ====================== 1. 索引建立（首次查询时） ======================
+    def _id_index(self):
+        if self._ids is None:
+            self._ids = np.array([str(v).lower() for v in self._columns.get(ID_COL, [])], dtype=str)
+            self._id_order = np.argsort(self._ids, kind="stable")
+            self._id_sorted = self._ids[self._id_order]
+        return self._ids
+
+    def _category_index(self, col: str) -> Dict[str, np.ndarray]:
+        """分类列倒排表 {取值: 行号数组（升序）}"""
+        if col not in self._categories:
+            values = np.array([str(v) for v in self._columns.get(col, [""] * self.n)], dtype=str)
+            keys, inverse = np.unique(values, return_inverse=True)
+            order = np.argsort(inverse, kind="stable")
+            bounds = np.cumsum(np.bincount(inverse, minlength=len(keys)))[:-1]
+            self._categories[col] = dict(zip(keys.tolist(), np.split(order, bounds)))
+        return self._categories[col]
+
+    def _numeric_index(self, col: str) -> tuple:
+        """数值列排序索引 (升序取值, 对应行号)，非数值及nan不参与"""
+        if col not in self._numeric:
+            values = np.array([v if isinstance(v, numbers.Real) and not isinstance(v, bool) else np.nan
+                               for v in self._columns.get(col, [])], dtype=float)
+            order = np.argsort(values, kind="stable")
+            valid = int(np.count_nonzero(~np.isnan(values)))
+            order = order[:valid]
+            self._numeric[col] = (values[order], order)
+        return self._numeric[col]
+
+    # ====================== 2. 单条件查询 ======================
+    def _prefix(self, prefix: str) -> np.ndarray:
+        self._id_index()
+        lo = np.searchsorted(self._id_sorted, prefix, side="left")
+        hi = np.searchsorted(self._id_sorted, prefix + "\U0010ffff", side="left")
+        return self._id_order[lo:hi]
+
+    def _mask(self, rows: np.ndarray) -> np.ndarray:
+        """行号数组转为行掩码"""
+        mask = np.zeros(self.n, dtype=bool)
+        mask[rows] = True
+        return mask
+
+    def _category(self, field: str, op: str, value: str) -> np.ndarray:
+        mask = np.zeros(self.n, dtype=bool)
+        for col in CATEGORY_FIELDS[field]:
+            rows = self._category_index(col).get(value)
+            if rows is not None:
+                mask[rows] = True
+        return np.flatnonzero(~mask if op == "!=" else mask)
+
+    def _numeric_range(self, field: str, op: str, value: str) -> np.ndarray:
+        values, order = self._numeric_index(NUMERIC_FIELDS[field])
+        v = float(value)
+        lo = np.searchsorted(values, v, side="left")
+        hi = np.searchsorted(values, v, side="right")
+        if op == "<":
+            return order[:lo]
+        if op == "<=":
+            return order[:hi]
+        if op == ">":
+            return order[hi:]
+        if op == ">=":
+            return order[lo:]
+        if op == "=":
+            return order[lo:hi]
+        return np.concatenate([order[:lo], order[hi:]])
+
+    def _substring(self, text: str, candidates: Optional[np.ndarray]) -> np.ndarray:
+        """截面编号子串查询（只在候选行中查找）"""
+        ids = self._id_index()
+        narrowing = candidates is None
+        if narrowing and self._last_substring is not None and self._last_substring[0] in text:
+            # 输入增加字符：在上次结果中查找
+            candidates = self._last_substring[1]
+        if candidates is None:
+            rows = np.flatnonzero(np.char.find(ids, text) >= 0)
+        else:
+            rows = candidates[np.char.find(ids[candidates], text) >= 0]
+        if narrowing:
+            self._last_substring = (text, rows)
+        return rows
+
+    # ====================== 3. 查询 ======================
+    def query(self, query) -> np.ndarray:
+        """
+        按查询表达式筛选
+        :param query: 查询表达式或parse_query解析的条件
+        :return: np.ndarray - 满足全部条件的行号（升序）
+        :raises ParameterError: 查询表达式无效时抛出异常
+        """
+        terms = parse_query(query) if isinstance(query, str) else list(query)
+        # 先按索引定位（前缀、分类、数值范围）并按行掩码求交集，子串条件最后在候选行中查找
+        located = []
+        for term in terms:
+            if term.field != ID_COL:
+                located.append(self._category(*term) if term.field in CATEGORY_FIELDS else self._numeric_range(*term))
+            elif term.op == "^":
+                located.append(self._prefix(term.value))
+        rows: Optional[np.ndarray] = None
+        if located:
+            mask = self._mask(located[0])
+            for found in located[1:]:
+                mask &= self._mask(found)
+            rows = np.flatnonzero(mask)
+        for term in terms:
+            if term.field == ID_COL and term.op == "~":
+                rows = self._substring(term.value, rows)
+        return np.arange(self.n) if rows is None else rows
+
+    def worst(self, n: int, field: str = "R/S") -> np.ndarray:
+        """
+        最不利的n个截面（按field升序，无计算结果的行不参与）
+        :return: np.ndarray - 行号（按field升序）
+        """
+        return self._numeric_index(NUMERIC_FIELDS[field])[1][:n]
@@ -0,0 +1,211 @@
+"""截面类型注册表
+每种截面类型登记逐截面计算函数、批量计算函数、计算书生成函数及输入参数表；
+批量计算按截面类型分组，每组调用一次批量计算函数，再按输入顺序回填结果。
+批量计算函数以"模块:函数名"登记，首次使用时才导入（单截面计算不导入numpy）
+"""
+import importlib
+import math
+from numbers import Real
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from common.exceptions import ErrorCode, ParameterError, make_error
+from .beam_rect_fc import beam_rect_fc
+from .beam_t_fc import beam_t_fc
+from .beam_i_fc import beam_i_fc, I_FLAGS
+from .records import PARAM_KEYS, FlexureResult, SectionInput
+from .report_beam import report_beam_rect_fc, report_beam_t_fc, report_beam_i_fc, report_beam_box_fc
+
+# calc_params末尾可省略的参数（缺省为0）
+OPTIONAL_KEYS = ("bft", "hft")
+
+# 文字参数（钢筋牌号），其余计算参数均为数值
+TEXT_KEYS = ("fy_grade", "fyc_grade")
+
+# 承载力计算结果的公共结果名
+RESULT_KEYS = ("x", "xb", "ξ", "ξb", "Mu", "σs", "σsc")
+
+# T形截面类型编号（批量计算结果flag）与文字对应
+T_FLAGS = {1: "第一类T型截面", 2: "第二类T型截面"}
+
+# 同类型截面数不超过该值时直接逐截面计算（数组运算的固定开销大于逐截面计算）
+BATCH_MIN = 8
+
+
+class SectionType(NamedTuple):
+    """截面类型"""
+    name: str  # 截面类型名（输入表"截面类型"列的取值）
+    keys: Tuple[str, ...]  # 计算函数参数名（按参数顺序，取自PARAM_KEYS）
+    solver: Callable  # 逐截面计算函数
+    batch: Optional[str]  # 批量计算函数"模块:函数名"，None时逐截面计算
+    report: Callable  # 计算书生成函数(num, args, result, is_seismic, M, rs_ratio, materials)，result为FlexureResult
+    result_keys: Tuple[str, ...]  # 计算函数返回tuple各项的结果名（check为校验文字）
+    flags: Optional[Dict[int, str]] = None  # 批量结果flag编号与文字对应
+
+    def args(self, calc_params: Union[Sequence, SectionInput]) -> list:
+        """从calc_params（或SectionInput）中取出本类型计算函数的参数（省略的受拉翼缘参数取0）"""
+        if isinstance(calc_params, SectionInput):
+            return calc_params.args(self.keys)
+        index = [PARAM_KEYS.index(k) for k in self.keys]
+        return [calc_params[i] if i < len(calc_params) or PARAM_KEYS[i] not in OPTIONAL_KEYS else 0 for i in index]
+
+    def solve(self, calc_params: Union[Sequence, SectionInput]) -> FlexureResult:
+        """
+        逐截面计算，返回结果记录
+        :param calc_params: calc_params或SectionInput
+        :raises CalculationError: 计算函数抛出的异常
+        """
+        return self.solve_args(self.args(calc_params))
+
+    def solve_args(self, args: Sequence) -> FlexureResult:
+        """按计算函数参数逐截面计算，返回结果记录（计算函数返回的tuple按result_keys转换）"""
+        return FlexureResult.from_tuple(self.solver(*args), self.result_keys)
+
+    def batch_solver(self) -> Optional[Callable]:
+        """导入批量计算函数"""
+        if self.batch is None:
+            return None
+        module, name = self.batch.split(":")
+        return getattr(importlib.import_module(module), name)
+
+
+SECTION_TYPES: Dict[str, SectionType] = {}
+
+
+def register_section_type(section: SectionType) -> SectionType:
+    """
+    登记截面类型（同名类型覆盖）
+    :param section: 截面类型
+    :return: SectionType - 登记的截面类型
+    :raises ParameterError: 参数名不在PARAM_KEYS中或结果名缺少x/Mu时抛出异常
+    """
+    unknown = [k for k in section.keys if k not in PARAM_KEYS]
+    if unknown:
+        raise ParameterError("截面类型参数名无效", parameter=f"{section.name}: {', '.join(unknown)}")
+    if "x" not in section.result_keys or "Mu" not in section.result_keys:
+        raise ParameterError("截面类型结果须包含x及Mu", parameter=section.name)
+    SECTION_TYPES[section.name] = section
+    return section
+
+
+def get_section_type(name) -> SectionType:
+    """
+    查询截面类型
+    :raises ParameterError: 截面类型未登记时抛出异常
+    """
+    section = SECTION_TYPES.get(name)
+    if section is None:
+        raise ParameterError(f"截面类型'{name}'不支持", parameter=f"可选：{', '.join(SECTION_TYPES)}")
+    return section
+
+
+def check_text(balanced) -> str:
+    """轴力平衡校验结果文字（与calculate_axial_balance_check一致）"""
+    return "✓轴力平衡校验通过!" if balanced else "×轴力平衡校验未通过!"
+
+
+def _solve_scalar(section: SectionType, args: list) -> Union[FlexureResult, Exception]:
+    """逐截面计算，异常作为结果返回"""
+    try:
+        return section.solve_args(args)
+    except Exception as e:
+        return e
+
+
+def _non_finite(section: SectionType, args: list) -> Optional[ParameterError]:
+    """数值参数含nan/inf时返回参数错误（不参与计算，批量与逐截面计算结果一致），否则返回None"""
+    bad = [f"{k}={v}" for k, v in zip(section.keys, args)
+           if k not in TEXT_KEYS and isinstance(v, Real) and not math.isfinite(v)]
+    return make_error(ErrorCode.INPUT, "参数须为有限数值", parameter=", ".join(bad)) if bad else None
+
+
+def _solve_group(section: SectionType, rows: List[list]) -> List[Union[FlexureResult, Exception]]:
+    """
+    同类型截面批量计算，参数无效的行由错误码生成异常，计算过程无效的行逐截面计算（给出具体错误信息）；
+    数值参数含nan/inf的行不论分组大小均返回参数错误
+    :param rows: 各截面的计算函数参数
+    :return: list - 各截面计算结果记录（与逐截面计算一致）或异常
+    """
+    solver = section.batch_solver() if len(rows) > BATCH_MIN else None
+    if solver is None:
+        return [_non_finite(section, args) or _solve_scalar(section, args) for args in rows]
+    import numpy as np
+    try:
+        columns = [col if key in TEXT_KEYS else np.asarray(col, dtype=float)
+                   for key, col in zip(section.keys, zip(*rows))]
+        finite = np.logical_and.reduce([np.isfinite(col) for key, col in zip(section.keys, columns)
+                                        if key not in TEXT_KEYS])
+        res = solver(*columns, rounded=True)
+    except (TypeError, ValueError):
+        # 参数含非数值等无法组成数组的情况
+        return [_non_finite(section, args) or _solve_scalar(section, args) for args in rows]
+
+    from .beam_batch import batch_error
+
+    # 结果数组整列转为结果记录，无效行随后替换为异常
+    n = len(rows)
+    columns = [res[key].tolist() for key in RESULT_KEYS]
+    checks = [check_text(v) for v in res["balanced"].tolist()]
+    flags = [section.flags.get(v) for v in res["flag"].tolist()] if "flag" in section.result_keys else [None] * n
+    results: List[Union[FlexureResult, Exception]] = list(map(FlexureResult, *columns, checks, flags))
+    for j in (j for j, ok in enumerate(res["valid"].tolist()) if not ok):
+        # 批量计算函数未给出错误码时逐截面计算
+        error = batch_error(res["code"][j], section.keys, rows[j]) if "code" in res else None
+        results[j] = error if error is not None else _solve_scalar(section, rows[j])
+    for j in np.flatnonzero(~finite).tolist():
+        results[j] = _non_finite(section, rows[j])
+    return results
+
+
+def solve_grouped(items: Sequence[Tuple[str, Sequence]]) -> List[Union[FlexureResult, Exception]]:
+    """
+    按截面类型分组计算
+    :param items: (截面类型名, calc_params)列表
+    :return: list - 按输入顺序的计算结果记录（FlexureResult）或异常（截面类型不支持时为ParameterError）
+    """
+    results: List[Union[FlexureResult, Exception, None]] = [None] * len(items)
+    groups: Dict[str, List[int]] = {}
+    for i, (name, _) in enumerate(items):
+        try:
+            groups.setdefault(get_section_type(name).name, []).append(i)
+        except ParameterError as e:
+            results[i] = e
+
+    for name, index in groups.items():
+        section = SECTION_TYPES[name]
+        solved = _solve_group(section, [section.args(items[i][1]) for i in index])
+        for i, result in zip(index, solved):
+            results[i] = result
+    return results
+
+
+# ====================== 内置截面类型 ======================
+register_section_type(SectionType(
+    name="矩形",
+    keys=("b", "h", "fcuk", "fy_grade", "fyc_grade", "Ast", "ast", "Asc", "asc", "γ0"),
+    solver=beam_rect_fc,
+    batch="concrete.core.beam_batch:beam_rect_fc_batch",
+    report=report_beam_rect_fc,
+    result_keys=RESULT_KEYS + ("check",),
+))
+
+register_section_type(SectionType(
+    name="T形",
+    keys=("b", "h", "bf", "hf", "fcuk", "fy_grade", "fyc_grade", "Ast", "ast", "Asc", "asc", "γ0"),
+    solver=beam_t_fc,
+    batch="concrete.core.beam_batch:beam_t_fc_batch",
+    report=report_beam_t_fc,
+    result_keys=("flag",) + RESULT_KEYS + ("check",),
+    flags=T_FLAGS,
+))
+
+# 箱形截面b为两侧腹板厚度之和，与工字形截面采用同一计算函数
+for _name, _report in (("工字形", report_beam_i_fc), ("箱形", report_beam_box_fc)):
+    register_section_type(SectionType(
+        name=_name,
+        keys=("b", "h", "bf", "hf", "bft", "hft", "fcuk", "fy_grade", "fyc_grade", "Ast", "ast", "Asc", "asc", "γ0"),
+        solver=beam_i_fc,
+        batch="concrete.core.beam_batch:beam_i_fc_batch",
+        report=_report,
+        result_keys=("flag",) + RESULT_KEYS + ("check",),
+        flags=I_FLAGS,
+    ))
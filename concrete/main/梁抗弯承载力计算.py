@@ -1,21 +1,29 @@
 # -*- coding: utf-8 -*-
 import sys
 import os
-import pandas as pd
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 # 添加项目根目录到sys.path，确保能找到concrete模块
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
-# 导入核心计算/报告模块
-from concrete.core.beam_rect_fc import beam_rect_fc
-from concrete.core.beam_t_fc import beam_t_fc
-from concrete.core.report_beam import report_beam_rect_fc, report_beam_t_fc
+# 导入核心计算/报告模块（均为纯标准库实现，pandas/openpyxl仅在读写Excel时导入）
+from common.exceptions import ErrorCode, error_code
+from common.utils import is_missing
+from concrete.core.records import PARAM_KEYS, SectionInput
+from concrete.core.section_types import RESULT_KEYS, SECTION_TYPES, get_section_type, solve_grouped
 
 # 导入配置和工具函数
 from concrete.config import (
     EXCEL_INPUT_PATH,
     EXCEL_OUTPUT_PATH,
+    INPUT_AUTO_FIX,
+    RESULT_EXPORT_PATH,
+    REPORT_OUTPUT_NAME,
+    REPORT_OUTPUT_PATH,
+    REPORT_WORKERS,
     OUTPUT_DIR,
     GAMMA_RE,
     OUTPUT_COLS
@@ -26,56 +34,79 @@ from concrete.core.beam_utils import (
     prepare_calculation_data,
     save_excel_result_with_style
 )
+from concrete.core.project_db import ProjectDB, is_project
+from concrete.core.report_writer import ReportBundle, ReportWriter, read_report
 
+# 结果列（result_columns的输出，GUI截面索引按这些列查询）
+RESULT_COLS = ("R/S", "ξ/ξb", "Mu", "判别")
 
-def calculate_single_item(item, index, total_count):
+# 进程池生成计算书时每个任务的截面数
+REPORT_CHUNK = 2000
+
+# 列式结果导出的列（result_table的输出）：输入参数、全精度计算结果、判别、R/S及错误码、错误信息
+EXPORT_INPUT_COLS = ("sec_num", "sec_type") + PARAM_KEYS + ("M", "is_seismic")
+EXPORT_RESULT_COLS = RESULT_KEYS[:5] + ("MuE",) + RESULT_KEYS[5:] + ("flag", "R/S", "error_code", "error")
+
+
+def _params(item):
+    """计算参数：SectionInput直接按字段取参数，计算参数字典取calc_params"""
+    return item if isinstance(item, SectionInput) else item["calc_params"]
+
+
+def _rs_ratio(Mu, M, is_seismic):
+    """抗力效应比R/S：地震作用组合时使用MuE/M，否则使用Mu/M（M不大于0时为0）"""
+    if M <= 0:
+        return 0
+    return Mu / GAMMA_RE / M if is_seismic == 1 else Mu / M
+
+
+def calculate_summary(item):
+    """
+    单截面快速验算：只计算承载力及抗力效应比，不生成计算书（供GUI实时计算）
+    :param item: 计算参数项（SectionInput或计算参数字典）
+    :return: tuple - (x, Mu, MuE, rs_ratio)
+    :raises ParameterError: 截面类型不支持时抛出异常
+    :raises CalculationError: 计算函数抛出的异常
+    """
+    result = get_section_type(item["sec_type"]).solve(_params(item))
+    return result.x, result.Mu, result.Mu / GAMMA_RE, _rs_ratio(result.Mu, item["M"], item["is_seismic"])
+
+
+def calculate_single_item(item, index, total_count, result=None):
     """
     计算单个数据项
-    :param item: 计算参数项
+    :param item: 计算参数项（SectionInput或计算参数字典）
     :param index: 索引
     :param total_count: 总数量
+    :param result: 已按截面类型分组计算的结果记录（solve_items的结果项），None时逐截面计算
     :return: tuple - (x, Mu, M, rs_ratio, report, error_msg)
     """
-    sec_num = item["sec_num"] if not pd.isna(item["sec_num"]) else ""
-    gamma_0 = item["γ0"]
+    sec_num = item["sec_num"] if not is_missing(item["sec_num"]) else ""
     M = item["M"]  # 弯矩设计值
     sec_num_display = f"序号：{index + 1}      编号：{sec_num}      截面类型：{item['sec_type']}"
-    calc_p = item["calc_params"]
 
-    try:
-        if item["sec_type"] == "矩形":
-            rect_calc_p = calc_p[0:2] + calc_p[4:]  # 跳过bf和hf
-            result = beam_rect_fc(*rect_calc_p)
-            x = result[0]
-            Mu = result[4]
-            # 计算抗力效应比R/S：地震作用组合时使用MuE/M，否则使用Mu/M
-            is_seismic = item["is_seismic"]
-            MuE = Mu / GAMMA_RE
-            rs_ratio = (MuE / M if is_seismic == 1 else Mu / M) if M > 0 else 0
-            # 创建包含M和rs_ratio的扩展结果
-            extended_result = result + (M, rs_ratio)
-            # 将is_seismic参数传递给报告生成函数
-            report = report_beam_rect_fc(sec_num_display, rect_calc_p, extended_result, is_seismic)
-            return x, Mu, M, rs_ratio, report, None
-
-        elif item["sec_type"] == "T形":
-            result = beam_t_fc(*calc_p)
-            x = result[1]
-            Mu = result[5]
-            # 计算抗力效应比R/S：地震作用组合时使用MuE/M，否则使用Mu/M
-            is_seismic = item["is_seismic"]
-            MuE = Mu / GAMMA_RE
-            rs_ratio = (MuE / M if is_seismic == 1 else Mu / M) if M > 0 else 0
-            # 创建包含M和rs_ratio的扩展结果
-            extended_result = result + (M, rs_ratio)
-            # 将is_seismic参数传递给报告生成函数
-            report = report_beam_t_fc(sec_num_display, calc_p, extended_result, is_seismic)
-            return x, Mu, M, rs_ratio, report, None
+    if item.get("error"):
+        error_msg = f"第{index + 1}行：{item['error']}"
+        return 0, 0, 0, 0, f"【错误】{error_msg}", error_msg
 
-        else:
-            error_msg = f"第{index + 1}行：截面类型'{item['sec_type']}'不支持"
-            report = f"【错误】{error_msg}"
-            return 0, 0, 0, 0, report, error_msg
+    section = SECTION_TYPES.get(item["sec_type"])
+    if section is None:
+        error_msg = f"第{index + 1}行：截面类型'{item['sec_type']}'不支持"
+        report = f"【错误】{error_msg}"
+        return 0, 0, 0, 0, report, error_msg
+
+    try:
+        args = section.args(_params(item))
+        if result is None:
+            result = section.solve_args(args)
+        elif isinstance(result, Exception):
+            raise result
+        is_seismic = item["is_seismic"]
+        rs_ratio = _rs_ratio(result.Mu, M, is_seismic)
+        # 计算书取结果记录及截面的材料参数记录（与计算函数所用材料参数相同）
+        inp = item if isinstance(item, SectionInput) else SectionInput.from_item(item)
+        report = section.report(sec_num_display, args, result, is_seismic, M, rs_ratio, inp.materials)
+        return result.x, result.Mu, M, rs_ratio, report, None
 
     except Exception as e:
         error_msg = f"第{index + 1}行：{str(e)}"
@@ -83,17 +114,176 @@ def calculate_single_item(item, index, total_count):
         return 0, 0, 0, 0, report, error_msg
 
 
-def main():
+def solve_items(param):
+    """
+    按截面类型分组批量计算（每种类型调用一次批量计算函数）
+    :param param: 计算参数列表（prepare_calculation_data输出）
+    :return: list - 与param顺序一致的计算结果记录（FlexureResult）或异常，作为calculate_single_item的result参数；
+             输入已有错误或截面类型不支持的项为None
+    """
+    index = [i for i, item in enumerate(param) if not item.get("error") and item["sec_type"] in SECTION_TYPES]
+    results = [None] * len(param)
+    solved = solve_grouped([(param[i]["sec_type"], _params(param[i])) for i in index])
+    for i, result in zip(index, solved):
+        results[i] = result
+    return results
+
+
+def _render_chunk(items, results, start, total_count):
+    """进程池任务：生成一块截面的calculate_single_item结果"""
+    return [calculate_single_item(item, start + i, total_count, result)
+            for i, (item, result) in enumerate(zip(items, results))]
+
+
+def render_items(param, results, workers=0, chunk_size=REPORT_CHUNK):
+    """
+    按输入顺序逐项生成calculate_single_item的结果（含计算书）
+    :param param: 计算参数列表
+    :param results: solve_items的计算结果
+    :param workers: 进程数，0为在当前进程逐个生成；大于0时分块在进程池中生成，
+                    同时提交的任务不超过进程数的2倍（限制未写出的计算书占用的内存）
+    :param chunk_size: 每个任务的截面数
+    :return: generator - (x, Mu, M, rs_ratio, report, error_msg)，顺序与param一致
+    """
+    total_count = len(param)
+    if not workers or total_count <= chunk_size:
+        for idx, item in enumerate(param):
+            yield calculate_single_item(item, idx, total_count, results[idx])
+        return
+    starts = iter(range(0, total_count, chunk_size))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for start in starts:
+            pending.append(pool.submit(_render_chunk, param[start:start + chunk_size],
+                                       results[start:start + chunk_size], start, total_count))
+            if len(pending) >= 2 * workers:
+                break
+        while pending:
+            rendered = pending.popleft().result()
+            start = next(starts, None)
+            if start is not None:
+                pending.append(pool.submit(_render_chunk, param[start:start + chunk_size],
+                                           results[start:start + chunk_size], start, total_count))
+            yield from rendered
+
+
+def result_columns(param, results):
+    """
+    计算结果整理为结果列（供GUI截面索引查询）
+    :param param: 计算参数列表
+    :param results: solve_items的计算结果
+    :return: dict - {"R/S": [...], "ξ/ξb": [...], "Mu": [...], "判别": [...]}，计算出错的行R/S、ξ/ξb、Mu为nan，判别为"错误"
+    """
+    columns = {col: [] for col in RESULT_COLS}
+    for item, result in zip(param, results):
+        if result is None or isinstance(result, Exception):
+            rs_ratio, ratio, Mu, flag = float("nan"), float("nan"), float("nan"), "错误"
+        else:
+            Mu = result.Mu
+            rs_ratio = _rs_ratio(Mu, item["M"], item["is_seismic"])
+            ratio = result.ξ / result.ξb
+            flag = result.flag or ""
+        columns["R/S"].append(rs_ratio)
+        columns["ξ/ξb"].append(ratio)
+        columns["Mu"].append(Mu)
+        columns["判别"].append(flag)
+    return columns
+
+
+def result_table(param, results):
+    """
+    全部输入参数及全精度计算结果整理为按列存储的结果表（供列式结果导出）
+    :param param: 计算参数列表
+    :param results: solve_items的计算结果
+    :return: dict - {列名: 各行取值}，列为EXPORT_INPUT_COLS + EXPORT_RESULT_COLS；
+             计算出错的行结果为nan，error_code为common.exceptions.ErrorCode，error为错误信息
+    """
+    nan = float("nan")
+    table = {col: [] for col in EXPORT_INPUT_COLS + EXPORT_RESULT_COLS}
+    for item, result in zip(param, results):
+        inp = item if isinstance(item, SectionInput) else SectionInput.from_item(item)
+        for col in EXPORT_INPUT_COLS:
+            table[col].append(getattr(inp, col))
+        if is_missing(inp.sec_num):
+            table["sec_num"][-1] = ""
+        section = SECTION_TYPES.get(item["sec_type"])
+        if item.get("error"):
+            code, error = error_code(item["error"]), item["error"]
+        elif section is None:
+            code, error = ErrorCode.SECTION_TYPE, f"截面类型'{item['sec_type']}'不支持"
+        elif isinstance(result, Exception):
+            code, error = error_code(result), str(result)
+        elif result is None:
+            code, error = ErrorCode.CALCULATION, "未计算"
+        else:
+            code, error = ErrorCode.OK, ""
+        if code != ErrorCode.OK:
+            for col in RESULT_KEYS + ("MuE", "R/S"):
+                table[col].append(nan)
+            table["flag"].append("错误")
+            table["error_code"].append(int(code))
+            table["error"].append(error)
+            continue
+        for key in RESULT_KEYS:
+            table[key].append(getattr(result, key))
+        table["MuE"].append(result.Mu / GAMMA_RE)
+        table["flag"].append(result.flag or "")
+        table["R/S"].append(_rs_ratio(result.Mu, item["M"], item["is_seismic"]))
+        table["error_code"].append(0)
+        table["error"].append("")
+    return table
+
+
+def save_project_results(db_path, param, results, started=None, source=""):
+    """
+    计算结果写入项目数据库（结果表，同时记录本次计算信息及使用的材料参数）
+    :param db_path: 项目数据库路径
+    :param param: 计算参数列表（由数据库读取，与截面按行顺序一一对应）
+    :param results: solve_items的计算结果
+    :param started: 计算开始时间
+    :param source: 计算来源
+    :return: dict - result_columns的结果列
+    """
+    columns = result_columns(param, results)
+    stored = dict(columns, x=[], error=[], MuE=[Mu / GAMMA_RE for Mu in columns["Mu"]])
+    materials = set()
+    for item, result in zip(param, results):
+        if result is None or isinstance(result, Exception):
+            stored["x"].append(float("nan"))
+            stored["error"].append(item.get("error") or (
+                str(result) if isinstance(result, Exception) else f"截面类型'{item['sec_type']}'不支持"))
+            continue
+        stored["x"].append(result.x)
+        stored["error"].append(None)
+        if isinstance(item, SectionInput):
+            materials.add(item.materials)
+    with ProjectDB(db_path) as db:
+        db.save_results(stored, source=source, started=started, materials=materials)
+    return columns
+
+
+def main(input_path=None, bundle_path=None, workers=REPORT_WORKERS, fix=INPUT_AUTO_FIX):
     """
     主函数
+    :param input_path: 数据文件（.xlsx）或项目数据库（.db）路径，缺省时为EXCEL_INPUT_PATH
+    :param bundle_path: 分册计算书（每个截面一个文件）输出路径，.zip为压缩包，否则为目录；None时不输出
+    :param workers: 生成计算书的进程数，0为在当前进程逐个生成
+    :param fix: 是否自动修正计算数据（T形截面bf或hf为0时按矩形截面计算）
     """
     print("🚀 梁抗弯承载力计算程序启动...")
     start_time = datetime.now()
+    input_path = input_path or EXCEL_INPUT_PATH
+    project = is_project(input_path)
 
-    # -------------------------- 读取Excel A-P列数据 --------------------------
-    print("📖 正在读取Excel文件...")
-    validate_file_exists(EXCEL_INPUT_PATH)
-    df_input = read_excel_data(EXCEL_INPUT_PATH)
+    # -------------------------- 读取A-P列数据 --------------------------
+    validate_file_exists(input_path)
+    if project:
+        print("📖 正在读取项目数据库...")
+        with ProjectDB(input_path) as db:
+            df_input = db.read_frame()
+    else:
+        print("📖 正在读取Excel文件...")
+        df_input = read_excel_data(input_path)
 
     # -------------------------- 准备计算数据 --------------------------
     param, result_data = prepare_calculation_data(df_input)
@@ -104,27 +294,35 @@ def main():
 
     print(f"📊 发现 {len(param)} 组待计算数据")
 
+    # -------------------------- 校验计算数据 --------------------------
+    # 整列校验后剔除必然出错的行（报告中列出错误），fix为True时T形截面翼缘尺寸为0按矩形截面计算
+    from concrete.core.input_check import check_items
+    quality = check_items(param, fix=fix)
+    quality.mark_errors(param)
+    print(f"🔍 数据校验：{quality.summary()}")
+
     # -------------------------- 生成OUT结果文件 --------------------------
     target_dir = OUTPUT_DIR
     os.makedirs(target_dir, exist_ok=True)
-    file_name = "梁抗弯承载力计算结果.out"
-    file_path = os.path.join(target_dir, file_name)
+    file_path = os.path.join(target_dir, REPORT_OUTPUT_NAME)
 
     local_time = start_time.strftime("%Y-%m-%d %H:%M:%S")
 
     print("🔄 开始计算...")
     error_count = 0
 
-    with open(file_path, "w", encoding="utf-8") as f:
+    # 计算书按截面记入索引（文件名.idx），之后可按截面编号直接读取；分册计算书与.out同时写出
+    # （出错时同样关闭zip，已写入的计算书仍可读取）
+    with ReportWriter(file_path) as f, (ReportBundle(bundle_path) if bundle_path else nullcontext()) as bundle:
         f.write(f"{'*' * 52}\n")
         f.write(f"计算时间：{local_time}\n")
         f.write(f"共{len(param)}组截面梁计算数据\n")
         f.write(f"{'*' * 52}\n")
 
-        # 计算每行数据
-        for idx, item in enumerate(param):
-            # 计算单个数据项
-            x, Mu, M, rs_ratio, report, error_msg = calculate_single_item(item, idx, len(param))
+        # 按截面类型分组批量计算，再按输入顺序生成计算书（workers大于0时由进程池生成）
+        results = solve_items(param)
+        for idx, (item, rendered) in enumerate(zip(param, render_items(param, results, workers))):
+            x, Mu, M, rs_ratio, report, error_msg = rendered
 
             # 记录错误
             if error_msg:
@@ -140,8 +338,11 @@ def main():
             result_data[idx][OUTPUT_COLS["mue_col"]] = round(MuE, 2)
             result_data[idx][OUTPUT_COLS["rs_col"]] = round(rs_ratio, 2)
 
-            # 写入out文件
-            f.write(report + "\n")
+            # 写入out文件及分册计算书
+            sec_num = item["sec_num"] if not is_missing(item["sec_num"]) else ""
+            f.add_report(sec_num, report)
+            if bundle is not None:
+                bundle.add(idx, sec_num, report)
 
         # 写入总结信息
         f.write(f"\n{'=' * 60}\n")
@@ -149,14 +350,29 @@ def main():
         f.write(f"总计: {len(param)} 组数据，其中 {error_count} 组计算出错\n")
         f.write(f"结果文件: {file_path}\n")
 
+    if bundle is not None:
+        print(f"📦 分册计算书已保存到: {bundle_path}（{bundle.count}个截面）")
     print(f"✅ 计算完成，生成报告文件: {file_path}")
     if error_count > 0:
         print(f"⚠️  注意: 有 {error_count} 组数据计算出错，请查看报告文件")
 
     # -------------------------- 生成Excel结果文件 --------------------------
     print("💾 正在保存Excel结果...")
-    save_excel_result_with_style(result_data, EXCEL_OUTPUT_PATH, EXCEL_INPUT_PATH)
+    if project:
+        # 结果写入项目数据库，Excel结果文件由数据库导出（数据文件表头+Q-T结果列）
+        save_project_results(input_path, param, results, start_time, "梁抗弯承载力计算.py")
+        with ProjectDB(input_path) as db:
+            db.export_workbook(EXCEL_OUTPUT_PATH, results=True)
+        print(f"💾 计算结果已保存到项目数据库: {input_path}")
+    else:
+        save_excel_result_with_style(result_data, EXCEL_OUTPUT_PATH, input_path)
     print("💾 Excel结果文件保存完毕")
+
+    # -------------------------- 生成列式结果目录 --------------------------
+    # 全部输入参数及全精度结果按列写入.npy，分析程序按内存映射载入，不再解析Excel
+    from concrete.core.result_export import write_columns
+    write_columns(result_table(param, results), RESULT_EXPORT_PATH, source=os.path.basename(input_path))
+    print(f"💾 列式结果已保存到: {RESULT_EXPORT_PATH}")
     # -------------------------- 程序结束 --------------------------
     end_time = datetime.now()
     duration = (end_time - start_time).total_seconds()
@@ -167,7 +383,29 @@ def main():
     print(f"📁 输出文件:")
     print(f"   📄 Excel结果: {EXCEL_OUTPUT_PATH}")
     print(f"   📄 详细报告: {file_path}")
+    print(f"   📄 列式结果: {RESULT_EXPORT_PATH}")
+
+
+def show_report(sec_num, report_path=None):
+    """
+    按计算书索引显示某个截面的计算书（命令行：梁抗弯承载力计算.py --report 截面编号 [计算书文件]）
+    :param sec_num: 截面编号
+    :param report_path: 计算书文件，缺省时为本程序输出的计算书
+    """
+    report = read_report(report_path or REPORT_OUTPUT_PATH, sec_num)
+    print(report if report is not None else f"❌ 计算书中没有截面: {sec_num}")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 2 and sys.argv[1] == "--report":
+        show_report(*sys.argv[2:4])
+    else:
+        import argparse
+        parser = argparse.ArgumentParser(description="梁抗弯承载力批量计算")
+        parser.add_argument("input", nargs="?", help="数据文件（.xlsx）或项目数据库（.db），缺省为配置的数据文件")
+        parser.add_argument("--bundle", help="分册计算书输出路径（每个截面一个文件），.zip为压缩包，否则为目录")
+        parser.add_argument("--workers", type=int, default=REPORT_WORKERS, help="生成计算书的进程数，0为在当前进程生成")
+        parser.add_argument("--fix", action=argparse.BooleanOptionalAction, default=INPUT_AUTO_FIX,
+                            help="计算前自动修正计算数据（T形截面bf或hf为0时按矩形截面计算）")
+        args = parser.parse_args()
+        main(args.input, args.bundle, args.workers, args.fix)
\ No newline at end of file
@@ -0,0 +1,382 @@
+# -*- coding: utf-8 -*-
+"""
+梁抗弯承载力本地计算服务
+常驻进程，基于asyncio提供HTTP/1.1接口（TCP或Unix套接字，仅用标准库），
+避免每次调用重复启动Python及导入pandas/openpyxl；
+同一时间窗口内并发的小请求合并为一次向量化批量计算，材料参数缓存常驻内存。
+
+接口（POST，JSON请求体，返回JSON）：
+  /rect    矩形截面抗弯承载力，参数同beam_rect_fc（b, h, fcuk, fy_grade, fyc_grade, Ast, ast, Asc, asc, γ0）
+  /t       T形截面抗弯承载力，参数同beam_t_fc（另含bf, hf）
+  /rebar   平法标注解析及合力点计算（notation, pos=bottom/top, c, dv, sn）
+  /report  计算书（sec_num, sec_type, M, is_seismic, γ0, calc_params，同批量计算数据项）
+  请求体可为单个对象，也可为{"items": [...]}形式的列表
+  GET /health、GET /stats 用于存活检查及合并批次统计
+
+用法：python -m concrete.main.梁抗弯计算服务 [--host 127.0.0.1] [--port 8765] [--unix PATH] [--window-ms 0]
+"""
+import sys
+import os
+import json
+import socket
+import asyncio
+import argparse
+import http.client
+from functools import lru_cache
+
+# 添加项目根目录到sys.path，确保能找到concrete模块
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from concrete.core.rebar_thickness import parse_rows, reverse_top_rebar, calc_core
+from concrete.core.section_types import SECTION_TYPES, TEXT_KEYS, _solve_group
+
+# 默认服务地址
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# 各截面类型的参数名（与beam_rect_fc/beam_t_fc参数顺序一致，见截面类型注册表）
+RECT_KEYS = SECTION_TYPES["矩形"].keys
+T_KEYS = SECTION_TYPES["T形"].keys
+
+
+# ====================== 1. 请求合并 ======================
+class RequestCoalescer:
+    """
+    请求合并器：在时间窗口内收集同类请求，到期后一次性批量求解
+    window为0时在事件循环下一轮处理，即合并同一轮到达的全部请求
+    """
+
+    def __init__(self, solve, window=0.0):
+        """
+        :param solve: 批量求解函数，输入请求列表，返回等长结果列表
+        :param window: 合并时间窗口(s)
+        """
+        self._solve = solve
+        self._window = window
+        self._pending = []
+        self._handle = None
+        self.requests = 0
+        self.batches = 0
+
+    def submit(self, payload):
+        """提交单个请求，返回结果Future"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((payload, future))
+        if self._handle is None:
+            if self._window > 0:
+                self._handle = loop.call_later(self._window, self._flush)
+            else:
+                self._handle = loop.call_soon(self._flush)
+        return future
+
+    def _flush(self):
+        """批量求解当前窗口内的全部请求（求解函数逐项给出错误，异常时全部请求返回该异常）"""
+        pending, self._pending, self._handle = self._pending, [], None
+        self.requests += len(pending)
+        self.batches += 1
+        try:
+            results = self._solve([payload for payload, _ in pending])
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+
+
+# ====================== 2. 批量求解 ======================
+def _item_args(item, keys):
+    """
+    由单个请求整理计算函数参数（不修改请求数据）
+    :return: list - 计算函数参数
+    :raises ValueError: 请求不是对象、缺少参数或数值参数无效时抛出异常（信息返回给该请求）
+    """
+    if not isinstance(item, dict):
+        raise ValueError("请求项须为JSON对象")
+    if "γ0" not in item and "gamma0" in item:
+        item = dict(item, γ0=item["gamma0"])
+    missing = [k for k in keys if k not in item]
+    if missing:
+        raise ValueError(f"缺少参数: {', '.join(missing)}")
+    args = []
+    for k in keys:
+        value = item[k]
+        if k in TEXT_KEYS:
+            args.append(str(value))
+            continue
+        try:
+            if isinstance(value, bool):
+                raise TypeError
+            args.append(float(value))
+        except (TypeError, ValueError):
+            raise ValueError(f"参数须为数值: {k}={value!r}") from None
+    return args
+
+
+def solve_section(items, name):
+    """
+    按截面类型批量求解请求：逐项校验参数，有效的请求经截面类型分组计算（少量请求或计算过程无效的行逐截面计算），
+    出错的请求只在该项返回{"error": 错误信息}
+    :param items: 请求列表
+    :param name: 截面类型名
+    :return: list - 与items等长的结果字典
+    """
+    section = SECTION_TYPES[name]
+    results = [None] * len(items)
+    index, rows = [], []
+    for i, item in enumerate(items):
+        try:
+            rows.append(_item_args(item, section.keys))
+            index.append(i)
+        except ValueError as e:
+            results[i] = {"error": str(e)}
+    keys = section.result_keys
+    for i, result in zip(index, _solve_group(section, rows)):
+        if isinstance(result, Exception):
+            results[i] = {"error": str(result)}
+        else:
+            results[i] = {k: getattr(result, k) for k in keys if k != "check"}
+            results[i]["check"] = result.check
+    return results
+
+
+def solve_rect(items):
+    """批量求解矩形截面请求"""
+    return solve_section(items, "矩形")
+
+
+def solve_t(items):
+    """批量求解T形截面请求"""
+    return solve_section(items, "T形")
+
+
+@lru_cache(maxsize=4096)
+def _rebar_layout(notation, pos, c, dv, sn):
+    """平法标注解析及合力点计算（按标注及参数缓存）"""
+    r = parse_rows(notation)
+    r_calc = reverse_top_rebar(r) if pos == "top" else r
+    res = calc_core(r_calc, c, dv, sn)
+    return {"rows": [row.text for row in res["r"]], "At": res["At_fmt"], "xc": res["xc_fmt"],
+            "rc": [round(v, 2) for v in res["rc_list"]]}
+
+
+def solve_rebar(items):
+    """求解平法标注请求"""
+    results = []
+    for item in items:
+        try:
+            results.append(_rebar_layout(str(item["notation"]), item.get("pos", "bottom"),
+                                         item.get("c", 20), item.get("dv", 10), item.get("sn", 25)))
+        except Exception as e:
+            results.append({"error": str(e)})
+    return results
+
+
+def solve_report(items):
+    """生成计算书，逐项调用批量计算主程序的calculate_single_item"""
+    from concrete.main.梁抗弯承载力计算 import calculate_single_item
+
+    results = []
+    for idx, item in enumerate(items):
+        if not isinstance(item, dict):
+            results.append({"error": "请求项须为JSON对象"})
+            continue
+        try:
+            x, Mu, M, rs_ratio, report, error_msg = calculate_single_item(item, item.get("index", idx), len(items))
+        except KeyError as e:
+            results.append({"error": f"缺少参数: {e}"})
+            continue
+        except Exception as e:
+            results.append({"error": str(e)})
+            continue
+        out = {"x": x, "Mu": Mu, "M": M, "rs_ratio": rs_ratio, "report": report}
+        if error_msg:
+            out["error"] = error_msg
+        results.append(out)
+    return results
+
+
+# ====================== 3. HTTP服务 ======================
+class CalcService:
+    """梁抗弯承载力计算服务"""
+
+    def __init__(self, window=0.0):
+        """
+        :param window: 请求合并时间窗口(s)，默认0即合并同一轮事件循环内到达的请求
+        """
+        self.coalescers = {
+            "/rect": RequestCoalescer(solve_rect, window),
+            "/t": RequestCoalescer(solve_t, window),
+            "/rebar": RequestCoalescer(solve_rebar, window),
+            "/report": RequestCoalescer(solve_report, window),
+        }
+        self._warm_up()
+
+    @staticmethod
+    def _warm_up():
+        """预热材料参数缓存及批量计算模块"""
+        from concrete.core import beam_batch
+        from concrete.core.concrete import CONC_BASE
+        from concrete.core.rebar import REBAR_PARAMS
+
+        for grade in CONC_BASE:
+            beam_batch.concrete_row(float(grade))
+        for grade in REBAR_PARAMS:
+            beam_batch.rebar_row(grade)
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None):
+        """
+        启动服务
+        :param unix_path: Unix套接字路径（提供时忽略host/port）
+        :return: asyncio.Server
+        """
+        if unix_path:
+            if os.path.exists(unix_path):
+                os.remove(unix_path)
+            return await asyncio.start_unix_server(self.handle, path=unix_path)
+        return await asyncio.start_server(self.handle, host, port)
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive=True):
+        """写出JSON响应"""
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {http.client.responses.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data)
+        await writer.drain()
+
+    async def handle(self, reader, writer):
+        """处理单个连接（支持keep-alive；请求格式错误返回400，处理出错返回500后关闭连接）"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    method, path = line.decode("latin-1").split()[:2]
+                    headers = {}
+                    while True:
+                        header = await reader.readline()
+                        if header in (b"\r\n", b"\n", b""):
+                            break
+                        key, _, value = header.decode("latin-1").partition(":")
+                        headers[key.strip().lower()] = value.strip()
+                    length = int(headers.get("content-length", 0))
+                except ValueError as e:
+                    await self._respond(writer, 400, {"error": f"请求格式错误: {e}"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    status, payload = await self.dispatch(method, path, body)
+                except Exception as e:
+                    status, payload, keep_alive = 500, {"error": f"服务内部错误: {type(e).__name__}: {e}"}, False
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, path, body):
+        """
+        分发请求
+        :return: tuple - (HTTP状态码, 返回数据)
+        """
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok"}
+        if method == "GET" and path == "/stats":
+            return 200, {p: {"requests": c.requests, "batches": c.batches} for p, c in self.coalescers.items()}
+        coalescer = self.coalescers.get(path)
+        if method != "POST" or coalescer is None:
+            return 404, {"error": f"不支持的接口: {method} {path}"}
+        try:
+            payload = json.loads(body or b"{}")
+        except json.JSONDecodeError as e:
+            return 400, {"error": f"请求体不是有效的JSON: {e}"}
+
+        if isinstance(payload, dict) and isinstance(payload.get("items"), list):
+            items = await asyncio.gather(*(coalescer.submit(item) for item in payload["items"]))
+            return 200, {"items": list(items)}
+        if not isinstance(payload, dict):
+            return 400, {"error": "请求体须为JSON对象"}
+        return 200, await coalescer.submit(payload)
+
+
+# ====================== 4. 客户端 ======================
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """基于Unix套接字的HTTP连接"""
+
+    def __init__(self, path):
+        super().__init__("localhost")
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.unix_path)
+
+
+class ServiceClient:
+    """
+    计算服务客户端（仅依赖标准库，保持长连接）
+    示例：ServiceClient().call("/rect", {"b": 250, "h": 500, ...})
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None):
+        if unix_path:
+            self.conn = _UnixHTTPConnection(unix_path)
+        else:
+            self.conn = http.client.HTTPConnection(host, port)
+            self.conn.connect()
+            self.conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def call(self, path, payload):
+        """
+        调用接口
+        :param path: 接口路径（如"/rect"）
+        :param payload: 请求数据（单个对象或{"items": [...]}）
+        :return: 返回数据
+        """
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.conn.request("POST", path, body, {"Content-Type": "application/json"})
+        return json.loads(self.conn.getresponse().read())
+
+    def close(self):
+        self.conn.close()
+
+
+# ====================== 5. 主程序 ======================
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None, window=0.0):
+    """启动服务并持续运行"""
+    service = CalcService(window)
+    server = await service.start(host, port, unix_path)
+    print(f"🚀 梁抗弯承载力计算服务已启动: {unix_path or f'http://{host}:{port}'}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    """
+    主函数
+    """
+    parser = argparse.ArgumentParser(description="梁抗弯承载力本地计算服务")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="监听地址")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="监听端口")
+    parser.add_argument("--unix", default=None, help="Unix套接字路径（提供时不监听TCP端口）")
+    parser.add_argument("--window-ms", type=float, default=0.0, help="请求合并时间窗口(ms)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.window_ms / 1000))
+    except KeyboardInterrupt:
+        print("\n服务已停止")
+
+
+if __name__ == "__main__":
+    main()
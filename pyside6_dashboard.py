@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+GUI结果分布面板
+按截面表格模型的结果列绘制R/S、ξ/ξb、Mu直方图及M-Mu散点图（按截面类型分组），
+分箱及散点抽样由concrete.core.result_stats整列计算，绘制的柱数、点数与截面数无关；
+点击直方图的柱发出对应的截面索引查询表达式，主窗口据此筛选截面列表
+"""
+from typing import Dict
+
+from PySide6.QtCharts import (QBarSeries, QBarSet, QCategoryAxis, QChart, QChartView, QLineSeries, QScatterSeries,
+                              QValueAxis)
+from PySide6.QtCore import QPointF, Qt, Signal
+from PySide6.QtGui import QCursor, QPainter
+from PySide6.QtWidgets import QDialog, QGridLayout, QHBoxLayout, QLabel, QPushButton, QToolTip, QVBoxLayout
+
+# 直方图：(字段, 标题)
+HIST_FIELDS = (("R/S", "抗力效应比R/S"), ("ξ/ξb", "相对受压区高度ξ/ξb"), ("Mu", "抗弯承载力Mu(kN·m)"))
+
+# 直方图横轴标注的分箱边界数
+AXIS_LABELS = 6
+
+
+def _padded(value_range):
+    """坐标范围两端各留5%（全部点取值相同时按取值的10%展开）"""
+    lo, hi = value_range
+    pad = (hi - lo) * 0.05 or abs(lo) * 0.1 or 1.0
+    return lo - pad, hi + pad
+
+
+class ResultDashboard(QDialog):
+    """结果分布面板（query_selected：点击直方图的柱时发出查询表达式；refresh_requested：点击刷新）"""
+    query_selected = Signal(str)
+    refresh_requested = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("结果分布")
+        self.resize(1000, 700)
+        self.hists = {}
+
+        layout = QVBoxLayout(self)
+        top = QHBoxLayout()
+        self.summary_label = QLabel("")
+        top.addWidget(self.summary_label, 1)
+        refresh_button = QPushButton("刷新")
+        refresh_button.clicked.connect(self.refresh_requested.emit)
+        top.addWidget(refresh_button)
+        layout.addLayout(top)
+
+        grid = QGridLayout()
+        self.hist_views: Dict[str, QChartView] = {}
+        for i, (field, title) in enumerate(HIST_FIELDS):
+            view = self._chart_view(title)
+            self.hist_views[field] = view
+            grid.addWidget(view, i // 2, i % 2)
+        self.scatter_view = self._chart_view("弯矩设计值M - 抗弯承载力Mu")
+        grid.addWidget(self.scatter_view, 1, 1)
+        layout.addLayout(grid, 1)
+
+    @staticmethod
+    def _chart_view(title: str) -> QChartView:
+        chart = QChart()
+        chart.setTitle(title)
+        chart.legend().hide()
+        view = QChartView(chart)
+        view.setRenderHint(QPainter.Antialiasing, False)
+        return view
+
+    def set_distribution(self, hists, scatter, summary) -> None:
+        """
+        更新图表
+        :param hists: {字段: Histogram}（result_distribution的输出）
+        :param scatter: Scatter - 散点抽样结果
+        :param summary: 结果汇总
+        """
+        self.hists = hists
+        self.summary_label.setText(
+            f"共 {summary['总数']} 个截面，计算出错 {summary['出错']} 个，R/S<1 {summary['R/S<1']} 个"
+            f"（点击直方图的柱筛选截面列表）")
+        for field, hist in hists.items():
+            self._set_histogram(self.hist_views[field].chart(), field, hist)
+        self._set_scatter(self.scatter_view.chart(), scatter)
+
+    @staticmethod
+    def _reset_chart(chart: QChart) -> None:
+        chart.removeAllSeries()
+        for axis in chart.axes():
+            chart.removeAxis(axis)
+
+    def _set_histogram(self, chart: QChart, field: str, hist) -> None:
+        self._reset_chart(chart)
+        bins = len(hist.counts)
+        bar_set = QBarSet(field)
+        bar_set.append([float(c) for c in hist.counts])
+        bar_set.clicked.connect(lambda i, f=field: self.query_selected.emit(self.hists[f].query(i)))
+        bar_set.hovered.connect(lambda status, i, f=field: self._show_bin(status, f, i))
+        series = QBarSeries()
+        series.setBarWidth(1.0)
+        series.append(bar_set)
+        chart.addSeries(series)
+
+        # 横轴在各柱左边缘标注分箱边界（首末分箱不设界，不标注外侧边界）
+        axis_x = QCategoryAxis()
+        axis_x.setLabelsPosition(QCategoryAxis.AxisLabelsPositionOnValue)
+        axis_x.setRange(-0.5, max(bins, 1) - 0.5)
+        step = max(1, bins // AXIS_LABELS)
+        for i in range(1, bins, step):
+            axis_x.append(f"{hist.edges[i]:.4g}", i - 0.5)
+        axis_y = QValueAxis()
+        axis_y.setRange(0, max(int(hist.counts.max()) if bins else 0, 1))
+        axis_y.setLabelFormat("%d")
+        axis_y.applyNiceNumbers()
+        chart.addAxis(axis_x, Qt.AlignBottom)
+        chart.addAxis(axis_y, Qt.AlignLeft)
+        series.attachAxis(axis_x)
+        series.attachAxis(axis_y)
+
+    def _show_bin(self, status: bool, field: str, i: int) -> None:
+        if status:
+            hist = self.hists[field]
+            QToolTip.showText(QCursor.pos(), f"{field} {hist.label(i)}：{int(hist.counts[i])} 个截面")
+        else:
+            QToolTip.hideText()
+
+    @staticmethod
+    def _set_scatter(chart: QChart, scatter) -> None:
+        ResultDashboard._reset_chart(chart)
+        axis_x = QValueAxis()
+        axis_x.setTitleText("M(kN·m)")
+        axis_y = QValueAxis()
+        axis_y.setTitleText("Mu(kN·m)")
+        chart.addAxis(axis_x, Qt.AlignBottom)
+        chart.addAxis(axis_y, Qt.AlignLeft)
+        for name, (xs, ys) in scatter.points.items():
+            series = QScatterSeries()
+            series.setName(f"{name}（{scatter.counts[name]}）")
+            series.setMarkerSize(5)
+            chart.addSeries(series)
+            series.attachAxis(axis_x)
+            series.attachAxis(axis_y)
+            # 关联坐标轴后再整体写入点（先写入点再关联坐标轴耗时约为3倍）
+            series.replace([QPointF(x, y) for x, y in zip(xs.tolist(), ys.tolist())])
+
+        # Mu=M参考线（非地震作用组合时线下方的截面R/S<1）
+        lo = min(scatter.x_range[0], scatter.y_range[0])
+        hi = max(scatter.x_range[1], scatter.y_range[1])
+        line = QLineSeries()
+        line.setName("Mu=M")
+        line.append(lo, lo)
+        line.append(hi, hi)
+        chart.addSeries(line)
+        line.attachAxis(axis_x)
+        line.attachAxis(axis_y)
+        axis_x.setRange(*_padded(scatter.x_range))
+        axis_y.setRange(*_padded(scatter.y_range))
+        axis_x.applyNiceNumbers()
+        axis_y.applyNiceNumbers()
+        chart.legend().setVisible(bool(scatter.points))
@@ -4,33 +4,61 @@
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QLabel, QLineEdit, QPushButton,
     QVBoxLayout, QHBoxLayout, QGroupBox, QStatusBar, QComboBox, QTextEdit,
-    QFileDialog, QMessageBox, QScrollArea, QListWidget, QFrame, QCheckBox
+    QFileDialog, QMessageBox, QScrollArea, QProgressBar, QSpinBox, QTableView, QAbstractItemView, QHeaderView, QFrame, QCheckBox
 )
-from PySide6.QtCore import Qt, QEvent
+from PySide6.QtCore import Qt, QEvent, QTimer
 import sys
 import os
-import pandas as pd
-
-# 导入计算模块
-from concrete.main.梁抗弯承载力计算 import calculate_single_item
-from concrete.core.beam_utils import prepare_calculation_data, save_excel_result_with_style
 
 # 添加项目根目录到sys.path
 sys.path.append(os.path.abspath(os.path.dirname(__file__)))
 
+# 导入计算模块（纯标准库实现；pandas/openpyxl在读写数据文件时才导入，加快窗口显示）
+from concrete.main.梁抗弯承载力计算 import calculate_single_item, calculate_summary, solve_items, RESULT_COLS, \
+    result_table, save_project_results
+from concrete.core.section_types import SECTION_TYPES
+from concrete.core.records import SectionInput
+from concrete.core.report_writer import ReportIndex, ReportWriter
+from common.utils import is_missing
+from concrete.config import GAMMA_RE
+from pyside6_section_model import SectionTableModel, SectionProxyModel, SaveWorker, EditJournal, PANEL_COLS, \
+    PANEL_DEFAULTS, journal_matches, journal_path, read_journal, update_results
+
+# 实时计算的防抖间隔(ms)：参数停止变化后才计算
+LIVE_CALC_DELAY_MS = 50
+
+# 更新日志文件（用于读取版本号）
+CHANGELOG_PATH = os.path.join(os.path.abspath(os.path.dirname(__file__)), "结构计算程序更新日志.md")
+
 class BeamCalculationGUI(QMainWindow):
     def __init__(self):
         super().__init__()
         # 保存当前选中的截面索引
         self.current_section_index = -1
-        # 从CHANGELOG.md获取版本号
-        self.version = self.get_latest_version()
+        # 截面表格对应的数据文件及后台保存线程
+        self.loaded_data_file = None
+        self.save_worker = None
+        # 修改日志（载入数据文件后记录未保存的改动）及保存开始时的日志记录数
+        self.journal = None
+        self.save_journal_mark = 0
+        # 计算书索引（查看计算书时按文件路径及修改时间缓存）
+        self.report_index = None
+        # 版本号在窗口显示后再读取
+        self.version = None
         self.init_ui()
+        # 窗口显示后再执行耗时的初始化（读取版本号、加载数据文件）
+        QTimer.singleShot(0, self.deferred_init)
+    
+    def deferred_init(self):
+        """窗口显示后的延迟初始化：读取版本号并加载初始数据文件"""
+        self.version = self.get_latest_version()
+        self.setWindowTitle(f"梁抗弯承载力计算程序 v{self.version}")
+        self.load_initial_data_file()
     
     def get_latest_version(self):
-        """从CHANGELOG.md获取最新版本号"""
+        """从更新日志获取最新版本号"""
         try:
-            with open("CHANGELOG.md", "r", encoding="utf-8") as f:
+            with open(CHANGELOG_PATH, "r", encoding="utf-8") as f:
                 for line in f:
                     if line.startswith("## [") and "Unreleased" not in line:
                         # 提取版本号，格式：## [1.2.0] - 2026-01-04
@@ -42,8 +70,8 @@ class BeamCalculationGUI(QMainWindow):
     
     def init_ui(self):
         """初始化用户界面"""
-        # 设置窗口属性，包含版本号
-        self.setWindowTitle(f"梁抗弯承载力计算程序 v{self.version}")
+        # 设置窗口属性（版本号在deferred_init中补充）
+        self.setWindowTitle("梁抗弯承载力计算程序")
         self.setGeometry(100, 100, 1000, 700)
         
         # 创建中央部件
@@ -84,6 +112,13 @@ class BeamCalculationGUI(QMainWindow):
         # 添加到状态栏右侧
         self.status_bar.addPermanentWidget(self.result_status_label)
         
+        # 保存数据进度条（保存时显示）
+        self.save_progress = QProgressBar()
+        self.save_progress.setFixedWidth(120)
+        self.save_progress.setRange(0, 100)
+        self.save_progress.hide()
+        self.status_bar.addPermanentWidget(self.save_progress)
+        
         # 为控件添加悬停提示信息
         self.setup_tooltips()
         
@@ -92,9 +127,6 @@ class BeamCalculationGUI(QMainWindow):
         
         # 为参数输入框添加回车键响应
         self.setup_enter_key_response()
-        
-        # 状态栏创建完成后，再加载数据文件
-        self.load_initial_data_file()
     
     def setup_tooltips(self):
         """设置控件的提示信息"""
@@ -107,6 +139,8 @@ class BeamCalculationGUI(QMainWindow):
             self.h_input: "截面高度，单位：mm",
             self.bf_input: "受压翼缘宽度，单位：mm（仅T形截面可用）",
             self.hf_input: "受压翼缘厚度，单位：mm（仅T形截面可用）",
+            self.bft_input: "受拉翼缘宽度，单位：mm（工字形、箱形截面，无受拉翼缘时填0）",
+            self.hft_input: "受拉翼缘厚度，单位：mm（工字形、箱形截面，无受拉翼缘时填0）",
             self.fcuk_input: "混凝土强度等级，如C30输入30",
             self.fy_combo: "选择受拉钢筋强度等级",
             self.fyc_combo: "选择受压钢筋强度等级",
@@ -121,10 +155,20 @@ class BeamCalculationGUI(QMainWindow):
             self.gamma0_input: "结构重要性系数，一级1.1，二级1.0，三级0.9",
             
             # 右侧批量计算面板
-            self.file_input: "数据文件路径",
+            self.file_input: "数据文件路径（Excel数据文件.xlsx或项目数据库.db）",
+            self.import_project_button: "将Excel数据文件导入为同名项目数据库(.db)并载入，之后读取、保存及批量计算不再解析Excel",
+            self.export_excel_button: "将项目数据库导出为Excel数据文件（含已保存的计算结果）",
             self.result_file_input: "结果文件名（无需扩展名，自动生成.xlsx和.out文件）",
             self.output_result_var: "勾选后将生成结果文件",
-            self.section_list: "显示数据文件中的截面列表",
+            self.report_gzip_check: "批量计算的计算书文件gzip压缩为.out.gz（可由解压软件直接打开）",
+            self.view_report_button: "按计算书索引从批量计算的计算书文件中读取当前截面的计算书",
+            self.section_view: "显示数据文件中的截面列表，点击表头排序",
+            self.filter_input: "查询条件以空格分隔，同时满足：\n"
+                               "  L5 / ^5F：截面编号包含L5 / 以5F开头\n"
+                               "  类型=T形、钢筋=HRB400、判别=第二类T型截面（可用!=）\n"
+                               "  R/S<1、ξ/ξb>0.8、Mu>=300、C>=30、b、h、M等数值比较",
+            self.worst_button: "按R/S从小到大列出最不利的截面",
+            self.dashboard_button: "显示R/S、ξ/ξb、Mu分布直方图及M-Mu散点图，点击直方图的柱筛选截面列表",
             self.result_text: "计算结果输出区域",
             self.save_data_button: "将数据修改保存到数据文件",
             self.add_data_button: "新增截面",
@@ -170,6 +214,8 @@ class BeamCalculationGUI(QMainWindow):
             self.h_input,
             self.bf_input,
             self.hf_input,
+            self.bft_input,
+            self.hft_input,
             self.fcuk_input,
             self.fy_combo,
             self.fyc_combo,
@@ -192,10 +238,72 @@ class BeamCalculationGUI(QMainWindow):
                 widget.returnPressed.connect(self.on_enter_key_pressed)  # 文本框的回车键
             # 为所有控件设置焦点策略，确保能接收焦点，通过事件过滤器处理回车键
             widget.setFocusPolicy(Qt.StrongFocus)  # 确保控件能接收焦点
+            # 参数变化时触发实时计算（防抖）
+            if hasattr(widget, 'textChanged'):
+                widget.textChanged.connect(self.schedule_live_calc)
+            else:
+                widget.currentTextChanged.connect(self.schedule_live_calc)
+    
+    def schedule_live_calc(self, *args):
+        """参数变化：实时计算开启时重新计时，停止输入LIVE_CALC_DELAY_MS后计算一次"""
+        if self.live_calc_check.isChecked():
+            self.live_timer.start()
+    
+    def on_live_calc_toggled(self, checked):
+        """开启实时计算时立即验算当前参数"""
+        if checked:
+            self.live_calculate()
+        else:
+            self.live_timer.stop()
+    
+    def live_calculate(self):
+        """实时计算：只计算承载力及抗力效应比并显示在状态栏，不生成计算书"""
+        try:
+            item = self.panel_item()
+            x, Mu, MuE, rs_ratio = calculate_summary(item)
+            self.result_status_label.setText(self.result_message(item, x, Mu, MuE, rs_ratio))
+        except ValueError as e:
+            self.result_status_label.setText(f"参数输入错误: {str(e)}")
+        except Exception as e:
+            self.result_status_label.setText(f"计算错误: {str(e)}")
+    
+    def result_message(self, item, x, Mu, MuE, rs_ratio):
+        """状态栏计算结果文字（地震作用组合时显示MuE）"""
+        mu_label, mu_value = ("MuE", MuE) if item.is_seismic == 1 else ("Mu", Mu)
+        return f"编号: {item.sec_num} | x={x:.2f}mm | {mu_label}={mu_value:.2f}kN·m | R/S={rs_ratio:.4f}"
+    
+    def panel_item(self):
+        """
+        由参数面板生成计算参数记录（T形截面bf或hf为0时按矩形截面计算）
+        :return: SectionInput - 计算参数
+        :raises ValueError: 数值输入无效时抛出异常
+        """
+        values = self.read_panel_values()
+        sec_type = values["sec_type"]
+        # 带翼缘的截面类型（T形、工字形、箱形）读取翼缘尺寸，工字形、箱形另读取受拉翼缘尺寸
+        keys = SECTION_TYPES[sec_type].keys if sec_type in SECTION_TYPES else ()
+        if "bft" not in keys:
+            values["bft"] = values["hft"] = 0
+        if "bf" not in keys:
+            values["bf"] = values["hf"] = 0
+        # 如果T形截面的bf或hf为0，自动转为矩形截面处理
+        elif sec_type == "T形" and (values["bf"] <= 0 or values["hf"] <= 0):
+            sec_type = "矩形"
+            values["bf"] = values["hf"] = 0
+        
+        # 使用当前选中的截面编号
+        if 0 <= self.current_section_index < self.section_model.rowCount():
+            sec_num = self.section_model.panel_values(self.current_section_index)["sec_num"]
+        else:
+            sec_num = "单个计算"
+        return SectionInput(sec_num, sec_type, values["b"], values["h"], values["bf"], values["hf"], values["fcuk"],
+                            values["fy_grade"], values["fyc_grade"], values["Ast"], values["ast"], values["Asc"],
+                            values["asc"], values["γ0"], values["bft"], values["hft"], M=values["M"],
+                            is_seismic=values["is_seismic"])
     
     def on_enter_key_pressed(self):
         """回车键按下时的处理：保存参数、更新列表、执行计算"""
-        # 保存当前参数到section_data
+        # 保存当前参数到截面表格
         self.save_current_params_to_data()
         # 执行单截面计算
         self.calculate_single()
@@ -221,7 +329,7 @@ class BeamCalculationGUI(QMainWindow):
         sec_type_layout = QHBoxLayout()
         sec_type_label = QLabel("截面类型:")
         self.sec_type_combo = QComboBox()
-        self.sec_type_combo.addItems(["矩形", "T形"])
+        self.sec_type_combo.addItems(list(SECTION_TYPES))
         self.sec_type_combo.setFixedWidth(100)
         self.sec_type_combo.currentTextChanged.connect(self.on_section_type_changed)
         sec_type_layout.addWidget(sec_type_label)
@@ -264,6 +372,23 @@ class BeamCalculationGUI(QMainWindow):
         hf_layout.addWidget(self.hf_input)
         left_layout.addLayout(hf_layout)
         
+        # 受拉翼缘宽度 bft、厚度 hft（仅工字形、箱形截面显示）
+        bft_layout = QHBoxLayout()
+        self.bft_label = QLabel("受拉翼缘宽度 bft (mm):")
+        self.bft_input = QLineEdit("0")
+        self.bft_input.setFixedWidth(100)
+        bft_layout.addWidget(self.bft_label)
+        bft_layout.addWidget(self.bft_input)
+        left_layout.addLayout(bft_layout)
+        
+        hft_layout = QHBoxLayout()
+        self.hft_label = QLabel("受拉翼缘厚度 hft (mm):")
+        self.hft_input = QLineEdit("0")
+        self.hft_input.setFixedWidth(100)
+        hft_layout.addWidget(self.hft_label)
+        hft_layout.addWidget(self.hft_input)
+        left_layout.addLayout(hft_layout)
+        
         # 混凝土强度等级
         fcuk_layout = QHBoxLayout()
         fcuk_label = QLabel("混凝土强度等级 C:")
@@ -379,6 +504,15 @@ class BeamCalculationGUI(QMainWindow):
         gamma0_layout.addWidget(self.gamma0_input)
         left_layout.addLayout(gamma0_layout)
         
+        # 实时计算：参数变化后自动验算（只更新状态栏结果，计算书在单截面计算时生成）
+        self.live_calc_check = QCheckBox("实时计算")
+        self.live_calc_check.toggled.connect(self.on_live_calc_toggled)
+        left_layout.addWidget(self.live_calc_check)
+        self.live_timer = QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(LIVE_CALC_DELAY_MS)
+        self.live_timer.timeout.connect(self.live_calculate)
+        
         # 初始设置
         self.on_section_type_changed("矩形")
         
@@ -386,18 +520,23 @@ class BeamCalculationGUI(QMainWindow):
     
     def on_section_type_changed(self, sec_type):
         """截面类型变化时的处理"""
-        if sec_type == "矩形":
-            # 矩形截面，禁用受压翼缘参数
+        section = SECTION_TYPES.get(sec_type)
+        if section is None or "bf" not in section.keys:
+            # 无翼缘截面，禁用受压翼缘参数
             self.bf_input.setEnabled(False)
             self.hf_input.setEnabled(False)
             self.bf_label.setEnabled(False)
             self.hf_label.setEnabled(False)
         else:
-            # T形截面，启用受压翼缘参数
+            # 带翼缘截面，启用受压翼缘参数
             self.bf_input.setEnabled(True)
             self.hf_input.setEnabled(True)
             self.bf_label.setEnabled(True)
             self.hf_label.setEnabled(True)
+        # 受拉翼缘参数只在工字形、箱形截面显示
+        tension = section is not None and "bft" in section.keys
+        for widget in (self.bft_label, self.bft_input, self.hft_label, self.hft_input):
+            widget.setVisible(tension)
     
     def create_right_panel(self, parent_layout):
         """创建右侧批量计算面板"""
@@ -418,9 +557,19 @@ class BeamCalculationGUI(QMainWindow):
         browse_button.setFixedWidth(80)
         browse_button.clicked.connect(self.browse_file)
         
+        # 项目数据库：由Excel数据文件导入，导出为Excel数据文件
+        self.import_project_button = QPushButton("转为项目")
+        self.import_project_button.setFixedWidth(80)
+        self.import_project_button.clicked.connect(self.import_project)
+        self.export_excel_button = QPushButton("导出Excel")
+        self.export_excel_button.setFixedWidth(80)
+        self.export_excel_button.clicked.connect(self.export_project_workbook)
+        
         file_layout.addWidget(file_label)
         file_layout.addWidget(self.file_input)
         file_layout.addWidget(browse_button)
+        file_layout.addWidget(self.import_project_button)
+        file_layout.addWidget(self.export_excel_button)
         right_layout.addLayout(file_layout)
         
         # 结果文件设置 - 只需要输入文件名
@@ -430,8 +579,8 @@ class BeamCalculationGUI(QMainWindow):
         result_file_layout.addWidget(result_file_label)
         result_file_layout.addWidget(self.result_file_input)
         
-        # 添加.xlsx及.out的文字提示
-        file_ext_label = QLabel(".xlsx及.out")
+        # 添加.xlsx、.cols及.out的文字提示
+        file_ext_label = QLabel(".xlsx、.cols及.out")
         result_file_layout.addWidget(file_ext_label)
         
         # 添加将数据修改保存到数据文件按钮
@@ -458,6 +607,13 @@ class BeamCalculationGUI(QMainWindow):
         self.output_result_var = QCheckBox("输出结果文件")
         self.output_result_var.setChecked(True)  # 默认勾选
         output_check_layout.addWidget(self.output_result_var)
+        self.report_gzip_check = QCheckBox("计算书压缩(.gz)")
+        output_check_layout.addWidget(self.report_gzip_check)
+        self.view_report_button = QPushButton("查看计算书")
+        self.view_report_button.setFixedWidth(90)
+        self.view_report_button.clicked.connect(self.show_section_report)
+        output_check_layout.addWidget(self.view_report_button)
+        output_check_layout.addStretch()
         right_layout.addLayout(output_check_layout)
         
         # 主体内容区域 - 列表框和文本输出区
@@ -470,13 +626,54 @@ class BeamCalculationGUI(QMainWindow):
         list_layout.setContentsMargins(5, 5, 5, 5)
         
         # 设置列表框的固定宽度，窗口最大化时保持不变
-        list_frame.setFixedWidth(150)
+        list_frame.setFixedWidth(320)
+        
+        # 截面表格：数据按列存储在模型中，经代理模型排序、筛选
+        self.section_model = SectionTableModel(self)
+        self.section_proxy = SectionProxyModel(self.section_model, self)
+        self.section_view = QTableView()
+        self.section_view.setModel(self.section_proxy)
+        self.section_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.section_view.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.section_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.section_view.verticalHeader().setVisible(False)
+        self.section_view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        # 初始不排序（保持数据文件顺序）
+        self.section_view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.section_view.setSortingEnabled(True)
+        self.section_view.selectionModel().currentRowChanged.connect(self.on_section_selected)
+        
+        # 截面索引（首次查询时建立），数据变化后重新建立
+        self.section_index = None
+        for signal in (self.section_model.modelReset, self.section_model.rowsInserted,
+                       self.section_model.rowsRemoved, self.section_model.dataChanged):
+            signal.connect(self.invalidate_section_index)
+        
+        # 查询输入框
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("查询，如 ^5F R/S<1")
+        self.filter_input.textChanged.connect(self.apply_filter)
+        
+        # 最不利截面
+        worst_layout = QHBoxLayout()
+        self.worst_count = QSpinBox()
+        self.worst_count.setRange(1, 100000)
+        self.worst_count.setValue(20)
+        self.worst_button = QPushButton("最不利截面")
+        self.worst_button.clicked.connect(self.show_worst_sections)
+        worst_layout.addWidget(self.worst_count)
+        worst_layout.addWidget(self.worst_button)
+        
+        # 结果分布面板（首次打开时创建）
+        self.dashboard = None
+        self.dashboard_button = QPushButton("结果分布")
+        self.dashboard_button.clicked.connect(self.show_dashboard)
+        worst_layout.addWidget(self.dashboard_button)
         
-        # 列表框
-        self.section_list = QListWidget()
-        self.section_list.itemClicked.connect(self.on_list_item_clicked)
         list_layout.addWidget(QLabel("截面列表"))
-        list_layout.addWidget(self.section_list)
+        list_layout.addWidget(self.filter_input)
+        list_layout.addLayout(worst_layout)
+        list_layout.addWidget(self.section_view)
         main_content_layout.addWidget(list_frame)  # 固定宽度，不需要比例
         
         # 右侧文本输出区（相应加宽）
@@ -499,15 +696,13 @@ class BeamCalculationGUI(QMainWindow):
         
         parent_layout.addWidget(right_group, 2)
         
-        # 存储数据文件中的截面数据
-        self.section_data = []
         # 初始数据文件路径
         self.default_data_file = default_data_file
     
     def browse_file(self):
         """浏览文件"""
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "选择数据文件", self.default_work_dir, "Excel 文件 (*.xlsx);;所有文件 (*.*)"
+            self, "选择数据文件", self.default_work_dir, "数据文件 (*.xlsx *.db);;Excel 文件 (*.xlsx);;项目数据库 (*.db);;所有文件 (*.*)"
         )
         if file_path:
             self.file_input.setText(file_path)
@@ -515,68 +710,309 @@ class BeamCalculationGUI(QMainWindow):
             self.load_data_file_to_list(file_path)
     
     def load_data_file_to_list(self, file_path):
-        """加载数据文件到列表框"""
+        """加载数据文件到截面表格"""
+        # 当前数据有未保存的修改时先询问是否保存
+        if not self.confirm_unsaved_changes():
+            return
         try:
             self.status_bar.showMessage(f"正在读取数据文件: {os.path.basename(file_path)}")
             
-            # 读取Excel文件
-            df = pd.read_excel(file_path)
-            
-            # 清空列表和数据存储
-            self.section_list.clear()
-            self.section_data.clear()
+            # 整表载入模型（缺失值替换为0），当前截面失效，不再回存面板参数
+            self.close_journal()
+            self.current_section_index = -1
+            self.read_data_file(file_path)
+            self.loaded_data_file = file_path
             
-            # 遍历数据行，添加到列表框
-            for idx, row in df.iterrows():
-                # 构造列表项文本，格式为：序号-编号，使用数据文件中的"截面编号"字段
-                sec_num = str(row.get("截面编号", row.get("sec_num", f"截面{idx+1}")))
-                list_text = f"{idx+1}-{sec_num}"
-                self.section_list.addItem(list_text)
-                
-                # 处理数据，将nan值替换为0
-                row_dict = row.to_dict()
-                # 遍历所有值，将nan替换为0
-                for key, value in row_dict.items():
-                    if pd.isna(value):
-                        row_dict[key] = 0
-                # 存储处理后的数据
-                self.section_data.append(row_dict)
+            self.status_bar.showMessage(f"已读取 {self.section_model.rowCount()} 个截面数据")
             
-            self.status_bar.showMessage(f"已读取 {len(self.section_data)} 个截面数据")
+            # 上次异常退出留下的未保存修改，询问是否恢复，之后的修改继续记录
+            self.open_journal(file_path)
             
             # 默认选择第一个截面
-            if self.section_data:
-                self.on_list_item_clicked(self.section_list.item(0))
+            if self.section_model.rowCount():
+                self.select_section(0)
         
         except Exception as e:
             error_msg = f"读取数据文件失败: {str(e)}"
             self.status_bar.showMessage(error_msg)
             self.result_text.append(error_msg + "\n")
     
-    def on_list_item_clicked(self, item):
-        """列表项点击事件处理"""
-        if not item:
+    def import_project(self):
+        """将当前Excel数据文件导入为同名项目数据库并载入"""
+        from concrete.core.project_db import PROJECT_SUFFIX, import_workbook, is_project
+        file_path = self.file_input.text()
+        if is_project(file_path):
+            self.status_bar.showMessage("当前数据文件已是项目数据库")
             return
-        
+        if not os.path.exists(file_path):
+            self.status_bar.showMessage(f"数据文件不存在: {file_path}")
+            return
+        # 导入读取的是文件中的数据，先处理未保存的修改
+        if not self.confirm_unsaved_changes():
+            return
+        db_path = os.path.splitext(file_path)[0] + PROJECT_SUFFIX
+        if os.path.exists(db_path) and QMessageBox.question(
+                self, "转为项目", f"项目数据库已存在，是否用数据文件替换其中的截面数据？\n{db_path}",
+                QMessageBox.Yes | QMessageBox.No) != QMessageBox.Yes:
+            return
+        try:
+            self.status_bar.showMessage(f"正在导入数据文件: {os.path.basename(file_path)}")
+            import_workbook(file_path, db_path)
+            # 原项目的修改日志对应替换前的数据，不再恢复
+            if os.path.exists(journal_path(db_path)):
+                os.remove(journal_path(db_path))
+        except Exception as e:
+            error_msg = f"导入数据文件失败: {str(e)}"
+            self.status_bar.showMessage(error_msg)
+            self.result_text.append(error_msg + "\n")
+            return
+        self.file_input.setText(db_path)
+        self.load_data_file_to_list(db_path)
+        self.result_text.append(f"已导入项目数据库: {db_path}\n")
+    
+    def export_project_workbook(self):
+        """将载入的项目数据库导出为Excel数据文件（含已保存的计算结果列）"""
+        from concrete.core.project_db import ProjectDB, is_project
+        file_path = self.loaded_data_file
+        if not file_path or not is_project(file_path):
+            self.status_bar.showMessage("请先载入项目数据库(.db)")
+            return
+        # 导出的是数据库中的数据，先处理未保存的修改
+        if not self.confirm_unsaved_changes():
+            return
+        target, _ = QFileDialog.getSaveFileName(
+            self, "导出Excel", os.path.splitext(file_path)[0] + "_导出.xlsx", "Excel 文件 (*.xlsx)"
+        )
+        if not target:
+            return
+        try:
+            self.status_bar.showMessage("正在导出Excel...")
+            with ProjectDB(file_path) as db:
+                count = db.export_workbook(target, results=True)
+            msg = f"已导出 {count} 个截面到: {target}"
+            self.status_bar.showMessage(msg)
+            self.result_text.append(msg + "\n")
+        except Exception as e:
+            error_msg = f"导出Excel失败: {str(e)}"
+            self.status_bar.showMessage(error_msg)
+            self.result_text.append(error_msg + "\n")
+    
+    def read_data_file(self, file_path):
+        """读取数据文件到截面表格模型：Excel整表解析；项目数据库按列读取，并载入已保存的计算结果"""
+        from concrete.core.project_db import ProjectDB, is_project
+        if not is_project(file_path):
+            import pandas as pd
+            self.section_model.load_frame(pd.read_excel(file_path))
+            return
+        with ProjectDB(file_path) as db:
+            self.section_model.load_columns(db.read_columns(fill=0))
+            results = db.read_results(RESULT_COLS)
+        rows = [i for i, flag in enumerate(results["判别"]) if flag is not None]
+        if rows:
+            self.section_model.set_results(rows, {col: [values[i] for i in rows] for col, values in results.items()})
+    
+    def open_journal(self, file_path):
+        """打开数据文件的修改日志：日志中有未保存的修改时询问是否恢复（重放到截面表格，失败时重新读取数据文件）"""
+        records = []
+        state = read_journal(file_path)
+        if state is not None and state[1]:
+            header, records = state
+            text = f"数据文件有上次未保存的修改（{len(records)}条），是否恢复？"
+            if not journal_matches(header, file_path):
+                text += "\n注意：记录修改后数据文件已被改动，恢复的修改可能与截面不对应。"
+            if QMessageBox.question(self, "恢复修改", text, QMessageBox.Yes | QMessageBox.No) == QMessageBox.Yes:
+                try:
+                    self.section_model.replay(records)
+                    msg = f"已恢复 {len(records)} 条未保存的修改"
+                except Exception as e:
+                    self.read_data_file(file_path)
+                    records = []
+                    msg = f"恢复修改失败: {str(e)}"
+                self.status_bar.showMessage(msg)
+                self.result_text.append(msg + "\n")
+            else:
+                records = []
+        self.journal = EditJournal(file_path, records)
+        self.section_model.journal = self.journal
+    
+    def close_journal(self, remove=True):
+        """停止记录修改日志（remove：改动已保存或放弃，删除日志文件）"""
+        if self.journal is not None:
+            self.section_model.journal = None
+            self.journal.close(remove)
+            self.journal = None
+    
+    def confirm_unsaved_changes(self):
+        """
+        有未保存的修改时询问是否保存
+        :return: bool - 是否继续（取消或保存失败时为False）
+        """
+        # 等待正在进行的后台保存完成
+        if self.save_worker is not None:
+            self.save_worker.wait()
+            self.on_save_done()
+        self.save_current_params_to_data()
+        if not self.section_model.is_dirty:
+            return True
+        reply = QMessageBox.question(
+            self, "保存修改", "数据已修改，是否保存到数据文件？",
+            QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel
+        )
+        if reply == QMessageBox.Cancel:
+            return False
+        if reply == QMessageBox.Save:
+            self.save_data_to_file()
+            if self.save_worker is not None:
+                self.save_worker.wait()
+                self.on_save_done()
+            return not self.section_model.is_dirty
+        return True
+    
+    def invalidate_section_index(self, *args):
+        """截面数据变化，截面索引作废"""
+        self.section_index = None
+    
+    def get_section_index(self, results=False):
+        """
+        获取截面索引（首次查询时建立）
+        :param results: 是否用到计算结果列（先重新计算结果过期的行）
+        """
+        if results and self.section_model.stale_result_rows():
+            self.status_bar.showMessage("正在计算截面结果...")
+            update_results(self.section_model)
+        if self.section_index is None:
+            from concrete.core.section_index import SectionIndex
+            self.section_index = SectionIndex(self.section_model.columns)
+        return self.section_index
+    
+    def apply_filter(self, text):
+        """按查询表达式筛选截面列表"""
+        text = text.strip()
+        if not text:
+            self.section_proxy.set_rows(None)
+            self.status_bar.showMessage(f"共 {self.section_model.rowCount()} 个截面")
+            return
+        try:
+            from concrete.core.section_index import parse_query, uses_results
+            terms = parse_query(text)
+            rows = self.get_section_index(uses_results(terms)).query(terms)
+        except Exception as e:
+            # 输入过程中的不完整条件只提示，不改变当前列表
+            self.status_bar.showMessage(f"查询条件无效: {str(e)}")
+            return
+        self.section_proxy.set_rows(rows.tolist())
+        self.status_bar.showMessage(f"查询到 {len(rows)} 个截面")
+    
+    def show_worst_sections(self):
+        """按R/S升序列出最不利的截面，并选中最不利截面"""
+        try:
+            rows = self.get_section_index(results=True).worst(self.worst_count.value())
+            # 清空查询条件并取消按列排序，保持R/S升序
+            self.filter_input.blockSignals(True)
+            self.filter_input.clear()
+            self.filter_input.blockSignals(False)
+            self.section_view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+            self.section_proxy.set_rows(rows.tolist())
+            if len(rows):
+                self.select_section(int(rows[0]))
+            self.status_bar.showMessage(f"最不利的 {len(rows)} 个截面（按R/S升序）")
+        except Exception as e:
+            error_msg = f"计算最不利截面失败: {str(e)}"
+            self.status_bar.showMessage(error_msg)
+            self.result_text.append(error_msg + "\n")
+    
+    def show_dashboard(self):
+        """显示结果分布面板（先重新计算结果过期的行）"""
+        try:
+            if self.dashboard is None:
+                from pyside6_dashboard import ResultDashboard
+                self.dashboard = ResultDashboard(self)
+                self.dashboard.query_selected.connect(self.filter_input.setText)
+                self.dashboard.refresh_requested.connect(self.refresh_dashboard)
+            self.refresh_dashboard()
+            self.dashboard.show()
+            self.dashboard.raise_()
+            self.dashboard.activateWindow()
+        except Exception as e:
+            error_msg = f"显示结果分布失败: {str(e)}"
+            self.status_bar.showMessage(error_msg)
+            self.result_text.append(error_msg + "\n")
+    
+    def refresh_dashboard(self):
+        """按截面表格当前数据重新统计结果分布"""
+        if self.section_model.stale_result_rows():
+            self.status_bar.showMessage("正在计算截面结果...")
+            update_results(self.section_model)
+        from concrete.core.result_stats import result_distribution
+        self.dashboard.set_distribution(*result_distribution(self.section_model.columns))
+        self.status_bar.showMessage(f"已统计 {self.section_model.rowCount()} 个截面的结果分布")
+    
+    def report_file_path(self, data_file=None):
+        """批量计算的计算书文件路径（数据文件目录下的结果文件名.out，勾选压缩时为.out.gz）"""
+        data_dir = os.path.dirname(data_file or self.file_input.text())
+        suffix = ".out.gz" if self.report_gzip_check.isChecked() else ".out"
+        return os.path.join(data_dir, self.result_file_input.text() + suffix)
+    
+    def show_section_report(self):
+        """按计算书索引读取当前截面的计算书（截面编号重复时取与行号对应的一个）"""
+        row = self.current_section_index
+        if row < 0:
+            self.status_bar.showMessage("请先选择截面")
+            return
+        file_path = self.report_file_path()
+        if not os.path.exists(file_path):
+            # 未勾选压缩时也查找压缩的计算书
+            other = file_path[:-3] if file_path.endswith(".gz") else file_path + ".gz"
+            file_path = other if os.path.exists(other) else file_path
+        try:
+            key = (file_path, os.path.getmtime(file_path))
+            if self.report_index is None or self.report_index[0] != key:
+                self.report_index = (key, ReportIndex(file_path))
+            index = self.report_index[1]
+        except (OSError, ValueError) as e:
+            self.status_bar.showMessage(f"读取计算书索引失败（请重新批量计算）: {str(e)}")
+            return
+        sec_num = self.section_model.value(row, "截面编号", "")
+        rows = index.find("" if is_missing(sec_num) else sec_num)
+        if not rows:
+            self.status_bar.showMessage(f"计算书中没有截面: {sec_num}")
+            return
+        self.result_text.setPlainText(index.read(row if row in rows else rows[0]))
+        self.status_bar.showMessage(f"已读取截面 {sec_num} 的计算书: {os.path.basename(file_path)}")
+    
+    def select_section(self, row):
+        """在表格中选中数据行row（被筛选隐藏时直接加载该截面）"""
+        index = self.section_proxy.mapFromSource(self.section_model.index(row, 0))
+        if index.isValid() and index != self.section_view.currentIndex():
+            self.section_view.setCurrentIndex(index)
+            self.section_view.scrollTo(index)
+        else:
+            self.load_section(row)
+    
+    def on_section_selected(self, current, previous):
+        """表格当前行变化事件处理"""
+        if current.isValid():
+            self.load_section(self.section_proxy.mapToSource(current).row())
+    
+    def load_section(self, index):
+        """加载第index个截面到参数面板并计算"""
         try:
             # 保存当前截面的数据（如果有选中的截面）
             if self.current_section_index >= 0:
                 self.save_current_params_to_data()
             
-            # 获取点击的列表项索引
-            index = self.section_list.row(item)
-            if 0 <= index < len(self.section_data):
+            if 0 <= index < self.section_model.rowCount():
                 # 保存当前选中的截面索引
                 self.current_section_index = index
                 
                 # 获取对应的数据
-                data = self.section_data[index]
+                data = self.section_model.panel_values(index)
                 
                 # 更新左侧参数面板
                 self.update_parameter_panel(data)
                 
                 # 状态栏提示
-                self.status_bar.showMessage(f"已加载截面: {data.get('截面编号', data.get('sec_num', f'截面{index+1}'))}")
+                self.status_bar.showMessage(f"已加载截面: {data['sec_num']}")
                 
                 # 自动执行计算
                 self.calculate_single()
@@ -587,168 +1023,65 @@ class BeamCalculationGUI(QMainWindow):
             self.result_text.append(error_msg + "\n")
     
     def update_parameter_panel(self, data):
-        """根据数据更新参数面板"""
-        # 调试信息：打印数据内容，查看实际字段名
-        print(f"更新参数面板，数据: {data}")
+        """根据数据更新参数面板（data为SectionTableModel.panel_values的字段）"""
+        self.sec_num_input.setText(str(data["sec_num"]))
         
-        # 更新截面编号
-        sec_num = data.get("截面编号", data.get("sec_num", ""))
-        self.sec_num_input.setText(str(sec_num))
-        
-        # 更新截面类型
-        # 尝试多种可能的字段名
-        sec_type = data.get("sec_type", data.get("截面类型", "矩形"))
+        # 更新截面类型，并手动调用截面类型变化处理函数，确保截面类型状态正确
+        sec_type = str(data["sec_type"])
         self.sec_type_combo.setCurrentText(sec_type)
-        
-        # 手动调用截面类型变化处理函数，确保截面类型状态正确
         self.on_section_type_changed(sec_type)
         
-        # 更新截面尺寸
-        self.b_input.setText(str(data.get("b", data.get("截面宽度", 300))))
-        self.h_input.setText(str(data.get("h", data.get("截面高度", 600))))
-        self.bf_input.setText(str(data.get("bf", data.get("受压翼缘宽度", 0))))
-        self.hf_input.setText(str(data.get("hf", data.get("受压翼缘厚度", 0))))
-        
-        # 更新混凝土强度等级
-        self.fcuk_input.setText(str(data.get("fcuk", data.get("混凝土强度等级", 30))))
-        
-        # 更新钢筋强度等级
-        fy_grade = data.get("fy_grade", data.get("受拉钢筋强度等级", data.get("钢筋强度等级", "HRB400")))
-        self.fy_combo.setCurrentText(fy_grade)
-        
-        # 更新受压钢筋强度等级
-        fyc_grade = data.get("fyc_grade", data.get("受压钢筋强度等级", fy_grade))
-        self.fyc_combo.setCurrentText(fyc_grade)
-        
-        # 更新钢筋面积和位置
-        # 尝试多种可能的字段名，确保能获取到正确的数据
-        ast = data.get("ast", data.get("As", data.get("受拉钢筋面积", data.get("受拉钢筋面积As", 1500))))
-        asc = data.get("asc", data.get("As'", data.get("受压钢筋面积", data.get("受压钢筋面积As", 0))))
-        self.ast_input.setText(str(ast))
-        self.as_t_input.setText(str(data.get("as_t", data.get("as", data.get("受拉钢筋as", 42.5)))))
-        self.asc_input.setText(str(asc))
-        self.as_c_input.setText(str(data.get("as_c", data.get("as'", data.get("受压钢筋as", data.get("受压钢筋as'", 42.5))))))
-        
-        # 更新弯矩设计值和其他参数
-        self.m_input.setText(str(data.get("M", data.get("弯矩设计值", data.get("弯矩", 250)))))
-        
-        # 更新地震作用组合
-        is_seismic = data.get("is_seismic", data.get("是否地震", data.get("地震作用组合", data.get("是否地震作用组合", 0))))
-        seismic_text = "是" if is_seismic == 1 else "否"
-        self.seismic_combo.setCurrentText(seismic_text)
-        
-        # 更新抗震等级
-        seismic_level = data.get("seismic_level", data.get("抗震等级", "二级"))
-        self.seismic_level_combo.setCurrentText(seismic_level)
-        
-        # 更新是否框架梁端
-        is_beam_end = data.get("is_beam_end", data.get("是否框架梁端", 0))
-        beam_end_text = "是" if is_beam_end == 1 else "否"
-        self.is_beam_end_combo.setCurrentText(beam_end_text)
-        
-        # 更新结构重要性系数
-        self.gamma0_input.setText(str(data.get("γ0", data.get("gamma0", data.get("结构重要性系数", 1.0)))))
-        
-        # 确保所有控件都更新完成
-        self.status_bar.showMessage(f"已更新截面参数: {data.get('sec_num', '未知')}")    
+        # 更新截面尺寸、材料、钢筋及荷载参数
+        for key, widget in self._panel_inputs().items():
+            widget.setText(str(data[key]))
+        self.fy_combo.setCurrentText(str(data["fy_grade"]))
+        self.fyc_combo.setCurrentText(str(data["fyc_grade"]))
+        self.seismic_combo.setCurrentText("是" if data["is_seismic"] == 1 else "否")
+        self.seismic_level_combo.setCurrentText(str(data["seismic_level"]))
+        self.is_beam_end_combo.setCurrentText("是" if data["is_beam_end"] == 1 else "否")
+        
+        self.status_bar.showMessage(f"已更新截面参数: {data['sec_num']}")
+    
+    def _panel_inputs(self):
+        """参数面板数值输入框（按参数面板字段）"""
+        return {"b": self.b_input, "h": self.h_input, "bf": self.bf_input, "hf": self.hf_input,
+                "bft": self.bft_input, "hft": self.hft_input, "fcuk": self.fcuk_input, "Ast": self.ast_input, "ast": self.as_t_input, "Asc": self.asc_input,
+                "asc": self.as_c_input, "M": self.m_input, "γ0": self.gamma0_input}
+    
+    def read_panel_values(self):
+        """
+        读取参数面板（数值参数转为float）
+        :return: dict - 参数面板字段
+        :raises ValueError: 数值输入无效时抛出异常
+        """
+        values = {key: float(widget.text()) for key, widget in self._panel_inputs().items()}
+        values.update({
+            "sec_num": self.sec_num_input.text().strip(),
+            "sec_type": self.sec_type_combo.currentText(),
+            "fy_grade": self.fy_combo.currentText(),
+            "fyc_grade": self.fyc_combo.currentText(),
+            "is_seismic": 1 if self.seismic_combo.currentText() == "是" else 0,
+            "seismic_level": self.seismic_level_combo.currentText(),
+            "is_beam_end": 1 if self.is_beam_end_combo.currentText() == "是" else 0,
+        })
+        return values
     
     def save_current_params_to_data(self):
-        """将当前参数面板的数据保存到section_data中"""
-        if self.current_section_index >= 0 and self.current_section_index < len(self.section_data):
+        """将当前参数面板的数据保存到截面表格模型中"""
+        if 0 <= self.current_section_index < self.section_model.rowCount():
             try:
-                # 获取当前参数面板的数据
-                sec_num = self.sec_num_input.text().strip()
-                sec_type = self.sec_type_combo.currentText()
-                b = float(self.b_input.text())
-                h = float(self.h_input.text())
-                bf = float(self.bf_input.text())
-                hf = float(self.hf_input.text())
-                fcuk = float(self.fcuk_input.text())
-                fy_grade = self.fy_combo.currentText()
-                fyc_grade = self.fyc_combo.currentText()
-                ast = float(self.ast_input.text())
-                as_t = float(self.as_t_input.text())
-                asc = float(self.asc_input.text())
-                as_c = float(self.as_c_input.text())
-                M = float(self.m_input.text())
-                is_seismic = 1 if self.seismic_combo.currentText() == "是" else 0
-                seismic_level = self.seismic_level_combo.currentText()
-                is_beam_end = 1 if self.is_beam_end_combo.currentText() == "是" else 0
-                gamma0 = float(self.gamma0_input.text())
+                values = self.read_panel_values()
                 
                 # 如果截面编号为空，使用默认值
-                if not sec_num:
-                    sec_num = f"截面{self.current_section_index+1}"
-                
-                # 获取原始数据的所有列，确保只更新读取的单元格
-                data_dict = self.section_data[self.current_section_index].copy()
+                if not values["sec_num"]:
+                    values["sec_num"] = f"截面{self.current_section_index+1}"
                 
-                # 更新数据字典，只更新已读取的字段
-                data_dict.update({
-                    "截面编号": sec_num,
-                    "sec_num": sec_num,
-                    "γ0": gamma0,
-                    "gamma0": gamma0,
-                    "结构重要性系数": gamma0,
-                    "M": M,
-                    "弯矩设计值": M,
-                    "弯矩": M,
-                    "is_seismic": is_seismic,
-                    "是否地震": is_seismic,
-                    "地震作用组合": is_seismic,
-                    "是否地震作用组合": is_seismic,
-                    "抗震等级": seismic_level,
-                    "seismic_level": seismic_level,
-                    "是否框架梁端": is_beam_end,
-                    "is_beam_end": is_beam_end,
-                    "sec_type": sec_type,
-                    "截面类型": sec_type,
-                    "b": b,
-                    "截面宽度": b,
-                    "h": h,
-                    "截面高度": h,
-                    "bf": bf,
-                    "受压翼缘宽度": bf,
-                    "hf": hf,
-                    "受压翼缘厚度": hf,
-                    "fcuk": fcuk,
-                    "混凝土强度等级": fcuk,
-                    "fy_grade": fy_grade,
-                    "受拉钢筋强度等级": fy_grade,
-                    "钢筋强度等级": fy_grade,
-                    "fyc_grade": fyc_grade,
-                    "受压钢筋强度等级": fyc_grade,
-                    "ast": ast,
-                    "As": ast,
-                    "受拉钢筋面积": ast,
-                    "受拉钢筋面积As": ast,
-                    "as_t": as_t,
-                    "as": as_t,
-                    "受拉钢筋as": as_t,
-                    "asc": asc,
-                    "As'": asc,
-                    "受压钢筋面积": asc,
-                    "受压钢筋面积As": asc,
-                    "as_c": as_c,
-                    "as'": as_c,
-                    "受压钢筋as": as_c,
-                    "受压钢筋as'": as_c
-                })
-                
-                # 更新section_data
-                self.section_data[self.current_section_index] = data_dict
-                
-                # 更新列表框中的显示文本
-                if self.section_list.count() > self.current_section_index:
-                    list_item = self.section_list.item(self.current_section_index)
-                    if list_item:
-                        new_text = f"{self.current_section_index+1}-{sec_num}"
-                        list_item.setText(new_text)
-                
-                print(f"已保存当前截面数据到section_data: {data_dict}")
+                # 只更新参数面板对应的列，其余列（如平法标注列）保持原值
+                self.section_model.update_record(
+                    self.current_section_index, {col: values[key] for key, col in PANEL_COLS.items()})
                 
             except Exception as e:
-                print(f"保存当前参数到section_data失败: {e}")
+                print(f"保存当前参数到截面表格失败: {e}")
     
     def load_initial_data_file(self):
         """加载初始数据文件"""
@@ -756,127 +1089,25 @@ class BeamCalculationGUI(QMainWindow):
         self.load_data_file_to_list(self.default_data_file)
         
     def add_new_section(self):
-        """新增截面，自动增加一个列表，并赋予默认参数"""
+        """新增截面，自动增加一行，并赋予默认参数"""
         try:
-            # 先保存当前参数到section_data
+            # 先保存当前参数到截面表格
             self.save_current_params_to_data()
             
             self.status_bar.showMessage("正在新增数据...")
             
             # 生成新的截面编号，序号自动加1
-            new_idx = len(self.section_data)
+            new_idx = self.section_model.rowCount()
             new_sec_num = f"截面{new_idx+1}"
             
-            # 如果已有数据，使用最后一行数据作为模板，确保所有列都存在
-            if self.section_data:
-                # 复制最后一行数据作为模板
-                default_data = self.section_data[-1].copy()
-                # 更新关键参数
-                default_data.update({
-                    "截面编号": new_sec_num,
-                    "sec_num": new_sec_num,
-                    "γ0": 1.0,
-                    "gamma0": 1.0,
-                    "结构重要性系数": 1.0,
-                    "M": 250,
-                    "弯矩设计值": 250,
-                    "弯矩": 250,
-                    "is_seismic": 0,
-                    "是否地震": 0,
-                    "地震作用组合": 0,
-                    "是否地震作用组合": 0,
-                    "sec_type": "矩形",
-                    "截面类型": "矩形",
-                    "b": 300,
-                    "截面宽度": 300,
-                    "h": 600,
-                    "截面高度": 600,
-                    "bf": 0,
-                    "受压翼缘宽度": 0,
-                    "hf": 0,
-                    "受压翼缘厚度": 0,
-                    "fcuk": 30,
-                    "混凝土强度等级": 30,
-                    "fy_grade": "HRB400",
-                    "受拉钢筋强度等级": "HRB400",
-                    "钢筋强度等级": "HRB400",
-                    "fyc_grade": "HRB400",
-                    "受压钢筋强度等级": "HRB400",
-                    "ast": 1500,
-                    "As": 1500,
-                    "受拉钢筋面积": 1500,
-                    "受拉钢筋面积As": 1500,
-                    "as_t": 42.5,
-                    "as": 42.5,
-                    "受拉钢筋as": 42.5,
-                    "asc": 0,
-                    "As'": 0,
-                    "受压钢筋面积": 0,
-                    "受压钢筋面积As": 0,
-                    "as_c": 42.5,
-                    "as'": 42.5,
-                    "受压钢筋as": 42.5,
-                    "受压钢筋as'": 42.5
-                })
-            else:
-                # 如果没有数据，使用默认参数
-                default_data = {
-                    "截面编号": new_sec_num,
-                    "sec_num": new_sec_num,
-                    "γ0": 1.0,
-                    "gamma0": 1.0,
-                    "结构重要性系数": 1.0,
-                    "M": 250,
-                    "弯矩设计值": 250,
-                    "弯矩": 250,
-                    "is_seismic": 0,
-                    "是否地震": 0,
-                    "地震作用组合": 0,
-                    "是否地震作用组合": 0,
-                    "sec_type": "矩形",
-                    "截面类型": "矩形",
-                    "b": 300,
-                    "截面宽度": 300,
-                    "h": 600,
-                    "截面高度": 600,
-                    "bf": 0,
-                    "受压翼缘宽度": 0,
-                    "hf": 0,
-                    "受压翼缘厚度": 0,
-                    "fcuk": 30,
-                    "混凝土强度等级": 30,
-                    "fy_grade": "HRB400",
-                    "受拉钢筋强度等级": "HRB400",
-                    "钢筋强度等级": "HRB400",
-                    "fyc_grade": "HRB400",
-                    "受压钢筋强度等级": "HRB400",
-                    "ast": 1500,
-                    "As": 1500,
-                    "受拉钢筋面积": 1500,
-                    "受拉钢筋面积As": 1500,
-                    "as_t": 42.5,
-                    "as": 42.5,
-                    "受拉钢筋as": 42.5,
-                    "asc": 0,
-                    "As'": 0,
-                    "受压钢筋面积": 0,
-                    "受压钢筋面积As": 0,
-                    "as_c": 42.5,
-                    "as'": 42.5,
-                    "受压钢筋as": 42.5,
-                    "受压钢筋as'": 42.5
-                }
-            
-            # 添加到section_data列表
-            self.section_data.append(default_data)
-            
-            # 更新截面列表
-            list_text = f"{new_idx+1}-{new_sec_num}"
-            self.section_list.addItem(list_text)
+            # 已有数据时以最后一行为模板（保留其余列），参数面板对应的列取默认参数
+            default_data = self.section_model.record(new_idx - 1) if new_idx else {}
+            default_data.update({PANEL_COLS[key]: value for key, value in PANEL_DEFAULTS.items()})
+            default_data[PANEL_COLS["sec_num"]] = new_sec_num
+            self.section_model.insert_record(default_data)
             
             # 自动选择新添加的数据
-            self.section_list.setCurrentRow(new_idx)
-            self.on_list_item_clicked(self.section_list.item(new_idx))
+            self.select_section(new_idx)
             
             self.status_bar.showMessage(f"已成功新增数据，序号: {new_idx+1}")
             self.result_text.append(f"已成功新增数据，序号: {new_idx+1}\n")
@@ -889,32 +1120,24 @@ class BeamCalculationGUI(QMainWindow):
     def delete_selected_section(self):
         """删除选中的截面"""
         try:
-            # 获取当前选中的列表项
-            current_item = self.section_list.currentItem()
-            if not current_item:
+            # 获取当前选中的表格行
+            current = self.section_view.currentIndex()
+            if not current.isValid():
                 self.status_bar.showMessage("请先选择要删除的截面数据")
                 return
             
-            # 获取选中项的索引
-            index = self.section_list.row(current_item)
-            if 0 <= index < len(self.section_data):
+            index = self.section_proxy.mapToSource(current).row()
+            if 0 <= index < self.section_model.rowCount():
                 # 获取要删除的截面编号
-                sec_num = self.section_data[index].get("sec_num", self.section_data[index].get("截面编号", f"截面{index+1}"))
+                sec_num = self.section_model.panel_values(index)["sec_num"]
                 
-                # 从数据存储和列表框中删除
-                del self.section_data[index]
-                self.section_list.takeItem(index)
-                
-                # 更新列表项的显示文本（重新编号）
-                for i in range(self.section_list.count()):
-                    item = self.section_list.item(i)
-                    new_sec_num = self.section_data[i].get("sec_num", self.section_data[i].get("截面编号", f"截面{i+1}"))
-                    item.setText(f"{i+1}-{new_sec_num}")
+                # 从模型中删除（序号由行号生成，无需逐行重新编号），删除前使当前截面失效
+                self.current_section_index = -1
+                self.section_model.remove_row(index)
                 
                 # 如果还有数据，自动选中第一个截面
-                if self.section_data:
-                    self.section_list.setCurrentRow(0)
-                    self.on_list_item_clicked(self.section_list.currentItem())
+                if self.section_model.rowCount():
+                    self.select_section(0)
                 
                 self.status_bar.showMessage(f"已删除截面数据: {sec_num}")
                 self.result_text.append(f"已删除截面数据: {sec_num}\n")
@@ -925,114 +1148,80 @@ class BeamCalculationGUI(QMainWindow):
             self.result_text.append(error_msg + "\n")
     
     def save_data_to_file(self):
-        """将数据修改保存到数据文件，只回写A-P列（原始数据），保持原文件样式"""
+        """将数据修改保存到数据文件：只回写修改过的A-P列单元格及增删的行，后台线程保存，保持原文件样式"""
         try:
-            # 先保存当前参数到section_data
-            self.save_current_params_to_data()
-            
-            self.status_bar.showMessage("正在保存数据到文件...")
-            
-            # 获取文件路径
-            file_path = self.file_input.text()
+            if self.save_worker is not None and self.save_worker.isRunning():
+                self.status_bar.showMessage("正在保存数据，请稍候...")
+                return
             
-            # 使用openpyxl加载文件，保持样式
-            from openpyxl import load_workbook
-            wb = load_workbook(file_path)
-            ws = wb.active
+            # 先保存当前参数到截面表格
+            self.save_current_params_to_data()
             
-            # 定义允许修改的列范围：A-P列（Excel列索引1-16，因为Excel从1开始计数）
-            allowed_cols = list(range(1, 17))  # A-P列对应1-16
+            # 改动对应载入截面表格的数据文件
+            file_path = self.loaded_data_file
+            if not file_path:
+                self.status_bar.showMessage("未加载数据文件")
+                return
             
-            # 定义列索引到数据的映射关系（A-P列）
-            col_data_mapping = {
-                1: "截面编号",        # A列
-                2: "结构重要性系数γ0",  # B列
-                3: "弯矩设计值M",     # C列
-                4: "是否地震作用组合",    # D列
-                5: "截面类型",        # E列
-                6: "b",             # F列
-                7: "h",             # G列
-                8: "bf",            # H列
-                9: "hf",            # I列
-                10: "混凝土强度等级C",    # J列
-                11: "受拉钢筋强度等级",   # K列
-                12: "受压钢筋强度等级",   # L列
-                13: "受拉钢筋面积As",    # M列
-                14: "受拉钢筋as",     # N列
-                15: "受压钢筋面积As",    # O列
-                16: "受压钢筋as"      # P列
-            }
+            changes = self.section_model.take_changes()
+            if not changes:
+                self.status_bar.showMessage("数据未修改，无需保存")
+                return
             
-            # 处理每一行数据
-            for idx, data in enumerate(self.section_data):
-                # 转换为Excel行号（从2开始，因为表头占1行）
-                excel_row = idx + 2
-                
-                # 确保行存在，如果不存在则添加，使用insert_rows保持样式
-                while excel_row > ws.max_row:
-                    # 复制前一行的样式到新行
-                    ws.insert_rows(ws.max_row + 1)
-                    # 清空新行的A-P列内容，但保留样式
-                    for col_idx in allowed_cols:
-                        ws.cell(row=excel_row, column=col_idx, value="")
-                
-                # 只更新A-P列
-                for col_idx in allowed_cols:
-                    # 获取对应的数据键
-                    data_key = col_data_mapping[col_idx]
-                    
-                    # 根据数据键获取对应的值
-                    cell_value = data.get(data_key, "")
-                    
-                    # 特殊处理一些字段
-                    if data_key == "结构重要性系数γ0":
-                        cell_value = data.get("γ0", data.get("gamma0", data.get("结构重要性系数", 1.0)))
-                    elif data_key == "弯矩设计值M":
-                        cell_value = data.get("M", data.get("弯矩设计值", data.get("弯矩", 250)))
-                    elif data_key == "是否地震作用组合":
-                        cell_value = data.get("is_seismic", data.get("是否地震", data.get("地震作用组合", data.get("是否地震作用组合", 0))))
-                    elif data_key == "截面类型":
-                        cell_value = data.get("sec_type", data.get("截面类型", "矩形"))
-                    elif data_key == "b":
-                        cell_value = data.get("b", data.get("截面宽度", 300))
-                    elif data_key == "h":
-                        cell_value = data.get("h", data.get("截面高度", 600))
-                    elif data_key == "bf":
-                        cell_value = data.get("bf", data.get("受压翼缘宽度", 0))
-                    elif data_key == "hf":
-                        cell_value = data.get("hf", data.get("受压翼缘厚度", 0))
-                    elif data_key == "混凝土强度等级C":
-                        cell_value = data.get("fcuk", data.get("混凝土强度等级", 30))
-                    elif data_key == "受拉钢筋强度等级":
-                        cell_value = data.get("fy_grade", data.get("受拉钢筋强度等级", data.get("钢筋强度等级", "HRB400")))
-                    elif data_key == "受压钢筋强度等级":
-                        cell_value = data.get("fyc_grade", data.get("受压钢筋强度等级", "HRB400"))
-                    elif data_key == "受拉钢筋面积As":
-                        cell_value = data.get("ast", data.get("As", data.get("受拉钢筋面积", data.get("受拉钢筋面积As", 1500))))
-                    elif data_key == "受拉钢筋as":
-                        cell_value = data.get("as_t", data.get("as", data.get("受拉钢筋as", 42.5)))
-                    elif data_key == "受压钢筋面积As":
-                        cell_value = data.get("asc", data.get("As'", data.get("受压钢筋面积", data.get("受压钢筋面积As", 0))))
-                    elif data_key == "受压钢筋as":
-                        cell_value = data.get("as_c", data.get("as'", data.get("受压钢筋as", data.get("受压钢筋as'", 42.5))))
-                    elif data_key == "截面编号":
-                        cell_value = data.get("截面编号", data.get("sec_num", f"截面{idx+1}"))
-                    
-                    # 设置单元格值，openpyxl会保持原有样式
-                    ws.cell(row=excel_row, column=col_idx, value=cell_value)
+            self.status_bar.showMessage("正在保存数据到文件...")
             
-            # 保存文件，保持样式
-            wb.save(file_path)
+            # 保存期间禁止增删截面（行号须与改动一致）
+            for button in (self.save_data_button, self.add_data_button, self.delete_data_button):
+                button.setEnabled(False)
+            self.save_progress.setValue(0)
+            self.save_progress.show()
             
-            # 显示保存成功信息
-            self.status_bar.showMessage(f"数据已成功保存到文件: {file_path}")
-            self.result_text.append(f"数据已成功保存到文件: {file_path}\n")
+            # 保存成功后日志中此前的记录已写入数据文件
+            self.save_journal_mark = self.journal.mark() if self.journal is not None else 0
+            self.save_worker = SaveWorker(file_path, changes, self)
+            self.save_worker.progress.connect(self.save_progress.setValue)
+            self.save_worker.done.connect(self.on_save_done)
+            self.save_worker.start()
             
         except Exception as e:
             error_msg = f"保存数据到文件失败: {str(e)}"
             self.status_bar.showMessage(error_msg)
             self.result_text.append(error_msg + "\n")
     
+    def on_save_done(self, *args):
+        """后台保存完成的处理（关闭窗口等待保存时直接调用，之后到达的done信号不再处理）"""
+        worker = self.save_worker
+        if worker is None or worker.isRunning():
+            return
+        self.save_worker = None
+        error = worker.error
+        self.save_progress.hide()
+        for button in (self.save_data_button, self.add_data_button, self.delete_data_button):
+            button.setEnabled(True)
+        
+        if error:
+            # 保存失败，改动放回模型，下次保存时重新写入
+            self.section_model.restore_changes(worker.changes)
+            error_msg = f"保存数据到文件失败: {error}"
+            self.status_bar.showMessage(error_msg)
+            self.result_text.append(error_msg + "\n")
+        else:
+            # 已保存的改动从修改日志中删去
+            if self.journal is not None and self.journal.file_path == worker.file_path:
+                self.journal.compact(self.save_journal_mark)
+            # 显示保存成功信息
+            msg = f"数据已成功保存到文件: {worker.file_path}（更新{worker.count}个单元格）"
+            self.status_bar.showMessage(msg)
+            self.result_text.append(msg + "\n")
+    
+    def closeEvent(self, event):
+        """关闭窗口前等待后台保存完成，有未保存的修改时询问是否保存；正常关闭后删除修改日志"""
+        if not self.confirm_unsaved_changes():
+            event.ignore()
+            return
+        self.close_journal()
+        super().closeEvent(event)
+    
     def create_button_panel(self, parent_layout):
         """创建底部按钮面板"""
         button_frame = QFrame()
@@ -1058,62 +1247,21 @@ class BeamCalculationGUI(QMainWindow):
     def calculate_single(self):
         """单个截面计算"""
         try:
+            # 已给出完整结果，取消待执行的实时计算
+            self.live_timer.stop()
+            
             # 清空文本输出框
             self.result_text.clear()
             
             # 状态栏提示
             self.status_bar.showMessage("正在获取输入参数...")
             
-            # 获取参数
-            sec_type = self.sec_type_combo.currentText()
-            b = float(self.b_input.text())
-            h = float(self.h_input.text())
-            bf = float(self.bf_input.text()) if sec_type == "T形" else 0
-            hf = float(self.hf_input.text()) if sec_type == "T形" else 0
-            
-            # 如果T形截面的bf或hf为0，自动转为矩形截面处理
-            if sec_type == "T形" and (bf <= 0 or hf <= 0):
-                sec_type = "矩形"
-                bf = 0
-                hf = 0
-            fcuk = float(self.fcuk_input.text())
-            fy_grade = self.fy_combo.currentText()
-            fyc_grade = self.fyc_combo.currentText()  # 使用受压钢筋强度等级控件的值
-            ast = float(self.ast_input.text())
-            as_t = float(self.as_t_input.text())
-            asc = float(self.asc_input.text())
-            as_c = float(self.as_c_input.text())
-            M = float(self.m_input.text())
-            is_seismic = 1 if self.seismic_combo.currentText() == "是" else 0
-            gamma0 = float(self.gamma0_input.text())
-            
-            # 构建计算参数
-            # 使用当前选中的截面索引来获取正确的序号和编号
-            if self.current_section_index >= 0 and self.current_section_index < len(self.section_data):
-                index = self.current_section_index
-                data = self.section_data[index]
-                sec_num = data.get("截面编号", data.get("sec_num", f"截面{index+1}"))
-            else:
-                index = 0
-                sec_num = "单个计算"
-            
-            item = {
-                "sec_num": sec_num,
-                "sec_type": sec_type,
-                "γ0": gamma0,
-                "M": M,
-                "is_seismic": is_seismic,
-                "calc_params": [
-                    b, h, bf, hf,
-                    fcuk, fy_grade, fyc_grade,
-                    ast, as_t,
-                    asc, as_c, gamma0
-                ]
-            }
+            # 获取参数（材料参数按材料组合缓存）
+            item = self.panel_item()
             
             # 调用计算函数，使用当前选中的截面索引作为计算序号
             self.status_bar.showMessage("正在计算...")
-            x, Mu, M_out, rs_ratio, report, error_msg = calculate_single_item(item, self.current_section_index, 1)
+            x, Mu, _, rs_ratio, report, error_msg = calculate_single_item(item, self.current_section_index, 1)
             
             if error_msg:
                 self.status_bar.showMessage(f"计算错误: {error_msg}")
@@ -1125,14 +1273,8 @@ class BeamCalculationGUI(QMainWindow):
                 # 在左侧状态栏显示临时提示
                 self.status_bar.showMessage("计算完成")
                 
-                # 在右侧永久状态栏区域显示计算结果
-                # 确定抗弯承载力的显示名称
-                mu_label = "MuE" if is_seismic == 1 else "Mu"
-                mu_value = M_out if is_seismic == 1 else Mu
-                
-                # 构建计算结果消息，包含截面编号
-                result_msg = f"编号: {sec_num} | x={x:.2f}mm | {mu_label}={mu_value:.2f}kN·m | R/S={rs_ratio:.4f}"
-                self.result_status_label.setText(result_msg)
+                # 在右侧永久状态栏区域显示计算结果（包含截面编号）
+                self.result_status_label.setText(self.result_message(item, x, Mu, Mu / GAMMA_RE, rs_ratio))
                 
                 # 生成结果文件（如果勾选了输出结果文件）
                 if hasattr(self, 'output_result_var') and self.output_result_var.isChecked():
@@ -1180,8 +1322,17 @@ class BeamCalculationGUI(QMainWindow):
             
             self.status_bar.showMessage("正在读取数据...")
             
-            # 读取并准备数据
-            df = pd.read_excel(data_file)
+            # 读取并准备数据（项目数据库按列读取）
+            from datetime import datetime
+            from concrete.core.project_db import ProjectDB, is_project
+            started = datetime.now()
+            project = is_project(data_file)
+            if project:
+                with ProjectDB(data_file) as db:
+                    df = db.read_frame()
+            else:
+                import pandas as pd
+                df = pd.read_excel(data_file)
             from concrete.core.beam_utils import prepare_calculation_data
             param, result_data = prepare_calculation_data(df)
             
@@ -1192,9 +1343,10 @@ class BeamCalculationGUI(QMainWindow):
             all_reports = []
             error_count = 0
             
+            # 按截面类型分组批量计算，再逐个生成计算书
+            results = solve_items(param)
             for idx, item in enumerate(param):
-                # 调用单个计算函数
-                x, Mu, M_out, rs_ratio, report, error_msg = calculate_single_item(item, idx, total_count)
+                x, Mu, M_out, rs_ratio, report, error_msg = calculate_single_item(item, idx, total_count, results[idx])
                 
                 # 添加报告到列表
                 all_reports.append(report)
@@ -1209,6 +1361,16 @@ class BeamCalculationGUI(QMainWindow):
                 # 显示进度
                 QApplication.processEvents()
             
+            # 计算结果写入项目数据库；截面表格为该项目且行号未变时，直接更新无未保存修改的行的结果列
+            if project:
+                columns = save_project_results(data_file, param, results, started, "GUI批量计算")
+                unsaved = self.section_model.unsaved_rows()
+                if (self.loaded_data_file == data_file and unsaved is not None
+                        and self.section_model.rowCount() == total_count):
+                    rows = sorted(set(range(total_count)) - set(unsaved))
+                    self.section_model.set_results(rows, {col: [values[i] for i in rows]
+                                                          for col, values in columns.items()})
+            
             # 显示所有报告
             self.result_text.append("=====批量计算结果=====\n")
             self.result_text.append(f"数据文件: {data_file}\n")
@@ -1225,16 +1387,29 @@ class BeamCalculationGUI(QMainWindow):
                 
                 # 生成Excel文件
                 excel_result_file = os.path.join(data_dir, f"{result_filename}.xlsx")
-                from concrete.core.beam_utils import save_excel_result_with_style
-                save_excel_result_with_style(result_data, excel_result_file, data_file)
+                if project:
+                    with ProjectDB(data_file) as db:
+                        db.export_workbook(excel_result_file, results=True)
+                else:
+                    from concrete.core.beam_utils import save_excel_result_with_style
+                    save_excel_result_with_style(result_data, excel_result_file, data_file)
                 
-                # 生成计算书文件（.out格式）
-                report_result_file = os.path.join(data_dir, f"{result_filename}.out")
-                with open(report_result_file, "w", encoding="utf-8") as f:
-                    f.write(self.result_text.toPlainText())
+                # 生成列式结果目录（全部输入参数及全精度结果，供分析程序按内存映射载入）
+                from concrete.core.result_export import EXPORT_SUFFIX, write_columns
+                write_columns(result_table(param, results), os.path.join(data_dir, result_filename + EXPORT_SUFFIX),
+                              source=os.path.basename(data_file))
+                
+                # 生成计算书文件（.out格式，同时写出按截面编号定位的索引文件）
+                report_result_file = self.report_file_path(data_file)
+                with ReportWriter(report_result_file) as f:
+                    f.write(f"=====批量计算结果=====\n数据文件: {data_file}\n共 {total_count} 个截面\n\n")
+                    for item, report in zip(param, all_reports):
+                        f.add_report(item["sec_num"] if not is_missing(item["sec_num"]) else "", report)
                 
                 # 显示保存成功信息
-                save_msg = f"结果已保存到: {data_dir}，Excel文件: {result_filename}.xlsx，计算书文件: {result_filename}.out"
+                save_msg = (f"结果已保存到: {data_dir}，Excel文件: {result_filename}.xlsx，"
+                            f"列式结果: {result_filename}{EXPORT_SUFFIX}，"
+                            f"计算书文件: {os.path.basename(report_result_file)}")
                 self.status_bar.showMessage(save_msg)
             
             # 显示总结
@@ -1246,7 +1421,7 @@ class BeamCalculationGUI(QMainWindow):
                 data_dir = os.path.dirname(data_file)
                 summary += f"结果已保存到: {data_dir}\n"
                 summary += f"Excel文件: {result_filename}.xlsx\n"
-                summary += f"计算书文件: {result_filename}.out\n"
+                summary += f"计算书文件: {os.path.basename(report_result_file)}\n"
             self.result_text.append(summary)
             
             # 滚动到顶部
@@ -1260,6 +1435,10 @@ class BeamCalculationGUI(QMainWindow):
             result_msg = f"批量计算完成 | 构件数: {total_count} | 成功: {total_count - error_count} | 失败: {error_count}"
             self.result_status_label.setText(result_msg)
             
+            # 结果分布面板已打开时按截面表格重新统计
+            if self.dashboard is not None and self.dashboard.isVisible():
+                self.refresh_dashboard()
+            
         except FileNotFoundError as e:
             error_msg = f"文件不存在: {str(e)}"
             self.status_bar.showMessage(error_msg)
@@ -0,0 +1,734 @@
+# -*- coding: utf-8 -*-
+"""
+GUI截面表格模型
+截面数据按列存储（列名同数据文件表头），表格视图只在绘制可见行时读取单元格，
+不再为每个截面创建列表项及参数字典；排序、筛选由SectionProxyModel按列整体计算行映射完成
+（QSortFilterProxyModel逐次比较都要回调Python的data，10万行排序需数十秒）。
+模型记录自上次载入/保存以来修改的单元格及增删行，保存时只回写这些改动到数据文件或项目数据库（SaveWorker后台线程执行）；
+计算结果列（R/S、ξ/ξb、Mu、判别）供截面索引查询，修改过的行结果过期，查询前只重新计算过期的行；
+每次改动同时追加到修改日志（EditJournal，后台线程写盘），程序异常退出后重新载入数据文件时重放日志即可恢复
+"""
+import json
+import math
+import numbers
+import os
+import queue
+import threading
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from PySide6.QtCore import QAbstractProxyModel, QAbstractTableModel, QModelIndex, QThread, Qt, Signal
+
+from concrete.config import INPUT_COLS, REBAR_NOTATION_COLS, TENSION_FLANGE_COLS
+from concrete.core.beam_utils import resolve_rebar_notation, tension_flange
+from concrete.core.project_db import ProjectDB, is_project
+from concrete.core.records import SectionInput
+from concrete.main.梁抗弯承载力计算 import RESULT_COLS, result_columns, solve_items
+
+# 参数面板字段与数据文件列名的对应关系
+PANEL_COLS = {
+    "sec_num": "截面编号",
+    "sec_type": "截面类型",
+    "b": "b",
+    "h": "h",
+    "bf": "bf",
+    "hf": "hf",
+    "bft": TENSION_FLANGE_COLS["bft"],
+    "hft": TENSION_FLANGE_COLS["hft"],
+    "fcuk": "混凝土强度等级C",
+    "fy_grade": "受拉钢筋强度等级",
+    "fyc_grade": "受压钢筋强度等级",
+    "Ast": "受拉钢筋面积As",
+    "ast": "受拉钢筋as",
+    "Asc": "受压钢筋面积As",
+    "asc": "受压钢筋as",
+    "M": "弯矩设计值M",
+    "is_seismic": "是否地震作用组合",
+    "γ0": "结构重要性系数γ0",
+    "seismic_level": "抗震等级",
+    "is_beam_end": "是否框架梁端",
+}
+
+# 新增截面及数据文件缺列时的默认值（按参数面板字段）
+PANEL_DEFAULTS = {
+    "sec_type": "矩形", "b": 300, "h": 600, "bf": 0, "hf": 0, "bft": 0, "hft": 0, "fcuk": 30,
+    "fy_grade": "HRB400", "fyc_grade": "HRB400", "Ast": 1500, "ast": 42.5, "Asc": 0, "asc": 42.5,
+    "M": 250, "is_seismic": 0, "γ0": 1.0, "seismic_level": "二级", "is_beam_end": 0,
+}
+
+# 新建列时其余行的取值（参数面板字段取PANEL_DEFAULTS，与缺列时读取的值一致，其余列取0）
+COLUMN_DEFAULTS = {PANEL_COLS[key]: value for key, value in PANEL_DEFAULTS.items()}
+
+# 表格显示的列：(表头, 数据列名)，序号列为None
+DISPLAY_COLS = (("序号", None), ("截面编号", "截面编号"), ("截面类型", "截面类型"), ("R/S", "R/S"))
+
+# 回写数据文件的列（A-P列原始数据），表头中找不到列名时按此列号写入
+SAVE_COLS = {
+    "截面编号": 1, "结构重要性系数γ0": 2, "弯矩设计值M": 3, "是否地震作用组合": 4, "截面类型": 5,
+    "b": 6, "h": 7, "bf": 8, "hf": 9, "混凝土强度等级C": 10, "受拉钢筋强度等级": 11, "受压钢筋强度等级": 12,
+    "受拉钢筋面积As": 13, "受拉钢筋as": 14, "受压钢筋面积As": 15, "受压钢筋as": 16,
+}
+
+# 同时回写的可选列（受拉翼缘），表头中找不到列名且有非0值时追加到末列之后
+OPTIONAL_SAVE_COLS = tuple(TENSION_FLANGE_COLS.values())
+
+# 修改日志文件后缀（日志文件名为数据文件名+后缀）
+JOURNAL_SUFFIX = ".journal.jsonl"
+
+
+class SheetChanges(NamedTuple):
+    """自上次载入/保存以来的改动"""
+    ops: List[Tuple[str, int]]  # 增删行操作（"insert"/"delete", 行号），按发生顺序
+    cells: List[Tuple[int, Dict[str, Any]]]  # 修改的单元格：(行号, {数据列名: 值})，行号为全部增删行之后的行号
+    generation: int  # 模型载入数据的批次（重新载入后作废）
+
+    def __bool__(self) -> bool:
+        return bool(self.ops or self.cells)
+
+
+class SectionTableModel(QAbstractTableModel):
+    """截面数据表格模型（按列存储）"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._columns: Dict[str, list] = {col: [] for col in INPUT_COLS + list(RESULT_COLS)}
+        self._count = 0
+        # 未保存的改动：增删行操作及各行修改的列
+        self._ops: List[Tuple[str, int]] = []
+        self._dirty: Dict[int, Set[str]] = {}
+        self._generation = 0
+        # 计算结果过期的行，None为全部过期（载入后尚未计算）
+        self._stale: Optional[Set[int]] = None
+        # 修改日志（None时不记录）
+        self.journal: Optional["EditJournal"] = None
+
+    # ====================== 1. Qt模型接口 ======================
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._count
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(DISPLAY_COLS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        col = DISPLAY_COLS[index.column()][1]
+        value = index.row() + 1 if col is None else self._columns[col][index.row()]
+        if role == Qt.DisplayRole:
+            if col in RESULT_COLS:
+                # 未计算或计算出错的结果不显示
+                return "" if value is None or (isinstance(value, float) and math.isnan(value)) else f"{value:.3f}"
+            return str(value)
+        if role == Qt.UserRole:
+            # 排序按原始值（序号、数值按大小排序）
+            return value
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return DISPLAY_COLS[section][0]
+        return None
+
+    # ====================== 2. 数据读写 ======================
+    def load_frame(self, df) -> None:
+        """
+        由数据文件DataFrame整体载入（缺失值替换为0）
+        :param df: pandas.DataFrame
+        """
+        df = df.fillna(0)
+        self.load_columns({col: df[col].tolist() for col in df.columns})
+
+    def load_columns(self, columns: Dict[str, list]) -> None:
+        """
+        整体载入按列存储的数据（如项目数据库读取的数据，空值须已替换），计算结果列清空
+        :param columns: {数据列名: 各行取值}
+        """
+        self.beginResetModel()
+        self._columns = {col: list(values) for col, values in columns.items()}
+        self._count = len(next(iter(columns.values()))) if columns else 0
+        for col in INPUT_COLS:
+            self._columns.setdefault(col, [0] * self._count)
+        for col in RESULT_COLS:
+            self._columns[col] = [None] * self._count
+        self._reset_changes()
+        self.endResetModel()
+
+    def clear(self) -> None:
+        """清空数据"""
+        self.beginResetModel()
+        self._columns = {col: [] for col in INPUT_COLS + list(RESULT_COLS)}
+        self._count = 0
+        self._reset_changes()
+        self.endResetModel()
+
+    @property
+    def columns(self) -> Dict[str, list]:
+        """按列存储的数据 {数据列名: 各行取值}（只读）"""
+        return self._columns
+
+    @property
+    def column_names(self) -> List[str]:
+        """数据列名"""
+        return list(self._columns)
+
+    def value(self, row: int, col: str, default=None) -> Any:
+        """读取单元格值（无该列时返回default）"""
+        values = self._columns.get(col)
+        return default if values is None else values[row]
+
+    def record(self, row: int) -> Dict[str, Any]:
+        """读取一行数据（按数据列名）"""
+        return {col: values[row] for col, values in self._columns.items()}
+
+    def panel_values(self, row: int) -> Dict[str, Any]:
+        """读取一行的参数面板字段（缺列时取默认值）"""
+        values = {key: self.value(row, col, PANEL_DEFAULTS.get(key)) for key, col in PANEL_COLS.items()}
+        if not values["sec_num"]:
+            values["sec_num"] = f"截面{row + 1}"
+        return values
+
+    def update_record(self, row: int, values: Dict[str, Any]) -> None:
+        """
+        修改一行数据（新列按COLUMN_DEFAULTS填充），值有变化的单元格记为未保存
+        :param row: 行号
+        :param values: {数据列名: 值}
+        """
+        changed = set()
+        for col, value in values.items():
+            if col not in self._columns:
+                self._columns[col] = [COLUMN_DEFAULTS.get(col, 0)] * self._count
+            if self._columns[col][row] != value:
+                self._columns[col][row] = value
+                changed.add(col)
+        if not changed:
+            return
+        self._dirty.setdefault(row, set()).update(changed)
+        self._mark_stale(row)
+        self._log({"op": "set", "row": row, "values": {col: values[col] for col in changed}})
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(DISPLAY_COLS) - 1))
+
+    def insert_record(self, values: Dict[str, Any], row: Optional[int] = None) -> int:
+        """
+        插入一行（未给出的列取0，新列其余行按COLUMN_DEFAULTS填充）
+        :param values: {数据列名: 值}
+        :param row: 插入位置，None时追加到末尾
+        :return: int - 新行行号
+        """
+        row = self._count if row is None else row
+        self.beginInsertRows(QModelIndex(), row, row)
+        for col in values:
+            self._columns.setdefault(col, [COLUMN_DEFAULTS.get(col, 0)] * self._count)
+        for col, column in self._columns.items():
+            column.insert(row, values.get(col, 0))
+        self._count += 1
+        self._shift_dirty(row, 1)
+        self._ops.append(("insert", row))
+        self._dirty[row] = set(self._columns)
+        self._mark_stale(row)
+        self._log({"op": "insert", "row": row, "values": dict(values)})
+        self.endInsertRows()
+        return row
+
+    def remove_row(self, row: int) -> None:
+        """删除一行（序号列由行号生成，其余行无需重新编号）"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        for column in self._columns.values():
+            del column[row]
+        self._count -= 1
+        self._dirty.pop(row, None)
+        if self._stale is not None:
+            self._stale.discard(row)
+        self._shift_dirty(row + 1, -1)
+        self._ops.append(("delete", row))
+        self._log({"op": "delete", "row": row})
+        self.endRemoveRows()
+
+    def section_input(self, row: int) -> SectionInput:
+        """
+        由一行数据生成计算参数（同prepare_calculation_data：平法标注列有标注时按标注计算钢筋面积及合力点）
+        :param row: 行号
+        :return: SectionInput - 计算参数（标注错误时error为错误信息）
+        """
+        record = {col: self._columns[col][row] for col in INPUT_COLS}
+        # 载入时缺失值已替换为0，0视为未填写
+        extra = {col: self._columns[col][row] for col in list(REBAR_NOTATION_COLS.values()) + list(TENSION_FLANGE_COLS.values())
+                 if col in self._columns and self._columns[col][row] not in (0, "")}
+        error = None
+        Ast, ast, Asc, asc = (record[col] for col in ("受拉钢筋面积As", "受拉钢筋as", "受压钢筋面积As", "受压钢筋as"))
+        if any(col in extra for col in (REBAR_NOTATION_COLS["bottom"], REBAR_NOTATION_COLS["top"])):
+            try:
+                Ast, ast, Asc, asc = resolve_rebar_notation({**record, **extra})
+            except ValueError as e:
+                error = f"钢筋标注错误：{e}"
+        return SectionInput(
+            record["截面编号"], record["截面类型"], record["b"], record["h"], record["bf"], record["hf"],
+            record["混凝土强度等级C"], record["受拉钢筋强度等级"], record["受压钢筋强度等级"],
+            Ast, ast, Asc, asc, record["结构重要性系数γ0"], *tension_flange(extra),
+            M=record["弯矩设计值M"], is_seismic=record["是否地震作用组合"], error=error
+        )
+
+    # ====================== 3. 计算结果列 ======================
+    def stale_result_rows(self) -> List[int]:
+        """计算结果过期的行"""
+        return list(range(self._count)) if self._stale is None else sorted(self._stale)
+
+    def set_results(self, rows: Sequence[int], results: Dict[str, list]) -> None:
+        """
+        写入计算结果（不计为未保存的改动）
+        :param rows: 行号
+        :param results: {结果列名: 各行结果}（result_columns的输出）
+        """
+        for col, values in results.items():
+            column = self._columns[col]
+            for row, value in zip(rows, values):
+                column[row] = value
+        stale = set(range(self._count)) if self._stale is None else self._stale
+        self._stale = stale - set(rows)
+        if rows:
+            self.dataChanged.emit(self.index(min(rows), 0), self.index(max(rows), len(DISPLAY_COLS) - 1))
+
+    def _mark_stale(self, row: int) -> None:
+        """行数据修改，计算结果过期（清空结果）"""
+        if self._stale is not None:
+            self._stale.add(row)
+        for col in RESULT_COLS:
+            self._columns[col][row] = None
+
+    # ====================== 4. 未保存改动 ======================
+    @property
+    def is_dirty(self) -> bool:
+        """是否有未保存的改动"""
+        return bool(self._ops or self._dirty)
+
+    def unsaved_rows(self) -> Optional[List[int]]:
+        """有未保存修改的行；有未保存的增删行（行号与数据文件不再对应）时为None"""
+        return None if self._ops else sorted(self._dirty)
+
+    def take_changes(self) -> SheetChanges:
+        """取出未保存的改动（取出后视为已保存，保存失败时由restore_changes放回）"""
+        cells = [(row, {col: self._columns[col][row] for col in cols}) for row, cols in sorted(self._dirty.items())]
+        changes = SheetChanges(self._ops, cells, self._generation)
+        self._ops, self._dirty = [], {}
+        return changes
+
+    def restore_changes(self, changes: SheetChanges) -> None:
+        """
+        放回保存失败的改动（取出后又发生增删行或重新载入时无法对应行号，不再放回）
+        :param changes: take_changes取出的改动
+        """
+        if changes.generation != self._generation or self._ops:
+            return
+        self._ops = list(changes.ops)
+        for row, values in changes.cells:
+            self._dirty.setdefault(row, set()).update(values)
+
+    def _reset_changes(self) -> None:
+        """载入新数据，清空未保存的改动"""
+        self._ops, self._dirty = [], {}
+        self._generation += 1
+
+    def _shift_dirty(self, start: int, offset: int) -> None:
+        """行号不小于start的未保存行及结果过期行整体移动offset行"""
+        self._dirty = {row + offset if row >= start else row: cols for row, cols in self._dirty.items()}
+        if self._stale is not None:
+            self._stale = {row + offset if row >= start else row for row in self._stale}
+
+    # ====================== 5. 修改日志 ======================
+    def _log(self, record: Dict[str, Any]) -> None:
+        if self.journal is not None:
+            self.journal.append(record)
+
+    def replay(self, records: Sequence[Dict[str, Any]]) -> None:
+        """
+        按顺序重放修改日志记录（重放的改动记为未保存）
+        :param records: read_journal读出的记录
+        :raises ValueError: 记录的行号超出数据范围或操作无效时抛出异常
+        """
+        for record in records:
+            op, row = record.get("op"), record.get("row")
+            limit = self._count if op == "insert" else self._count - 1
+            if not isinstance(row, int) or not 0 <= row <= limit:
+                raise ValueError(f"修改日志与数据文件不一致（{op}行号{row}超出范围）")
+            if op == "set":
+                self.update_record(row, record["values"])
+            elif op == "insert":
+                self.insert_record(record["values"], row)
+            elif op == "delete":
+                self.remove_row(row)
+            else:
+                raise ValueError(f"修改日志操作'{op}'无效")
+
+
+def update_results(model: SectionTableModel) -> int:
+    """
+    重新计算结果过期的行（按截面类型分组批量计算）
+    :param model: 截面表格模型
+    :return: int - 计算的行数
+    """
+    rows = model.stale_result_rows()
+    if rows:
+        param = [model.section_input(row) for row in rows]
+        model.set_results(rows, result_columns(param, solve_items(param)))
+    return len(rows)
+
+
+def write_project_changes(file_path: str, changes: SheetChanges,
+                          progress: Optional[Callable[[int], None]] = None) -> int:
+    """
+    将改动写入项目数据库（一个事务，只更新改动的行；只写数据库已有的列、A-P列及受拉翼缘列，计算结果列不写入）
+    :param file_path: 项目数据库路径
+    :param changes: 模型的未保存改动
+    :param progress: 进度回调(百分比)
+    :return: int - 写入的单元格数
+    """
+    report = progress or (lambda percent: None)
+    report(0)
+    with ProjectDB(file_path) as db:
+        allowed = set(db.columns) | set(SAVE_COLS) | set(OPTIONAL_SAVE_COLS)
+        cells = [(row, {col: value for col, value in values.items() if col in allowed})
+                 for row, values in changes.cells]
+        count = db.apply_changes(changes.ops, cells)
+    report(100)
+    return count
+
+
+def write_changes(file_path: str, changes: SheetChanges,
+                  progress: Optional[Callable[[int], None]] = None) -> int:
+    """
+    将改动回写数据文件（只写修改的A-P列及受拉翼缘列单元格，增删行整行移动，保持原文件样式）
+    :param file_path: 数据文件路径
+    :param changes: 模型的未保存改动
+    :param progress: 进度回调(百分比)
+    :return: int - 写入的单元格数
+    """
+    from openpyxl import load_workbook
+
+    report = progress or (lambda percent: None)
+    report(0)
+    wb = load_workbook(file_path)
+    ws = wb.active
+    report(40)
+
+    # 列号按表头查找（第1行）
+    header = {cell.value: cell.column for cell in ws[1] if cell.value in SAVE_COLS or cell.value in OPTIONAL_SAVE_COLS}
+    columns = {col: header.get(col, index) for col, index in SAVE_COLS.items()}
+    for col in OPTIONAL_SAVE_COLS:
+        if col in header:
+            columns[col] = header[col]
+        elif any(values.get(col) not in (None, 0, "") for _, values in changes.cells):
+            columns[col] = ws.max_column + 1
+            ws.cell(row=1, column=columns[col], value=col)
+
+    # 按顺序重放增删行（表头占1行，数据行号+2为Excel行号）
+    for op, row in changes.ops:
+        if op == "insert":
+            ws.insert_rows(row + 2)
+        else:
+            ws.delete_rows(row + 2)
+
+    count = 0
+    total = max(len(changes.cells), 1)
+    for i, (row, values) in enumerate(changes.cells):
+        for col, value in values.items():
+            if col in columns:
+                ws.cell(row=row + 2, column=columns[col], value=value)
+                count += 1
+        if i % 1000 == 0:
+            report(40 + 40 * i // total)
+    report(80)
+    wb.save(file_path)
+    report(100)
+    return count
+
+
+class SaveWorker(QThread):
+    """后台保存线程（数据文件或项目数据库；done信号：成功时为空字符串，失败时为错误信息）"""
+    progress = Signal(int)
+    done = Signal(str)
+
+    def __init__(self, file_path: str, changes: SheetChanges, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.changes = changes
+        self.count = 0
+        self.error = ""
+
+    def run(self) -> None:
+        try:
+            write = write_project_changes if is_project(self.file_path) else write_changes
+            self.count = write(self.file_path, self.changes, self.progress.emit)
+        except Exception as e:
+            self.error = str(e)
+        self.done.emit(self.error)
+
+
+def journal_path(file_path: str) -> str:
+    """数据文件的修改日志路径（与数据文件同目录）"""
+    return file_path + JOURNAL_SUFFIX
+
+
+def _file_header(file_path: str) -> Dict[str, Any]:
+    """日志首行：数据文件信息（修改时间及大小用于判断日志之后数据文件是否被改动）"""
+    stat = os.stat(file_path)
+    return {"op": "open", "file": os.path.basename(file_path), "mtime": stat.st_mtime, "size": stat.st_size}
+
+
+def read_journal(file_path: str) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+    """
+    读取数据文件的修改日志（异常退出时未写完的末行忽略）
+    :param file_path: 数据文件路径
+    :return: (首行数据文件信息, 修改记录)，无日志时返回None
+    """
+    path = journal_path(file_path)
+    if not os.path.exists(path):
+        return None
+    header, records = None, []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            if header is None:
+                header = record
+            else:
+                records.append(record)
+    if not isinstance(header, dict) or header.get("op") != "open":
+        return None
+    return header, records
+
+
+def journal_matches(header: Dict[str, Any], file_path: str) -> bool:
+    """日志记录后数据文件是否未被改动"""
+    current = _file_header(file_path)
+    return header.get("mtime") == current["mtime"] and header.get("size") == current["size"]
+
+
+class EditJournal:
+    """
+    修改日志：自上次保存以来的改动按发生顺序逐条追加到JSONL文件（首行为数据文件信息），
+    写盘在后台线程进行，队列写空时刷新到磁盘；保存数据文件成功后compact删去已保存的记录
+    """
+
+    def __init__(self, file_path: str, records: Sequence[Dict[str, Any]] = ()):
+        """
+        :param file_path: 数据文件路径
+        :param records: 已有的未保存记录（恢复后继续记录时传入，日志文件按此重写）
+        """
+        self.file_path = file_path
+        self.path = journal_path(file_path)
+        self.error: Optional[str] = None  # 最近一次写盘错误
+        self._records: List[Dict[str, Any]] = list(records)
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="EditJournal", daemon=True)
+        self._thread.start()
+        self._queue.put(("rewrite", _file_header(file_path), list(self._records)))
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """追加一条记录"""
+        self._records.append(record)
+        self._queue.put(("append", record))
+
+    def mark(self) -> int:
+        """当前记录数（保存开始时取得，保存成功后传给compact）"""
+        return len(self._records)
+
+    def compact(self, mark: int) -> None:
+        """
+        数据文件保存成功：删去前mark条记录，按保存后的数据文件重写日志
+        :param mark: 保存开始时mark()的返回值（其后的记录为保存期间的改动，保留）
+        """
+        del self._records[:mark]
+        self._queue.put(("rewrite", _file_header(self.file_path), list(self._records)))
+
+    def flush(self) -> None:
+        """等待已追加的记录写盘"""
+        self._queue.join()
+
+    def close(self, remove: bool = True) -> None:
+        """
+        停止记录
+        :param remove: 是否删除日志文件（改动已保存或放弃时删除）
+        """
+        self._queue.put(("close", remove))
+        self._thread.join()
+
+    def _run(self) -> None:
+        f = None
+        while True:
+            op, *args = self._queue.get()
+            try:
+                if op == "append" and f is not None:
+                    f.write(json.dumps(args[0], ensure_ascii=False, default=str) + "\n")
+                elif op == "rewrite":
+                    # 写临时文件后替换，重写过程中异常退出不丢失原日志
+                    if f is not None:
+                        f.close()
+                    temp = self.path + ".tmp"
+                    with open(temp, "w", encoding="utf-8") as out:
+                        for record in [args[0]] + args[1]:
+                            out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                        out.flush()
+                        os.fsync(out.fileno())
+                    os.replace(temp, self.path)
+                    f = open(self.path, "a", encoding="utf-8")
+                elif op == "close":
+                    if f is not None:
+                        f.close()
+                        f = None
+                    if args[0] and os.path.exists(self.path):
+                        os.remove(self.path)
+                    return
+                if f is not None and self._queue.empty():
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError as e:
+                self.error = str(e)
+                print(f"写入修改日志失败: {e}")
+            finally:
+                self._queue.task_done()
+
+
+def _sort_key(value):
+    """排序键（数值按大小排在文字前，文字按字符串排序）"""
+    if isinstance(value, numbers.Real):
+        return 0, value, ""
+    return 1, 0, str(value)
+
+
+class SectionProxyModel(QAbstractProxyModel):
+    """
+    截面表格排序、筛选代理模型
+    行映射由源模型的列数据整体排序得到，筛选行由截面索引查询给出；未排序且未筛选时为恒等映射，增删行无需重建映射
+    """
+
+    def __init__(self, model: SectionTableModel, parent=None):
+        super().__init__(parent)
+        self._rows: Optional[List[int]] = None  # 代理行 -> 源行，None为恒等映射
+        self._pos: Optional[Dict[int, int]] = None  # 源行 -> 代理行
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+        self._filter_rows: Optional[List[int]] = None  # 筛选出的源行（按给定顺序），None为不筛选
+        self.setSourceModel(model)
+        model.modelAboutToBeReset.connect(self.beginResetModel)
+        model.modelReset.connect(self._rebuild)
+        model.rowsAboutToBeInserted.connect(self._before_insert)
+        model.rowsInserted.connect(self._after_insert)
+        model.rowsAboutToBeRemoved.connect(self._before_remove)
+        model.rowsRemoved.connect(self._after_remove)
+        model.dataChanged.connect(self._source_data_changed)
+
+    # ====================== 1. Qt代理模型接口 ======================
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return self.sourceModel().rowCount() if self._rows is None else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.sourceModel().columnCount()
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= row < self.rowCount() and 0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=None):
+        if index is None:
+            return super().parent()
+        return QModelIndex()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+        row = proxy_index.row() if self._rows is None else self._rows[proxy_index.row()]
+        return self.sourceModel().index(row, proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        row = source_index.row() if self._pos is None else self._pos.get(source_index.row(), -1)
+        return self.index(row, source_index.column())
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        return self.sourceModel().headerData(section, orientation, role)
+
+    def sort(self, column, order=Qt.AscendingOrder) -> None:
+        """按列排序（column为-1时恢复数据文件顺序）"""
+        self._sort_column, self._sort_order = column, order
+        self.beginResetModel()
+        self._rebuild()
+
+    # ====================== 2. 筛选 ======================
+    def set_rows(self, rows: Optional[Sequence[int]]) -> None:
+        """
+        只显示指定的源行（未按列排序时保持给定顺序，如按R/S升序的最不利截面）
+        :param rows: 源行号，None时显示全部
+        """
+        self._filter_rows = None if rows is None else list(rows)
+        self.beginResetModel()
+        self._rebuild()
+
+    @property
+    def is_filtered(self) -> bool:
+        return self._filter_rows is not None
+
+    # ====================== 3. 行映射维护 ======================
+    def _rebuild(self) -> None:
+        """重新计算行映射（须在beginResetModel之后调用）"""
+        model = self.sourceModel()
+        col = DISPLAY_COLS[self._sort_column][1] if self._sort_column >= 0 else None
+        descending = self._sort_column >= 0 and self._sort_order == Qt.DescendingOrder
+        if col is None and not descending and self._filter_rows is None:
+            self._rows = self._pos = None
+        else:
+            rows = list(range(model.rowCount())) if self._filter_rows is None else list(self._filter_rows)
+            if col is not None:
+                values = model.columns[col]
+                rows.sort(key=lambda i: _sort_key(values[i]), reverse=descending)
+            elif self._sort_column >= 0:
+                # 按序号排序
+                rows.sort(reverse=descending)
+            self._rows = rows
+            self._pos = {r: i for i, r in enumerate(rows)}
+        self.endResetModel()
+
+    def _before_insert(self, parent, first, last) -> None:
+        if self._rows is None:
+            self.beginInsertRows(QModelIndex(), first, last)
+        else:
+            self.beginResetModel()
+
+    def _after_insert(self, parent, first, last) -> None:
+        if self._rows is None:
+            self.endInsertRows()
+            return
+        if self._filter_rows is not None:
+            # 筛选行号随插入移动（新行不在筛选结果中）
+            count = last - first + 1
+            self._filter_rows = [r + count if r >= first else r for r in self._filter_rows]
+        self._rebuild()
+
+    def _before_remove(self, parent, first, last) -> None:
+        if self._rows is None:
+            self.beginRemoveRows(QModelIndex(), first, last)
+        else:
+            self.beginResetModel()
+
+    def _after_remove(self, parent, first, last) -> None:
+        if self._rows is None:
+            self.endRemoveRows()
+            return
+        if self._filter_rows is not None:
+            count = last - first + 1
+            self._filter_rows = [r - count if r > last else r for r in self._filter_rows if not first <= r <= last]
+        self._rebuild()
+
+    def _source_data_changed(self, top_left, bottom_right, roles=()) -> None:
+        """源数据修改：转发到代理（不重新排序、筛选；非恒等映射时整表刷新）"""
+        if self._rows is None:
+            self.dataChanged.emit(self.index(top_left.row(), top_left.column()),
+                                  self.index(bottom_right.row(), bottom_right.column()))
+        elif self.rowCount():
+            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, self.columnCount() - 1))
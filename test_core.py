@@ -8,10 +8,19 @@ import os
 # 添加项目根目录到sys.path
 sys.path.append(os.path.abspath(os.path.dirname(__file__)))
 
-from concrete.core.beam_rect_fc import beam_rect_fc
+from concrete.core.beam_rect_fc import beam_rect_fc, get_material_params
 from concrete.core.beam_t_fc import beam_t_fc
+from concrete.core.beam_i_fc import beam_i_fc, I_FLAGS
 from concrete.core.rebar import get_params as get_rebar_params
 from concrete.core.concrete import get_params as get_concrete_params
+from concrete.core.rebar_thickness import parse_rows, parse_many, parse_flat, calc_core, calc_rows, rows_to_arrays, \
+    calc_core_batch, rebar_centroid
+from concrete.core.beam_utils import prepare_calculation_data
+from concrete.core.beam_design import beam_rect_design, beam_t_design
+from concrete.core.records import SectionInput, FlexureResult, material_set
+from concrete.core.section_types import SECTION_TYPES
+from concrete.core.report_writer import ReportIndex, ReportWriter, index_path
+from concrete.main.梁抗弯承载力计算 import calculate_single_item, calculate_summary
 
 
 def test_concrete_params():
@@ -114,6 +123,222 @@ def test_beam_t_fc():
     print(f"✓ T形截面梁计算成功，{flag}，Mu={Mu} kN·m")
 
 
+def test_beam_i_fc():
+    """测试工字形截面梁抗弯承载力计算"""
+    print("\n=== 测试工字形截面梁抗弯承载力计算 ===")
+    # 无受拉翼缘时与T形截面一致
+    for Ast in (2011, 6000, 12000):
+        t = beam_t_fc(250, 600, 800, 120, 30, "HRB400", "HRB400", Ast, 40, 0, 35, 1.0)
+        i = beam_i_fc(250, 600, 800, 120, 0, 0, 30, "HRB400", "HRB400", Ast, 40, 0, 35, 1.0)
+        assert t[1:] == i[1:]
+
+    # 受拉翼缘较厚时受压区进入受拉翼缘，受拉翼缘参与受压使x减小、Mu增大
+    i = beam_i_fc(200, 800, 600, 120, 600, 350, 30, "HRB400", "HRB400", 20000, 60, 0, 40, 1.0)
+    t = beam_t_fc(200, 800, 600, 120, 30, "HRB400", "HRB400", 20000, 60, 0, 40, 1.0)
+    assert i[0] == I_FLAGS[3] and "✓" in i[8]
+    assert i[1] < t[1] and i[5] > t[5]
+
+    # 判别受压区位置时计入受压钢筋：fy·Ast > α1·fc·bf'·hf'，但不超过α1·fc·bf'·hf' + fy'·As'时仍位于受压翼缘
+    i = beam_i_fc(300, 800, 800, 150, 0, 0, 30, "HRB400", "HRB400", 5000, 60, 2000, 40, 1.0)
+    rect = beam_rect_fc(800, 800, 30, "HRB400", "HRB400", 5000, 60, 2000, 40, 1.0)
+    assert i[0] == I_FLAGS[1] and (i[1], i[5]) == (rect[0], rect[4]) == (94.4, 1252.2)
+    # 超筋截面（受压区进入腹板且x > xb）钢筋应力σs < fy
+    i = beam_i_fc(250, 600, 600, 100, 0, 0, 30, "HRB400", "HRB400", 12000, 60, 1000, 40, 1.0)
+    assert i[0] == I_FLAGS[2] and i[1] > i[2] and i[6] < 360 and "✓" in i[8]
+    print(f"✓ 工字形截面梁计算成功，{i[0]}，Mu={i[5]} kN·m")
+
+
+def test_beam_design():
+    """测试配筋设计（反算）"""
+    print("\n=== 测试配筋设计 ===")
+    # 单筋：αs = 150e6/(14.3×250×460²)，ξ = 1 - √(1 - 2αs)
+    x, xb, ξ, ξb, Ast, Asc, Ast_min = beam_rect_design(250, 500, 30, "HRB400", "HRB400", 150, 40, 0, 40, 1.0)
+    assert (x, Ast, Asc, Ast_min) == (102.7, 1019.6, 0.0, 250.0)
+
+    # 按设计配筋验算，抗弯承载力等于设计弯矩（地震组合乘γRE）
+    cases = [(250, 500, 30, "HRB400", "HRB400", 400, 40, 0, 40, 1.0, 0),
+             (300, 600, 35, "HRB500", "HRB400", 450, 65, 400, 40, 1.1, 1),
+             (250, 500, 30, "HPB300", "HRB400", 60, 40, 600, 40, 1.0, 0)]
+    for b, h, fcuk, fy_g, fyc_g, M, ast, Asc0, asc, γ0, seismic in cases:
+        x, xb, ξ, ξb, Ast, Asc, _ = beam_rect_design(b, h, fcuk, fy_g, fyc_g, M, ast, Asc0, asc, γ0, seismic)
+        Mu = beam_rect_fc(b, h, fcuk, fy_g, fyc_g, Ast, ast, Asc, asc, γ0)[4]
+        assert abs(Mu - M * (0.75 if seismic else 1)) <= 0.2
+    assert beam_rect_design(250, 500, 30, "HRB400", "HRB400", 400, 40, 0, 40, 1.0)[5] > 0
+
+    for bf, hf, M in ((1000, 100, 400), (600, 80, 600)):
+        flag, x, xb, ξ, ξb, Ast, Asc, _ = beam_t_design(250, 600, bf, hf, 30, "HRB400", "HRB400", M, 40, 0, 40, 1.0)
+        res = beam_t_fc(250, 600, bf, hf, 30, "HRB400", "HRB400", Ast, 40, Asc, 40, 1.0)
+        assert res[0] == flag and abs(res[5] - M) <= 0.2
+    print("✓ 配筋设计成功")
+
+
+def test_rebar_parser():
+    """测试平法标注解析"""
+    print("\n=== 测试平法标注解析 ===")
+    # 排内混合直径
+    rows = parse_rows("2d25+2d22/4d25")
+    assert [row.text for row in rows] == ["2d25+2d22", "4d25"]
+    assert rows[0].n == 4 and rows[0].d == 25
+    assert abs(calc_core(rows)["At_fmt"] - 3705.5) < 0.1
+
+    # 总根数+各排根数，括号内为不伸入支座根数
+    rows = parse_rows("6d25 2(-2)/4")
+    assert [(row.n, row.cut) for row in rows] == [(2, 2), (4, 0)]
+
+    # 架立筋不计入受力钢筋
+    assert parse_rows("2d25+(2d12)")[0].n == 2
+
+    # 旧接口兼容
+    assert parse_flat("9d25 3/3/3") == [(3, 25), (3, 25), (3, 25)]
+    assert parse_flat("4d20+2d18") == [(6, 20)]
+
+    # 无法解析的标注不再静默丢弃
+    for bad in ("6d25 2/3", "4d20/abc", "1d20/1d20/1d20/1d20/1d20"):
+        try:
+            parse_rows(bad)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"未识别无效标注：{bad}")
+    assert parse_many(["4d20", "abc", "4d20"], strict=False)[1] is None
+    print("✓ 平法标注解析成功")
+
+
+def test_rebar_calc_batch():
+    """测试合力点数值核心及批量计算"""
+    print("\n=== 测试合力点批量计算 ===")
+    notations = ["4d20/4d25", "2d18/3d20/2d22/2d25", "9d25 3/3/3", "6d22", "2d25+2d22/4d25"]
+    layouts = parse_many(notations)
+    res = calc_core(layouts[1], 20, 10, 25)
+    At, xc, rc, _ = calc_rows(layouts[1], 20, 10, 25)
+    assert res["rc_list"] == list(rc) and res["At_fmt"] == round(At, 1)
+    assert abs(res["xc_fmt"] - xc) < 0.01
+
+    A, D = rows_to_arrays(layouts)
+    batch = calc_core_batch(A, D, c=20, dv=10, sn=25)
+    for i, r in enumerate(layouts):
+        At, xc, rc, _ = calc_rows(r, 20, 10, 25)
+        assert abs(batch["At"][i] - At) < 1e-9 and abs(batch["xc"][i] - xc) < 1e-9
+        assert list(batch["rc"][i][:len(r)]) == list(rc)
+    print("✓ 合力点批量计算与逐个计算一致")
+
+
+def test_notation_columns():
+    """测试批量输入由平法标注列计算As及as"""
+    print("\n=== 测试平法标注列 ===")
+    base = {"截面编号": "L-1", "截面类型": "矩形", "b": 300, "h": 600, "bf": 0, "hf": 0,
+            "混凝土强度等级C": 30, "受拉钢筋强度等级": "HRB400", "受压钢筋强度等级": "HRB400",
+            "受拉钢筋面积As": 1000, "受拉钢筋as": 40, "受压钢筋面积As": 0, "受压钢筋as": 40,
+            "弯矩设计值M": 200, "是否地震作用组合": 0, "结构重要性系数γ0": 1.0}
+    rows = [
+        base,  # 无标注列，沿用手填数值
+        dict(base, 梁底钢筋="4d20/4d25", 梁顶钢筋="2d25+2d22/4d25", 保护层厚度c=25),
+        dict(base, 梁底钢筋="4d20/4d25", 梁顶钢筋="2d25+2d22/4d25", 受拉侧="梁顶"),
+        dict(base, 梁底钢筋="6d25 2/3"),
+    ]
+    import pandas as pd
+    param, _ = prepare_calculation_data(pd.DataFrame(rows))
+    assert param[0]["calc_params"][7:11] == [1000, 40, 0, 40]
+    assert param[1]["calc_params"][7:9] == list(rebar_centroid("4d20/4d25", "bottom", 25, 10, 25))
+    assert param[1]["calc_params"][9:11] == list(rebar_centroid("2d25+2d22/4d25", "top", 25, 10, 25))
+    assert param[2]["calc_params"][7:9] == list(rebar_centroid("2d25+2d22/4d25", "top", 20, 10, 25))
+    assert "钢筋标注错误" in param[3]["error"]
+    print("✓ 平法标注列计算成功")
+
+
+def test_section_records():
+    """测试截面输入及计算结果记录与参数字典、结果tuple互转"""
+    print("\n=== 测试截面记录 ===")
+    item = {"sec_num": "L-1", "sec_type": "T形", "M": 300, "is_seismic": 1, "γ0": 1.0,
+            "calc_params": [250, 600, 800, 120, 30, "HRB400", "HRB400", 3000, 40, 0, 35, 1.0]}
+    rec = SectionInput.from_item(item)
+    assert not hasattr(rec, "__dict__") and (rec.bft, rec.hft) == (0, 0)
+    assert rec.to_item()["calc_params"] == item["calc_params"] + [0, 0]
+    assert rec["sec_type"] == "T形" and rec.get("error") is None
+    # 按字典读取的计算函数对记录与字典给出相同结果
+    assert calculate_single_item(rec, 0, 1) == calculate_single_item(item, 0, 1)
+
+    section = SECTION_TYPES["T形"]
+    result = section.solve(rec)
+    assert result.to_tuple(section.result_keys) == beam_t_fc(*item["calc_params"])
+    assert FlexureResult.from_tuple(beam_rect_fc(*rec.args(SECTION_TYPES["矩形"].keys)),
+                                    SECTION_TYPES["矩形"].result_keys).flag is None
+    # 相同材料组合共用一个材料记录
+    assert rec.materials is material_set(30, "HRB400", "HRB400") and rec.materials.fy == 360
+    assert rec.replace(fcuk=40).materials.fc == 19.1
+    # 计算书取截面的材料参数记录：C50以上ξb随β1减小，与计算结果一致
+    high = rec.replace(fcuk=60)
+    report = calculate_single_item(high, 0, 1)[4]
+    assert f"ξb={high.materials.ξb:.4f}" in report and high.materials.ξb < rec.materials.ξb
+    assert round(high.materials.ξb, 3) == SECTION_TYPES["T形"].solve(high).ξb
+    print(f"✓ 截面记录计算成功，Mu={result.Mu} kN·m")
+
+
+def test_calculate_summary():
+    """测试单截面快速验算与完整计算（含计算书）结果一致"""
+    print("\n=== 测试单截面快速验算 ===")
+    rec = SectionInput("L-1", "矩形", 300, 600, 0, 0, 30, "HRB400", "HRB400", 2000, 40, 0, 35, 1.0,
+                       M=250, is_seismic=1)
+    x, Mu, M, rs_ratio, _, error = calculate_single_item(rec, 0, 1)
+    summary = calculate_summary(rec)
+    assert error is None and summary[:2] == (x, Mu) and summary[3] == rs_ratio
+    assert abs(summary[2] / M - rs_ratio) < 1e-12
+    assert calculate_summary(rec.replace(is_seismic=0))[3] == Mu / 250
+    # 材料参数按材料组合缓存
+    hits = get_material_params.cache_info().hits
+    calculate_summary(rec.replace(b=350))
+    assert get_material_params.cache_info().hits == hits + 1
+    try:
+        calculate_summary(rec.replace(sec_type="圆形"))
+        assert False, "截面类型不支持时应抛出异常"
+    except Exception as e:
+        assert "不支持" in str(e)
+    print(f"✓ 快速验算成功，R/S={rs_ratio:.4f}")
+
+
+def test_report_writer():
+    """测试计算书文件写入（含gzip压缩）及按截面编号读取"""
+    print("\n=== 测试计算书索引 ===")
+    import gzip
+    import tempfile
+    reports = [(f"KL{i % 40}", calculate_single_item(
+        SectionInput(f"KL{i}", "矩形", 300, 600, 0, 0, 30, "HRB400", "HRB400", 1000 + i, 40, 0, 35, 1.0, M=200),
+        i, 100)[4]) for i in range(100)]
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, compress in (("a.out", False), ("a.out.gz", True)):
+            path = os.path.join(tmp, name)
+            # 压缩块取较小值，使计算书分布在多个gzip成员中
+            with ReportWriter(path, block_size=4096) as writer:
+                writer.write("标题\n")
+                for sec_num, report in reports:
+                    writer.add_report(sec_num, report)
+                writer.write("总计\n")
+            expected = "标题\n" + "".join(report + "\n" for _, report in reports) + "总计\n"
+            if compress:
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    assert f.read() == expected
+            else:
+                with open(path, encoding="utf-8") as f:
+                    assert f.read() == expected
+
+            index = ReportIndex(path)
+            assert len(index) == 100 and index.compressed == compress and (len(index.blocks) > 1) == compress
+            assert index.find("KL5") == [5, 45, 85] and index.find("无") == []
+            assert index.read(99) == reports[99][1] and index.report("KL3") == reports[3][1]
+            assert all(index.read(i) == reports[i][1] for i in range(100))
+
+        # 计算书文件改动后索引失效
+        with open(path, "ab") as f:
+            f.write(b"x")
+        try:
+            ReportIndex(path)
+            assert False, "文件改动后索引应失效"
+        except ValueError:
+            pass
+        assert os.path.exists(index_path(path))
+    print("✓ 计算书索引读取完成")
+
+
 def main():
     """主测试函数"""
     try:
@@ -121,6 +346,14 @@ def main():
         test_rebar_params()
         test_beam_rect_fc()
         test_beam_t_fc()
+        test_beam_i_fc()
+        test_beam_design()
+        test_rebar_parser()
+        test_rebar_calc_batch()
+        test_notation_columns()
+        test_section_records()
+        test_calculate_summary()
+        test_report_writer()
         print("\n🎉 所有测试通过！")
     except Exception as e:
         print(f"\n❌ 测试失败: {e}")
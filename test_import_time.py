@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+导入耗时基准测试（python -X importtime）
+确保单截面计算及GUI启动时不导入pandas/openpyxl/numpy等重型依赖
+"""
+import sys
+import os
+import subprocess
+import importlib.util
+
+# 项目根目录
+PROJECT_ROOT = os.path.abspath(os.path.dirname(__file__))
+
+# 启动时不允许导入的重型依赖
+HEAVY_MODULES = ("pandas", "openpyxl", "numpy")
+
+# 单截面计算相关模块的导入耗时上限(ms)
+CORE_IMPORT_BUDGET_MS = 200
+
+
+def import_profile(statement):
+    """
+    在子进程中以-X importtime执行导入语句
+    :param statement: 导入语句
+    :return: dict - {模块名: 累计导入耗时(μs)}
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import sys; sys.path.insert(0, {PROJECT_ROOT!r}); {statement}"],
+        capture_output=True, text=True, encoding="utf-8", cwd=PROJECT_ROOT,
+        env=dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    )
+    assert proc.returncode == 0, proc.stderr
+    profile = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def test_core_import_is_light():
+    """测试单截面计算模块为纯标准库实现"""
+    print("=== 测试核心计算模块导入耗时 ===")
+    profile = import_profile(
+        "import concrete.core.beam_rect_fc, concrete.core.beam_t_fc, concrete.core.report_beam, "
+        "concrete.core.rebar_thickness, concrete.core.beam_utils, concrete.main.梁抗弯承载力计算"
+    )
+    heavy = [name for name in profile if name.split(".")[0] in HEAVY_MODULES]
+    assert not heavy, f"导入了重型依赖: {heavy[:5]}"
+    total_ms = profile["concrete.main.梁抗弯承载力计算"] / 1000
+    assert total_ms < CORE_IMPORT_BUDGET_MS, f"导入耗时{total_ms:.1f}ms超出上限"
+    print(f"✓ 核心计算模块导入耗时 {total_ms:.1f} ms")
+
+
+def test_gui_import_is_light():
+    """测试GUI模块启动时不导入pandas/openpyxl"""
+    print("\n=== 测试GUI模块导入 ===")
+    if importlib.util.find_spec("PySide6") is None:
+        print("未安装PySide6，跳过")
+        return
+    profile = import_profile("import pyside6_gui_main")
+    heavy = [name for name in profile if name.split(".")[0] in HEAVY_MODULES]
+    assert not heavy, f"导入了重型依赖: {heavy[:5]}"
+    print(f"✓ GUI模块导入耗时 {profile['pyside6_gui_main'] / 1000:.1f} ms")
+
+
+def main():
+    """主测试函数"""
+    try:
+        test_core_import_is_light()
+        test_gui_import_is_light()
+        print("\n🎉 所有测试通过！")
+    except Exception as e:
+        print(f"\n❌ 测试失败: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,930 @@
+# -*- coding: utf-8 -*-
+"""
+本地计算服务及批量计算模块单元测试
+"""
+import sys
+import os
+import time
+import asyncio
+import shutil
+import tempfile
+import socket
+import threading
+import importlib.util
+
+import numpy as np
+
+# 添加项目根目录到sys.path
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+from concrete.core.beam_rect_fc import beam_rect_fc
+from concrete.core.beam_t_fc import beam_t_fc
+from common.exceptions import ErrorCode, ParameterError
+from concrete.core.beam_batch import beam_rect_fc_batch, beam_t_fc_batch, beam_i_fc_batch, beam_rect_design_batch, \
+    beam_t_design_batch, batch_error, RECT_PARAMS, RECT_DESIGN_PARAMS, DESIGN_ERROR_PARAMS
+from concrete.core.beam_i_fc import beam_i_fc, I_FLAGS
+from concrete.core.beam_design import beam_rect_design, beam_t_design
+from concrete.core.capacity_curve import CapacityCurve
+from concrete.core.beam_sweep import sweep, SweepResult
+from concrete.core.rebar_layout import optimize_layout, layout_table
+from concrete.core.rebar_thickness import rebar_centroid, calc_core_batch
+from concrete.core.beam_fiber import build_section, ultimate, moment_curvature
+from concrete.core.records import FlexureResult
+from concrete.core.section_types import BATCH_MIN, get_section_type, solve_grouped
+from concrete.core.input_check import check_items
+from concrete.main.梁抗弯计算服务 import CalcService, ServiceClient, solve_rect
+from concrete.main.梁抗弯承载力计算 import calculate_single_item, solve_items
+
+# 测试数据：(b, h, bf, hf, fcuk, fy_grade, fyc_grade, Ast, ast, Asc, asc, γ0)
+SECTIONS = [
+    (250, 500, 0, 0, 30, "HPB300", "HRB335", 1500, 42.5, 0, 67.5, 1.0),
+    (300, 550, 0, 0, 30, "HRB335", "HRB400", 2500, 67.5, 500, 92.5, 1.0),
+    (350, 600, 0, 0, 30, "HRB400", "HRB500", 5000, 92.5, 1000, 42.5, 1.1),
+    (400, 650, 0, 0, 55, "HRB500", "HPB300", 9000, 42.5, 1500, 67.5, 1.0),
+    (450, 700, 1200, 100, 30, "HPB300", "HRB335", 1500, 67.5, 2000, 67.5, 1.0),
+    (500, 750, 1300, 110, 37, "HRB335", "HRB400", 2500, 92.5, 2500, 92.5, 0.9),
+    (550, 800, 1400, 120, 30, "HRB400", "HRB500", 5000, 42.5, 3000, 42.5, 1.0),
+    (600, 850, 1500, 130, 30, "HRB500", "HPB300", 9000, 67.5, 3500, 67.5, 1.1),
+]
+
+
+def test_batch_matches_scalar():
+    """测试批量计算与逐截面计算结果一致"""
+    print("=== 测试批量计算与逐截面计算一致性 ===")
+    cols = [list(c) for c in zip(*SECTIONS)]
+    rect = beam_rect_fc_batch(*(cols[0:2] + cols[4:]), rounded=True)
+    tee = beam_t_fc_batch(*cols, rounded=True)
+    keys = ("x", "xb", "ξ", "ξb", "Mu", "σs", "σsc")
+    for i, sec in enumerate(SECTIONS):
+        expected = beam_rect_fc(*(sec[0:2] + sec[4:]))
+        assert tuple(float(rect[k][i]) for k in keys) == expected[:7]
+        expected = beam_t_fc(*sec)
+        assert tuple(float(tee[k][i]) for k in keys) == expected[1:8]
+        assert tee["flag"][i] == (1 if expected[0] == "第一类T型截面" else 2)
+
+    # 工字形截面：受拉翼缘(bft, hft)覆盖无翼缘、受压区位于腹板及进入受拉翼缘的情况
+    flanges = [(0, 0), (600, 150), (900, 400), (500, 300)]
+    for bft, hft in flanges:
+        res = beam_i_fc_batch(*cols[:4], bft, hft, *cols[4:], rounded=True)
+        for i, sec in enumerate(SECTIONS[4:], 4):
+            expected = beam_i_fc(*sec[:4], bft, hft, *sec[4:])
+            assert tuple(float(res[k][i]) for k in keys) == expected[1:8]
+            assert I_FLAGS[int(res["flag"][i])] == expected[0]
+    # 受压钢筋使受压区保持在受压翼缘内（fy·Ast > α1·fc·bf'·hf'）
+    res = beam_i_fc_batch(300, 800, 800, 150, 0, 0, 30, "HRB400", "HRB400", 5000, 60, 2000, 40, 1.0, rounded=True)
+    expected = beam_i_fc(300, 800, 800, 150, 0, 0, 30, "HRB400", "HRB400", 5000, 60, 2000, 40, 1.0)
+    assert res["flag"] == 1 and tuple(float(res[k]) for k in keys) == expected[1:8]
+
+    # 无效参数行标记为无效，不影响其他行
+    bad = beam_rect_fc_batch([250, -1], 500, 30, "HRB400", ["HRB400", "XRB"], 1500, 40, 0, 35, 1.0)
+    assert list(bad["valid"]) == [True, False]
+    # 多项参数无效时取逐截面计算首先校验的一项（截面尺寸先于材料）
+    assert list(bad["code"]) == [ErrorCode.OK, ErrorCode.DIMENSION] and bad["param"][1] == RECT_PARAMS.index("b")
+    print("✓ 批量计算结果与逐截面计算一致")
+
+
+def test_grouped_dispatch():
+    """测试按截面类型分组批量计算与逐行计算结果一致"""
+    print("\n=== 测试截面类型分组计算 ===")
+    param = []
+    for i in range(40):
+        sec = SECTIONS[i % len(SECTIONS)]
+        param.append({"sec_num": f"L{i}", "sec_type": "T形" if sec[2] else "矩形", "M": 100 + i,
+                      "is_seismic": i % 2, "γ0": sec[-1], "calc_params": list(sec)})
+    param[3]["calc_params"][5] = "XRB"  # 材料无效
+    param[9]["sec_type"] = "圆形"  # 类型不支持
+    param[12]["error"] = "钢筋标注错误"
+    for i in range(13, 40):
+        param[i]["sec_type"] = "工字形" if i % 3 else "箱形"
+        param[i]["calc_params"] += [param[i]["calc_params"][2], 200]
+    # 批量计算中参数无效的行，错误信息须与逐截面计算一致
+    param[14]["calc_params"][7] = -1  # 钢筋面积为负
+    param[15]["calc_params"][8] = param[15]["calc_params"][1]  # 有效高度为0
+    param[16]["calc_params"][11] = 0  # 结构重要性系数为0
+    param[17]["calc_params"][6] = "XRB"  # 受压钢筋等级无效
+    results = solve_items(param)
+    for i in (14, 15, 16, 17):
+        sec = get_section_type(param[i]["sec_type"])
+        try:
+            sec.solver(*sec.args(param[i]["calc_params"]))
+        except Exception as e:
+            assert type(results[i]) is type(e) and str(results[i]) == str(e)
+    assert results[9] is None and results[12] is None and isinstance(results[3], Exception)
+    # 批量计算结果为结果记录，与逐截面计算的记录相同
+    for i, result in enumerate(results):
+        if isinstance(result, FlexureResult):
+            assert result == get_section_type(param[i]["sec_type"]).solve(param[i]["calc_params"])
+    assert sum(isinstance(result, FlexureResult) for result in results) == 33
+    for i, item in enumerate(param):
+        assert calculate_single_item(item, i, len(param), results[i]) == calculate_single_item(item, i, len(param))
+
+    # 数值参数含nan/inf的行不论分组大小（逐截面或批量计算）均为参数错误，不影响其他行
+    for n in (BATCH_MIN, BATCH_MIN + 4):
+        items = [("矩形", list(SECTIONS[0])) for _ in range(n)]
+        items[0][1][0] = float("nan")
+        items[1][1][7] = np.nan
+        items[2][1][11] = float("inf")
+        grouped = solve_grouped(items)
+        for i in (0, 1, 2):
+            assert isinstance(grouped[i], ParameterError) and "有限数值" in grouped[i].message
+        assert "b=nan" in grouped[0].parameter and "γ0=inf" in grouped[2].parameter
+        assert all(r == get_section_type("矩形").solve(SECTIONS[0]) for r in grouped[3:])
+    print("✓ 分组批量计算结果及计算书与逐行计算一致")
+
+
+def test_design_batch_matches_scalar():
+    """测试批量配筋设计与逐截面设计结果一致"""
+    print("\n=== 测试批量配筋设计 ===")
+    # 由SECTIONS改为(…, M, ast, Asc, asc, γ0, is_seismic)，覆盖单筋、双筋及第一/二类T形截面
+    rows = [sec[0:2] + (max(sec[2], sec[0]), sec[3] or 100) + sec[4:7] + (M, sec[8], Asc, sec[10], sec[11], seismic)
+            for sec, M, Asc, seismic in zip(SECTIONS, (80, 250, 600, 900, 400, 1200, 1500, 2500),
+                                            (0, 500, 0, 1500, 0, 2500, 0, 3500), (0, 1, 0, 1, 0, 1, 0, 1))]
+    cols = [list(c) for c in zip(*rows)]
+    rect = beam_rect_design_batch(*(cols[0:2] + cols[4:]), rounded=True)
+    tee = beam_t_design_batch(*cols, rounded=True)
+    keys = ("x", "xb", "ξ", "ξb", "Ast", "Asc", "Ast_min")
+    for i, row in enumerate(rows):
+        assert tuple(float(rect[k][i]) for k in keys) == beam_rect_design(*(row[0:2] + row[4:]))
+        expected = beam_t_design(*row)
+        assert tuple(float(tee[k][i]) for k in keys) == expected[1:]
+        assert tee["flag"][i] == (1 if expected[0] == "第一类T型截面" else 2)
+    bad = beam_rect_design_batch(250, 500, 30, ["HRB400", "XRB"], "HRB400", [150, -1], 40, 0, 40, 1.0)
+    assert list(bad["valid"]) == [True, False]
+    # 多项参数无效时取逐截面计算首先校验的一项（弯矩先于材料）
+    assert bad["code"][1] == ErrorCode.MOMENT and bad["param"][1] == RECT_DESIGN_PARAMS.index("M")
+    assert str(batch_error(bad["code"][1], RECT_DESIGN_PARAMS, (250, 500, 30, "XRB", "HRB400", -1, 40, 0, 40, 1.0),
+                           DESIGN_ERROR_PARAMS)) == "弯矩设计值不能为负 | 参数：M=-1"
+    print("✓ 批量配筋设计与逐截面设计一致")
+
+
+def test_capacity_curve():
+    """测试承载力曲线与批量计算一致及反算"""
+    print("\n=== 测试承载力曲线 ===")
+    Ast = np.linspace(0, 20000, 4001)
+    for b, h, bf, hf, fcuk, fy_grade, fyc_grade, _, ast, Asc, asc, γ0 in SECTIONS:
+        for tee in (False, True):
+            if tee:
+                curve = CapacityCurve(b, h, fcuk, fy_grade, fyc_grade, ast, Asc, asc, γ0, bf=max(bf, b), hf=hf)
+                ref = beam_t_fc_batch(b, h, max(bf, b), hf, fcuk, fy_grade, fyc_grade, Ast, ast, Asc, asc, γ0)
+            else:
+                curve = CapacityCurve(b, h, fcuk, fy_grade, fyc_grade, ast, Asc, asc, γ0)
+                ref = beam_rect_fc_batch(b, h, fcuk, fy_grade, fyc_grade, Ast, ast, Asc, asc, γ0)
+            mu = curve.mu(Ast)
+            assert np.allclose(mu[ref["valid"]], ref["Mu"][ref["valid"]], rtol=0, atol=1e-9)
+
+            # 反算所需最小Ast：承载力达到目标，减小1mm²则不足
+            target = np.linspace(1, mu.max(), 100)
+            need = curve.ast(target)
+            assert np.all(curve.mu(need) >= target - 1e-9)
+            assert np.all(curve.mu(need - 1) < target)
+    assert np.isnan(curve.ast(1e6))
+    print("✓ 承载力曲线与批量计算一致")
+
+
+def test_sweep():
+    """测试参数扫描与批量计算一致及结果文件读写"""
+    print("\n=== 测试参数扫描 ===")
+    params = {"b": [200, 250, 300], "h": range(400, 801, 100), "fcuk": [25, 30, 40], "fy_grade": ["HRB400", "HRB500"],
+              "fyc_grade": "HRB400", "ρ": np.linspace(0.002, 0.04, 20), "ast": 40, "Asc": [0, 500], "asc": 40,
+              "γ0": 1.0}
+    res = sweep(params, outputs=("Mu", "valid"), chunk_size=1000, dtype=np.float64)
+    assert res["Mu"].shape == (3, 5, 3, 2, 20, 2)
+    grid = np.meshgrid(*res.axes.values(), indexing="ij")
+    b, h, fcuk, fy_grade, ρ, Asc = grid
+    ref = beam_rect_fc_batch(b, h, fcuk, fy_grade, "HRB400", ρ * b * (h - 40), 40, Asc, 40, 1.0)
+    assert np.array_equal(res["Mu"], ref["Mu"], equal_nan=True)
+    assert np.array_equal(res["valid"], ref["valid"])
+
+    # T形截面、进程池计算
+    params.update({"bf": 800, "hf": [0, 100, 120]})
+    tee = sweep(params, section="T形", chunk_size=700, workers=2)
+    assert tee["Mu"].dtype == np.float32 and tee["Mu"].shape == (3, 5, 3, 2, 20, 2, 3)
+    assert abs(tee.sel("Mu", b=250, h=600, fcuk=30, fy_grade="HRB400", Asc=0, hf=100)[5]
+               - beam_t_fc(250, 600, 800, 100, 30, "HRB400", "HRB400", tee.axes["ρ"][5] * 250 * 560, 40, 0, 40,
+                           1.0)[5]) < 0.01
+
+    # .npz及内存映射目录
+    with tempfile.TemporaryDirectory() as tmp:
+        res.save(os.path.join(tmp, "rect.npz"))
+        loaded = SweepResult.load(os.path.join(tmp, "rect.npz"))
+        assert list(loaded.axes) == list(res.axes) and np.array_equal(loaded["Mu"], res["Mu"], equal_nan=True)
+        mm = sweep(params, section="T形", out_dir=os.path.join(tmp, "t"))
+        loaded = SweepResult.load(os.path.join(tmp, "t"))
+        assert isinstance(loaded["Mu"], np.memmap) and loaded.fixed["bf"] == 800
+        assert np.array_equal(loaded["Mu"], mm["Mu"], equal_nan=True)
+        del loaded, mm
+
+    # 截面类型无该输出结果键
+    try:
+        sweep(dict(params, hf=100), outputs=("Mu", "flag"))
+        raise AssertionError("矩形截面输出flag应抛出ParameterError")
+    except ParameterError as e:
+        assert "flag" in e.message and "Mu" in e.parameter
+    codes = sweep(dict(params, b=[-1, 250]), section="T形", outputs=("flag", "code"))
+    assert codes["code"].dtype == np.int8 and (codes["code"][0] != 0).all() and (codes["flag"][0] == 0).all()
+    print("✓ 参数扫描结果与批量计算一致")
+
+
+def test_layout_optimizer():
+    """测试钢筋排布优选"""
+    print("\n=== 测试钢筋排布优选 ===")
+    best = optimize_layout(300, 700, 30, "HRB400", "HRB400", 350, 0, 40, 1.0, top_k=10)
+    assert len(best) == 10 and [c.score for c in best] == sorted(c.score for c in best)
+    for cand in best:
+        Ast, ast = rebar_centroid(cand.notation, "bottom", 20, 10, 25)
+        assert abs(Ast - cand.Ast) < 0.1 and abs(ast - cand.ast) < 0.02
+        assert beam_rect_fc(300, 700, 30, "HRB400", "HRB400", Ast, ast, 0, 40, 1.0)[4] >= 350
+
+    # 剪枝不遗漏最优方案：与全部方案逐一计算比较
+    table = layout_table(300)
+    res = beam_rect_fc_batch(300, 700, 30, "HRB400", "HRB400", table["Ast"], table["ast"], 0, 40, 1.0)
+    ok = res["valid"] & (res["Mu"] >= 350) & (res["x"] <= res["xb"])
+    assert abs(table["Ast"][ok].min() - best[0].Ast) < 0.1
+
+    # 梁顶受拉、地震组合、按造价评分
+    top = optimize_layout(300, 700, 30, "HRB400", "HRB400", 350, 0, 40, 1.0, is_seismic=1, position="top",
+                          cost={d: d * d + 100 for d in (16, 20, 25)})
+    assert top and all(c.Mu >= 350 * 0.75 for c in top)
+    Ast, ast = rebar_centroid(top[0].notation, "top", 20, 10, 25)
+    assert abs(Ast - top[0].Ast) < 0.1 and abs(ast - top[0].ast) < 0.02
+    assert optimize_layout(200, 400, 30, "HRB400", "HRB400", 5000, 0, 40, 1.0) == []
+    print(f"✓ 钢筋排布优选成功，最优方案 {best[0].notation}")
+
+
+def test_fiber_section():
+    """测试纤维模型（与等效矩形应力图计算结果对比）"""
+    print("\n=== 测试纤维模型 ===")
+    b, h, bf, hf = 250, 600, 800, 100
+    Ast = np.array([800, 1200, 1600, 2000, 2400])
+    rect = ultimate(build_section(b, h, 30, "HRB400", "HRB400", Ast, 40, 0, 40))
+    tee = ultimate(build_section(b, h, 40, "HRB400", "HRB400", Ast * 2, 40, 0, 40, bf=bf, hf=hf))
+    for i, A in enumerate(Ast):
+        assert abs(rect["Mu"][i] / beam_rect_fc(b, h, 30, "HRB400", "HRB400", A, 40, 0, 40, 1.0)[4] - 1) < 0.02
+        assert abs(tee["Mu"][i] / beam_t_fc(b, h, bf, hf, 40, "HRB400", "HRB400", A * 2, 40, 0, 40, 1.0)[5] - 1) < 0.02
+
+    # 分排钢筋：各排高度来自calc_core_batch
+    A_rows = np.array([[0.0, 0, 1473, 1473], [0.0, 0, 0, 2945]])
+    geo = calc_core_batch(A_rows, np.array([[0.0, 0, 25, 25], [0.0, 0, 0, 25]]))
+    rows = ultimate(build_section(b, h, 30, "HRB400", "HRB400", geo["At"], geo["xc"], 0, 40, rows=(A_rows, geo["rc"])))
+    lumped = ultimate(build_section(b, h, 30, "HRB400", "HRB400", geo["At"], geo["xc"], 0, 40))
+    assert np.allclose(rows["Mu"], lumped["Mu"], rtol=0.01)
+
+    mc = moment_curvature(build_section(b, h, 30, "HRB400", "HRB400", Ast, 40, 0, 40), n_points=20)
+    assert mc["M"].shape == (5, 20) and (np.diff(mc["M"][:, :5], axis=1) > 0).all()
+    assert (mc["μφ"] > 1).all() and (np.diff(mc["μφ"]) < 0).all() and mc["yielded"].all()
+
+    # 超筋截面：混凝土先压碎、受拉钢筋未屈服，无屈服点
+    over = moment_curvature(build_section(200, 500, 25, "HRB400", "HRB400", np.array([800, 2857]), 40, 0, 40))
+    assert list(over["yielded"]) == [True, False] and np.isfinite(over["Mu"]).all()
+    assert np.isnan([over["φy"][1], over["My"][1], over["μφ"][1]]).all() and over["My"][0] < over["Mu"][0]
+    print(f"✓ 纤维模型计算成功，Mu = {np.round(rect['Mu'], 1)}，μφ = {np.round(mc['μφ'], 2)}")
+
+
+def test_input_check():
+    """测试计算数据整列校验与逐截面计算的参数校验一致"""
+    print("\n=== 测试计算数据校验 ===")
+    param = [{"sec_num": f"L{i}", "sec_type": "T形" if sec[2] else "矩形", "M": 100.0, "calc_params": list(sec)}
+             for i, sec in enumerate(SECTIONS * 2)]
+    param[1]["calc_params"][8] = 600  # 有效高度为0
+    param[2]["calc_params"][7] = -1  # 钢筋面积为负
+    param[3]["calc_params"][6] = "XRB"  # 钢筋牌号无效
+    param[4]["calc_params"][3] = 800  # 翼缘高度超过梁高
+    param[5]["calc_params"][4] = 90  # 混凝土等级超出范围
+    param[6]["M"] = float("nan")  # 弯矩缺失
+    param[7]["calc_params"][0] = "250mm"  # 非数值
+    param[8]["sec_type"] = "圆形"  # 类型不支持
+    param[9]["sec_type"], param[9]["calc_params"][2:4] = "T形", [0, 0]  # 可自动修正
+    param[10]["error"] = "钢筋标注错误"
+
+    # 不修正时翼缘尺寸为0的T形截面只警告，按原截面类型计算
+    report = check_items(param)
+    assert not report.fixed.any() and not report.bad[9] and param[9]["sec_type"] == "T形"
+    assert report.counts["警告: T形截面翼缘尺寸为0"] == 1
+
+    report = check_items(param, fix=True)
+    assert list(np.flatnonzero(report.bad)) == [1, 2, 3, 4, 5, 6, 7, 8, 10]
+    assert list(np.flatnonzero(report.fixed)) == [9] and param[9]["sec_type"] == "矩形"
+    assert report.counts["错误: 钢筋面积不能为负"] == 1
+    # 与逐截面计算的异常信息一致
+    errors = report.row_errors()
+    for i in (1, 4):
+        sec = get_section_type(param[i]["sec_type"])
+        try:
+            sec.solver(*sec.args(param[i]["calc_params"]))
+        except Exception as e:
+            assert str(e).split(" | ")[0] == errors[i].split(" | ")[0]
+    assert report.mark_errors(param) == 8 and param[10]["error"] == "钢筋标注错误"
+    results = solve_items(param)
+    assert all(results[i] is None for i in np.flatnonzero(report.bad))
+    print(f"✓ 数据校验完成\n{report.summary()}")
+
+
+def test_section_model():
+    """测试GUI截面表格模型（按列存储、排序筛选）"""
+    print("\n=== 测试GUI截面表格模型 ===")
+    if importlib.util.find_spec("PySide6") is None:
+        print("✓ 未安装PySide6，跳过")
+        return
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    import pandas as pd
+    from PySide6.QtCore import Qt
+    from PySide6.QtWidgets import QApplication
+    from pyside6_section_model import SectionTableModel, SectionProxyModel, PANEL_COLS
+    from concrete.core.section_index import SectionIndex
+    app = QApplication.instance() or QApplication([])
+
+    n = 100000
+    df = pd.DataFrame({"截面编号": [f"L{i}" for i in range(n)], "截面类型": ["矩形", "T形"] * (n // 2),
+                       "b": 300.0, "h": 600.0, "bf": [0.0, 1200.0] * (n // 2), "hf": [np.nan, 100.0] * (n // 2),
+                       "混凝土强度等级C": 30, "弯矩设计值M": 250.0, "结构重要性系数γ0": 1.1})
+    model = SectionTableModel()
+    proxy = SectionProxyModel(model)
+    start = time.perf_counter()
+    model.load_frame(df)
+    elapsed = time.perf_counter() - start
+    assert model.rowCount() == n and model.columnCount() == 4
+    values = model.panel_values(0)
+    assert values["hf"] == 0 and values["fcuk"] == 30 and values["M"] == 250 and values["γ0"] == 1.1
+    assert values["Asc"] == 0 and model.index(1, 2).data() == "T形"
+
+    # 增删改
+    model.update_record(1, {PANEL_COLS["b"]: 350, "备注": "修改"})
+    assert model.value(1, "b") == 350 and model.value(0, "备注") == 0
+    model.insert_record({"截面编号": "新增", "截面类型": "工字形"}, row=0)
+    assert model.rowCount() == n + 1 and model.value(0, "b") == 0 and model.index(1, 0).data() == "2"
+    model.remove_row(0)
+    assert model.rowCount() == n and model.value(0, "截面编号") == "L0"
+
+    # 按原始值排序（序号按数值排序），筛选为截面索引给出的行
+    proxy.sort(0, Qt.DescendingOrder)
+    assert proxy.index(0, 1).data() == f"L{n - 1}"
+    proxy.set_rows(SectionIndex(model.columns).query("l9999"))
+    assert proxy.rowCount() == 11 and proxy.index(0, 1).data() == "L99999"
+    assert model.index(99990, 1).data() == proxy.mapToSource(proxy.index(9, 1)).data()
+    model.update_record(99999, {"截面类型": "箱形"})
+    assert proxy.index(0, 2).data() == "箱形"
+    model.remove_row(0)
+    assert proxy.rowCount() == 11 and proxy.mapToSource(proxy.index(0, 1)).row() == 99998
+    proxy.sort(-1)
+    proxy.set_rows(None)
+    assert proxy.mapFromSource(model.index(5, 0)).row() == 5
+    print(f"✓ 截面表格模型载入{n}行耗时 {elapsed * 1000:.1f} ms")
+
+
+def test_section_index():
+    """测试截面索引查询及计算结果列"""
+    print("\n=== 测试截面索引 ===")
+    if importlib.util.find_spec("PySide6") is None:
+        print("✓ 未安装PySide6，跳过")
+        return
+    import pandas as pd
+    from common.exceptions import ParameterError
+    from concrete.core.section_index import SectionIndex, parse_query, uses_results
+    from pyside6_section_model import SectionTableModel, update_results
+
+    n = 2000
+    df = pd.DataFrame({"截面编号": [f"{i % 10 + 1}F-KL{i}" for i in range(n)],
+                       "截面类型": ["矩形", "T形"] * (n // 2), "b": 300, "h": 600,
+                       "bf": [0, 1200] * (n // 2), "hf": [0, 120] * (n // 2), "混凝土强度等级C": 30,
+                       "受拉钢筋强度等级": "HRB400", "受压钢筋强度等级": ["HRB400", "HRB335"] * (n // 2),
+                       "受拉钢筋面积As": np.linspace(500, 5000, n), "受拉钢筋as": 40, "受压钢筋面积As": 0,
+                       "受压钢筋as": 40, "弯矩设计值M": 300, "是否地震作用组合": 0, "结构重要性系数γ0": 1.0})
+    df.loc[3, "b"] = -1  # 计算出错
+    model = SectionTableModel()
+    model.load_frame(df)
+    assert update_results(model) == n and update_results(model) == 0
+    assert model.index(3, 3).data() == "" and model.value(3, "判别") == "错误"
+    rs = model.columns["R/S"]
+    assert abs(rs[1] - get_section_type("T形").solve(model.section_input(1)).Mu / 300) < 1e-9
+
+    index = SectionIndex(model.columns)
+    ids = [str(v).lower() for v in model.columns["截面编号"]]
+    expect = [i for i in range(n) if ids[i].startswith("5f") and model.value(i, "截面类型") == "T形" and rs[i] < 1]
+    assert index.query("^5F 类型=T形 R/S<1").tolist() == expect
+    assert index.query("kl12").tolist() == [i for i in range(n) if "kl12" in ids[i]]
+    assert index.query("kl123").tolist() == [123, 1230, 1231, 1232, 1233, 1234, 1235, 1236, 1237, 1238, 1239]
+    assert len(index.query("受压钢筋=HRB335")) == n // 2 and len(index.query("类型!=T形")) == n // 2
+    assert len(index.query("判别=第二类T型截面")) + len(index.query("判别=第一类T型截面")) == n // 2 - 1
+    assert index.query("判别=错误").tolist() == [3]
+    worst = index.worst(5)
+    assert 3 not in worst and list(rs[i] for i in worst) == sorted(r for r in rs if r == r)[:5]
+    assert uses_results(parse_query("^5F R/S<1")) and not uses_results(parse_query("^5F 类型=T形"))
+    for bad in ("x<1", "R/S<abc", "类型>1"):
+        try:
+            parse_query(bad)
+            assert False, f"{bad}应抛出异常"
+        except ParameterError:
+            pass
+
+    # 修改过的行结果过期，只重新计算这些行
+    worst_rs, before = rs[worst[0]], model.value(1, "R/S")
+    model.update_record(1, {"受拉钢筋面积As": 6000.0})
+    model.remove_row(0)
+    assert model.stale_result_rows() == [0] and model.value(0, "R/S") is None
+    assert update_results(model) == 1 and model.value(0, "R/S") > before
+    print(f"✓ 截面索引查询完成，最不利R/S={worst_rs:.3f}")
+
+
+def test_result_distribution():
+    """测试结果分布直方图分箱、散点抽样及点击分箱筛选"""
+    print("\n=== 测试结果分布 ===")
+    from concrete.core.result_stats import histogram, downsample_scatter, nice_edges, result_distribution
+    from concrete.core.section_index import SectionIndex
+
+    rng = np.random.default_rng(0)
+    n = 100000
+    rs = rng.normal(1.2, 0.2, n)
+    rs[:10] = [50, -3, np.nan, np.nan, 1.0, 1.0, 0.95, 0.95, 1e6, 0]  # 离群值、出错行及边界值
+    types = np.where(np.arange(n) % 3 == 0, "T形", "矩形")
+    M = rng.uniform(50, 800, n)
+    columns = {"截面编号": [f"KL{i}" for i in range(n)], "R/S": rs.tolist(), "Mu": (rs * M).tolist(),
+               "弯矩设计值M": M.tolist(), "截面类型": types.tolist(), "ξ/ξb": rng.uniform(0, 1.2, n).tolist()}
+
+    assert nice_edges(0.13, 2.87, 30).tolist()[:3] == [0.1, 0.2, 0.3]
+    hist = histogram(columns["R/S"], "R/S")
+    assert hist.total == n - 2 and hist.counts.sum() == n - 2 and len(hist.counts) <= 30
+    # 各分箱截面数与按分箱查询表达式筛选的截面数一致（首末分箱包含离群值）
+    index = SectionIndex(columns)
+    for i in range(len(hist.counts)):
+        assert len(index.query(hist.query(i))) == hist.counts[i], hist.query(i)
+    assert hist.query(0).startswith("R/S<") and hist.query(len(hist.counts) - 1).startswith("R/S>=")
+    assert histogram([np.nan, None, "x"], "R/S").total == 0
+
+    scatter = downsample_scatter(M, rs * M, types, grid=(100, 50))
+    assert scatter.counts == {"T形": (n + 2) // 3 - 1, "矩形": n - (n + 2) // 3 - 1}
+    for xs, ys in scatter.points.values():
+        assert len(xs) <= 100 * 50 and np.isfinite(xs).all() and np.isfinite(ys).all()
+    assert scatter.y_range[1] == np.nanmax(rs * M)  # 离群点保留
+    t0 = time.perf_counter()
+    hists, _, summary = result_distribution(columns)
+    elapsed = time.perf_counter() - t0
+    assert summary == {"总数": n, "出错": 2, "R/S<1": int((rs < 1).sum())} and set(hists) == {"R/S", "ξ/ξb", "Mu"}
+
+    if importlib.util.find_spec("PySide6") is not None:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PySide6.QtWidgets import QApplication
+        app = QApplication.instance() or QApplication([])
+        from pyside6_dashboard import ResultDashboard
+        dashboard = ResultDashboard()
+        dashboard.set_distribution(*result_distribution(columns))
+        selected = []
+        dashboard.query_selected.connect(selected.append)
+        dashboard.hist_views["R/S"].chart().series()[0].barSets()[0].clicked.emit(3)
+        assert selected == [hist.query(3)]
+        dashboard.set_distribution(*result_distribution({"R/S": [], "Mu": []}))
+    print(f"✓ 结果分布统计完成（{n}个截面 {elapsed * 1000:.0f}ms）")
+
+
+def test_section_save():
+    """测试GUI截面表格只回写修改的单元格及增删行"""
+    print("\n=== 测试GUI截面数据增量保存 ===")
+    if importlib.util.find_spec("PySide6") is None:
+        print("✓ 未安装PySide6，跳过")
+        return
+    import pandas as pd
+    from openpyxl import Workbook, load_workbook
+    from pyside6_section_model import SectionTableModel, SAVE_COLS, write_changes
+
+    header = list(SAVE_COLS) + ["梁底钢筋"]
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Sheet1"
+    ws.append(header)
+    for i in range(5):
+        ws.append([f"L{i}", 1.0, 100 + i, 0, "矩形", 300, 600, 0, 0, 30, "HRB400", "HRB400", 1500, 42.5, 0, 42.5,
+                   f"{i + 2}d20"])
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data.xlsx")
+        wb.save(path)
+        model = SectionTableModel()
+        model.load_frame(pd.read_excel(path))
+        assert not model.is_dirty
+
+        model.update_record(0, {"b": 300.0, "h": 650})  # b未变化
+        model.remove_row(1)
+        model.update_record(2, {"弯矩设计值M": 999})  # 原L3
+        model.insert_record({"截面编号": "新增", "截面类型": "T形"})
+        changes = model.take_changes()
+        assert changes.ops == [("delete", 1), ("insert", 4)]
+        assert changes.cells[0] == (0, {"h": 650}) and changes.cells[1] == (2, {"弯矩设计值M": 999})
+        assert not model.is_dirty and not model.take_changes()
+        assert write_changes(path, changes) == 2 + len(SAVE_COLS)
+
+        saved = pd.read_excel(path).fillna(0)
+        assert list(saved["截面编号"]) == ["L0", "L2", "L3", "L4", "新增"]
+        assert list(saved["h"]) == [650, 600, 600, 600, 0] and saved["弯矩设计值M"][2] == 999
+        # 增删行整行移动，未回写的列随行移动
+        assert list(saved["梁底钢筋"]) == ["2d20", "4d20", "5d20", "6d20", 0]
+        assert load_workbook(path).active.max_row == 6
+
+        # 受拉翼缘列一并回写，表头中没有时追加到末列之后
+        model.update_record(3, {"受拉翼缘宽度bft": 600, "受拉翼缘高度hft": 150})
+        assert write_changes(path, model.take_changes()) == 2
+        saved = pd.read_excel(path).fillna(0)
+        assert list(saved["受拉翼缘宽度bft"]) == [0, 0, 0, 600, 0] and saved["受拉翼缘高度hft"][3] == 150
+
+        # 保存失败时放回改动
+        model.update_record(0, {"b": 350})
+        changes = model.take_changes()
+        model.restore_changes(changes)
+        assert model.take_changes() == changes
+    print("✓ 增量保存完成")
+
+
+def test_gui_panel_item():
+    """测试GUI参数面板的计算参数（含受拉翼缘）与批量计算一致"""
+    print("\n=== 测试GUI参数面板 ===")
+    if importlib.util.find_spec("PySide6") is None:
+        print("✓ 未安装PySide6，跳过")
+        return
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    import pandas as pd
+    from PySide6.QtTest import QTest
+    from PySide6.QtWidgets import QApplication, QMessageBox
+    from concrete.main.梁抗弯承载力计算 import calculate_summary
+    from pyside6_gui_main import BeamCalculationGUI
+    from pyside6_section_model import update_results
+    app = QApplication.instance() or QApplication([])
+
+    question = QMessageBox.question
+    QMessageBox.question = staticmethod(lambda *args, **kwargs: QMessageBox.No)
+    try:
+        gui = BeamCalculationGUI()
+        QTest.qWait(300)  # 延迟初始化（载入默认数据文件）完成后再替换数据
+
+        # 示例数据文件无"抗震等级"等面板列，只浏览截面不产生未保存修改
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "data.xlsx")
+            shutil.copy(os.path.join(os.path.dirname(os.path.abspath(__file__)), "input", "梁抗弯承载力数据文件.xlsx"),
+                        path)
+            gui.load_data_file_to_list(path)
+            assert gui.section_model.rowCount() > 1 and gui.section_model.value(0, "抗震等级") is None
+            for row in (1, 0, 1):
+                gui.load_section(row)
+            assert not gui.section_model.is_dirty and gui.section_model.value(0, "抗震等级") == "二级"
+            gui.close_journal()
+
+        gui.current_section_index = -1
+        df = pd.DataFrame({"截面编号": ["I-1", "R-1"], "截面类型": ["工字形", "矩形"], "b": 200.0, "h": 800.0,
+                           "bf": 600.0, "hf": 120.0, "受拉翼缘宽度bft": [600.0, 0.0], "受拉翼缘高度hft": [350.0, 0.0],
+                           "混凝土强度等级C": 30, "受拉钢筋强度等级": "HRB400", "受压钢筋强度等级": "HRB400",
+                           "受拉钢筋面积As": 20000.0, "受拉钢筋as": 60.0, "受压钢筋面积As": 0.0, "受压钢筋as": 40.0,
+                           "弯矩设计值M": 1500.0, "是否地震作用组合": 0, "结构重要性系数γ0": 1.0})
+        gui.section_model.load_frame(df)
+        update_results(gui.section_model)
+        gui.load_section(0)
+        item = gui.panel_item()
+        assert (item.bft, item.hft) == (600, 350) and gui.bft_input.isVisibleTo(gui)
+        x, Mu, MuE, rs_ratio = calculate_summary(item)
+        assert Mu == gui.section_model.value(0, "Mu") and rs_ratio == gui.section_model.value(0, "R/S")
+        # 受拉翼缘进入受压区，与不计受拉翼缘的结果不同
+        assert Mu > calculate_summary(item.replace(bft=0, hft=0))[1]
+
+        gui.load_section(1)
+        item = gui.panel_item()
+        assert (item.bft, item.hft) == (0, 0) and not gui.bft_input.isVisibleTo(gui)
+        assert calculate_summary(item)[1] == gui.section_model.value(1, "Mu")
+        gui.close_journal()
+        gui.hide()
+        gui.deleteLater()
+    finally:
+        QMessageBox.question = question
+    print(f"✓ 参数面板与批量计算一致，工字形截面Mu={Mu} kN·m")
+
+
+def test_edit_journal():
+    """测试GUI修改日志的记录、重放及保存后压缩"""
+    print("\n=== 测试GUI修改日志 ===")
+    if importlib.util.find_spec("PySide6") is None:
+        print("✓ 未安装PySide6，跳过")
+        return
+    import pandas as pd
+    from openpyxl import Workbook
+    from pyside6_section_model import (SectionTableModel, SAVE_COLS, EditJournal, journal_matches, journal_path,
+                                       read_journal, write_changes)
+
+    wb = Workbook()
+    ws = wb.active
+    ws.append(list(SAVE_COLS))
+    for i in range(4):
+        ws.append([f"L{i}", 1.0, 100 + i, 0, "矩形", 300, 600, 0, 0, 30, "HRB400", "HRB400", 1500, 42.5, 0, 42.5])
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data.xlsx")
+        wb.save(path)
+        assert read_journal(path) is None
+        model = SectionTableModel()
+        model.load_frame(pd.read_excel(path))
+        model.journal = EditJournal(path)
+        model.update_record(0, {"h": 650})
+        model.update_record(0, {"h": 650})  # 未变化，不记录
+        model.remove_row(1)
+        model.insert_record({"截面编号": "新增", "截面类型": "T形"}, 1)
+        model.update_record(3, {"弯矩设计值M": 999})
+        model.journal.flush()
+
+        # 模拟异常退出：日志末行未写完
+        with open(journal_path(path), "a", encoding="utf-8") as f:
+            f.write('{"op": "set", "ro')
+        header, records = read_journal(path)
+        assert [r["op"] for r in records] == ["set", "delete", "insert", "set"] and journal_matches(header, path)
+        recovered = SectionTableModel()
+        recovered.load_frame(pd.read_excel(path))
+        recovered.replay(records)
+        assert recovered.columns["截面编号"] == model.columns["截面编号"] == ["L0", "新增", "L2", "L3"]
+        changes = recovered.take_changes()
+        assert changes[:2] == model.take_changes()[:2]
+        try:
+            recovered.replay([{"op": "delete", "row": 9}])
+            assert False, "行号超出范围应抛出异常"
+        except ValueError:
+            pass
+
+        # 保存：保存开始前的记录写入数据文件后删去，保存期间的修改保留
+        journal = model.journal
+        mark = journal.mark()
+        model.update_record(2, {"b": 350})
+        write_changes(path, changes)
+        journal.compact(mark)
+        journal.flush()
+        header, records = read_journal(path)
+        assert records == [{"op": "set", "row": 2, "values": {"b": 350}}] and journal_matches(header, path)
+        assert list(pd.read_excel(path)["截面编号"]) == ["L0", "新增", "L2", "L3"]
+        journal.close()
+        assert read_journal(path) is None and journal.error is None
+    print("✓ 修改日志记录及恢复完成")
+
+
+def test_project_db():
+    """测试项目数据库导入导出、增量保存及计算结果"""
+    print("\n=== 测试项目数据库 ===")
+    import pandas as pd
+    from openpyxl import Workbook
+    from concrete.core.beam_utils import prepare_calculation_data
+    from concrete.config import OUTPUT_COLS
+    from concrete.core.project_db import ProjectDB, import_workbook, is_project
+    from concrete.main.梁抗弯承载力计算 import save_project_results, solve_items
+
+    header = ["截面编号", "结构重要性系数γ0", "弯矩设计值M", "是否地震作用组合", "截面类型", "b", "h", "bf", "hf",
+              "混凝土强度等级C", "受拉钢筋强度等级", "受压钢筋强度等级", "受拉钢筋面积As", "受拉钢筋as", "受压钢筋面积As",
+              "受压钢筋as", "梁底钢筋"]
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Sheet1"
+    ws.append(header)
+    for i in range(6):
+        ws.append([f"00{i}", 1.0, 100 + 50 * i, i % 2, "T形" if i % 3 == 0 else "矩形", 300, 600, 1200, 120, 30,
+                   "HRB400", "HRB400", 1500, 42.5, 0, 42.5, "4d20" if i == 2 else None])
+    with tempfile.TemporaryDirectory() as tmp:
+        xlsx = os.path.join(tmp, "data.xlsx")
+        wb.save(xlsx)
+        path = import_workbook(xlsx)
+        assert is_project(path) and path.endswith("data.db")
+        db = ProjectDB(path)
+        assert db.columns == header and db.count() == 6
+        columns = db.read_columns()
+        assert columns["截面编号"][:2] == ["000", "001"] and columns["梁底钢筋"][1] is None
+        assert db.read_columns(fill=0)["梁底钢筋"][1] == 0
+
+        # 由数据库读取的计算参数与读取Excel一致
+        param, _ = prepare_calculation_data(db.read_frame())
+        expect, _ = prepare_calculation_data(pd.read_excel(xlsx, dtype={"截面编号": str}))
+        assert [p.calc_params for p in param] == [p.calc_params for p in expect] and param[2].Ast != 1500
+
+        # 计算结果按行顺序保存，修改或删除截面后对应结果删除
+        results = solve_items(param)
+        columns = save_project_results(path, param, results, source="test")
+        stored = db.read_results()
+        assert stored["R/S"] == columns["R/S"] and stored["error"] == [None] * 6
+        assert db.runs()[0][3:] == ("test", 6, 0)
+        assert db.conn.execute("SELECT COUNT(*) FROM materials").fetchone()[0] == 1
+        assert db.apply_changes([("delete", 1), ("insert", 4)],
+                                [(0, {"h": 650}), (4, {"截面编号": "新增", "截面类型": "矩形", "新列": "x"})]) == 4
+        assert db.read_columns()["截面编号"] == ["000", "002", "003", "004", "新增", "005"]
+        assert db.read_columns()["h"] == [650, 600, 600, 600, None, 600] and "新列" in db.columns
+        rs = db.read_results()["R/S"]
+        assert rs[0] is None and rs[4] is None and rs[1:4] == columns["R/S"][2:5] and rs[5] == columns["R/S"][5]
+
+        # 导出为数据文件格式（表头同原数据文件，附加Q-T结果列）
+        out = os.path.join(tmp, "out.xlsx")
+        assert db.export_workbook(out, results=True) == 6
+        exported = pd.read_excel(out, dtype={"截面编号": str})
+        assert list(exported.columns[:len(header)]) == header and exported.columns[-1] == "抗力效应比R/S"
+        assert list(exported["截面编号"]) == ["000", "002", "003", "004", "新增", "005"]
+        assert exported["抗力效应比R/S"][1] == round(columns["R/S"][2], 2) and pd.isna(exported["抗力效应比R/S"][0])
+        db.close()
+
+        # 导出文件再导入：结果列不作为截面数据，再次导出时结果表头不重复
+        again = import_workbook(out, os.path.join(tmp, "again.db"))
+        with ProjectDB(again) as db2:
+            assert not set(db2.columns) & set(OUTPUT_COLS.values())
+            # 截面数据中已有的结果列（旧项目）导出时由当前计算结果替换
+            db2.apply_changes([], [(0, {"抗力效应比R/S": 9.99})])
+            db2.export_workbook(out, results=True)
+        again = pd.read_excel(out)
+        assert list(again.columns) == list(exported.columns) and pd.isna(again["抗力效应比R/S"][0])
+
+        if importlib.util.find_spec("PySide6") is not None:
+            from pyside6_section_model import SectionTableModel, write_project_changes
+            model = SectionTableModel()
+            with ProjectDB(path) as db:
+                model.load_columns(db.read_columns(fill=0))
+            model.update_record(0, {"b": 350, "抗震等级": "一级"})
+            assert model.unsaved_rows() == [0]
+            model.insert_record(model.record(0))
+            assert model.unsaved_rows() is None
+            assert write_project_changes(path, model.take_changes()) == 1 + len(header) + 1
+            with ProjectDB(path) as db:
+                assert db.count() == 7 and db.read_columns()["b"][0] == db.read_columns()["b"][6] == 350
+                assert "抗震等级" not in db.columns and "R/S" not in db.columns
+    print("✓ 项目数据库读写完成")
+
+
+def test_result_export():
+    """测试列式结果导出（内存映射读取、错误码及CSV另存）"""
+    print("\n=== 测试列式结果导出 ===")
+    import csv
+    from common.exceptions import ParameterError
+    from concrete.core.records import SectionInput
+    from concrete.core.result_export import load_columns, read_manifest, write_columns, write_table
+    from concrete.main.梁抗弯承载力计算 import EXPORT_INPUT_COLS, EXPORT_RESULT_COLS, result_columns, result_table
+
+    param = [SectionInput(f"KL{i}", "矩形", *sec, M=100 + 50 * i, is_seismic=i % 2) for i, sec in enumerate(SECTIONS)]
+    param.append(SectionInput("KL-b0", "矩形", 0, 500, 0, 0, 30, "HRB400", "HRB400", 1500, 42.5, 0, 42.5, 1.0, M=100))
+    param.append(SectionInput("KL-圆", "圆形", 300, 500, 0, 0, 30, "HRB400", "HRB400", 1500, 42.5, 0, 42.5, 1.0))
+    param.append(SectionInput("KL-注", "矩形", *SECTIONS[0], error="梁底钢筋标注'4x20'无法解析"))
+    results = solve_items(param)
+    table = result_table(param, results)
+    assert list(table) == list(EXPORT_INPUT_COLS + EXPORT_RESULT_COLS)
+    n = len(SECTIONS)
+    assert table["error_code"] == [ErrorCode.OK] * n + [ErrorCode.DIMENSION, ErrorCode.SECTION_TYPE, ErrorCode.INPUT]
+    assert table["R/S"][:n] == result_columns(param, results)["R/S"][:n]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "结果.cols")
+        assert write_columns(table, path, source="test") == len(param)
+        assert write_columns(table, path) == len(param)  # 已有结果目录整体替换
+        assert read_manifest(path)["rows"] == len(param)
+        loaded = load_columns(path)
+        assert isinstance(loaded["Mu"], np.memmap) and loaded["Mu"].dtype == np.float64
+        assert loaded["Mu"][:n].tolist() == table["Mu"][:n] and np.isnan(loaded["Mu"][n:]).all()
+        assert loaded["sec_num"].tolist() == [item.sec_num for item in param] and loaded["fy_grade"][0] == "HPB300"
+        assert loaded["error"][-1] == param[-1].error and loaded["error"][0] == ""
+        assert list(load_columns(path, ["R/S", "flag"], mmap=False)) == ["R/S", "flag"]
+        try:
+            write_columns(table, tmp)
+            assert False, "非结果目录不应被覆盖"
+        except ParameterError:
+            pass
+
+        # CSV另存：nan为空单元格，数值保留全精度
+        csv_path = os.path.join(tmp, "结果.csv")
+        assert write_table(loaded, csv_path) == len(param)
+        with open(csv_path, encoding="utf-8-sig") as f:
+            rows = list(csv.DictReader(f))
+        assert float(rows[0]["Mu"]) == table["Mu"][0] and rows[n]["Mu"] == "" and rows[n]["error_code"] == "1"
+        if importlib.util.find_spec("pyarrow") is None:
+            try:
+                write_table(loaded, os.path.join(tmp, "结果.parquet"))
+                assert False, "未安装pyarrow时应提示"
+            except ParameterError:
+                pass
+    print("✓ 列式结果导出完成")
+
+
+def test_parallel_reports():
+    """测试进程池生成计算书（顺序与逐个生成一致）及分册计算书"""
+    print("\n=== 测试并行生成计算书 ===")
+    import zipfile
+    from concrete.core.records import SectionInput
+    from concrete.core.report_writer import ReportBundle
+    from concrete.main.梁抗弯承载力计算 import render_items
+
+    param = [SectionInput(f"KL/{i}" if i % 7 else "", "矩形", *SECTIONS[i % len(SECTIONS)], M=100 + i)
+             for i in range(60)]
+    results = solve_items(param)
+    serial = list(render_items(param, results))
+    assert list(render_items(param, results, workers=2, chunk_size=7)) == serial
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data = []
+        for name in ("a.zip", "b.zip"):
+            with ReportBundle(os.path.join(tmp, name)) as bundle:
+                for i, (item, rendered) in enumerate(zip(param, serial)):
+                    bundle.add(i, item.sec_num, rendered[4])
+            with open(os.path.join(tmp, name), "rb") as f:
+                data.append(f.read())
+        assert data[0] == data[1]  # 相同结果生成的压缩包逐字节相同
+        with zipfile.ZipFile(os.path.join(tmp, "a.zip")) as z:
+            names = z.namelist()
+            assert names[:2] == ["000001.txt", "000002_KL_1.txt"] and len(names) == len(param)
+            assert z.read(names[1]).decode("utf-8") == serial[1][4] + "\n"
+        with ReportBundle(os.path.join(tmp, "计算书")) as bundle:
+            bundle.add(59, "KL 59", serial[59][4])
+        assert os.listdir(os.path.join(tmp, "计算书")) == ["000060_KL_59.txt"]
+    print("✓ 并行生成计算书与逐个生成一致")
+
+
+def _start_service():
+    """在后台线程中启动服务，返回(事件循环, 服务, 端口)"""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    service = CalcService()
+    server = asyncio.run_coroutine_threadsafe(service.start(port=0), loop).result()
+    return loop, server, service, server.sockets[0].getsockname()[1]
+
+
+def test_service_endpoints():
+    """测试计算服务各接口及请求合并"""
+    print("\n=== 测试本地计算服务 ===")
+    loop, server, service, port = _start_service()
+    client = ServiceClient(port=port)
+    try:
+        sec = SECTIONS[2]
+        rect_args = dict(zip(("b", "h", "fcuk", "fy_grade", "fyc_grade", "Ast", "ast", "Asc", "asc", "γ0"),
+                             sec[0:2] + sec[4:]))
+        res = client.call("/rect", rect_args)
+        assert res["Mu"] == beam_rect_fc(*(sec[0:2] + sec[4:]))[4]
+
+        t_args = dict(zip(("b", "h", "bf", "hf", "fcuk", "fy_grade", "fyc_grade", "Ast", "ast", "Asc", "asc",
+                           "γ0"), SECTIONS[6]))
+        res = client.call("/t", t_args)
+        assert res["flag"] == beam_t_fc(*SECTIONS[6])[0]
+
+        # 列表请求在同一批次内求解
+        batches = service.coalescers["/rect"].batches
+        items = [dict(rect_args, Ast=1000 + 100 * i) for i in range(20)] + [dict(rect_args, b=-1), {"b": 250}]
+        res = client.call("/rect", {"items": items})
+        assert service.coalescers["/rect"].batches == batches + 1
+        assert res["items"][0] == client.call("/rect", items[0])
+        assert "截面尺寸" in res["items"][20]["error"]
+        assert "缺少参数" in res["items"][21]["error"]
+
+        # 格式错误的请求项与有效请求合并求解时只影响该项
+        batches = service.coalescers["/rect"].batches
+        res = client.call("/rect", {"items": items[:20] + [dict(rect_args, b="abc"), 1, dict(rect_args, Ast=None)]})
+        assert service.coalescers["/rect"].batches == batches + 1
+        assert all("error" not in r for r in res["items"][:20]) and res["items"][0] == client.call("/rect", items[0])
+        assert "参数须为数值: b" in res["items"][20]["error"] and "JSON对象" in res["items"][21]["error"]
+        assert "参数须为数值: Ast" in res["items"][22]["error"]
+        assert client.call("/rect", {"items": [1, rect_args]})["items"][1] == client.call("/rect", rect_args)
+        assert "error" in client.call("/report", {"items": [1]})["items"][0]
+        request = dict(rect_args)
+        request["gamma0"] = request.pop("γ0")
+        assert solve_rect([request])[0] == client.call("/rect", rect_args) and "γ0" not in request
+        # 请求行无效时返回400
+        with socket.create_connection(("127.0.0.1", port)) as sock:
+            sock.sendall(b"BAD\r\n\r\n")
+            reply = sock.recv(4096).decode("utf-8")
+        assert reply.startswith("HTTP/1.1 400") and "请求格式错误" in reply
+
+        res = client.call("/rebar", {"notation": "2d25+2d22/4d25", "c": 20, "dv": 10, "sn": 25})
+        assert res["rows"] == ["2d25+2d22", "4d25"]
+        assert "error" in client.call("/rebar", {"notation": "6d25 2/3"})
+
+        res = client.call("/report", {"sec_num": "L-1", "sec_type": "矩形", "M": 250, "is_seismic": 0,
+                                      "γ0": 1.0, "calc_params": list(SECTIONS[0])})
+        assert "矩形截面梁" in res["report"]
+
+        # 长连接下单次调用耗时
+        start = time.perf_counter()
+        for _ in range(200):
+            client.call("/rect", rect_args)
+        per_call = (time.perf_counter() - start) / 200
+        print(f"✓ 计算服务接口正常，单次调用耗时 {per_call * 1e3:.3f} ms")
+    finally:
+        client.close()
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.05), loop).result()
+        loop.call_soon_threadsafe(server.close)
+        loop.call_soon_threadsafe(loop.stop)
+
+
+def main():
+    """主测试函数"""
+    try:
+        test_batch_matches_scalar()
+        test_grouped_dispatch()
+        test_design_batch_matches_scalar()
+        test_capacity_curve()
+        test_sweep()
+        test_layout_optimizer()
+        test_fiber_section()
+        test_input_check()
+        test_section_model()
+        test_section_index()
+        test_result_distribution()
+        test_section_save()
+        test_gui_panel_item()
+        test_edit_journal()
+        test_project_db()
+        test_result_export()
+        test_parallel_reports()
+        test_service_endpoints()
+        print("\n🎉 所有测试通过！")
+    except Exception as e:
+        print(f"\n❌ 测试失败: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()